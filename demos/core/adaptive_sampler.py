@@ -0,0 +1,51 @@
+# External imports
+import numpy as np
+from timeit import timeit
+
+# Internal imports
+from raysect.optical.observer import PowerPipeline2D, SpectralPowerPipeline2D
+from raysect.optical.observer import MonoAdaptiveSampler2D, SpectralAdaptiveSampler2D
+
+
+"""
+Adaptive sampler benchmark
+--------------------------
+
+Times the task generation of the adaptive frame samplers, which runs between
+every pass of a converging render. The pipeline frames are filled with
+synthetic statistics: a quarter of the pixels (and of the spectral bins)
+have no power, the remaining pixels have random means, variances and sample
+counts.
+"""
+
+
+def fill(frame, rng):
+
+    frame.mean[:] = rng.uniform(0, 1, frame.mean.shape) * (rng.uniform(0, 1, frame.mean.shape) > 0.25)
+    frame.variance[:] = rng.uniform(0, 0.1, frame.variance.shape)
+    frame.samples[:] = rng.integers(50, 500, frame.samples.shape)
+
+
+def benchmark(name, sampler, pixels, repeats=5):
+
+    elapsed = timeit(lambda: sampler.generate_tasks(pixels), number=repeats) / repeats
+    print("{:<36} {:8.1f}ms per pass".format(name, 1000 * elapsed))
+
+
+if __name__ == '__main__':
+
+    rng = np.random.default_rng(1)
+
+    pixels = (1024, 1024)
+    pipeline = PowerPipeline2D(display_progress=False)
+    pipeline.initialise(pixels, 1, 375, 740, 1, [], True)
+    fill(pipeline.frame, rng)
+    benchmark("mono 1024x1024", MonoAdaptiveSampler2D(pipeline, cutoff=0.01), pixels)
+
+    pixels = (256, 256)
+    pipeline = SpectralPowerPipeline2D()
+    pipeline.initialise(pixels, 1, 375, 740, 40, [], True)
+    fill(pipeline.frame, rng)
+    for method in ('weighted', 'mean', 'percentile', 'power_percentile'):
+        sampler = SpectralAdaptiveSampler2D(pipeline, cutoff=0.01, reduction_method=method)
+        benchmark("spectral 256x256x40 {}".format(method), sampler, pixels, repeats=1)
@@ -0,0 +1,129 @@
+
+# External imports
+import time
+import numpy as np
+
+# Internal imports
+from raysect.core import World, Point3D, Vector3D, Ray, translate, rotate
+from raysect.primitive import Sphere, Box, Cylinder, Union, Intersect, Subtract, flatten_csg
+
+
+"""
+CSG evaluation benchmark
+------------------------
+
+Compares the incremental evaluation of CSG primitives with the interval
+evaluation. Random rays are traced through the nested CSG primitive used by
+demos/csg.py and through a deep CSG tree of overlapping spheres with holes.
+
+A union of 500 cylinders built from binary CSG operations is then compared
+with the N-ary CSG primitive produced by flatten_csg().
+"""
+
+
+def demo_primitive(parent):
+
+    cyl_x = Cylinder(1, 4.2, transform=rotate(90, 0, 0)*translate(0, 0, -2.1))
+    cyl_y = Cylinder(1, 4.2, transform=rotate(0, 90, 0)*translate(0, 0, -2.1))
+    cyl_z = Cylinder(1, 4.2, transform=rotate(0, 0, 0)*translate(0, 0, -2.1))
+    cube = Box(Point3D(-1.5, -1.5, -1.5), Point3D(1.5, 1.5, 1.5))
+    sphere = Sphere(2.0)
+
+    return Intersect(sphere, Subtract(cube, Union(Union(cyl_x, cyl_y), cyl_z)), parent)
+
+
+def deep_primitive(parent, depth=8):
+
+    # a chain of unions, each member a sphere with a cylindrical hole
+    primitive = None
+    for i in range(depth):
+        angle = 360 * i / depth
+        member = Subtract(Sphere(0.6), Cylinder(0.2, 2, transform=translate(0, 0, -1)),
+                          transform=rotate(angle, 0, 0) * translate(0, 0.8, 0))
+        primitive = member if primitive is None else Union(primitive, member)
+
+    primitive.parent = parent
+    return primitive
+
+
+def cylinder_array(parent, count=500):
+
+    # a left-leaning chain of binary unions, a ray passes through every level of the tree
+    primitive = None
+    for i in range(count):
+        member = Cylinder(0.05, 1.0, transform=translate(0.1 * (i % 25) - 1.25, 0.1 * (i // 25) - 1.0, -0.5))
+        primitive = member if primitive is None else Union(primitive, member)
+
+    primitive.parent = parent
+    return primitive
+
+
+def random_rays(count, seed=1):
+
+    # rays are launched from a sphere enclosing the primitives towards random points near the origin
+    rng = np.random.RandomState(seed)
+    rays = []
+    for i in range(count):
+        direction = rng.normal(size=3)
+        origin = 5 * direction / np.linalg.norm(direction)
+        direction = rng.uniform(-1.5, 1.5, size=3) - origin
+        rays.append(Ray(Point3D(*origin), Vector3D(*direction).normalise()))
+    return rays
+
+
+def benchmark(name, factory, count=50000):
+
+    rays = random_rays(count)
+
+    timings = {}
+    for interval in (False, True):
+
+        world = World()
+        primitive = factory(world)
+        primitive.interval_evaluation = interval
+        world.build_accelerator()
+
+        start = time.time()
+        hits = 0
+        for ray in rays:
+            if world.hit(ray) is not None:
+                hits += 1
+        timings[interval] = time.time() - start
+
+    print("{}: {} rays ({} hits)".format(name, count, hits))
+    print("    incremental evaluation: {:0.3f}s ({:0.1f}k rays/s)".format(timings[False], count / timings[False] / 1000))
+    print("    interval evaluation:    {:0.3f}s ({:0.1f}k rays/s)".format(timings[True], count / timings[True] / 1000))
+    print("    speed up: {:0.2f}x".format(timings[False] / timings[True]))
+
+
+def benchmark_flatten(name, factory, count=5000):
+
+    rays = random_rays(count)
+
+    timings = {}
+    for flatten in (False, True):
+
+        world = World()
+        primitive = factory(world)
+        if flatten:
+            flat = flatten_csg(primitive)
+            primitive.parent = None
+            flat.parent = world
+        world.build_accelerator()
+
+        start = time.time()
+        hits = 0
+        for ray in rays:
+            if world.hit(ray) is not None:
+                hits += 1
+        timings[flatten] = time.time() - start
+
+    print("{}: {} rays ({} hits)".format(name, count, hits))
+    print("    binary CSG tree:   {:0.3f}s ({:0.1f}k rays/s)".format(timings[False], count / timings[False] / 1000))
+    print("    flattened CSG:     {:0.3f}s ({:0.1f}k rays/s)".format(timings[True], count / timings[True] / 1000))
+    print("    speed up: {:0.2f}x".format(timings[False] / timings[True]))
+
+
+benchmark("CSG demo primitive", demo_primitive)
+benchmark("Deep CSG tree", deep_primitive)
+benchmark_flatten("Union of 500 cylinders", cylinder_array)
@@ -0,0 +1,68 @@
+# External imports
+import time
+import numpy as np
+
+# Internal imports
+from raysect.core import Point3D, Vector3D, translate
+from raysect.primitive import Sphere, Box
+from raysect.optical import World, Ray, ConstantSF
+from raysect.optical.material import Lambert, UniformSurfaceEmitter
+
+
+"""
+Direct lighting benchmark
+-------------------------
+
+Compares the noise of the radiance estimated for a diffuse surface lit by
+a small emitter, for the three sampling modes of ContinuousBSDF materials:
+BSDF sampling only, the default single sample multiple importance sampling
+and explicit direct lighting. The scene is a diffuse floor and wall (a
+corner of a Cornell box) lit by a small spherical emitter.
+
+The noise is reported as the relative standard error of a fixed time
+budget, lower is better. The direct lighting mode traces two rays per
+surface interaction, so the comparison is made at equal render time.
+"""
+
+
+def build_world(direct_lighting):
+
+    world = World()
+
+    floor = Lambert(ConstantSF(0.5))
+    wall = Lambert(ConstantSF(0.8))
+    floor.direct_lighting = direct_lighting
+    wall.direct_lighting = direct_lighting
+
+    Box(Point3D(-5, -5, -1), Point3D(5, 5, 0), parent=world, material=floor)
+    Box(Point3D(-5, 0.5, 0), Point3D(5, 1, 5), parent=world, material=wall)
+    Sphere(0.05, parent=world, transform=translate(0, 0, 2), material=UniformSurfaceEmitter(ConstantSF(1.0)))
+    return world
+
+
+def benchmark(name, world, importance_sampling, samples=20000, budget=1.0):
+
+    values = np.empty(samples)
+    start = time.time()
+    for i in range(samples):
+        ray = Ray(Point3D(0, -1, 1), Vector3D(0, 1, -1).normalise(), min_wavelength=500, max_wavelength=501,
+                  bins=1, importance_sampling=importance_sampling)
+        values[i] = ray.trace(world).samples[0]
+    elapsed = time.time() - start
+
+    # the standard error after the time budget
+    mean = values.mean()
+    budget_samples = budget * samples / elapsed
+    noise = values.std() / np.sqrt(budget_samples) / mean
+
+    print("{:<30} mean {:0.4e}, {:0.1f}us/sample, relative noise after {:0.1f}s: {:0.2e}".format(
+        name + ":", mean, 1e6 * elapsed / samples, budget, noise))
+    return noise
+
+
+bsdf = benchmark("BSDF sampling", build_world(False), False)
+mis = benchmark("Multiple importance sampling", build_world(False), True)
+direct = benchmark("Direct lighting", build_world(True), True)
+
+print("noise reduction vs BSDF sampling: {:0.1f}x".format(bsdf / direct))
+print("noise reduction vs multiple importance sampling: {:0.1f}x".format(mis / direct))
@@ -0,0 +1,97 @@
+# External imports
+import time
+import numpy as np
+
+# Internal imports
+from raysect.optical.observer import RGBPipeline2D, set_display_backend
+from raysect.optical.observer.pipeline.display import DisplayThread, decimate_frame
+
+
+"""
+Live display preview benchmark
+------------------------------
+
+Measures the work a live render preview adds to the render loop for a large
+RGB frame. Previously each preview was generated and drawn synchronously
+while worker results queued up. Previews are now generated by a background
+thread from frame snapshots, the render loop only copies the (optionally
+decimated) snapshot and draws the finished image.
+
+The preview thread competes with the render loop for the GIL, so the
+throughput of a pure Python stand-in for the render loop is measured while a
+preview is being generated and compared with its throughput when idle. The
+preview pixel loops release the GIL, so with a free core the render loop
+keeps most of its throughput, on a single core the two threads share it.
+"""
+
+
+def build_pipeline(nx, ny, decimation):
+
+    pipeline = RGBPipeline2D(display_progress=False, display_decimation=decimation)
+    pipeline.initialise((nx, ny), 1, 375, 740, 1, [], True)
+    pipeline.xyz_frame.mean[:] = np.random.RandomState(1).uniform(0, 1, (nx, ny, 3))
+    return pipeline
+
+
+def consume(done):
+    """
+    A stand-in for the render loop consuming results, runs until done() is True.
+
+    Returns the number of iterations per second.
+    """
+
+    count = 0
+    start = time.perf_counter()
+    while not done():
+        for _ in range(100):
+            count += 1
+    return count / (time.perf_counter() - start)
+
+
+def benchmark(nx, ny, decimation, repeats=5):
+
+    pipeline = build_pipeline(nx, ny, decimation)
+    frame = pipeline.xyz_frame
+
+    # synchronous preview, as performed by the render loop previously
+    pipeline._render_display(frame, 'rendering...')
+    start = time.time()
+    for _ in range(repeats):
+        pipeline._render_display(frame, 'rendering...')
+    synchronous = (time.time() - start) / repeats
+
+    # render loop throughput with and without a preview being generated by the display thread
+    thread = DisplayThread(pipeline._generate_display)
+    idle = 0
+    busy = 0
+    loop = 0
+    for _ in range(repeats):
+
+        end = time.perf_counter() + 0.2
+        idle += consume(lambda: time.perf_counter() > end)
+
+        start = time.time()
+        thread.submit(decimate_frame(frame, decimation))
+        loop += time.time() - start
+        busy += consume(lambda: thread.ready)
+
+        start = time.time()
+        image, sensitivity = thread.collect()
+        pipeline._draw_display(image, 'rendering...')
+        loop += time.time() - start
+
+    thread.stop()
+    loop /= repeats
+
+    print("{}x{} decimation {}: synchronous preview {:0.1f}ms, render loop {:0.1f}ms, "
+          "render loop throughput while generating a preview {:0.0f}%".format(
+        nx, ny, decimation, 1000 * synchronous, 1000 * loop, 100 * busy / idle))
+
+
+if __name__ == '__main__':
+
+    # non-interactive backend, the timings exclude the gui event loop
+    set_display_backend('Agg')
+
+    for decimation in (1, 2, 4):
+        benchmark(1024, 1024, decimation)
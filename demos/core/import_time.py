@@ -0,0 +1,51 @@
+# External imports
+import subprocess
+import sys
+
+
+"""
+Import time benchmark
+---------------------
+
+Times the import of the raysect.optical packages in fresh interpreters, as
+experienced by spawned render workers and batch jobs. Each module is imported
+repeatedly in a new process and the best wall time is reported, together with
+whether matplotlib was pulled in as a side effect. Matplotlib should only be
+loaded once a pipeline display is used.
+"""
+
+
+MODULES = [
+    'raysect.core',
+    'raysect.optical',
+    'raysect.optical.observer',
+    'raysect.optical.library',
+]
+
+CODE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed, 'matplotlib' in sys.modules)
+"""
+
+
+def benchmark(module, repeats=5):
+
+    times = []
+    for _ in range(repeats):
+        output = subprocess.check_output([sys.executable, '-c', CODE.format(module=module)])
+        elapsed, matplotlib = output.decode().split()
+        times.append(float(elapsed))
+
+    print("{:<28} best {:6.1f}ms, matplotlib imported: {}".format(module, 1000 * min(times), matplotlib))
+
+
+if __name__ == '__main__':
+
+    for module in MODULES:
+        benchmark(module)
+
+    # the import cost the lazy display support avoids
+    benchmark('matplotlib.pyplot')
@@ -0,0 +1,55 @@
+# External imports
+import time
+import numpy as np
+
+# Internal imports
+from raysect.core import Point3D, translate
+from raysect.primitive import Sphere
+from raysect.optical import World
+from raysect.optical.material import UniformSurfaceEmitter
+from raysect.optical.library.spectra.colours import orange
+from raysect.optical.scenegraph.world import ImportanceManager
+
+
+"""
+Light tree benchmark
+--------------------
+
+Times the sampling and pdf evaluation of the world importance manager for
+scenes containing increasing numbers of small important spheres, arranged
+as a planar array of emitters (e.g. an LED panel). The important primitives
+are organised in a light tree, so the cost per call grows with the depth of
+the tree rather than the number of important primitives.
+"""
+
+
+def build_world(count, seed=1):
+
+    rng = np.random.RandomState(seed)
+    world = World()
+    for i in range(count):
+        x, y = rng.uniform(-5, 5, 2)
+        Sphere(0.02, parent=world, transform=translate(x, y, 2), material=UniformSurfaceEmitter(orange))
+    return world
+
+
+def benchmark(count, samples=20000):
+
+    manager = ImportanceManager(build_world(count).primitives)
+    origins = [Point3D(x, y, 0) for x, y in np.random.RandomState(2).uniform(-5, 5, (samples, 2))]
+
+    start = time.time()
+    directions = [manager.sample(origin) for origin in origins]
+    sample_time = time.time() - start
+
+    start = time.time()
+    for origin, direction in zip(origins, directions):
+        manager.pdf(origin, direction)
+    pdf_time = time.time() - start
+
+    print("{:>6} important primitives: sample {:0.2f}us, pdf {:0.2f}us".format(
+        count, 1e6 * sample_time / samples, 1e6 * pdf_time / samples))
+
+
+for count in (10, 100, 1000, 5000):
+    benchmark(count)
@@ -0,0 +1,97 @@
+# External imports
+import os
+import time
+import numpy as np
+
+# Internal imports
+from raysect.core import Point3D, Vector3D, Ray
+from raysect.primitive import Mesh, import_obj
+
+
+"""
+Packed mesh leaf benchmark
+--------------------------
+
+Compares the per-triangle intersection tests with the packed leaf blocks
+enabled by MeshData.packed_leaves. Random rays are traced through the mesh
+kd-trees of the Stanford bunny (if the model is available in the resources
+folder) and a finely tessellated sphere, built with the default kd-tree
+settings and with larger leaves (kdtree_min_items=16).
+"""
+
+
+def sphere_mesh(radius, divisions, **kwargs):
+
+    # regular latitude-longitude tessellation of a sphere
+    theta = np.linspace(0, np.pi, divisions + 1)
+    phi = np.linspace(0, 2 * np.pi, 2 * divisions, endpoint=False)
+    theta, phi = np.meshgrid(theta, phi, indexing="ij")
+
+    vertices = np.stack([
+        radius * np.sin(theta) * np.cos(phi),
+        radius * np.sin(theta) * np.sin(phi),
+        radius * np.cos(theta)
+    ], axis=-1).reshape(-1, 3)
+
+    triangles = []
+    columns = 2 * divisions
+    for i in range(divisions):
+        for j in range(columns):
+            v1 = i * columns + j
+            v2 = i * columns + (j + 1) % columns
+            v3 = (i + 1) * columns + j
+            v4 = (i + 1) * columns + (j + 1) % columns
+            triangles.append((v1, v3, v2))
+            triangles.append((v2, v3, v4))
+
+    return Mesh(vertices, np.array(triangles), closed=False, **kwargs)
+
+
+def random_rays(mesh, count, seed=1):
+
+    # rays are launched from a sphere enclosing the mesh towards random points inside the mesh bounds
+    rng = np.random.RandomState(seed)
+    box = mesh.bounding_box()
+    centre = np.array([box.centre.x, box.centre.y, box.centre.z])
+    extent = np.array([box.upper.x - box.lower.x, box.upper.y - box.lower.y, box.upper.z - box.lower.z])
+    radius = np.linalg.norm(extent)
+
+    rays = []
+    for i in range(count):
+        direction = rng.normal(size=3)
+        origin = centre + radius * direction / np.linalg.norm(direction)
+        target = centre + extent * (rng.uniform(size=3) - 0.5)
+        direction = target - origin
+        rays.append(Ray(Point3D(*origin), Vector3D(*direction).normalise()))
+    return rays
+
+
+def benchmark(name, mesh, count=200000):
+
+    rays = random_rays(mesh, count)
+
+    timings = {}
+    for packed in (False, True):
+        mesh.data.packed_leaves = packed
+        start = time.time()
+        hits = 0
+        for ray in rays:
+            if mesh.data.trace(ray):
+                hits += 1
+        timings[packed] = time.time() - start
+
+    print("{}: {} triangles, {} rays ({} hits)".format(name, mesh.data.triangles.shape[0], count, hits))
+    print("    per-triangle tests: {:0.3f}s ({:0.1f}k rays/s)".format(timings[False], count / timings[False] / 1000))
+    print("    packed leaves:      {:0.3f}s ({:0.1f}k rays/s)".format(timings[True], count / timings[True] / 1000))
+    print("    speed up: {:0.2f}x".format(timings[False] / timings[True]))
+
+
+base_path = os.path.split(os.path.realpath(__file__))[0]
+
+bunny_path = os.path.join(base_path, "../resources/stanford_bunny.obj")
+if os.path.exists(bunny_path):
+    benchmark("Stanford bunny", import_obj(bunny_path))
+    benchmark("Stanford bunny (large leaves)", import_obj(bunny_path, kdtree_min_items=16))
+
+benchmark("Sphere", sphere_mesh(1.0, 200))
+benchmark("Sphere (large leaves)", sphere_mesh(1.0, 200, kdtree_min_items=16))
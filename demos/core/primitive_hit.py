@@ -0,0 +1,63 @@
+# External imports
+import time
+import numpy as np
+
+# Internal imports
+from raysect.core import World, Point3D, Vector3D, Ray, translate, rotate
+from raysect.primitive import Sphere, Box
+
+
+"""
+Primitive hit benchmark
+-----------------------
+
+Times Sphere.hit() and Box.hit() for primitives with identity, translation
+and general (rotation and translation) transforms. Primitives with identity
+or translation root transforms skip the matrix arithmetic when converting
+rays into local space, and the local ray origin and direction are written
+into buffers held by the primitive rather than newly allocated objects.
+"""
+
+
+def random_rays(count, seed=1):
+
+    # rays are launched from a sphere of radius 3 towards points near the origin
+    rng = np.random.RandomState(seed)
+    rays = []
+    for i in range(count):
+        direction = rng.normal(size=3)
+        origin = 3 * direction / np.linalg.norm(direction)
+        target = rng.uniform(-0.5, 0.5, 3)
+        rays.append(Ray(Point3D(*origin), Vector3D(*(target - origin)).normalise()))
+    return rays
+
+
+def benchmark(name, primitive_type, count=500000, repeats=3):
+
+    rays = random_rays(count)
+    transforms = (
+        ("identity", translate(0, 0, 0)),
+        ("translation", translate(0.1, 0.2, 0.3)),
+        ("general", translate(0.1, 0.2, 0.3) * rotate(10, 20, 30)),
+    )
+
+    print("{}.hit(): {} rays".format(name, count))
+    for label, transform in transforms:
+
+        world = World()
+        primitive = primitive_type(parent=world, transform=transform)
+
+        # best of several runs to reduce timing noise
+        best = None
+        for repeat in range(repeats):
+            start = time.time()
+            for ray in rays:
+                primitive.hit(ray)
+            elapsed = time.time() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        print("    {:<12} {:0.3f}s ({:0.1f}k rays/s)".format(label + ":", best, count / best / 1000))
+
+
+benchmark("Sphere", Sphere)
+benchmark("Box", Box)
@@ -0,0 +1,91 @@
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE. 
+
+
+"""
+Runs the reference benchmarks.
+
+The results are saved as JSON. If a baseline report is supplied, the rates
+are compared and the exit status is 1 if any benchmark has regressed.
+"""
+
+import argparse
+import sys
+
+from raysect.benchmarks.suite import reference_suite, run_benchmarks, save_report, load_report, compare_reports
+
+
+def main(args=None):
+
+    parser = argparse.ArgumentParser(prog="python -m raysect.benchmarks", description="Runs the Raysect reference benchmarks.")
+    parser.add_argument("names", nargs="*", help="the benchmarks to run (default: all)")
+    parser.add_argument("-o", "--output", help="save the report to this JSON file")
+    parser.add_argument("-b", "--baseline", help="compare the rates to this JSON report")
+    parser.add_argument("-t", "--tolerance", type=float, default=0.1, help="permitted fractional fall in rate (default: 0.1)")
+    parser.add_argument("-s", "--scale", type=float, default=1.0, help="scales the size of the workloads (default: 1.0)")
+    parser.add_argument("-r", "--repeats", type=int, default=3, help="number of timed runs of each benchmark (default: 3)")
+    parser.add_argument("-m", "--mesh", help="mesh file for the bunny scene (default: procedural mesh)")
+    parser.add_argument("-l", "--list", action="store_true", help="list the benchmarks and exit")
+    args = parser.parse_args(args)
+
+    benchmarks = reference_suite(args.scale, mesh_file=args.mesh)
+
+    if args.list:
+        for benchmark in benchmarks:
+            print("{:<20} {}".format(benchmark.name, benchmark.description))
+        return 0
+
+    if args.names:
+        available = [benchmark.name for benchmark in benchmarks]
+        for name in args.names:
+            if name not in available:
+                parser.error("unknown benchmark '{}'".format(name))
+        benchmarks = [benchmark for benchmark in benchmarks if benchmark.name in args.names]
+
+    baseline = load_report(args.baseline) if args.baseline else None
+
+    report = run_benchmarks(benchmarks, repeats=args.repeats)
+
+    if args.output:
+        save_report(report, args.output)
+
+    if baseline:
+        print()
+        print("Comparison with Raysect {} ({}):".format(baseline["raysect"], baseline["date"]))
+        regressed = False
+        for name, reference, rate, ratio, regression in compare_reports(baseline, report, args.tolerance):
+            print("{:<20} {:>7.2f}x{}".format(name, ratio, "  REGRESSION" if regression else ""))
+            regressed |= regression
+        return 1 if regressed else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
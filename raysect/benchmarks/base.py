@@ -0,0 +1,192 @@
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE. 
+
+
+from raysect.core.workflow import RenderEngine, SerialEngine
+
+
+class Benchmark:
+    """
+    Base class for benchmarks.
+
+    A benchmark prepares its workload in setup(), which is not timed, and
+    performs it in run(). The run() method returns the amount of work done,
+    in the units named by the unit attribute, so a rate can be reported
+    alongside the wall time. The run() method may be called several times
+    after a single call to setup().
+
+    The size of the workload is controlled by the scale parameter, a scale
+    of 1.0 is the reference workload used to track performance between
+    versions.
+
+    :param float scale: Scales the size of the workload (default=1.0).
+    """
+
+    name = None
+    description = None
+    unit = "rays"
+
+    def __init__(self, scale=1.0):
+
+        if scale <= 0:
+            raise ValueError("The benchmark scale must be greater than zero.")
+        self.scale = scale
+
+        # render statistics of the last run, if collected by the benchmark
+        self.statistics = None
+
+    def scaled(self, value, minimum=1):
+        """
+        Returns a workload size multiplied by the benchmark scale.
+
+        :param float value: The size of the reference workload.
+        :param int minimum: The smallest size returned (default=1).
+        :rtype: int
+        """
+
+        return max(minimum, int(round(value * self.scale)))
+
+    def setup(self):
+        """
+        Prepares the workload, called once before the benchmark is timed.
+        """
+        pass
+
+    def run(self):
+        """
+        Performs the timed workload.
+
+        :return: The amount of work done, in the benchmark's units.
+        """
+        raise NotImplementedError("Virtual method run() has not been implemented.")
+
+    def teardown(self):
+        """
+        Releases the workload, called once after the benchmark is timed.
+        """
+        pass
+
+
+class CountingEngine(RenderEngine):
+    """
+    Render engine that counts the rays traced by an observer.
+
+    Wraps another render engine and inspects the results passed to the
+    observer's update function. Supports the results of the observers and
+    of observer groups.
+
+    :param object engine: The render engine that performs the work (default=SerialEngine()).
+    """
+
+    def __init__(self, engine=None):
+        super().__init__()
+        self.engine = engine or SerialEngine()
+        self.rays = 0
+
+    def run(self, tasks, render, update, render_args=(), render_kwargs={}, update_args=(), update_kwargs={}):
+
+        def count(result, *args, **kwargs):
+            self.rays += _ray_count(result)
+            update(result, *args, **kwargs)
+
+        self.engine.run(tasks, render, count, render_args=render_args, render_kwargs=render_kwargs,
+                        update_args=update_args, update_kwargs=update_kwargs)
+
+        self.statistics = getattr(self.engine, "statistics", None)
+        self.worker_statistics = getattr(self.engine, "worker_statistics", None)
+
+    def worker_count(self):
+        return self.engine.worker_count()
+
+
+def _ray_count(result):
+
+    # observer results end with the ray count, observer groups wrap an observer result
+    count = result[-1]
+    if isinstance(count, tuple):
+        return count[-1]
+    return count
+
+
+class SceneBenchmark(Benchmark):
+    """
+    Base class for benchmarks that render a reference scene.
+
+    The scene is constructed by build(), which must return an observer, or an
+    observer group, configured to use the supplied render engine. Each run
+    performs a single call to observe() and returns the number of rays
+    traced. Renders are seeded, so the same rays are traced on every machine
+    and the rates of different versions are comparable.
+
+    :param float scale: Scales the size of the workload (default=1.0).
+    :param object engine: The render engine used to render the scene (default=SerialEngine(seed=1)).
+    """
+
+    def __init__(self, scale=1.0, engine=None):
+        super().__init__(scale)
+        self.engine = engine
+        self.observer = None
+        self._counter = None
+
+    def build(self, engine):
+        """
+        Constructs the scene.
+
+        :param object engine: The render engine the observer must use.
+        :return: An observer or an observer group.
+        """
+        raise NotImplementedError("Virtual method build() has not been implemented.")
+
+    def pixels(self, width, height):
+        """
+        Returns an image size with its pixel count multiplied by the benchmark scale.
+
+        The image is at least 2 pixels wide and high.
+
+        :param int width: The width of the reference image.
+        :param int height: The height of the reference image.
+        :rtype: tuple
+        """
+
+        factor = self.scale ** 0.5
+        return max(2, int(round(width * factor))), max(2, int(round(height * factor)))
+
+    def setup(self):
+        self._counter = CountingEngine(self.engine or SerialEngine(seed=1))
+        self.observer = self.build(self._counter)
+
+    def run(self):
+        self._counter.rays = 0
+        self.observer.observe()
+        self.statistics = self.observer.render_statistics
+        return self._counter.rays
+
+    def teardown(self):
+        self.observer = None
+        self._counter = None
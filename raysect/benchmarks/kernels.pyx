@@ -0,0 +1,60 @@
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE. 
+
+
+from raysect.optical.spectrum cimport Spectrum
+
+
+cpdef double spectrum_arithmetic(Spectrum spectrum, Spectrum other, int count) except *:
+    """
+    Applies a sequence of in-place arithmetic operations to a spectrum.
+
+    Each iteration performs four operations: a scalar multiply, a spectrum
+    addition, a multiply-add and a sum over the spectrum's bins. These are
+    the operations performed on spectra by the materials and pipelines.
+
+    :param Spectrum spectrum: The spectrum to modify.
+    :param Spectrum other: A compatible spectrum.
+    :param int count: The number of iterations.
+    :return: The sum of the totals, to prevent the loop being optimised away.
+    """
+
+    cdef:
+        int i
+        double total = 0
+
+    if not spectrum.is_compatible(other.min_wavelength, other.max_wavelength, other.bins):
+        raise ValueError("The spectra are not compatible.")
+
+    for i in range(count):
+        spectrum.mul_scalar(0.5)
+        spectrum.add_spectrum(other)
+        spectrum.mad_scalar(0.1, other.samples_mv)
+        total += spectrum.total()
+    return total
@@ -0,0 +1,263 @@
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE. 
+
+
+"""
+Micro-benchmarks of the core operations of Raysect.
+"""
+
+import io
+import numpy as np
+
+from raysect.core import Point3D, Vector3D, Ray as CoreRay
+from raysect.optical import World, Ray, Spectrum, translate, ConstantSF, d65_white
+from raysect.optical.material import Lambert, UniformSurfaceEmitter
+from raysect.optical.observer import RGBPipeline2D, PowerPipeline2D
+from raysect.optical.observer.base.slice import SpectralSlice
+from raysect.primitive import Box, Sphere, Mesh
+from raysect.primitive.mesh.mesh import MeshData
+
+from raysect.benchmarks.base import Benchmark
+from raysect.benchmarks.kernels import spectrum_arithmetic
+from raysect.benchmarks.scenes import blob_mesh, blob_divisions
+
+
+def _random_rays(box, count, seed, ray_class=CoreRay):
+
+    # rays are launched from a sphere enclosing the box towards random points inside the box
+    rng = np.random.RandomState(seed)
+    centre = np.array([box.centre.x, box.centre.y, box.centre.z])
+    extent = np.array([box.upper.x - box.lower.x, box.upper.y - box.lower.y, box.upper.z - box.lower.z])
+    radius = np.linalg.norm(extent)
+
+    rays = []
+    for i in range(count):
+        direction = rng.normal(size=3)
+        origin = centre + radius * direction / np.linalg.norm(direction)
+        direction = centre + extent * (rng.uniform(size=3) - 0.5) - origin
+        rays.append(ray_class(Point3D(*origin), Vector3D(*direction).normalise()))
+    return rays
+
+
+class RayTraceBenchmark(Benchmark):
+    """
+    Traces optical rays into a small scene of diffuse primitives.
+
+    The rate is the number of rays traced, including the secondary rays
+    spawned by the materials.
+
+    :param float scale: Scales the size of the workload (default=1.0).
+    """
+
+    name = "ray_trace"
+    description = "Ray.trace() through a diffuse scene"
+    unit = "rays"
+
+    def setup(self):
+
+        self.world = World()
+        Box(Point3D(-1, -1, -1), Point3D(1, 1, 1), parent=self.world, material=Lambert(ConstantSF(0.5)))
+        Sphere(0.3, parent=self.world, transform=translate(0.2, 0.1, 0.4), material=Lambert(ConstantSF(0.8)))
+        Sphere(0.2, parent=self.world, transform=translate(-0.4, 0.5, 0), material=UniformSurfaceEmitter(d65_white))
+
+        template = Ray(bins=15, max_depth=10)
+        rng = np.random.RandomState(1)
+        self.rays = []
+        for i in range(self.scaled(50000)):
+            direction = rng.normal(size=3)
+            self.rays.append(template.copy(Point3D(0, -0.5, -0.5), Vector3D(*direction).normalise()))
+
+    def run(self):
+
+        count = 0
+        for ray in self.rays:
+            ray.trace(self.world)
+            count += ray.ray_count
+        return count
+
+    def teardown(self):
+        self.world = None
+        self.rays = None
+
+
+class KDTreeBuildBenchmark(Benchmark):
+    """
+    Builds the kd-tree of a mesh.
+
+    :param float scale: Scales the size of the workload (default=1.0).
+    """
+
+    name = "kdtree_build"
+    description = "KDTree3DCore build of a mesh"
+    unit = "triangles"
+
+    def setup(self):
+
+        mesh = blob_mesh(1.0, blob_divisions(self.scaled(50000)))
+        self.vertices = mesh.data.vertices
+        self.triangles = mesh.data.triangles
+
+    def run(self):
+        MeshData(self.vertices, self.triangles, closed=False)
+        return self.triangles.shape[0]
+
+    def teardown(self):
+        self.vertices = None
+        self.triangles = None
+
+
+class KDTreeTraceBenchmark(Benchmark):
+    """
+    Traces random rays through the kd-tree of a mesh.
+
+    :param float scale: Scales the size of the workload (default=1.0).
+    """
+
+    name = "kdtree_trace"
+    description = "KDTree3DCore traversal of a mesh"
+    unit = "rays"
+
+    def setup(self):
+        mesh = blob_mesh(1.0, blob_divisions(self.scaled(50000)))
+        self.data = mesh.data
+        self.rays = _random_rays(mesh.bounding_box(), self.scaled(100000), seed=1)
+
+    def run(self):
+        for ray in self.rays:
+            self.data.trace(ray)
+        return len(self.rays)
+
+    def teardown(self):
+        self.data = None
+        self.rays = None
+
+
+class MeshLoadBenchmark(Benchmark):
+    """
+    Loads a mesh and its kd-tree from a Raysect mesh file (.rsm).
+
+    The mesh file is held in memory, so the benchmark is not limited by the
+    speed of the storage.
+
+    :param float scale: Scales the size of the workload (default=1.0).
+    """
+
+    name = "mesh_load"
+    description = "MeshData load from a Raysect mesh file"
+    unit = "triangles"
+
+    def setup(self):
+
+        mesh = blob_mesh(1.0, blob_divisions(self.scaled(50000)))
+        self.triangles = mesh.data.triangles.shape[0]
+
+        file = io.BytesIO()
+        mesh.save(file)
+        self.file = file.getvalue()
+
+    def run(self):
+        Mesh.from_file(io.BytesIO(self.file))
+        return self.triangles
+
+    def teardown(self):
+        self.file = None
+
+
+class SpectrumBenchmark(Benchmark):
+    """
+    Performs in-place arithmetic on spectra.
+
+    :param float scale: Scales the size of the workload (default=1.0).
+    """
+
+    name = "spectrum_ops"
+    description = "Spectrum arithmetic (40 bins)"
+    unit = "operations"
+
+    def setup(self):
+        self.spectrum = Spectrum(375, 785, 40)
+        self.other = Spectrum(375, 785, 40)
+        self.other.samples[:] = np.linspace(0, 1, 40)
+        self.count = self.scaled(1000000)
+
+    def run(self):
+        spectrum_arithmetic(self.spectrum, self.other, self.count)
+        return 4 * self.count
+
+
+class PipelineUpdateBenchmark(Benchmark):
+    """
+    Updates the RGB and power pipelines of a camera with pixel results.
+
+    The pixel results are generated before the benchmark is timed, so only
+    the pipeline update() calls made while rendering are measured.
+
+    :param float scale: Scales the size of the workload (default=1.0).
+    """
+
+    name = "pipeline_update"
+    description = "RGBPipeline2D and PowerPipeline2D update"
+    unit = "updates"
+
+    def setup(self):
+
+        bins = 15
+        side = max(1, int(round(256 * self.scale ** 0.5)))
+        self.pixels = (side, side)
+        self.slices = [SpectralSlice(375, 785, bins, bins, 0)]
+        self.pipelines = [RGBPipeline2D(display_progress=False), PowerPipeline2D(display_progress=False)]
+
+        spectrum = Spectrum(375, 785, bins)
+        spectrum.samples[:] = np.linspace(0.5, 1.5, bins)
+
+        self.results = []
+        for pipeline in self.pipelines:
+            pipeline.initialise(self.pixels, 1, 375, 785, bins, self.slices, True)
+            results = []
+            for x in range(side):
+                for y in range(side):
+                    processor = pipeline.pixel_processor(x, y, 0)
+                    processor.add_sample(spectrum, 1.0)
+                    results.append((x, y, processor.pack_results()))
+            self.results.append(results)
+
+    def run(self):
+
+        count = 0
+        for pipeline, results in zip(self.pipelines, self.results):
+            for x, y, packed_result in results:
+                pipeline.update(x, y, 0, packed_result)
+            count += len(results)
+        return count
+
+    def teardown(self):
+        for pipeline in self.pipelines:
+            pipeline.finalise()
+        self.pipelines = None
+        self.results = None
@@ -0,0 +1,383 @@
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE. 
+
+
+"""
+Reference scenes for tracking the rendering performance of Raysect.
+
+Each scene exercises a different part of the ray-tracer: mesh kd-trees,
+diffuse inter-reflection, CSG evaluation, volume integration, dispersive
+refraction and many small non-imaging observers.
+"""
+
+from math import tan, pi
+import os
+import numpy as np
+
+from raysect.optical import World, Node, Point3D, Vector3D, translate, rotate, rotate_basis, d65_white, ConstantSF, InterpolatedSF
+from raysect.optical.library import schott, Gold
+from raysect.optical.material import Lambert, UniformSurfaceEmitter, UniformVolumeEmitter, InhomogeneousVolumeEmitter, NumericalIntegrator
+from raysect.optical.observer import PinholeCamera, RGBPipeline2D, SightLine, PowerPipeline0D, ObserverGroup
+from raysect.primitive import Box, Sphere, Cylinder, Mesh, Union, Intersect, Subtract, import_obj, import_ply, import_stl
+
+from raysect.benchmarks.base import SceneBenchmark
+
+
+# number of triangles in the Stanford bunny model
+BUNNY_TRIANGLES = 69451
+
+
+def blob_mesh(radius, divisions, lumps=0.2, **kwargs):
+    """
+    Returns a deterministic, irregular mesh with 4 * divisions^2 triangles.
+
+    The surface is a sphere with a sinusoidally modulated radius, tessellated
+    on a latitude-longitude grid. It stands in for scanned models when
+    benchmarking mesh operations.
+
+    :param float radius: The mean radius of the mesh.
+    :param int divisions: The number of latitude divisions.
+    :param float lumps: The relative amplitude of the radius modulation (default=0.2).
+    :param kwargs: Additional arguments passed to the Mesh constructor.
+    :rtype: Mesh
+    """
+
+    # the poles are left open to avoid degenerate triangles
+    theta = np.linspace(0.01, pi - 0.01, divisions + 1)
+    phi = np.linspace(0, 2 * pi, 2 * divisions, endpoint=False)
+    theta, phi = np.meshgrid(theta, phi, indexing="ij")
+
+    r = radius * (1 + lumps * np.sin(3 * theta) * np.cos(5 * phi))
+    vertices = np.stack([
+        r * np.sin(theta) * np.cos(phi),
+        r * np.cos(theta),
+        r * np.sin(theta) * np.sin(phi)
+    ], axis=-1).reshape(-1, 3)
+
+    columns = 2 * divisions
+    i, j = np.meshgrid(np.arange(divisions), np.arange(columns), indexing="ij")
+    v1 = (i * columns + j).ravel()
+    v2 = (i * columns + (j + 1) % columns).ravel()
+    v3 = ((i + 1) * columns + j).ravel()
+    v4 = ((i + 1) * columns + (j + 1) % columns).ravel()
+    triangles = np.concatenate([np.stack([v1, v3, v2], axis=-1), np.stack([v2, v3, v4], axis=-1)])
+
+    return Mesh(vertices, triangles, closed=False, **kwargs)
+
+
+def blob_divisions(triangles):
+    """
+    Returns the number of divisions of a blob mesh with roughly the requested number of triangles.
+
+    :param int triangles: The number of triangles.
+    :rtype: int
+    """
+
+    return max(2, int(round((triangles / 4) ** 0.5)))
+
+
+def load_mesh(filename, **kwargs):
+    """
+    Loads a mesh from a Raysect (.rsm), OBJ, PLY or STL mesh file.
+
+    :param str filename: The mesh file.
+    :param kwargs: Additional arguments passed to the mesh importer.
+    :rtype: Mesh
+    """
+
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".rsm":
+        return Mesh.from_file(filename, **kwargs)
+    if extension == ".obj":
+        return import_obj(filename, **kwargs)
+    if extension == ".ply":
+        return import_ply(filename, **kwargs)
+    if extension == ".stl":
+        return import_stl(filename, **kwargs)
+    raise ValueError("Unsupported mesh file format '{}'.".format(extension))
+
+
+def _camera(world, engine, pixels, samples, transform, fov=45):
+
+    rgb = RGBPipeline2D(display_progress=False)
+    camera = PinholeCamera(pixels, fov=fov, pipelines=[rgb], parent=world, transform=transform)
+    camera.render_engine = engine
+    camera.pixel_samples = samples
+    camera.spectral_bins = 15
+    camera.spectral_rays = 1
+    camera.quiet = True
+    return camera
+
+
+class BunnyScene(SceneBenchmark):
+    """
+    A gold mesh on a diffuse floor, lit by an area light.
+
+    The Stanford bunny is not distributed with Raysect. A mesh file may be
+    supplied, otherwise a procedural mesh with the same number of triangles
+    as the bunny is used (multiplied by the scale). The mesh is scaled to a height of roughly 0.2m.
+
+    :param float scale: Scales the size of the workload (default=1.0).
+    :param object engine: The render engine used to render the scene (default=SerialEngine(seed=1)).
+    :param str mesh_file: An optional mesh file (default=None).
+    """
+
+    name = "scene_bunny"
+    description = "Gold mesh (bunny) on a diffuse floor"
+
+    def __init__(self, scale=1.0, engine=None, mesh_file=None):
+        super().__init__(scale, engine)
+        self.mesh_file = mesh_file
+
+    def build(self, engine):
+
+        world = World()
+
+        if self.mesh_file:
+            mesh = load_mesh(self.mesh_file)
+            box = mesh.bounding_box()
+            mesh.transform = translate(-box.centre.x, -box.lower.y, -box.centre.z)
+        else:
+            mesh = blob_mesh(0.08, blob_divisions(self.scaled(BUNNY_TRIANGLES)), transform=translate(0, 0.1, 0))
+        mesh.parent = world
+        mesh.material = Gold()
+
+        Box(Point3D(-10, -0.1, -10), Point3D(10, 0, 10), parent=world, material=Lambert(ConstantSF(0.5)))
+        Box(Point3D(-0.5, -0.5, -0.01), Point3D(0.5, 0.5, 0), parent=world,
+            transform=translate(0, 1, 0) * rotate(0, 90, 0), material=UniformSurfaceEmitter(d65_white, 2))
+
+        return _camera(world, engine, self.pixels(64, 64), 16, translate(0, 0.15, -0.5) * rotate(0, -10, 0))
+
+
+class CornellBoxScene(SceneBenchmark):
+    """
+    The Cornell box with a glass sphere and a glass block.
+
+    Exercises diffuse inter-reflection, importance sampling of the ceiling
+    light and refraction.
+
+    :param float scale: Scales the size of the workload (default=1.0).
+    :param object engine: The render engine used to render the scene (default=SerialEngine(seed=1)).
+    """
+
+    name = "scene_cornell_box"
+    description = "Cornell box with glass primitives"
+
+    def build(self, engine):
+
+        world = World()
+        enclosure = Node(world)
+
+        white = Lambert(ConstantSF(0.73))
+        red = Lambert(InterpolatedSF([400, 580, 600, 700], [0.05, 0.07, 0.4, 0.64]))
+        green = Lambert(InterpolatedSF([400, 480, 530, 600, 700], [0.1, 0.11, 0.47, 0.15, 0.15]))
+
+        wall = (Point3D(-1, -1, 0), Point3D(1, 1, 0))
+        Box(*wall, parent=enclosure, transform=translate(0, 0, 1), material=white)
+        Box(*wall, parent=enclosure, transform=translate(0, -1, 0) * rotate(0, -90, 0), material=white)
+        Box(*wall, parent=enclosure, transform=translate(0, 1, 0) * rotate(0, 90, 0), material=white)
+        Box(*wall, parent=enclosure, transform=translate(1, 0, 0) * rotate(-90, 0, 0), material=red)
+        Box(*wall, parent=enclosure, transform=translate(-1, 0, 0) * rotate(90, 0, 0), material=green)
+
+        light = InterpolatedSF([400, 500, 600, 700], [0.0, 8.0, 15.6, 18.4])
+        Box(Point3D(-0.4, -0.4, -0.01), Point3D(0.4, 0.4, 0.0), parent=enclosure,
+            transform=translate(0, 1, 0) * rotate(0, 90, 0), material=UniformSurfaceEmitter(light, 2))
+
+        Box(Point3D(-0.4, 0, -0.4), Point3D(0.3, 1.4, 0.3), parent=world,
+            transform=translate(0.4, -1 + 1e-6, 0.4) * rotate(30, 0, 0), material=schott("N-BK7"))
+        Sphere(0.4, parent=world, transform=translate(-0.4, -0.6 + 1e-6, -0.4), material=schott("N-BK7"))
+
+        camera = _camera(world, engine, self.pixels(64, 64), 8, translate(0, 0, -3.3))
+        camera.ray_importance_sampling = True
+        camera.ray_important_path_weight = 0.25
+        camera.ray_max_depth = 50
+        return camera
+
+
+class CSGStackScene(SceneBenchmark):
+    """
+    A column of nested CSG operations on a diffuse floor.
+
+    Each level of the stack is a ring, the difference of two cylinders,
+    cut by a box and united with the levels below it. Rays passing through
+    the stack evaluate deep trees of CSG operations.
+
+    :param float scale: Scales the size of the workload (default=1.0).
+    :param object engine: The render engine used to render the scene (default=SerialEngine(seed=1)).
+    """
+
+    name = "scene_csg_stack"
+    description = "Stack of nested CSG operations"
+
+    levels = 16
+
+    def build(self, engine):
+
+        world = World()
+
+        stack = None
+        for level in range(self.levels):
+            radius = 0.3 - 0.01 * level
+            ring = Subtract(Cylinder(radius, 0.05), Cylinder(0.7 * radius, 0.06, transform=translate(0, 0, -0.005)))
+            cut = Intersect(ring, Box(Point3D(-1, -0.2 * radius, -1), Point3D(1, 1, 1)))
+            cut.transform = translate(0, 0, 0.06 * level) * rotate(0, 0, 25 * level)
+            stack = cut if stack is None else Union(stack, cut)
+
+        stack.parent = world
+        stack.transform = rotate(0, -90, 0)
+        stack.material = Lambert(ConstantSF(0.8))
+
+        Box(Point3D(-10, -0.1, -10), Point3D(10, 0, 10), parent=world, material=Lambert(ConstantSF(0.5)))
+        Sphere(0.2, parent=world, transform=translate(0.5, 1.5, -0.5), material=UniformSurfaceEmitter(d65_white, 50))
+
+        return _camera(world, engine, self.pixels(64, 64), 16, translate(0, 0.6, -2.5) * rotate(0, -10, 0))
+
+
+class CosGlow(InhomogeneousVolumeEmitter):
+    """
+    A spectrally varying volume emitter defined in Python.
+    """
+
+    def emission_function(self, point, direction, spectrum, world, ray, primitive, to_local, to_world):
+
+        centre = 0.5 * (spectrum.max_wavelength + spectrum.min_wavelength)
+        width = spectrum.min_wavelength - spectrum.max_wavelength
+        shift = 2 * (spectrum.wavelengths - centre) / width
+        radius = (point.x**2 + point.y**2) ** 0.5
+        spectrum.samples += np.cos((shift + 5) * radius) ** 4
+        return spectrum
+
+
+class VolumeScene(SceneBenchmark):
+    """
+    An inhomogeneous volume emitter above a diffuse floor.
+
+    The emission function is defined in Python and is integrated numerically
+    along each ray segment through the volume.
+
+    :param float scale: Scales the size of the workload (default=1.0).
+    :param object engine: The render engine used to render the scene (default=SerialEngine(seed=1)).
+    """
+
+    name = "scene_volume"
+    description = "Inhomogeneous volume emitter"
+
+    def build(self, engine):
+
+        world = World()
+        Box(Point3D(-1, -1, -0.25), Point3D(1, 1, 0.25), parent=world, material=CosGlow(NumericalIntegrator(step=0.05)),
+            transform=translate(0, 1, 0) * rotate(30, 0, 0))
+        Box(Point3D(-100, -0.1, -100), Point3D(100, 0, 100), parent=world, material=Lambert(ConstantSF(0.5)))
+
+        return _camera(world, engine, self.pixels(48, 48), 4, translate(0, 4, -3.5) * rotate(0, -45, 0))
+
+
+def _prism(width, height, parent, transform, material):
+
+    half_width = width / 2
+    mid_point = half_width * tan(60 / 180 * pi) / 2
+
+    centre = Box(Point3D(-half_width * 1.001, 0, 0), Point3D(half_width * 1.001, height, width))
+    left = Box(Point3D(0, -height * 0.001, -width * 0.001), Point3D(width, height * 1.001, 2 * width),
+               transform=translate(half_width, 0, 0) * rotate(30, 0, 0))
+    right = Box(Point3D(-width, -height * 0.001, -width * 0.001), Point3D(0.0, height * 1.001, 2 * width),
+                transform=translate(-half_width, 0, 0) * rotate(-30, 0, 0))
+
+    return Subtract(Subtract(centre, left), right, parent=parent,
+                    transform=transform * translate(0, 0, -mid_point), material=material)
+
+
+class PrismScene(SceneBenchmark):
+    """
+    A dispersive glass prism illuminated through a slit.
+
+    The camera samples several spectral rays per pixel, so the wavelength
+    dependent refraction of the prism is traced separately for each band.
+
+    :param float scale: Scales the size of the workload (default=1.0).
+    :param object engine: The render engine used to render the scene (default=SerialEngine(seed=1)).
+    """
+
+    name = "scene_prism"
+    description = "Dispersive prism and slit light source"
+
+    def build(self, engine):
+
+        world = World()
+        Box(Point3D(-1000, -0.1, -1000), Point3D(1000, 0, 1000), parent=world, material=Lambert())
+        _prism(0.06, 0.15, world, translate(0, 1e-6, -0.01), schott("SF11"))
+
+        # a box with a slit emitting white light
+        light = Node(parent=world, transform=translate(0.1, 1e-6, -0.3) * rotate(-30, 0, 0))
+        outer = Box(Point3D(-0.01, 0, -0.05), Point3D(0.01, 0.15, 0.0))
+        slit = Box(Point3D(-0.0015, 0.03, -0.045), Point3D(0.0015, 0.12, 0.0001))
+        Subtract(outer, slit, parent=light, material=Lambert(reflectivity=ConstantSF(0.1)))
+        Box(Point3D(-0.0015, 0.03, -0.045), Point3D(0.0015, 0.12, -0.04), parent=light,
+            material=UniformSurfaceEmitter(d65_white, 250))
+
+        camera = _camera(world, engine, self.pixels(48, 48), 8, translate(0, 0.2, -0.6) * rotate(0, -15, 0))
+        camera.spectral_rays = 3
+        return camera
+
+
+class SightlineScene(SceneBenchmark):
+    """
+    A fan of sight-lines viewing a glowing plasma column in a diffuse vessel.
+
+    Models a diagnostic composed of many lines of sight, rendered together
+    by an observer group.
+
+    :param float scale: Scales the size of the workload (default=1.0).
+    :param object engine: The render engine used to render the scene (default=SerialEngine(seed=1)).
+    """
+
+    name = "scene_sightlines"
+    description = "Fan of sight-lines viewing a volume emitter"
+
+    def build(self, engine):
+
+        world = World()
+        Cylinder(0.5, 2, parent=world, transform=translate(0, 0, -1),
+                 material=UniformVolumeEmitter(d65_white, 0.5))
+        Subtract(Box(Point3D(-1.1, -1.1, -1.1), Point3D(1.1, 1.1, 1.1)), Box(Point3D(-1, -1, -1), Point3D(1, 1, 1)),
+                 parent=world, material=Lambert(ConstantSF(0.3)))
+
+        count = self.scaled(256)
+        origin = Point3D(0, -0.95, 0)
+        sightlines = []
+        for angle in np.linspace(-60, 60, count):
+            direction = Vector3D(np.sin(np.radians(angle)), np.cos(np.radians(angle)), 0)
+            up = Vector3D(0, 0, 1)
+            sightline = SightLine(pipelines=[PowerPipeline0D()], parent=world, quiet=True,
+                                  transform=translate(origin.x, origin.y, origin.z) * rotate_basis(direction, up))
+            sightline.pixel_samples = 50
+            sightline.spectral_bins = 15
+            sightlines.append(sightline)
+
+        return ObserverGroup(sightlines, render_engine=engine, quiet=True)
@@ -0,0 +1,216 @@
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE. 
+
+
+import json
+import os
+import platform
+from datetime import datetime
+from time import perf_counter
+
+import numpy as np
+
+import raysect
+from raysect.benchmarks.scenes import BunnyScene, CornellBoxScene, CSGStackScene, VolumeScene, PrismScene, SightlineScene
+from raysect.benchmarks.micro import RayTraceBenchmark, KDTreeBuildBenchmark, KDTreeTraceBenchmark, MeshLoadBenchmark, \
+    SpectrumBenchmark, PipelineUpdateBenchmark
+
+
+REPORT_VERSION = 1
+
+
+def reference_suite(scale=1.0, mesh_file=None):
+    """
+    Returns the reference benchmarks.
+
+    :param float scale: Scales the size of the workloads (default=1.0).
+    :param str mesh_file: An optional mesh file for the bunny scene, such as the Stanford bunny (default=None).
+    :rtype: list
+    """
+
+    return [
+        RayTraceBenchmark(scale),
+        KDTreeBuildBenchmark(scale),
+        KDTreeTraceBenchmark(scale),
+        MeshLoadBenchmark(scale),
+        SpectrumBenchmark(scale),
+        PipelineUpdateBenchmark(scale),
+        BunnyScene(scale, mesh_file=mesh_file),
+        CornellBoxScene(scale),
+        CSGStackScene(scale),
+        VolumeScene(scale),
+        PrismScene(scale),
+        SightlineScene(scale),
+    ]
+
+
+def run_benchmark(benchmark, repeats=3):
+    """
+    Times a benchmark.
+
+    The benchmark is run the requested number of times after a single call
+    to setup(). The fastest run is reported as the wall time, it is the
+    least affected by other activity on the machine. The render statistics
+    of the last run are included, if collected.
+
+    :param Benchmark benchmark: The benchmark to run.
+    :param int repeats: The number of timed runs (default=3).
+    :return: A dictionary holding the timings of the benchmark.
+    :rtype: dict
+    """
+
+    if repeats < 1:
+        raise ValueError("The number of repeats must be at least 1.")
+
+    benchmark.setup()
+    try:
+        times = []
+        count = 0
+        for i in range(repeats):
+            start = perf_counter()
+            count = benchmark.run()
+            times.append(perf_counter() - start)
+    finally:
+        benchmark.teardown()
+
+    wall_time = min(times)
+    result = {
+        "description": benchmark.description,
+        "unit": benchmark.unit,
+        "count": count,
+        "wall_time": wall_time,
+        "times": times,
+        "rate": count / wall_time if wall_time > 0 else float("inf")
+    }
+
+    # render statistics are only available if enabled in the build
+    if benchmark.statistics is not None:
+        result["statistics"] = benchmark.statistics.as_dict()
+
+    return result
+
+
+def run_benchmarks(benchmarks=None, repeats=3, quiet=False):
+    """
+    Runs a set of benchmarks and returns a report.
+
+    The report records the version of Raysect and details of the machine,
+    so reports generated by different versions on the same hardware can be
+    compared with compare_reports().
+
+    :param list benchmarks: The benchmarks to run (default=reference_suite()).
+    :param int repeats: The number of timed runs of each benchmark (default=3).
+    :param bool quiet: When True, suppresses the printing of results (default=False).
+    :return: The benchmark report.
+    :rtype: dict
+    """
+
+    if benchmarks is None:
+        benchmarks = reference_suite()
+
+    report = {
+        "report_version": REPORT_VERSION,
+        "raysect": raysect.__version__,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "host": platform.node(),
+        "cpus": os.cpu_count(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "repeats": repeats,
+        "benchmarks": {}
+    }
+
+    for benchmark in benchmarks:
+        if benchmark.name in report["benchmarks"]:
+            raise ValueError("The benchmark name '{}' is used more than once.".format(benchmark.name))
+        result = run_benchmark(benchmark, repeats)
+        result["scale"] = benchmark.scale
+        report["benchmarks"][benchmark.name] = result
+        if not quiet:
+            print("{:<20} {:>10.3f}s {:>14.1f} {}/s".format(benchmark.name, result["wall_time"], result["rate"], result["unit"]))
+
+    return report
+
+
+def save_report(report, filename):
+    """
+    Saves a benchmark report as JSON.
+
+    :param dict report: The benchmark report.
+    :param str filename: The output file.
+    """
+
+    with open(filename, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def load_report(filename):
+    """
+    Loads a benchmark report saved by save_report().
+
+    :param str filename: The report file.
+    :rtype: dict
+    """
+
+    with open(filename, "r") as f:
+        report = json.load(f)
+
+    if report.get("report_version") != REPORT_VERSION:
+        raise ValueError("The file '{}' is not a compatible benchmark report.".format(filename))
+    return report
+
+
+def compare_reports(baseline, report, tolerance=0.1):
+    """
+    Compares the rates of the benchmarks common to two reports.
+
+    A benchmark has regressed if its rate has fallen by more than the
+    tolerance, relative to the baseline. Benchmarks run at a different scale
+    to the baseline are not compared.
+
+    :param dict baseline: The reference report.
+    :param dict report: The report to compare to the reference.
+    :param float tolerance: The permitted fractional fall in rate (default=0.1).
+    :return: A list of (name, baseline rate, rate, ratio, regressed) tuples.
+    :rtype: list
+    """
+
+    if tolerance < 0:
+        raise ValueError("The tolerance cannot be less than zero.")
+
+    comparison = []
+    for name, result in report["benchmarks"].items():
+        reference = baseline["benchmarks"].get(name)
+        if reference is None or reference["scale"] != result["scale"]:
+            continue
+        ratio = result["rate"] / reference["rate"]
+        comparison.append((name, reference["rate"], result["rate"], ratio, ratio < 1 - tolerance))
+    return comparison
@@ -0,0 +1,218 @@
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE. 
+
+
+"""
+Unit tests for the benchmark suite.
+"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from raysect.optical import World, Spectrum
+from raysect.optical.observer import SightLine, PowerPipeline0D
+from raysect.benchmarks import Benchmark, CornellBoxScene, CountingEngine, blob_mesh, blob_divisions, reference_suite, \
+    run_benchmark, run_benchmarks, save_report, load_report, compare_reports
+from raysect.benchmarks.kernels import spectrum_arithmetic
+from raysect.benchmarks.__main__ import main
+
+# the smallest workloads keep the tests fast
+SCALE = 1e-4
+
+
+class CountBenchmark(Benchmark):
+
+    name = "count"
+    description = "Counts the calls to run()"
+    unit = "calls"
+
+    def __init__(self, scale=1.0):
+        super().__init__(scale)
+        self.calls = 0
+        self.events = []
+
+    def setup(self):
+        self.events.append("setup")
+
+    def run(self):
+        self.calls += 1
+        self.events.append("run")
+        return self.calls
+
+    def teardown(self):
+        self.events.append("teardown")
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_scale(self):
+        """The workload is scaled and the scale must be positive."""
+
+        benchmark = Benchmark(0.5)
+        self.assertEqual(benchmark.scaled(100), 50, 'Workload was not scaled.')
+        self.assertEqual(benchmark.scaled(1), 1, 'Workload was scaled below the minimum.')
+
+        with self.assertRaises(ValueError, msg='A scale of zero did not raise a ValueError.'):
+            Benchmark(0)
+
+    def test_run_benchmark(self):
+        """The benchmark is set up once and run the requested number of times."""
+
+        benchmark = CountBenchmark()
+        result = run_benchmark(benchmark, repeats=3)
+
+        self.assertEqual(benchmark.events, ["setup", "run", "run", "run", "teardown"], 'Benchmark methods were called in the wrong order.')
+        self.assertEqual(len(result["times"]), 3, 'The time of each run was not recorded.')
+        self.assertEqual(result["wall_time"], min(result["times"]), 'The wall time is not the fastest run.')
+        self.assertEqual(result["count"], 3, 'The count of the last run was not recorded.')
+        self.assertEqual(result["unit"], "calls", 'The unit was not recorded.')
+
+        with self.assertRaises(ValueError, msg='Zero repeats did not raise a ValueError.'):
+            run_benchmark(CountBenchmark(), repeats=0)
+
+    def test_reference_suite(self):
+        """All reference benchmarks run and report a positive rate."""
+
+        benchmarks = reference_suite(SCALE)
+        names = [benchmark.name for benchmark in benchmarks]
+        self.assertEqual(len(names), len(set(names)), 'Benchmark names are not unique.')
+
+        report = run_benchmarks(benchmarks, repeats=1, quiet=True)
+        self.assertEqual(list(report["benchmarks"].keys()), names, 'Not all benchmarks were run.')
+        for name, result in report["benchmarks"].items():
+            self.assertGreater(result["count"], 0, 'Benchmark {} did no work.'.format(name))
+            self.assertGreater(result["rate"], 0, 'Benchmark {} has no rate.'.format(name))
+            self.assertEqual(result["scale"], SCALE, 'Benchmark {} has the wrong scale.'.format(name))
+
+    def test_scene_repeatable(self):
+        """Seeded scenes trace the same number of rays on each run."""
+
+        counts = [run_benchmark(CornellBoxScene(SCALE), repeats=1)["count"] for i in range(2)]
+        self.assertEqual(counts[0], counts[1], 'Scene renders are not repeatable.')
+
+    def test_counting_engine(self):
+        """The counting engine counts the rays traced by an observer."""
+
+        engine = CountingEngine()
+        sightline = SightLine(pipelines=[PowerPipeline0D()], parent=World(), render_engine=engine, quiet=True)
+        sightline.pixel_samples = 10
+        sightline.spectral_rays = 2
+        sightline.observe()
+
+        # rays escaping an empty world are only counted once
+        self.assertEqual(engine.rays, 20, 'Counted the wrong number of rays.')
+
+    def test_blob_mesh(self):
+        """Blob meshes have the requested number of triangles."""
+
+        mesh = blob_mesh(1.0, blob_divisions(1000))
+        self.assertEqual(mesh.data.triangles.shape[0], 4 * blob_divisions(1000) ** 2, 'Blob mesh has the wrong number of triangles.')
+        self.assertAlmostEqual(mesh.data.triangles.shape[0], 1000, delta=100, msg='Blob mesh does not have roughly the requested number of triangles.')
+
+    def test_spectrum_arithmetic(self):
+        """The spectrum kernel rejects incompatible spectra."""
+
+        spectrum = Spectrum(400, 700, 10)
+        other = Spectrum(400, 700, 10)
+        other.samples[:] = 1.0
+
+        spectrum_arithmetic(spectrum, other, 1)
+        self.assertTrue((spectrum.samples == 1.1).all(), 'Spectrum arithmetic gave the wrong result.')
+
+        with self.assertRaises(ValueError, msg='Incompatible spectra did not raise a ValueError.'):
+            spectrum_arithmetic(spectrum, Spectrum(400, 700, 20), 1)
+
+
+class TestReports(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def report(self, rate, scale=1.0):
+        return {"raysect": "0.0.0", "date": "", "benchmarks": {"count": {"rate": rate, "scale": scale}}}
+
+    def test_save_load(self):
+        """Reports survive a round trip through a JSON file."""
+
+        report = run_benchmarks([CountBenchmark()], repeats=2, quiet=True)
+        filename = os.path.join(self.directory.name, "report.json")
+        save_report(report, filename)
+        self.assertEqual(load_report(filename), report, 'The loaded report does not match the saved report.')
+
+    def test_load_invalid(self):
+        """Loading a file that is not a report raises a ValueError."""
+
+        filename = os.path.join(self.directory.name, "invalid.json")
+        with open(filename, "w") as f:
+            json.dump({"benchmarks": {}}, f)
+
+        with self.assertRaises(ValueError, msg='Loading an invalid report did not raise a ValueError.'):
+            load_report(filename)
+
+    def test_compare(self):
+        """Falls in rate larger than the tolerance are regressions."""
+
+        baseline = self.report(100.0)
+
+        (name, reference, rate, ratio, regressed), = compare_reports(baseline, self.report(95.0), tolerance=0.1)
+        self.assertEqual(name, "count", 'Compared the wrong benchmark.')
+        self.assertAlmostEqual(ratio, 0.95, msg='Rate ratio is wrong.')
+        self.assertFalse(regressed, 'A fall within the tolerance was reported as a regression.')
+
+        regressed = compare_reports(baseline, self.report(80.0), tolerance=0.1)[0][4]
+        self.assertTrue(regressed, 'A fall beyond the tolerance was not reported as a regression.')
+
+        self.assertEqual(compare_reports(baseline, self.report(50.0, scale=0.5)), [], 'Benchmarks with different scales were compared.')
+
+    def test_command_line(self):
+        """The command line runs selected benchmarks and reports regressions in the exit status."""
+
+        output = os.path.join(self.directory.name, "report.json")
+        baseline = os.path.join(self.directory.name, "baseline.json")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(main(["spectrum_ops", "-s", str(SCALE), "-r", "1", "-o", output]), 0, 'Command line failed.')
+            report = load_report(output)
+            self.assertEqual(list(report["benchmarks"].keys()), ["spectrum_ops"], 'Command line ran the wrong benchmarks.')
+
+            # a baseline that is much faster forces a regression
+            report["benchmarks"]["spectrum_ops"]["rate"] *= 1e6
+            save_report(report, baseline)
+            self.assertEqual(main(["spectrum_ops", "-s", str(SCALE), "-r", "1", "-b", baseline]), 1, 'Regression was not reported.')
+
+
+if __name__ == "__main__":
+    unittest.main()
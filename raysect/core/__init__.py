@@ -36,3 +36,5 @@ from .math import *
 from .scenegraph import *
 from .constants import *
 from .workflow import SerialEngine, MulticoreEngine
+from .statistics import RenderStatistics, RenderProfile, statistics_enabled, get_counters, reset_counters
+from .statistics import set_profiling, profiling_enabled
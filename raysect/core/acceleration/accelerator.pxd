@@ -39,4 +39,6 @@ cdef class Accelerator:
 
     cpdef Intersection hit(self, Ray ray)
 
+    cpdef bint occluded(self, Ray ray) except -1
+
     cpdef list contains(self, Point3D point)
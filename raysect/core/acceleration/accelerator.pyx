@@ -39,6 +39,11 @@ cdef class Accelerator:
 
         raise NotImplementedError("Accelerator virtual method hit() has not been implemented.")
 
+    cpdef bint occluded(self, Ray ray) except -1:
+
+        # accelerators without an any-hit traversal fall back to a closest hit search
+        return self.hit(ray) is not None
+
     cpdef list contains(self, Point3D point):
 
         raise NotImplementedError("Accelerator virtual method contains() has not been implemented.")
\ No newline at end of file
@@ -43,6 +43,10 @@ cdef class BoundPrimitive:
 
     cdef Intersection hit(self, Ray ray)
 
+    cdef double hit_distance(self, Ray ray) except? -1
+
+    cdef Intersection materialise_intersection(self)
+
     cdef Intersection next_intersection(self)
 
     cdef bint contains(self, Point3D point)
\ No newline at end of file
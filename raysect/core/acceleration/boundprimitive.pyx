@@ -29,8 +29,14 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
+from raysect.core.statistics cimport RAYSECT_STATISTICS, count_event, PRIMITIVE_TESTS
+from raysect.core.statistics cimport profile_enter, profile_exit, PROFILE_HIT, PROFILE_CONTAINS
+
 # TODO: add docstrings
 
+# cython doesn't have a built-in infinity constant, this compiles to +infinity
+DEF INFINITY = 1e999
+
 cdef class BoundPrimitive:
 
     def __init__(self, Primitive primitive not None):
@@ -41,15 +47,52 @@ cdef class BoundPrimitive:
 
     cdef Intersection hit(self, Ray ray):
 
+        cdef:
+            Intersection intersection
+            bint profiled
+
         if self.box.hit(ray):
+            if RAYSECT_STATISTICS:
+                count_event(PRIMITIVE_TESTS, 1)
             self._primitive_tested = True
-            return self.primitive.hit(ray)
+            profiled = RAYSECT_STATISTICS and profile_enter()
+            intersection = self.primitive.hit(ray)
+            if profiled:
+                profile_exit(PROFILE_HIT, self.primitive)
+            return intersection
 
         # primitive hit was not called so next_intersection could now be invalid
         self._primitive_tested = False
 
         return None
 
+    cdef double hit_distance(self, Ray ray) except? -1:
+
+        cdef:
+            double distance
+            bint profiled
+
+        if self.box.hit(ray):
+            if RAYSECT_STATISTICS:
+                count_event(PRIMITIVE_TESTS, 1)
+            self._primitive_tested = True
+            profiled = RAYSECT_STATISTICS and profile_enter()
+            distance = self.primitive.hit_distance(ray)
+            if profiled:
+                profile_exit(PROFILE_HIT, self.primitive)
+            return distance
+
+        # primitive hit was not called so next_intersection could now be invalid
+        self._primitive_tested = False
+
+        return INFINITY
+
+    cdef Intersection materialise_intersection(self):
+
+        if self._primitive_tested:
+            return self.primitive.materialise_intersection()
+        return None
+
     cdef Intersection next_intersection(self):
 
         # only permit calls to next intersection if the primitive hit function was called
@@ -61,6 +104,12 @@ cdef class BoundPrimitive:
 
     cdef bint contains(self, Point3D point):
 
+        cdef bint result, profiled
+
         if self.box.contains(point):
-            return self.primitive.contains(point)
+            profiled = RAYSECT_STATISTICS and profile_enter()
+            result = self.primitive.contains(point)
+            if profiled:
+                profile_exit(PROFILE_CONTAINS, self.primitive)
+            return result
         return False
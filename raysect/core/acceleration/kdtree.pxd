@@ -32,13 +32,32 @@
 from raysect.core.acceleration.accelerator cimport Accelerator as _Accelerator
 from raysect.core.math.spatial.kdtree3d cimport KDTree3DCore as _KDTreeCore
 from raysect.core.intersection cimport Intersection
+from raysect.core.acceleration.boundprimitive cimport BoundPrimitive
+from raysect.core.ray cimport Ray
+from libc.stdint cimport uint64_t
 
 cdef class _PrimitiveKDTree(_KDTreeCore):
     cdef:
         list primitives
         Intersection hit_intersection
+        uint64_t[::1] _mailbox
+        uint64_t _ray_id
+        BoundPrimitive _candidate
+        double _candidate_distance
+
+    cdef void _reset_mailbox(self)
 
 
 cdef class KDTree(_Accelerator):
-    cdef _PrimitiveKDTree _kdtree
 
+    cdef:
+        _PrimitiveKDTree _kdtree
+        public object cache
+        readonly bint cache_hit
+
+    cdef _PrimitiveKDTree _load_cache(self, list bound_primitives, str path)
+
+    cdef void _save_cache(self, str path) except *
+
+
+cpdef str scene_hash(list bound_primitives)
@@ -34,28 +34,43 @@ from raysect.core.math.spatial.kdtree3d cimport Item3D
 from raysect.core.scenegraph cimport Primitive
 from raysect.core.ray cimport Ray
 from raysect.core.acceleration.boundprimitive cimport BoundPrimitive
-from libc.stdint cimport int32_t
+from libc.stdint cimport int32_t, uint64_t
+from raysect.core.math cimport AffineMatrix3D
+from numpy import zeros, uint64
+from hashlib import sha256
+from tempfile import NamedTemporaryFile
+import io
+import os
+import struct
+import warnings
 cimport cython
 
+# cython doesn't have a built-in infinity constant, this compiles to +infinity
+DEF INFINITY = 1e999
+
+# identifies cache files, bump the version if the content hash or the serialised kd-tree format changes
+_CACHE_MAGIC = b"RSKDTREE"
+_CACHE_VERSION = 1
+
 
 cdef class _PrimitiveKDTree(_KDTreeCore):
 
     def __init__(self, list primitives, int max_depth=0, int min_items=1, double hit_cost=80.0, double empty_bonus=0.2):
 
         cdef:
-            Primitive primitive
             BoundPrimitive bound_primitive
             int32_t id
             list items
 
-        # wrap each primitive with its bounding box
-        self.primitives = [BoundPrimitive(primitive) for primitive in primitives]
+        # the primitives are supplied wrapped with their bounding boxes
+        self.primitives = primitives
 
         # kd-Tree init requires the primitives's id (it's index here) and bounding box
         items = [Item3D(id, bound_primitive.box) for id, bound_primitive in enumerate(self.primitives)]
         super().__init__(items, max_depth, min_items, hit_cost, empty_bonus)
 
         self.hit_intersection = None
+        self._reset_mailbox()
 
     def __getstate__(self):
         return self.primitives, super().__getstate__()
@@ -64,12 +79,67 @@ cdef class _PrimitiveKDTree(_KDTreeCore):
         self.primitives, super_state = state
         super().__setstate__(super_state)
         self.hit_intersection = None
+        self._reset_mailbox()
 
     def __reduce__(self):
         return self.__new__, (self.__class__, ), self.__getstate__()
 
+    cdef void _reset_mailbox(self):
+        """
+        Allocates the per-primitive mailboxes.
+
+        A primitive whose bounding box straddles a split plane is referenced
+        by several leaves. Each trace is assigned a unique ray id and a
+        primitive's mailbox records the id of the last ray it was tested
+        against, so the primitive is tested at most once per ray.
+        """
+
+        self._mailbox = zeros(len(self.primitives), dtype=uint64)
+        self._ray_id = 0
+        self._candidate = None
+        self._candidate_distance = INFINITY
+
+    cdef bint _trace(self, Ray ray):
+        """
+        Starts the ray traversal of the kd tree.
+
+        :param ray: A Ray object.
+        :return: True is a hit occurs, false otherwise.
+        """
+
+        cdef bint hit
+
+        # start a new mailbox epoch, the closest candidate is tracked across leaves
+        self._ray_id += 1
+        self._candidate = None
+        self._candidate_distance = INFINITY
+        self.hit_intersection = None
+
+        hit = _KDTreeCore._trace(self, ray)
+
+        # a candidate lying beyond the range of the last leaf visited is still the closest intersection
+        if not hit and self._candidate is not None:
+            self.hit_intersection = self._candidate.materialise_intersection()
+            hit = True
+
+        self._candidate = None
+        return hit
+
+    cdef bint _trace_any(self, Ray ray):
+        """
+        Starts the any-hit ray traversal of the kd tree.
+
+        :param ray: A Ray object.
+        :return: True is a hit occurs, false otherwise.
+        """
+
+        # start a new mailbox epoch
+        self._ray_id += 1
+        return _KDTreeCore._trace_any(self, ray)
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
+    @cython.initializedcheck(False)
     cdef bint _trace_leaf(self, int32_t id, Ray ray, double max_range):
         """
         Tests each item in the kd-Tree leaf node to identify if an intersection occurs.
@@ -93,34 +163,78 @@ cdef class _PrimitiveKDTree(_KDTreeCore):
         cdef:
             int32_t count, item, index
             double distance
-            Intersection intersection, closest_intersection
             BoundPrimitive primitive
 
         # unpack leaf data
         count = self._nodes[id].count
 
-        # find the closest primitive-ray intersection with initial search distance limited by node and ray limits
-        distance = min(ray.max_distance, max_range)
-        closest_intersection = None
+        # find the closest primitive-ray intersection, continuing the search from the closest candidate of earlier leaves
+        # only the distances are evaluated, the intersection is constructed for the closest primitive alone
         for item in range(count):
 
-            # dereference the primitive
+            # skip primitives already tested against this ray in an earlier leaf
             index = self._nodes[id].items[item]
+            if self._mailbox[index] == self._ray_id:
+                continue
+            self._mailbox[index] = self._ray_id
+
+            # dereference the primitive
             primitive = <BoundPrimitive> self.primitives[index]
 
             # test for intersection
-            intersection = primitive.hit(ray)
-            if intersection is not None and intersection.ray_distance <= distance:
-                distance = intersection.ray_distance
-                closest_intersection = intersection
+            distance = primitive.hit_distance(ray)
+            if distance < self._candidate_distance:
+                self._candidate_distance = distance
+                self._candidate = primitive
 
-        if closest_intersection is None:
-            self.hit_intersection = None
+        # a candidate beyond the node range may be beaten by a primitive in a later leaf
+        if self._candidate is None or self._candidate_distance > max_range:
             return False
 
-        self.hit_intersection = closest_intersection
+        self.hit_intersection = self._candidate.materialise_intersection()
+        self._candidate = None
         return True
 
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef bint _trace_any_leaf(self, int32_t id, Ray ray):
+        """
+        Tests the items in the kd-Tree leaf node to identify if any intersection occurs.
+
+        The test terminates at the first primitive that intersects the ray
+        within the ray's maximum distance. No intersection object is
+        constructed.
+
+        :param id: Index of node in node array.
+        :param ray: Ray object.
+        :return: True is an intersection occurs, false otherwise.
+        """
+
+        cdef:
+            int32_t count, item, index
+            BoundPrimitive primitive
+
+        # unpack leaf data
+        count = self._nodes[id].count
+
+        for item in range(count):
+
+            # skip primitives already tested against this ray in an earlier leaf
+            index = self._nodes[id].items[item]
+            if self._mailbox[index] == self._ray_id:
+                continue
+            self._mailbox[index] = self._ray_id
+
+            # dereference the primitive
+            primitive = <BoundPrimitive> self.primitives[index]
+
+            # any intersection blocks the ray, primitives only report intersections within the ray range
+            if primitive.hit_distance(ray) < INFINITY:
+                return True
+
+        return False
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     cdef list _items_containing_leaf(self, int32_t id, Point3D point):
@@ -164,9 +278,126 @@ cdef class _PrimitiveKDTree(_KDTreeCore):
 
 
 cdef class KDTree(_Accelerator):
+    """
+    A kd-tree acceleration structure for the primitives in a World.
+
+    Building the kd-tree of a large scene can take a significant amount of
+    time. If a cache directory is specified, the built kd-tree is saved to the
+    directory and reused by any later build of a scene with identical
+    content, even in another process. The cache key is a hash of the type,
+    transform and bounding box of each primitive, in scene order. The kd-tree
+    depends only on these bounding boxes, so a change of any primitive
+    parameter or mesh data that alters the geometry changes the key. Material
+    changes do not affect the kd-tree and reuse the cached structure.
+
+    Cache files are never removed automatically.
+
+    :param str cache: Path of a directory in which to cache kd-trees (default = None, caching disabled).
+
+    :ivar str cache: The cache directory or None if caching is disabled.
+    :ivar bool cache_hit: True if the last build was loaded from the cache.
+
+    .. code-block:: pycon
+
+        >>> from raysect.core import World
+        >>> from raysect.core.acceleration import KDTree
+        >>>
+        >>> world = World()
+        >>> world.accelerator = KDTree(cache="/tmp/raysect-cache")
+    """
+
+    def __init__(self, object cache=None):
+        self.cache = cache
+        self.cache_hit = False
 
     cpdef build(self, list primitives):
-        self._kdtree = _PrimitiveKDTree(primitives)
+
+        cdef:
+            list bound_primitives
+            str path
+
+        # wrap each primitive with its bounding box
+        bound_primitives = [BoundPrimitive(primitive) for primitive in primitives]
+
+        self.cache_hit = False
+        if self.cache is None:
+            self._kdtree = _PrimitiveKDTree(bound_primitives)
+            return
+
+        path = os.path.join(os.fspath(self.cache), scene_hash(bound_primitives) + ".kdtree")
+        self._kdtree = self._load_cache(bound_primitives, path)
+        if self._kdtree is not None:
+            self.cache_hit = True
+            return
+
+        self._kdtree = _PrimitiveKDTree(bound_primitives)
+        self._save_cache(path)
+
+    cdef _PrimitiveKDTree _load_cache(self, list bound_primitives, str path):
+        """
+        Loads a cached kd-tree, returns None if the cache entry is missing or invalid.
+        """
+
+        cdef:
+            _PrimitiveKDTree kdtree
+            bytes data, digest, payload
+
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except OSError:
+            return None
+
+        # the payload digest guards against truncated or corrupted files
+        header_size = len(_CACHE_MAGIC) + 4
+        if len(data) < header_size + 32 or data[:len(_CACHE_MAGIC)] != _CACHE_MAGIC:
+            return None
+
+        if struct.unpack("<i", data[len(_CACHE_MAGIC):header_size])[0] != _CACHE_VERSION:
+            return None
+
+        digest = data[header_size:header_size + 32]
+        payload = data[header_size + 32:]
+        if sha256(payload).digest() != digest:
+            return None
+
+        kdtree = _PrimitiveKDTree.__new__(_PrimitiveKDTree)
+        kdtree.__setstate__((bound_primitives, payload))
+        return kdtree
+
+    cdef void _save_cache(self, str path) except *:
+        """
+        Saves the kd-tree to the cache.
+
+        The file is written under a temporary name and moved into place so
+        concurrent processes never observe a partially written cache entry.
+        The cache is only an optimisation, a failure to write the cache entry
+        is reported as a warning.
+        """
+
+        cdef:
+            object stream
+            bytes payload
+            str directory, temporary = None
+
+        stream = io.BytesIO()
+        self._kdtree.save(stream)
+        payload = stream.getvalue()
+
+        directory = os.path.dirname(path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with NamedTemporaryFile(dir=directory, suffix=".tmp", delete=False) as file:
+                temporary = file.name
+                file.write(_CACHE_MAGIC)
+                file.write(struct.pack("<i", _CACHE_VERSION))
+                file.write(sha256(payload).digest())
+                file.write(payload)
+            os.replace(temporary, path)
+        except OSError as error:
+            if temporary is not None and os.path.exists(temporary):
+                os.remove(temporary)
+            warnings.warn("The kd-tree could not be saved to the cache '{}': {}".format(directory, error), RuntimeWarning)
 
     cpdef Intersection hit(self, Ray ray):
 
@@ -175,7 +406,53 @@ cdef class KDTree(_Accelerator):
             return self._kdtree.hit_intersection
         return None
 
+    cpdef bint occluded(self, Ray ray) except -1:
+        return self._kdtree._trace_any(ray)
+
     cpdef list contains(self, Point3D point):
 
         # we explicitly use _items_containing() rather than items_containing() as _items_containing is cdef, rather than cpdef
-        return self._kdtree._items_containing(point)
\ No newline at end of file
+        return self._kdtree._items_containing(point)
+
+
+cpdef str scene_hash(list bound_primitives):
+    """
+    Returns a hash of the content of a scene that determines its kd-tree.
+
+    The hash covers the type, transform and bounding box of each primitive,
+    in order, together with the cache format version.
+
+    :param list bound_primitives: A list of BoundPrimitive objects.
+    :return: A hexadecimal hash string.
+    """
+
+    cdef:
+        BoundPrimitive bound_primitive
+        Primitive primitive
+        AffineMatrix3D m
+        object hasher
+
+    hasher = sha256()
+    hasher.update(_CACHE_MAGIC)
+    hasher.update(struct.pack("<ii", _CACHE_VERSION, len(bound_primitives)))
+
+    for bound_primitive in bound_primitives:
+
+        primitive = bound_primitive.primitive
+        hasher.update("{}.{}".format(type(primitive).__module__, type(primitive).__qualname__).encode())
+
+        m = primitive.to_root()
+        hasher.update(struct.pack(
+            "<12d",
+            m.m[0][0], m.m[0][1], m.m[0][2], m.m[0][3],
+            m.m[1][0], m.m[1][1], m.m[1][2], m.m[1][3],
+            m.m[2][0], m.m[2][1], m.m[2][2], m.m[2][3]
+        ))
+
+        hasher.update(struct.pack(
+            "<6d",
+            bound_primitive.box.lower.x, bound_primitive.box.lower.y, bound_primitive.box.lower.z,
+            bound_primitive.box.upper.x, bound_primitive.box.upper.y, bound_primitive.box.upper.z
+        ))
+
+    return hasher.hexdigest()
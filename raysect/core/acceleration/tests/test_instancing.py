@@ -0,0 +1,152 @@
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE. 
+
+import unittest
+import numpy as np
+from raysect.core import World, Point3D, Vector3D, Ray, translate, rotate
+from raysect.core.acceleration import Unaccelerated, KDTree
+from raysect.primitive import Sphere, Box, Mesh, Instance
+
+
+class TestInstancing(unittest.TestCase):
+    """
+    Tests instanced primitives against equivalent individually placed primitives.
+    """
+
+    # a closed tetrahedron
+    vertices = [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]]
+    triangles = [[0, 2, 1], [0, 1, 3], [0, 3, 2], [1, 2, 3]]
+
+    transforms = [translate(3 * i, 3 * j, 0) * rotate(15 * i, 10 * j, 5) for i in range(-2, 3) for j in range(-2, 3)]
+
+    def build_worlds(self, prototype, factory, accelerator):
+
+        instanced = World()
+        instanced.accelerator = accelerator()
+        for transform in self.transforms:
+            Instance(prototype, parent=instanced, transform=transform)
+
+        reference = World()
+        reference.accelerator = accelerator()
+        for transform in self.transforms:
+            factory(reference, transform)
+
+        return instanced, reference
+
+    def compare_hits(self, instanced, reference):
+
+        rng = np.random.RandomState(1)
+        for i in range(1000):
+
+            origin = Point3D(*rng.uniform(-9, 9, 3))
+            direction = Vector3D(*rng.normal(size=3)).normalise()
+
+            expected = reference.hit(Ray(origin, direction))
+            intersection = instanced.hit(Ray(origin, direction))
+
+            if expected is None:
+                self.assertIsNone(intersection, "Instanced scene returned an intersection where the reference scene did not.")
+                continue
+
+            self.assertIsNotNone(intersection, "Instanced scene missed an intersection found in the reference scene.")
+            self.assertAlmostEqual(intersection.ray_distance, expected.ray_distance, places=9, msg="Intersection distances do not match.")
+            self.assertIsInstance(intersection.primitive, Instance, "The intersection primitive should be the instance.")
+
+            # the intersection transforms must map the hit point between world and primitive space
+            world_point = intersection.hit_point.transform(intersection.primitive_to_world)
+            expected_point = expected.hit_point.transform(expected.primitive_to_world)
+            for a, b in zip(world_point, expected_point):
+                self.assertAlmostEqual(a, b, places=9, msg="Intersection hit points do not match.")
+
+            normal = intersection.normal.transform(intersection.primitive_to_world).normalise()
+            expected_normal = expected.normal.transform(expected.primitive_to_world).normalise()
+            for a, b in zip(normal, expected_normal):
+                self.assertAlmostEqual(a, b, places=9, msg="Intersection normals do not match.")
+
+    def test_sphere(self):
+
+        prototype = Sphere(0.7)
+        for accelerator in (KDTree, Unaccelerated):
+            instanced, reference = self.build_worlds(prototype, lambda parent, transform: Sphere(0.7, parent=parent, transform=transform), accelerator)
+            self.compare_hits(instanced, reference)
+
+    def test_mesh(self):
+
+        prototype = Mesh(self.vertices, self.triangles, closed=True)
+        for accelerator in (KDTree, Unaccelerated):
+            instanced, reference = self.build_worlds(prototype, lambda parent, transform: prototype.instance(parent=parent, transform=transform), accelerator)
+            self.compare_hits(instanced, reference)
+
+    def test_next_intersection(self):
+        """Interleaved use of the shared primitive by different instances."""
+
+        world = World()
+        prototype = Box(Point3D(-0.5, -0.5, -0.5), Point3D(0.5, 0.5, 0.5))
+        a = Instance(prototype, parent=world, transform=translate(0, 0, 2))
+        b = Instance(prototype, parent=world, transform=translate(0, 0, 5))
+
+        ray = Ray(Point3D(0, 0, 0), Vector3D(0, 0, 1))
+        self.assertAlmostEqual(a.hit(ray).ray_distance, 1.5, places=12)
+        self.assertAlmostEqual(b.hit(ray).ray_distance, 4.5, places=12)
+        self.assertAlmostEqual(a.next_intersection().ray_distance, 2.5, places=12)
+        self.assertAlmostEqual(b.next_intersection().ray_distance, 5.5, places=12)
+        self.assertIsNone(a.next_intersection())
+
+    def test_contains(self):
+
+        world = World()
+        prototype = Sphere(1.0)
+        instance = Instance(prototype, parent=world, transform=translate(5, 0, 0))
+
+        self.assertTrue(instance.contains(Point3D(5.5, 0, 0)))
+        self.assertFalse(instance.contains(Point3D(0.5, 0, 0)))
+
+    def test_bounding_box(self):
+
+        world = World()
+        prototype = Box(Point3D(-1, -2, -3), Point3D(1, 2, 3))
+        instance = Instance(prototype, parent=world, transform=translate(10, 0, 0))
+
+        box = instance.bounding_box()
+        self.assertTrue(box.contains(Point3D(9, -2, -3)))
+        self.assertTrue(box.contains(Point3D(11, 2, 3)))
+        self.assertFalse(box.contains(Point3D(0, 0, 0)))
+
+    def test_material(self):
+
+        from raysect.core import Material
+        material = Material()
+        prototype = Sphere(1.0, material=material)
+
+        self.assertIs(Instance(prototype).material, material, "Instances should default to the material of the shared primitive.")
+        self.assertIs(Instance(prototype).instance().primitive, prototype)
+
+
+if __name__ == "__main__":
+    unittest.main()
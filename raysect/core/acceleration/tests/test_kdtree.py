@@ -0,0 +1,289 @@
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE. 
+
+import unittest
+import pickle
+import os
+import tempfile
+import numpy as np
+from raysect.core import World, Point3D, Vector3D, Ray, translate, rotate
+from raysect.core.acceleration import Unaccelerated, KDTree
+from raysect.primitive import Sphere, Box, Cylinder, Mesh
+from raysect.primitive.mesh.mesh import MeshData
+
+
+class TestKDTree(unittest.TestCase):
+    """
+    Tests the kd-tree accelerator against the unaccelerated reference.
+
+    The scenes contain large, overlapping primitives that straddle many split
+    planes so each primitive is referenced by several leaves.
+    """
+
+    def build_world(self, accelerator):
+
+        rng = np.random.RandomState(3)
+        world = World()
+        world.accelerator = accelerator
+        for i in range(40):
+            transform = translate(*rng.uniform(-5, 5, 3)) * rotate(*rng.uniform(0, 90, 3))
+            if i % 3 == 0:
+                Sphere(rng.uniform(0.1, 3), parent=world, transform=transform)
+            elif i % 3 == 1:
+                Box(Point3D(-2, -0.1, -2), Point3D(2, 0.1, 2), parent=world, transform=transform)
+            else:
+                Cylinder(rng.uniform(0.1, 1), rng.uniform(1, 8), parent=world, transform=transform)
+        return world
+
+    def test_hit(self):
+        """Closest intersections match the unaccelerated search."""
+
+        kdtree_world = self.build_world(KDTree())
+        reference_world = self.build_world(Unaccelerated())
+
+        rng = np.random.RandomState(7)
+        for i in range(2000):
+            origin = Point3D(*rng.uniform(-8, 8, 3))
+            direction = Vector3D(*rng.normal(size=3)).normalise()
+            ray = Ray(origin, direction)
+
+            result = kdtree_world.hit(ray)
+            reference = reference_world.hit(ray)
+            if reference is None:
+                self.assertIsNone(result, "The kd-tree found an intersection missed by the reference.")
+            else:
+                self.assertIsNotNone(result, "The kd-tree missed an intersection.")
+                self.assertAlmostEqual(result.ray_distance, reference.ray_distance, delta=1e-9, msg="Intersection distances differ.")
+
+            # repeated queries must not be affected by the mailboxes of the previous ray
+            repeat = kdtree_world.hit(ray)
+            self.assertEqual(repeat is None, result is None, "Repeated query returned a different result.")
+
+    def test_mesh_hit(self):
+        """Mesh intersections match a mesh with a single leaf."""
+
+        rng = np.random.RandomState(5)
+        vertices = rng.uniform(-5, 5, (300, 3))
+        triangles = np.arange(300).reshape(100, 3)
+
+        mesh = Mesh(vertices, triangles, closed=False)
+        reference = Mesh(vertices, triangles, closed=False, kdtree_max_depth=1, kdtree_min_items=1000)
+
+        for i in range(2000):
+            origin = Point3D(*rng.uniform(-6, 6, 3))
+            direction = Vector3D(*rng.normal(size=3)).normalise()
+
+            result = mesh.hit(Ray(origin, direction))
+            expected = reference.hit(Ray(origin, direction))
+            if expected is None:
+                self.assertIsNone(result, "The mesh kd-tree found an intersection missed by the reference.")
+            else:
+                self.assertIsNotNone(result, "The mesh kd-tree missed an intersection.")
+                self.assertAlmostEqual(result.ray_distance, expected.ray_distance, delta=1e-6, msg="Intersection distances differ.")
+
+    def test_build_cache(self):
+        """Unchanged scenes load the kd-tree from the cache."""
+
+        with tempfile.TemporaryDirectory() as cache:
+
+            first = self.build_world(KDTree(cache=cache))
+            first.build_accelerator()
+            self.assertFalse(first.accelerator.cache_hit, "An empty cache should not produce a cache hit.")
+            self.assertEqual(len(os.listdir(cache)), 1, "The kd-tree should have been saved to the cache.")
+
+            second = self.build_world(KDTree(cache=cache))
+            second.build_accelerator()
+            self.assertTrue(second.accelerator.cache_hit, "An identical scene should be loaded from the cache.")
+
+            reference = self.build_world(Unaccelerated())
+            rng = np.random.RandomState(13)
+            for i in range(1000):
+                origin = Point3D(*rng.uniform(-8, 8, 3))
+                direction = Vector3D(*rng.normal(size=3)).normalise()
+
+                result = second.hit(Ray(origin, direction))
+                expected = reference.hit(Ray(origin, direction))
+                if expected is None:
+                    self.assertIsNone(result, "The cached kd-tree found an intersection missed by the reference.")
+                else:
+                    self.assertIsNotNone(result, "The cached kd-tree missed an intersection.")
+                    self.assertAlmostEqual(result.ray_distance, expected.ray_distance, delta=1e-9, msg="Intersection distances differ.")
+
+            # a change to the geometry must produce a new cache entry
+            second.primitives[0].transform = translate(20, 0, 0)
+            second.build_accelerator()
+            self.assertFalse(second.accelerator.cache_hit, "A modified scene should not be loaded from the cache.")
+            self.assertEqual(len(os.listdir(cache)), 2, "The modified scene should have been saved to the cache.")
+
+            # corrupted cache entries are ignored and replaced
+            for name in os.listdir(cache):
+                with open(os.path.join(cache, name), "r+b") as file:
+                    file.truncate(100)
+
+            third = self.build_world(KDTree(cache=cache))
+            third.build_accelerator()
+            self.assertFalse(third.accelerator.cache_hit, "A corrupted cache entry should be ignored.")
+
+            fourth = self.build_world(KDTree(cache=cache))
+            fourth.build_accelerator()
+            self.assertTrue(fourth.accelerator.cache_hit, "The corrupted cache entry should have been replaced.")
+
+    def test_build_cache_unwritable(self):
+        """A cache that cannot be written only produces a warning."""
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            # the cache directory cannot be created, a file is in the way
+            cache = os.path.join(directory, "cache")
+            with open(cache, "w"):
+                pass
+
+            world = self.build_world(KDTree(cache=os.path.join(cache, "kdtree")))
+            with self.assertWarns(RuntimeWarning, msg="A failed cache write should raise a warning."):
+                world.build_accelerator()
+            self.assertFalse(world.accelerator.cache_hit, "An unwritable cache should not produce a cache hit.")
+
+            reference = self.build_world(Unaccelerated())
+            for x in range(-5, 6):
+                ray = Ray(Point3D(x, 0, -20), Vector3D(0, 0, 1))
+                self.assertEqual(world.hit(ray) is None, reference.hit(ray) is None, "The kd-tree was not built.")
+
+            # the cache entry cannot be moved into place, the temporary file must be removed
+            cache = os.path.join(directory, "entries")
+            world = self.build_world(KDTree(cache=cache))
+            world.build_accelerator()
+            name, = os.listdir(cache)
+            os.remove(os.path.join(cache, name))
+            os.mkdir(os.path.join(cache, name))
+            os.mkdir(os.path.join(cache, name, "blocked"))
+
+            world = self.build_world(KDTree(cache=cache))
+            with self.assertWarns(RuntimeWarning, msg="A failed cache write should raise a warning."):
+                world.build_accelerator()
+            self.assertEqual(os.listdir(cache), [name], "The temporary cache file was not removed.")
+
+    def test_compact_traversal(self):
+        """The compact iterative traversal matches the recursive traversal."""
+
+        rng = np.random.RandomState(11)
+        vertices = rng.uniform(-5, 5, (600, 3))
+        triangles = np.arange(600).reshape(200, 3)
+
+        mesh = Mesh(vertices, triangles, closed=False)
+        self.assertTrue(mesh.data.compact_traversal, "The mesh kd-tree should use the compact traversal.")
+
+        # the compact layout must survive serialisation
+        restored = pickle.loads(pickle.dumps(mesh.data))
+        self.assertTrue(restored.compact_traversal, "The restored kd-tree should use the compact traversal.")
+
+        for i in range(2000):
+            origin = Point3D(*rng.uniform(-6, 6, 3))
+            direction = Vector3D(*rng.normal(size=3)).normalise()
+
+            mesh.data.compact_traversal = True
+            result = mesh.hit(Ray(origin, direction))
+            any_hit = mesh.data.trace_any(Ray(origin, direction))
+
+            mesh.data.compact_traversal = False
+            expected = mesh.hit(Ray(origin, direction))
+            expected_any_hit = mesh.data.trace_any(Ray(origin, direction))
+
+            self.assertEqual(any_hit, expected_any_hit, "Any-hit traversals disagree.")
+            if expected is None:
+                self.assertIsNone(result, "The compact traversal found an intersection missed by the recursive traversal.")
+            else:
+                self.assertIsNotNone(result, "The compact traversal missed an intersection.")
+                self.assertEqual(result.ray_distance, expected.ray_distance, "Intersection distances differ.")
+
+    def test_packed_leaves(self):
+        """The packed leaf blocks find the same intersections as the per-triangle tests."""
+
+        rng = np.random.RandomState(17)
+        vertices = rng.uniform(-5, 5, (1500, 3))
+        triangles = np.arange(1500).reshape(500, 3)
+
+        # large leaves ensure blocks with both full and partially filled lanes
+        packed = Mesh(vertices, triangles, closed=False, kdtree_min_items=20)
+        unpacked = Mesh(vertices, triangles, closed=False, kdtree_min_items=20)
+        packed.data.packed_leaves = True
+        self.assertTrue(packed.data.packed_leaves, "The mesh should use the packed leaves.")
+
+        # the packed layout must survive serialisation
+        restored = pickle.loads(pickle.dumps(packed.data))
+        self.assertTrue(restored.packed_leaves, "The restored mesh should use the packed leaves.")
+
+        # states pickled before packed leaves were introduced only hold the serialised mesh
+        data, _ = packed.data.__getstate__()
+        restored = MeshData.__new__(MeshData)
+        restored.__setstate__(data)
+        self.assertFalse(restored.packed_leaves, "A legacy state should restore an unpacked mesh.")
+        np.testing.assert_array_equal(restored.triangles, packed.data.triangles, "The legacy state was not restored.")
+
+        for i in range(2000):
+            origin = Point3D(*rng.uniform(-6, 6, 3))
+            direction = Vector3D(*rng.normal(size=3)).normalise()
+
+            result = packed.hit(Ray(origin, direction))
+            any_hit = packed.data.trace_any(Ray(origin, direction))
+
+            expected = unpacked.hit(Ray(origin, direction))
+            expected_any_hit = unpacked.data.trace_any(Ray(origin, direction))
+
+            self.assertEqual(any_hit, expected_any_hit, "Any-hit tests disagree.")
+            if expected is None:
+                self.assertIsNone(result, "The packed leaves found an intersection missed by the per-triangle tests.")
+            else:
+                self.assertIsNotNone(result, "The packed leaves missed an intersection.")
+                self.assertEqual(result.ray_distance, expected.ray_distance, "Intersection distances differ.")
+                self.assertEqual(result.hit_point, expected.hit_point, "Intersection points differ.")
+
+        # rays through the shared edges and vertices of a grid exercise the double precision fallback
+        grid = np.array([(x, y, 0) for y in range(5) for x in range(5)], dtype=float)
+        triangles = []
+        for y in range(4):
+            for x in range(4):
+                i = 5 * y + x
+                triangles.append((i, i + 1, i + 6))
+                triangles.append((i, i + 6, i + 5))
+
+        mesh = Mesh(grid, triangles, closed=False)
+        for x in np.linspace(0, 4, 17):
+            for y in np.linspace(0, 4, 17):
+                ray = Ray(Point3D(x, y, 1), Vector3D(0, 0, -1))
+                mesh.data.packed_leaves = True
+                result = mesh.hit(ray)
+                mesh.data.packed_leaves = False
+                expected = mesh.hit(ray)
+                self.assertEqual(result is None, expected is None, "The packed leaves disagree on a grid edge.")
+                if expected is not None:
+                    self.assertEqual(result.ray_distance, expected.ray_distance, "Intersection distances differ.")
+
+
+if __name__ == "__main__":
+    unittest.main()
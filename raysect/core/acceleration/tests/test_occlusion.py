@@ -0,0 +1,95 @@
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE. 
+
+import unittest
+import numpy as np
+from raysect.core import World, Point3D, Vector3D, Ray, translate
+from raysect.core.acceleration import Unaccelerated, KDTree
+from raysect.primitive import Sphere, Box
+
+
+class TestOcclusion(unittest.TestCase):
+    """
+    Tests the any-hit occlusion queries of the accelerators.
+    """
+
+    def build_world(self, accelerator):
+
+        world = World()
+        world.accelerator = accelerator
+        Sphere(1.0, parent=world, transform=translate(0, 0, 5))
+        Box(Point3D(-1, -1, -1), Point3D(1, 1, 1), parent=world, transform=translate(5, 0, 0))
+        return world
+
+    def test_occluded(self):
+        """Segments crossing or stopping short of primitives."""
+
+        for accelerator in (KDTree(), Unaccelerated()):
+            world = self.build_world(accelerator)
+
+            self.assertTrue(world.occluded(Point3D(0, 0, 0), Point3D(0, 0, 10)), "Segment through the sphere should be occluded.")
+            self.assertTrue(world.occluded(Point3D(0, 0, 0), Point3D(10, 0, 0)), "Segment through the box should be occluded.")
+            self.assertFalse(world.occluded(Point3D(0, 0, 0), Point3D(0, 0, 3.5)), "Segment ending before the sphere should not be occluded.")
+            self.assertFalse(world.occluded(Point3D(0, 0, 0), Point3D(0, 10, 0)), "Segment missing all primitives should not be occluded.")
+            self.assertFalse(world.occluded(Point3D(0, 0, 0), Point3D(0, 0, 4)), "A surface at the target point should not occlude the segment.")
+            self.assertFalse(world.occluded(Point3D(1, 1, 1), Point3D(1, 1, 1)), "A zero length segment should not be occluded.")
+
+    def test_is_occluded(self):
+        """Any-hit ray queries agree with closest hit queries."""
+
+        rng = np.random.RandomState(1)
+        for accelerator in (KDTree(), Unaccelerated()):
+            world = self.build_world(accelerator)
+
+            for i in range(500):
+                origin = Point3D(*rng.uniform(-8, 8, 3))
+                direction = Vector3D(*rng.normal(size=3)).normalise()
+                ray = Ray(origin, direction, rng.uniform(0, 10))
+                self.assertEqual(world.is_occluded(ray), world.hit(ray) is not None, "Occlusion query disagrees with hit().")
+
+    def test_occluded_array(self):
+        """Batched occlusion queries."""
+
+        world = self.build_world(KDTree())
+        origins = np.zeros((4, 3))
+        targets = np.array([[0, 0, 10], [10, 0, 0], [0, 0, 3.5], [0, 10, 0]])
+
+        result = world.occluded_array(origins, targets)
+        self.assertEqual(result.dtype, np.bool_, "Result should be a boolean array.")
+        self.assertEqual(list(result), [True, True, False, False], "Incorrect occlusion results.")
+
+        with self.assertRaises(ValueError, msg="Mismatched array shapes did not raise a ValueError."):
+            world.occluded_array(origins, targets[:2])
+
+        with self.assertRaises(ValueError, msg="Arrays of the wrong shape did not raise a ValueError."):
+            world.occluded_array(np.zeros((4, 2)), np.zeros((4, 2)))
+
+
+if __name__ == "__main__":
+    unittest.main()
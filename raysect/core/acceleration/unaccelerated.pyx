@@ -37,6 +37,9 @@ from raysect.core.math cimport Point3D
 from raysect.core.intersection cimport Intersection
 from raysect.core.acceleration.boundprimitive cimport BoundPrimitive
 
+# cython doesn't have a built-in infinity constant, this compiles to +infinity
+DEF INFINITY = 1e999
+
 cdef class Unaccelerated(Accelerator):
 
     def __init__(self):
@@ -64,9 +67,8 @@ cdef class Unaccelerated(Accelerator):
     cpdef Intersection hit(self, Ray ray):
 
         cdef:
-            double distance
-            Intersection intersection, closest_intersection
-            BoundPrimitive primitive
+            double distance, candidate
+            BoundPrimitive primitive, closest_primitive
 
         # does the ray intersect the space containing the primitives
         if not self.world_box.hit(ray):
@@ -74,23 +76,46 @@ cdef class Unaccelerated(Accelerator):
             return None
 
         # find the closest primitive-ray intersection
-        closest_intersection = None
+        closest_primitive = None
 
         # intial search distance is maximum possible ray extent
         distance = ray.max_distance
 
         for primitive in self.primitives:
 
-            intersection = primitive.hit(ray)
+            candidate = primitive.hit_distance(ray)
+
+            if candidate < distance:
+
+                distance = candidate
+                closest_primitive = primitive
+
+        if closest_primitive is None:
 
-            if intersection is not None:
+            return None
+
+        # only the closest primitive constructs its intersection
+        return closest_primitive.materialise_intersection()
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef bint occluded(self, Ray ray) except -1:
+
+        cdef BoundPrimitive primitive
+
+        # does the ray intersect the space containing the primitives
+        if not self.world_box.hit(ray):
+
+            return False
+
+        # terminate at the first primitive intersecting the ray
+        for primitive in self.primitives:
 
-                if intersection.ray_distance < distance:
+            if primitive.hit_distance(ray) < INFINITY:
 
-                    distance = intersection.ray_distance
-                    closest_intersection = intersection
+                return True
 
-        return closest_intersection
+        return False
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -0,0 +1,74 @@
+# Copyright (c) 2014-2017, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Unit tests for the cython tetrahedra utilities.
+"""
+
+import unittest
+from raysect.core.math.cython.tetrahedra import _test_inside_tetrahedra as inside_tetrahedra
+
+
+class TestTetrahedra(unittest.TestCase):
+
+    def test_inside_tetrahedra(self):
+        """Tests the inside tetrahedra algorithm."""
+
+        # defining tetrahedra vertices
+        v1x, v1y, v1z = 0, 0, 0
+        v2x, v2y, v2z = 1, 0, 0
+        v3x, v3y, v3z = 0, 1, 0
+        v4x, v4y, v4z = 0, 0, 1
+
+        vertices = (v1x, v1y, v1z, v2x, v2y, v2z, v3x, v3y, v3z, v4x, v4y, v4z)
+
+        # test vertices are inside
+        self.assertTrue(inside_tetrahedra(*vertices, v1x, v1y, v1z))
+        self.assertTrue(inside_tetrahedra(*vertices, v2x, v2y, v2z))
+        self.assertTrue(inside_tetrahedra(*vertices, v3x, v3y, v3z))
+        self.assertTrue(inside_tetrahedra(*vertices, v4x, v4y, v4z))
+
+        # check edges and faces are inside
+        self.assertTrue(inside_tetrahedra(*vertices, 0.5, 0, 0))
+        self.assertTrue(inside_tetrahedra(*vertices, 0, 0.5, 0.5))
+        self.assertTrue(inside_tetrahedra(*vertices, 0.25, 0.25, 0))
+        self.assertTrue(inside_tetrahedra(*vertices, 0.25, 0.25, 0.5))
+
+        # check an interior point
+        self.assertTrue(inside_tetrahedra(*vertices, 0.1, 0.2, 0.3))
+
+        # check exterior points
+        self.assertFalse(inside_tetrahedra(*vertices, -0.5, -0.5, -0.5))
+        self.assertFalse(inside_tetrahedra(*vertices, 0.5, 0.5, 0.01))
+        self.assertFalse(inside_tetrahedra(*vertices, 0.1, 0.1, -0.01))
+        self.assertFalse(inside_tetrahedra(*vertices, 0.33334, 0.33334, 0.33334))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+cdef bint inside_tetrahedra(double v1x, double v1y, double v1z,
+                            double v2x, double v2y, double v2z,
+                            double v3x, double v3y, double v3z,
+                            double v4x, double v4y, double v4z,
+                            double px, double py, double pz) nogil
+
+
+cdef void barycentric_coords_tetra(double v1x, double v1y, double v1z,
+                                   double v2x, double v2y, double v2z,
+                                   double v3x, double v3y, double v3z,
+                                   double v4x, double v4y, double v4z,
+                                   double px, double py, double pz,
+                                   double *alpha, double *beta, double *gamma, double *delta) nogil
+
+
+cdef bint barycentric_inside_tetrahedra(double alpha, double beta, double gamma, double delta) nogil
+
+
+cdef double barycentric_interpolation_tetra(double alpha, double beta, double gamma, double delta,
+                                            double va, double vb, double vc, double vd) nogil
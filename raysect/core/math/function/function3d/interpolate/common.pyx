@@ -0,0 +1,456 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import io
+import struct
+import numpy as np
+cimport numpy as np
+from raysect.core.math.spatial.kdtree3d cimport Item3D
+from raysect.core.boundingbox cimport new_boundingbox3d
+from raysect.core.math.point cimport new_point3d
+from raysect.core.math.cython cimport barycentric_coords_tetra, barycentric_inside_tetrahedra
+from cpython.bytes cimport PyBytes_AsString
+from libc.stdint cimport uint8_t
+cimport cython
+
+# bounding box is padded by a small amount to avoid numerical accuracy issues
+DEF BOX_PADDING = 1e-6
+
+# maximum number of tetrahedra visited by the neighbour walk before falling back to the kd-tree
+DEF MAX_WALK_STEPS = 8
+
+# friendly name for first node
+DEF ROOT_NODE = 0
+
+# convenience defines
+DEF V1 = 0
+DEF V2 = 1
+DEF V3 = 2
+DEF V4 = 3
+
+DEF X = 0
+DEF Y = 1
+DEF Z = 2
+
+DEF NO_NEIGHBOUR = -1
+
+# raysect tetrahedral mesh format constants
+DEF RTM_VERSION_MAJOR = 1
+DEF RTM_VERSION_MINOR = 0
+
+
+cdef class MeshKDTree3D(KDTree3DCore):
+    """
+    A kd-Tree for locating the tetrahedra of an unstructured 3D mesh.
+
+    In addition to the kd-Tree search, the tree holds the face connectivity of
+    the tetrahedra. Successive look-ups start by walking from the tetrahedron
+    found by the previous look-up towards the new point, crossing the face
+    opposite the most negative barycentric coordinate at each step. For
+    spatially coherent queries (e.g. sampling along a ray) the containing
+    tetrahedron is usually found in a couple of steps without touching the
+    kd-Tree. The walk is abandoned in favour of a full kd-Tree search if it
+    reaches the mesh boundary or exceeds a small number of steps.
+
+    :param ndarray vertices: An array of vertex coordinates (x, y, z) with shape Nx3.
+    :param ndarray tetrahedra: An array of vertex indices defining the mesh tetrahedra, with shape Mx4.
+    """
+
+    def __init__(self, object vertices not None, object tetrahedra not None):
+
+        vertices = np.array(vertices, dtype=np.double)
+        tetrahedra = np.array(tetrahedra, dtype=np.int32)
+
+        # check dimensions are correct
+        if vertices.ndim != 2 or vertices.shape[1] != 3:
+            raise ValueError("The vertex array must have dimensions Nx3.")
+
+        if tetrahedra.ndim != 2 or tetrahedra.shape[1] != 4:
+            raise ValueError("The tetrahedra array must have dimensions Mx4.")
+
+        # check tetrahedra contains only valid indices
+        invalid = (tetrahedra[:, 0:4] < 0) | (tetrahedra[:, 0:4] >= vertices.shape[0])
+        if invalid.any():
+            raise ValueError("The tetrahedra array references non-existent vertices.")
+
+        # assign to internal attributes
+        self._vertices = vertices
+        self._tetrahedra = tetrahedra
+
+        # assign to memory views
+        self._vertices_mv = vertices
+        self._tetrahedra_mv = tetrahedra
+
+        # face connectivity for the neighbour walk
+        self._generate_neighbours()
+
+        # kd-Tree init
+        items = []
+        for tetrahedron in range(self._tetrahedra.shape[0]):
+            items.append(Item3D(tetrahedron, self._generate_bounding_box(tetrahedron)))
+        super().__init__(items, max_depth=0, min_items=1, hit_cost=50.0, empty_bonus=0.2)
+
+        # initialise hit state attributes and cache
+        self._reset_hit()
+
+    def __getstate__(self):
+        state = io.BytesIO()
+        self.save(state)
+        return state.getvalue()
+
+    def __setstate__(self, state):
+        self.load(io.BytesIO(state))
+
+    def __reduce__(self):
+        return self.__new__, (self.__class__, ), self.__getstate__()
+
+    @property
+    def vertices(self):
+        return self._vertices.copy()
+
+    @property
+    def tetrahedra(self):
+        return self._tetrahedra.copy()
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef BoundingBox3D _generate_bounding_box(self, np.int32_t tetrahedron):
+        """
+        Generates a bounding box for the specified tetrahedron.
+
+        A small degree of padding is added to the bounding box to provide the
+        conservative bounds required to avoid numerical accuracy issues.
+
+        :param tetrahedron: Tetrahedra array index.
+        :return: A BoundingBox3D object.
+        """
+
+        cdef:
+            np.int32_t i1, i2, i3, i4
+            BoundingBox3D bbox
+
+        i1 = self._tetrahedra_mv[tetrahedron, V1]
+        i2 = self._tetrahedra_mv[tetrahedron, V2]
+        i3 = self._tetrahedra_mv[tetrahedron, V3]
+        i4 = self._tetrahedra_mv[tetrahedron, V4]
+
+        bbox = new_boundingbox3d(
+            new_point3d(
+                min(self._vertices_mv[i1, X], self._vertices_mv[i2, X], self._vertices_mv[i3, X], self._vertices_mv[i4, X]),
+                min(self._vertices_mv[i1, Y], self._vertices_mv[i2, Y], self._vertices_mv[i3, Y], self._vertices_mv[i4, Y]),
+                min(self._vertices_mv[i1, Z], self._vertices_mv[i2, Z], self._vertices_mv[i3, Z], self._vertices_mv[i4, Z]),
+            ),
+            new_point3d(
+                max(self._vertices_mv[i1, X], self._vertices_mv[i2, X], self._vertices_mv[i3, X], self._vertices_mv[i4, X]),
+                max(self._vertices_mv[i1, Y], self._vertices_mv[i2, Y], self._vertices_mv[i3, Y], self._vertices_mv[i4, Y]),
+                max(self._vertices_mv[i1, Z], self._vertices_mv[i2, Z], self._vertices_mv[i3, Z], self._vertices_mv[i4, Z]),
+            ),
+        )
+
+        bbox.pad(max(BOX_PADDING, bbox.largest_extent() * BOX_PADDING))
+
+        return bbox
+
+    cdef object _generate_neighbours(self):
+        """
+        Identifies the tetrahedra sharing each face of each tetrahedron.
+
+        Element [i, k] of the neighbour array holds the index of the tetrahedron
+        sharing the face opposite vertex k of tetrahedron i, or -1 if the face
+        lies on the mesh boundary.
+        """
+
+        cdef np.ndarray faces, order, shared, lower, upper, neighbours
+
+        count = self._tetrahedra.shape[0]
+
+        # faces listed in the order of the vertex they lie opposite
+        faces = self._tetrahedra[:, [[1, 2, 3], [0, 2, 3], [0, 1, 3], [0, 1, 2]]].reshape(4 * count, 3)
+        faces.sort(axis=1)
+
+        # sort the faces so shared faces become adjacent entries
+        order = np.lexsort((faces[:, 2], faces[:, 1], faces[:, 0]))
+        faces = faces[order]
+        shared = np.nonzero((faces[1:] == faces[:-1]).all(axis=1))[0]
+
+        # each face index encodes the owning tetrahedron (index // 4) and the opposite vertex (index % 4)
+        lower = order[shared]
+        upper = order[shared + 1]
+
+        neighbours = np.full(4 * count, NO_NEIGHBOUR, dtype=np.int32)
+        neighbours[lower] = upper // 4
+        neighbours[upper] = lower // 4
+
+        self._neighbours = neighbours.reshape(count, 4)
+        self._neighbours_mv = self._neighbours
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef void _barycentric_coords(self, np.int32_t tetrahedron, Point3D point, double *coords):
+
+        cdef np.int32_t i1, i2, i3, i4
+
+        i1 = self._tetrahedra_mv[tetrahedron, V1]
+        i2 = self._tetrahedra_mv[tetrahedron, V2]
+        i3 = self._tetrahedra_mv[tetrahedron, V3]
+        i4 = self._tetrahedra_mv[tetrahedron, V4]
+
+        barycentric_coords_tetra(self._vertices_mv[i1, X], self._vertices_mv[i1, Y], self._vertices_mv[i1, Z],
+                                 self._vertices_mv[i2, X], self._vertices_mv[i2, Y], self._vertices_mv[i2, Z],
+                                 self._vertices_mv[i3, X], self._vertices_mv[i3, Y], self._vertices_mv[i3, Z],
+                                 self._vertices_mv[i4, X], self._vertices_mv[i4, Y], self._vertices_mv[i4, Z],
+                                 point.x, point.y, point.z,
+                                 &coords[V1], &coords[V2], &coords[V3], &coords[V4])
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef void _store_hit(self, np.int32_t tetrahedron, double *coords):
+
+        # store id of tetrahedron hit
+        self.tetrahedron_id = tetrahedron
+
+        # store vertex indices and barycentric coords
+        self.i1 = self._tetrahedra_mv[tetrahedron, V1]
+        self.i2 = self._tetrahedra_mv[tetrahedron, V2]
+        self.i3 = self._tetrahedra_mv[tetrahedron, V3]
+        self.i4 = self._tetrahedra_mv[tetrahedron, V4]
+        self.alpha = coords[V1]
+        self.beta = coords[V2]
+        self.gamma = coords[V3]
+        self.delta = coords[V4]
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef bint _is_contained_leaf(self, np.int32_t id, Point3D point):
+
+        cdef:
+            np.int32_t index, tetrahedron
+            double coords[4]
+
+        # identify the first tetrahedron that contains the point, if any
+        for index in range(self._nodes[id].count):
+
+            tetrahedron = self._nodes[id].items[index]
+            self._barycentric_coords(tetrahedron, point, coords)
+
+            if barycentric_inside_tetrahedra(coords[V1], coords[V2], coords[V3], coords[V4]):
+                self._store_hit(tetrahedron, coords)
+                return True
+
+        return False
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef bint _walk(self, Point3D point):
+        """
+        Walks the mesh from the last tetrahedron found towards the point.
+
+        :param Point3D point: A Point3D object.
+        :return: True if the walk located a tetrahedron containing the point, False otherwise.
+        """
+
+        cdef:
+            np.int32_t tetrahedron, face, vertex
+            int step
+            double coords[4]
+
+        tetrahedron = self.tetrahedron_id
+        if tetrahedron == NO_NEIGHBOUR:
+            return False
+
+        for step in range(MAX_WALK_STEPS):
+
+            self._barycentric_coords(tetrahedron, point, coords)
+            if barycentric_inside_tetrahedra(coords[V1], coords[V2], coords[V3], coords[V4]):
+                self._store_hit(tetrahedron, coords)
+                return True
+
+            # exit through the face opposite the most negative coordinate
+            face = V1
+            for vertex in range(V2, V4 + 1):
+                if coords[vertex] < coords[face]:
+                    face = vertex
+
+            tetrahedron = self._neighbours_mv[tetrahedron, face]
+            if tetrahedron == NO_NEIGHBOUR:
+                return False
+
+        return False
+
+    cpdef bint is_contained(self, Point3D point):
+        """
+        Identifies if the point is contained by a tetrahedron of the mesh.
+
+        The neighbour walk from the previously located tetrahedron is attempted
+        first, the kd-Tree is only traversed if the walk fails.
+
+        :param Point3D point: A Point3D object.
+        :return: True if the point lies inside a tetrahedron, false otherwise.
+        """
+
+        cdef bint result
+
+        if self._cache_available and point.x == self._cached_x and point.y == self._cached_y and point.z == self._cached_z:
+            return self._cached_result
+
+        if not self.bounds.contains(point):
+            result = False
+        else:
+            result = self._walk(point) or self._is_contained_node(ROOT_NODE, point)
+
+        # add cache
+        self._cache_available = True
+        self._cached_x = point.x
+        self._cached_y = point.y
+        self._cached_z = point.z
+        self._cached_result = result
+
+        return result
+
+    cdef void _reset_hit(self):
+
+        # initialise hit state attributes
+        self.tetrahedron_id = -1
+        self.i1 = -1
+        self.i2 = -1
+        self.i3 = -1
+        self.i4 = -1
+        self.alpha = 0.0
+        self.beta = 0.0
+        self.gamma = 0.0
+        self.delta = 0.0
+
+        # initialise cache values
+        self._cache_available = False
+        self._cached_x = 0.0
+        self._cached_y = 0.0
+        self._cached_z = 0.0
+        self._cached_result = False
+
+    def save(self, object file):
+        """
+        Save the tetrahedral mesh and its kd-Tree to a binary Raysect tetrahedral mesh file (.rtm).
+
+        Loading a saved mesh avoids the cost of rebuilding the kd-Tree.
+
+        :param object file: File stream or string file name to save state.
+        """
+
+        close = False
+
+        # treat as a filename if a stream is not supplied
+        if not isinstance(file, io.IOBase):
+            file = open(file, mode="wb")
+            close = True
+
+        # write header
+        file.write(b"RTM")
+        file.write(struct.pack("<B", RTM_VERSION_MAJOR))
+        file.write(struct.pack("<B", RTM_VERSION_MINOR))
+
+        # item counts
+        file.write(struct.pack("<i", self._vertices.shape[0]))
+        file.write(struct.pack("<i", self._tetrahedra.shape[0]))
+
+        # mesh arrays
+        file.write(self._vertices.astype("<f8").tobytes())
+        file.write(self._tetrahedra.astype("<i4").tobytes())
+
+        # write kd-tree
+        super().save(file)
+
+        # if we opened a file, we should close it
+        if close:
+            file.close()
+
+    def load(self, object file):
+        """
+        Load a tetrahedral mesh and its kd-Tree from a binary Raysect tetrahedral mesh file (.rtm).
+
+        :param object file: File stream or string file name to load state.
+        """
+
+        close = False
+
+        # treat as a filename if a stream is not supplied
+        if not isinstance(file, io.IOBase):
+            file = open(file, mode="rb")
+            close = True
+
+        # read and check header
+        identifier = file.read(3)
+        major_version = (<uint8_t *> PyBytes_AsString(file.read(1)))[0]
+        minor_version = (<uint8_t *> PyBytes_AsString(file.read(1)))[0]
+
+        # validate
+        if identifier != b"RTM":
+            raise ValueError("Specified file is not a Raysect tetrahedral mesh file.")
+
+        if major_version != RTM_VERSION_MAJOR or minor_version != RTM_VERSION_MINOR:
+            raise ValueError("Unsupported Raysect tetrahedral mesh version.")
+
+        # item counts
+        num_vertices = self._read_int32(file)
+        num_tetrahedra = self._read_int32(file)
+
+        # mesh arrays
+        self._vertices = np.frombuffer(file.read(num_vertices * 3 * 8), dtype="<f8").reshape(num_vertices, 3).astype(np.double)
+        self._tetrahedra = np.frombuffer(file.read(num_tetrahedra * 4 * 4), dtype="<i4").reshape(num_tetrahedra, 4).astype(np.int32)
+        self._vertices_mv = self._vertices
+        self._tetrahedra_mv = self._tetrahedra
+
+        # read kd-tree
+        super().load(file)
+
+        # rebuild face connectivity and reset state
+        self._generate_neighbours()
+        self._reset_hit()
+
+        # if we opened a file, we should close it
+        if close:
+            file.close()
+
+    @classmethod
+    def from_file(cls, file):
+        """
+        Load a tetrahedral mesh and its kd-Tree from a binary Raysect tetrahedral mesh file (.rtm).
+
+        :param object file: File stream or string file name to load state.
+        """
+
+        m = MeshKDTree3D.__new__(MeshKDTree3D)
+        m.load(file)
+        return m
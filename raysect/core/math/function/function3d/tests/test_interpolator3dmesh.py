@@ -0,0 +1,188 @@
+# Copyright (c) 2014-2019, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Unit tests for the Interpolator3DMesh and Discrete3DMesh classes.
+"""
+
+import io
+import pickle
+import unittest
+import numpy as np
+from raysect.core.math.function.function3d.interpolate import Interpolator3DMesh, Discrete3DMesh
+from raysect.core.math.function.function3d.interpolate.common import MeshKDTree3D
+
+
+def generate_mesh(n):
+    """
+    Generates a tetrahedral mesh of the unit cube with n x n x n sub-cubes.
+
+    Each sub-cube is split into six tetrahedra sharing the cube diagonal.
+    """
+
+    vertices = []
+    for k in range(n + 1):
+        for j in range(n + 1):
+            for i in range(n + 1):
+                vertices.append((i / n, j / n, k / n))
+
+    def index(i, j, k):
+        return i + j * (n + 1) + k * (n + 1) ** 2
+
+    paths = [(0, 1, 2), (0, 2, 1), (1, 0, 2), (1, 2, 0), (2, 0, 1), (2, 1, 0)]
+
+    tetrahedra = []
+    for k in range(n):
+        for j in range(n):
+            for i in range(n):
+                for path in paths:
+                    corner = [i, j, k]
+                    tetrahedron = [index(*corner)]
+                    for axis in path[:-1]:
+                        corner[axis] += 1
+                        tetrahedron.append(index(*corner))
+                    tetrahedron.append(index(i + 1, j + 1, k + 1))
+                    tetrahedra.append(tetrahedron)
+
+    return np.array(vertices), np.array(tetrahedra)
+
+
+def linear(x, y, z):
+    return 1.0 + x + 2 * y - 3 * z
+
+
+class TestInterpolator3DMesh(unittest.TestCase):
+
+    def setUp(self):
+
+        self.vertices, self.tetrahedra = generate_mesh(3)
+        self.vertex_data = np.array([linear(*v) for v in self.vertices])
+        self.interpolator = Interpolator3DMesh(self.vertices, self.vertex_data, self.tetrahedra)
+
+    def test_interpolation(self):
+
+        rng = np.random.RandomState(1)
+        for x, y, z in rng.uniform(0, 1, (200, 3)):
+            self.assertAlmostEqual(self.interpolator(x, y, z), linear(x, y, z), places=10, msg="Interpolated value does not match linear function.")
+
+    def test_vertices(self):
+
+        for vertex, value in zip(self.vertices, self.vertex_data):
+            self.assertAlmostEqual(self.interpolator(*vertex), value, places=10, msg="Interpolated value does not match vertex data.")
+
+    def test_coherent_lookup(self):
+        """Successive nearby look-ups, resolved by the neighbour walk, must remain exact."""
+
+        for t in np.linspace(0, 1, 101):
+            x, y, z = 0.05 + 0.9 * t, 0.1 + 0.3 * t, 0.95 - 0.9 * t
+            self.assertAlmostEqual(self.interpolator(x, y, z), linear(x, y, z), places=10)
+
+    def test_limit(self):
+
+        with self.assertRaises(ValueError):
+            self.interpolator(1.5, 0.5, 0.5)
+
+        interpolator = Interpolator3DMesh.instance(self.interpolator, limit=False, default_value=-7.0)
+        self.assertEqual(interpolator(1.5, 0.5, 0.5), -7.0)
+        self.assertEqual(interpolator(0.5, -0.5, 0.5), -7.0)
+
+    def test_instance(self):
+
+        interpolator = Interpolator3DMesh.instance(self.interpolator, vertex_data=2 * self.vertex_data)
+        self.assertAlmostEqual(interpolator(0.3, 0.6, 0.2), 2 * linear(0.3, 0.6, 0.2), places=10)
+
+        with self.assertRaises(ValueError):
+            Interpolator3DMesh.instance(self.interpolator, vertex_data=[1.0, 2.0])
+
+    def test_invalid_mesh(self):
+
+        with self.assertRaises(ValueError):
+            Interpolator3DMesh(self.vertices[:, 0:2], self.vertex_data, self.tetrahedra)
+
+        with self.assertRaises(ValueError):
+            Interpolator3DMesh(self.vertices, self.vertex_data, self.tetrahedra[:, 0:3])
+
+        with self.assertRaises(ValueError):
+            Interpolator3DMesh(self.vertices, self.vertex_data, self.tetrahedra + len(self.vertices))
+
+    def test_pickle(self):
+
+        interpolator = pickle.loads(pickle.dumps(self.interpolator))
+        self.assertAlmostEqual(interpolator(0.3, 0.6, 0.2), linear(0.3, 0.6, 0.2), places=10)
+
+
+class TestDiscrete3DMesh(unittest.TestCase):
+
+    def setUp(self):
+
+        self.vertices, self.tetrahedra = generate_mesh(2)
+        self.tetrahedra_data = np.arange(len(self.tetrahedra), dtype=np.float64)
+        self.discrete = Discrete3DMesh(self.vertices, self.tetrahedra, self.tetrahedra_data)
+
+    def test_discrete(self):
+
+        # the centroid of each tetrahedron must return that tetrahedron's value
+        for tetrahedron, value in zip(self.tetrahedra, self.tetrahedra_data):
+            centroid = self.vertices[tetrahedron].mean(axis=0)
+            self.assertEqual(self.discrete(*centroid), value)
+
+    def test_limit(self):
+
+        with self.assertRaises(ValueError):
+            self.discrete(0.5, 0.5, -1.0)
+
+        discrete = Discrete3DMesh.instance(self.discrete, limit=False)
+        self.assertEqual(discrete(0.5, 0.5, -1.0), 0.0)
+
+
+class TestMeshKDTree3D(unittest.TestCase):
+
+    def test_save_load(self):
+
+        vertices, tetrahedra = generate_mesh(2)
+        kdtree = MeshKDTree3D(vertices, tetrahedra)
+
+        stream = io.BytesIO()
+        kdtree.save(stream)
+        stream.seek(0)
+        loaded = MeshKDTree3D.from_file(stream)
+
+        np.testing.assert_array_equal(loaded.vertices, vertices)
+        np.testing.assert_array_equal(loaded.tetrahedra, tetrahedra)
+        self.assertEqual(kdtree.bounds.lower, loaded.bounds.lower)
+        self.assertEqual(kdtree.bounds.upper, loaded.bounds.upper)
+
+    def test_invalid_file(self):
+
+        with self.assertRaises(ValueError):
+            MeshKDTree3D.from_file(io.BytesIO(b"NOTAMESH"))
+
+
+if __name__ == "__main__":
+    unittest.main()
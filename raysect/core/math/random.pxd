@@ -31,9 +31,27 @@
 
 from raysect.core.math.vector cimport Vector3D
 from raysect.core.math.point cimport Point2D, Point3D
+from libc.stdint cimport uint32_t, uint64_t
+
+# state of a counter-based (Philox-4x32-10) random number stream
+cdef struct philox_state:
+    uint32_t key[2]
+    uint32_t counter[4]
+    uint32_t buffer[4]
+    int index
+
+cdef void philox_init(philox_state *state, uint64_t seed, uint64_t stream) nogil
+
+cdef uint64_t philox_uint64(philox_state *state) nogil
+
+cdef double philox_uniform(philox_state *state) nogil
 
 cpdef seed(object d=*)
 
+cpdef seed_stream(uint64_t seed, uint64_t stream)
+
+cpdef clear_stream()
+
 cpdef double uniform()
 
 cpdef double normal(double mean, double sigma)
@@ -93,7 +93,7 @@ from raysect.core.math.vector cimport new_vector3d
 from raysect.core.math.point cimport new_point2d, Point3D, new_point3d
 from raysect.core.math.cython cimport barycentric_interpolation
 from libc.math cimport cos, sin, asin, log, fabs, sqrt, M_PI as PI
-from libc.stdint cimport uint64_t, int64_t
+from libc.stdint cimport uint32_t, uint64_t, int64_t
 cimport cython
 
 DEF NN = 312
@@ -105,6 +105,14 @@ cdef uint64_t mt[NN]
 # mti == NN+1 means mt[NN] is not initialized
 cdef int mti = NN + 1
 
+# Philox-4x32-10 round count
+DEF PHILOX_ROUNDS = 10
+
+# when a stream is active, random numbers are drawn from the counter-based
+# generator instead of the Mersenne Twister
+cdef philox_state _stream
+cdef bint _stream_active = False
+
 
 cdef void init_genrand64(uint64_t seed) nogil:
     """
@@ -175,6 +183,9 @@ cdef uint64_t _rand_uint64() nogil:
         uint64_t x
         uint64_t mag01[2]
 
+    if _stream_active:
+        return philox_uint64(&_stream)
+
     mag01[0] = 0
     mag01[1] = 0xB5026F5AA96619E9UL
 
@@ -211,6 +222,148 @@ cdef uint64_t _rand_uint64() nogil:
     return x
 
 
+# -----------------------------------------------------------------------------
+# Counter-based generator.
+#
+# Philox-4x32-10 as described in: J. K. Salmon, M. A. Moraes, R. O. Dror and
+# D. E. Shaw, "Parallel random numbers: as easy as 1, 2, 3", Proceedings of the
+# International Conference for High Performance Computing, Networking, Storage
+# and Analysis (SC11), 2011.
+#
+# The generator output is a pure function of a key and a counter. The key is
+# derived from the user seed. The upper half of the counter holds a stream id
+# and the lower half the index of the block of samples within the stream.
+# Independent streams can therefore be generated in any order, by any process
+# or thread, without shared state.
+# -----------------------------------------------------------------------------
+
+cdef inline void _philox4x32_round(uint32_t *counter, uint32_t *key) nogil:
+
+    cdef:
+        uint64_t p0, p1
+        uint32_t hi0, lo0, hi1, lo1
+
+    # round multipliers
+    p0 = 0xD2511F53UL * <uint64_t> counter[0]
+    p1 = 0xCD9E8D57UL * <uint64_t> counter[2]
+
+    hi0 = <uint32_t> (p0 >> 32)
+    lo0 = <uint32_t> p0
+    hi1 = <uint32_t> (p1 >> 32)
+    lo1 = <uint32_t> p1
+
+    counter[0] = hi1 ^ counter[1] ^ key[0]
+    counter[1] = lo1
+    counter[2] = hi0 ^ counter[3] ^ key[1]
+    counter[3] = lo0
+
+
+cdef void _philox4x32(uint32_t *counter, uint32_t *key, uint32_t *output) nogil:
+    """
+    Applies the Philox-4x32-10 bijection to the counter.
+
+    :param counter: Array of 4 counter words.
+    :param key: Array of 2 key words.
+    :param output: Array of 4 words to hold the generated values.
+    """
+
+    cdef:
+        int i
+        uint32_t k[2]
+
+    output[0] = counter[0]
+    output[1] = counter[1]
+    output[2] = counter[2]
+    output[3] = counter[3]
+
+    k[0] = key[0]
+    k[1] = key[1]
+
+    for i in range(PHILOX_ROUNDS):
+        if i > 0:
+            # key schedule (Weyl sequence)
+            k[0] += 0x9E3779B9UL
+            k[1] += 0xBB67AE85UL
+        _philox4x32_round(output, k)
+
+
+def _test_philox4x32(tuple counter, tuple key):
+    """Expose cython function for testing."""
+
+    cdef uint32_t c[4]
+    cdef uint32_t k[2]
+    cdef uint32_t o[4]
+
+    c = counter
+    k = key
+    _philox4x32(c, k, o)
+    return o[0], o[1], o[2], o[3]
+
+
+cdef void philox_init(philox_state *state, uint64_t seed, uint64_t stream) nogil:
+    """
+    Initialises a counter-based random number stream.
+
+    The stream is fully defined by the seed and stream id. Each state is
+    independent, a thread may safely draw numbers from its own state without
+    locking.
+
+    :param state: Pointer to the stream state.
+    :param seed: The global seed.
+    :param stream: The stream id e.g. a render task identifier.
+    """
+
+    state.key[0] = <uint32_t> seed
+    state.key[1] = <uint32_t> (seed >> 32)
+
+    # sample block index
+    state.counter[0] = 0
+    state.counter[1] = 0
+
+    # stream id
+    state.counter[2] = <uint32_t> stream
+    state.counter[3] = <uint32_t> (stream >> 32)
+
+    # buffer is empty, force generation on first request
+    state.index = 4
+
+
+cdef uint64_t philox_uint64(philox_state *state) nogil:
+    """
+    Generates a random number on [0, 2^64-1] - interval from a counter-based stream.
+
+    :param state: Pointer to the stream state.
+    """
+
+    cdef uint64_t x
+
+    # generate a new block of samples when the buffer is exhausted
+    if state.index >= 4:
+
+        _philox4x32(state.counter, state.key, state.buffer)
+        state.index = 0
+
+        # advance the 64 bit sample block index
+        state.counter[0] += 1
+        if state.counter[0] == 0:
+            state.counter[1] += 1
+
+    x = (<uint64_t> state.buffer[state.index] << 32) | state.buffer[state.index + 1]
+    state.index += 2
+    return x
+
+
+@cython.cdivision(True)
+cdef double philox_uniform(philox_state *state) nogil:
+    """
+    Generates a random double in range [0, 1) from a counter-based stream.
+
+    :param state: Pointer to the stream state.
+    """
+
+    return (philox_uint64(state) >> 11) * (1.0 / 9007199254740992.0)
+
+
 cpdef seed(object d=None):
     """
     Seeds the random number generator with the specified integer.
@@ -218,6 +371,8 @@ cpdef seed(object d=None):
     If a seed is not specified the generator is automatically re-seed using the
     system cryptographic random number generator (urandom).
 
+    Seeding deactivates any counter-based stream selected with seed_stream().
+
     :param int d: Integer seed.
 
     .. code-block:: pycon
@@ -241,6 +396,8 @@ cpdef seed(object d=None):
         s[i] = int.from_bytes(b[i*8:(i+1)*8], byteorder='big')
     init_by_array64(s, NN)
 
+    clear_stream()
+
 
 @cython.cdivision(True)
 cpdef double uniform():
@@ -304,6 +461,52 @@ cpdef double normal(double mean, double stddev):
     return _normal_c1 * cos(_normal_c2) * stddev + mean
 
 
+cpdef seed_stream(uint64_t seed, uint64_t stream):
+    """
+    Switches the generator to a reproducible, counter-based random number stream.
+
+    The random numbers returned by this module's functions are a pure function
+    of the seed, the stream id and the number of values drawn since the stream
+    was selected. This permits a render task to be assigned its own stream:
+    the results will then be identical regardless of which process computes
+    the task or the order in which tasks are processed.
+
+    The Mersenne Twister state is left untouched. Call clear_stream() (or
+    seed()) to return to the Mersenne Twister sequence.
+
+    :param int seed: The global seed, an unsigned 64 bit integer.
+    :param int stream: The stream id, an unsigned 64 bit integer.
+
+    .. code-block:: pycon
+
+        >>> from raysect.core.math.random import seed_stream, uniform
+        >>> seed_stream(1, 0)
+        >>> uniform()
+        0.8902591729757107
+    """
+
+    global _stream_active, _normal_generate
+
+    philox_init(&_stream, seed, stream)
+    _stream_active = True
+
+    # discard any cached normal so the stream fully defines the output sequence
+    # (normal() toggles the flag before use, False forces a fresh evaluation)
+    _normal_generate = False
+
+
+cpdef clear_stream():
+    """
+    Returns the generator to the Mersenne Twister sequence.
+
+    The Mersenne Twister continues from the point it was left when a stream
+    was selected with seed_stream().
+    """
+
+    global _stream_active
+    _stream_active = False
+
+
 cpdef bint probability(double prob):
     """
     Samples from the Bernoulli distribution where P(True) = prob.
@@ -29,6 +29,7 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
+from raysect.core.math.sampler.sequence cimport *
 from raysect.core.math.sampler.solidangle cimport *
 from raysect.core.math.sampler.surface3d cimport *
 from raysect.core.math.sampler.targetted cimport *
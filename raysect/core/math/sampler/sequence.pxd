@@ -0,0 +1,74 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-17, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+from libc.stdint cimport uint32_t, uint64_t
+
+
+cdef class LowDiscrepancySequence:
+
+    cdef:
+        readonly bint scramble
+        uint32_t _max_dimensions
+
+    cdef double _sample(self, uint64_t index, uint32_t dimension, uint64_t seed) except? -1
+
+    cpdef double sample(self, uint64_t index, uint32_t dimension, uint64_t seed=*) except? -1
+
+
+cdef class SobolSequence(LowDiscrepancySequence):
+    pass
+
+
+cdef class HaltonSequence(LowDiscrepancySequence):
+    pass
+
+
+cdef void begin_sequence(LowDiscrepancySequence sequence, uint64_t seed)
+
+cdef void end_sequence()
+
+cdef bint sequence_active()
+
+cdef bint sequence_generating()
+
+cdef uint32_t sequence_dimension()
+
+cdef void sequence_seek(uint64_t index, uint32_t dimension)
+
+cdef void sequence_pause(uint32_t dimension)
+
+cdef double sequence_uniform()
+
+cdef void sequence_uniform2d(double *u1, double *u2)
+
+cdef uint64_t new_sequence_seed()
+
+cdef bint acquire_sequence(LowDiscrepancySequence sequence)
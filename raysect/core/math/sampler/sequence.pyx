@@ -0,0 +1,587 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-17, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import numpy as np
+from libc.math cimport log, ceil
+from libc.stdint cimport uint32_t, uint64_t
+from raysect.core.math.random cimport uniform
+cimport cython
+
+# number of dimensions in the Sobol direction number table
+DEF SOBOL_DIMENSIONS = 16
+
+# number of Sobol dimensions stratified together before the index is re-shuffled
+# the first two Sobol dimensions form a (0, 2)-sequence, ideal for the 2D samplers
+DEF SOBOL_PADDING = 2
+
+# number of prime bases available to the Halton sequence
+DEF HALTON_DIMENSIONS = 64
+
+# largest double less than one
+DEF ONE_MINUS_EPSILON = 0.9999999999999999
+
+# 2**-32
+DEF UINT32_NORM = 2.3283064365386963e-10
+
+# 2**-53
+DEF UINT53_NORM = 1.1102230246251565e-16
+
+# marker for sequences without a dimension limit
+DEF UNLIMITED_DIMENSIONS = 0xFFFFFFFF
+
+# Sobol direction numbers from S. Joe and F. Y. Kuo, "Constructing Sobol sequences
+# with better two-dimensional projections", SIAM J. Sci. Comput. 30, 2635-2654 (2008).
+# Each entry is (degree s, polynomial coefficients a, initial direction numbers m).
+# The first dimension is the van der Corput sequence and is not listed.
+_SOBOL_PARAMETERS = (
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49))
+)
+
+cdef uint32_t _sobol_directions[SOBOL_DIMENSIONS][32]
+cdef uint32_t _halton_bases[HALTON_DIMENSIONS]
+cdef int _halton_digits[HALTON_DIMENSIONS]
+
+
+cdef void _init_sobol_directions():
+
+    cdef:
+        int d, j, k, s
+        uint32_t a
+        tuple m
+
+    # first dimension: van der Corput sequence in base 2
+    for j in range(32):
+        _sobol_directions[0][j] = (<uint32_t> 1) << (31 - j)
+
+    for d in range(1, SOBOL_DIMENSIONS):
+
+        s, a, m = _SOBOL_PARAMETERS[d - 1]
+
+        for j in range(32):
+
+            if j < s:
+                _sobol_directions[d][j] = (<uint32_t> m[j]) << (31 - j)
+                continue
+
+            _sobol_directions[d][j] = _sobol_directions[d][j - s] ^ (_sobol_directions[d][j - s] >> s)
+            for k in range(1, s):
+                if (a >> (s - 1 - k)) & 1:
+                    _sobol_directions[d][j] ^= _sobol_directions[d][j - k]
+
+
+cdef void _init_halton_bases():
+
+    cdef:
+        int count = 0
+        uint32_t candidate = 2, divisor
+        bint prime
+
+    while count < HALTON_DIMENSIONS:
+
+        prime = True
+        divisor = 2
+        while divisor * divisor <= candidate:
+            if candidate % divisor == 0:
+                prime = False
+                break
+            divisor += 1
+
+        if prime:
+            _halton_bases[count] = candidate
+
+            # number of digits required to resolve a double precision value
+            _halton_digits[count] = <int> ceil(53 * log(2) / log(candidate))
+            count += 1
+
+        candidate += 1
+
+
+_init_sobol_directions()
+_init_halton_bases()
+
+
+cdef inline uint64_t _mix64(uint64_t x) nogil:
+    """
+    SplitMix64 finaliser, a fast high quality 64 bit hash.
+    """
+
+    x ^= x >> 30
+    x *= 0xBF58476D1CE4E5B9ULL
+    x ^= x >> 27
+    x *= 0x94D049BB133111EBULL
+    x ^= x >> 31
+    return x
+
+
+cdef inline uint32_t _reverse_bits(uint32_t x) nogil:
+
+    x = ((x >> 1) & 0x55555555) | ((x & 0x55555555) << 1)
+    x = ((x >> 2) & 0x33333333) | ((x & 0x33333333) << 2)
+    x = ((x >> 4) & 0x0F0F0F0F) | ((x & 0x0F0F0F0F) << 4)
+    x = ((x >> 8) & 0x00FF00FF) | ((x & 0x00FF00FF) << 8)
+    return (x >> 16) | (x << 16)
+
+
+cdef inline uint32_t _owen_scramble(uint32_t x, uint32_t seed) nogil:
+    """
+    Hash based nested uniform (Owen) scrambling of a 32 bit fixed point value.
+
+    The bits are reversed so the Laine-Karras permutation, in which each bit is
+    only affected by the bits below it, permutes each bit by a hash of the
+    more significant bits. See B. Burley, "Practical Hash-based Owen Scrambling",
+    Journal of Computer Graphics Techniques 9(4), 2020.
+    """
+
+    x = _reverse_bits(x)
+    x ^= x * 0x3D20ADEA
+    x += seed
+    x *= (seed >> 16) | 1
+    x ^= x * 0x05526C56
+    x ^= x * 0x53A22864
+    return _reverse_bits(x)
+
+
+cdef inline uint32_t _sobol(uint32_t index, int dimension) nogil:
+
+    cdef:
+        uint32_t result = 0
+        int j = 0
+
+    while index:
+        if index & 1:
+            result ^= _sobol_directions[dimension][j]
+        index >>= 1
+        j += 1
+    return result
+
+
+cdef class LowDiscrepancySequence:
+    """
+    Base class for low-discrepancy (quasi-random) sample sequences.
+
+    A sequence generates well stratified points in the unit hypercube. Each
+    sample is identified by an index and each coordinate of the point by a
+    dimension. Averaging an integrand over the first N points of a sequence
+    converges faster than averaging over N pseudo-random points if the
+    integrand is reasonably smooth.
+
+    Scrambled sequences are randomised by a seed while preserving their
+    stratification. Independently seeded scrambles give unbiased, uncorrelated
+    estimates, this is used to decorrelate the samples of each pixel.
+
+    :param bool scramble: Toggles the scrambling of the sequence (default=True).
+    """
+
+    def __init__(self, bint scramble=True):
+        self.scramble = scramble
+        self._max_dimensions = UNLIMITED_DIMENSIONS
+
+    def __reduce__(self):
+        return self.__class__, (self.scramble, )
+
+    @property
+    def max_dimensions(self):
+        """
+        The number of dimensions available, None if unlimited.
+
+        :rtype: int
+        """
+
+        if self._max_dimensions == UNLIMITED_DIMENSIONS:
+            return None
+        return self._max_dimensions
+
+    cdef double _sample(self, uint64_t index, uint32_t dimension, uint64_t seed) except? -1:
+        raise NotImplementedError("The method _sample() is not implemented for this sequence.")
+
+    cpdef double sample(self, uint64_t index, uint32_t dimension, uint64_t seed=0) except? -1:
+        """
+        Returns a single coordinate of a sequence point.
+
+        :param int index: The index of the point in the sequence.
+        :param int dimension: The dimension of the coordinate.
+        :param int seed: The scrambling seed (default=0).
+        :return: A value in the range [0, 1).
+        :rtype: float
+        """
+
+        if dimension >= self._max_dimensions:
+            raise ValueError("The requested dimension exceeds the number of dimensions supported by the sequence.")
+        return self._sample(index, dimension, seed)
+
+    def generate(self, int samples, int dimensions, uint64_t seed=0):
+        """
+        Generates the first points of the sequence.
+
+        .. code-block:: pycon
+
+            >>> from raysect.core.math import SobolSequence
+            >>>
+            >>> sobol = SobolSequence(scramble=False)
+            >>> sobol.generate(4, 2)
+            array([[0.  , 0.  ],
+                   [0.5 , 0.5 ],
+                   [0.25, 0.75],
+                   [0.75, 0.25]])
+
+        :param int samples: The number of points to generate.
+        :param int dimensions: The number of dimensions of each point.
+        :param int seed: The scrambling seed (default=0).
+        :return: A (samples, dimensions) numpy array.
+        """
+
+        cdef:
+            int i, j
+            double[:, ::1] points_mv
+
+        if samples <= 0:
+            raise ValueError("Number of samples must be greater than 0.")
+
+        if dimensions <= 0:
+            raise ValueError("Number of dimensions must be greater than 0.")
+
+        if <uint32_t> dimensions > self._max_dimensions:
+            raise ValueError("The requested dimensions exceed the number of dimensions supported by the sequence.")
+
+        points = np.empty((samples, dimensions), dtype=np.float64)
+        points_mv = points
+        for i in range(samples):
+            for j in range(dimensions):
+                points_mv[i, j] = self._sample(i, j, seed)
+        return points
+
+
+cdef class SobolSequence(LowDiscrepancySequence):
+    """
+    The Sobol low-discrepancy sequence.
+
+    The scrambled sequence uses hash based Owen scrambling. Dimensions are
+    grouped into pairs, each pair is generated from the first two Sobol
+    dimensions with the sample index shuffled independently for each pair
+    (padding). Every pair is therefore a well stratified (0, 2)-sequence and an
+    unlimited number of dimensions is supported.
+
+    The unscrambled sequence is limited to 16 dimensions.
+
+    The sample index is limited to 32 bits.
+
+    :param bool scramble: Toggles the scrambling of the sequence (default=True).
+
+    .. code-block:: pycon
+
+        >>> from raysect.core.math import SobolSequence
+        >>>
+        >>> sobol = SobolSequence()
+        >>> sobol.sample(index=5, dimension=0, seed=42)
+        0.37938121310435236
+    """
+
+    def __init__(self, bint scramble=True):
+        super().__init__(scramble)
+        if not scramble:
+            self._max_dimensions = SOBOL_DIMENSIONS
+
+    @cython.cdivision(True)
+    cdef double _sample(self, uint64_t index, uint32_t dimension, uint64_t seed) except? -1:
+
+        cdef:
+            uint32_t value, block
+            uint32_t i = <uint32_t> index
+
+        if not self.scramble:
+            return _sobol(i, dimension) * UINT32_NORM
+
+        # shuffle the point order for each block of dimensions
+        block = dimension // SOBOL_PADDING
+        i = _owen_scramble(i, <uint32_t> _mix64(seed ^ _mix64(block + 1)))
+
+        # scramble the coordinate
+        value = _sobol(i, dimension % SOBOL_PADDING)
+        value = _owen_scramble(value, <uint32_t> (_mix64(seed + _mix64(dimension + 1)) >> 32))
+        return value * UINT32_NORM
+
+
+cdef class HaltonSequence(LowDiscrepancySequence):
+    """
+    The Halton low-discrepancy sequence.
+
+    Each dimension is the radical inverse of the sample index in successive
+    prime bases. The scrambled sequence applies a nested (Owen) random digit
+    scramble, the permutation of each digit depends on the value of all the
+    preceding digits.
+
+    The sequence is limited to 64 dimensions. Higher bases have poor
+    stratification at low sample counts, the Sobol sequence is generally preferred.
+
+    :param bool scramble: Toggles the scrambling of the sequence (default=True).
+
+    .. code-block:: pycon
+
+        >>> from raysect.core.math import HaltonSequence
+        >>>
+        >>> halton = HaltonSequence(scramble=False)
+        >>> halton.generate(4, 2)
+        array([[0.        , 0.        ],
+               [0.5       , 0.33333333],
+               [0.25      , 0.66666667],
+               [0.75      , 0.11111111]])
+    """
+
+    def __init__(self, bint scramble=True):
+        super().__init__(scramble)
+        self._max_dimensions = HALTON_DIMENSIONS
+
+    @cython.cdivision(True)
+    cdef double _sample(self, uint64_t index, uint32_t dimension, uint64_t seed) except? -1:
+
+        cdef:
+            uint64_t base, digit, node
+            double base_inv, factor, result
+            int i
+
+        base = _halton_bases[dimension]
+        base_inv = 1.0 / base
+        factor = base_inv
+        result = 0
+
+        if not self.scramble:
+
+            while index:
+                result += (index % base) * factor
+                index //= base
+                factor *= base_inv
+            return result
+
+        # the digit permutations are random shifts selected by hashing the digits above
+        node = _mix64(seed ^ _mix64(dimension + 1))
+        for i in range(_halton_digits[dimension]):
+            digit = index % base
+            index //= base
+            result += ((digit + node) % base) * factor
+            factor *= base_inv
+            node = _mix64(node + digit + 1)
+
+        return min(result, ONE_MINUS_EPSILON)
+
+
+# The sequence state for the current sample.
+#
+# The observers initialise the sequence for each pixel. Ray generation then
+# reserves dimensions for the point and direction samplers (generating phase).
+# Before each ray is traced the sample index is set and the remaining dimensions
+# are drawn, in order, by the samplers used for BSDF sampling (drawing phase).
+cdef LowDiscrepancySequence _sequence = None
+cdef uint64_t _sequence_seed = 0
+cdef uint64_t _sequence_index = 0
+cdef uint32_t _sequence_dimension = 0
+cdef bint _sequence_drawing = False
+
+
+cdef void begin_sequence(LowDiscrepancySequence sequence, uint64_t seed):
+    """
+    Activates a sample sequence.
+
+    While active, the surface and solid angle samplers draw their samples from
+    the sequence rather than the pseudo-random number generator.
+
+    :param LowDiscrepancySequence sequence: The sample sequence.
+    :param int seed: The scrambling seed.
+    """
+
+    global _sequence, _sequence_seed, _sequence_index, _sequence_dimension, _sequence_drawing
+
+    _sequence = sequence
+    _sequence_seed = seed
+    _sequence_index = 0
+    _sequence_dimension = 0
+    _sequence_drawing = False
+
+
+cdef void end_sequence():
+    """
+    Deactivates the sample sequence, samplers revert to pseudo-random sampling.
+    """
+
+    global _sequence, _sequence_drawing
+
+    _sequence = None
+    _sequence_drawing = False
+
+
+cdef bint sequence_active():
+    """
+    Returns True if a sample sequence is active.
+    """
+
+    return _sequence is not None
+
+
+cdef bint sequence_generating():
+    """
+    Returns True if a sequence is active and dimensions may be reserved.
+    """
+
+    return _sequence is not None and not _sequence_drawing
+
+
+cdef uint32_t sequence_dimension():
+    """
+    Returns the next unused sequence dimension.
+    """
+
+    return _sequence_dimension
+
+
+cdef void sequence_seek(uint64_t index, uint32_t dimension):
+    """
+    Selects the sequence point and the dimension of the next draw.
+
+    Subsequent calls to sequence_uniform() and sequence_uniform2d() return
+    successive dimensions of the point.
+
+    :param int index: The index of the sequence point.
+    :param int dimension: The first dimension to draw.
+    """
+
+    global _sequence_index, _sequence_dimension, _sequence_drawing
+
+    _sequence_index = index
+    _sequence_dimension = dimension
+    _sequence_drawing = _sequence is not None
+
+
+cdef void sequence_pause(uint32_t dimension):
+    """
+    Stops drawing from the sequence, leaving dimension as the next unused dimension.
+
+    :param int dimension: The next unused dimension.
+    """
+
+    global _sequence_dimension, _sequence_drawing
+
+    _sequence_dimension = dimension
+    _sequence_drawing = False
+
+
+cdef double sequence_uniform():
+    """
+    Returns the next dimension of the current sequence point.
+
+    If the sequence is not drawing, or has run out of dimensions, a uniform
+    pseudo-random number is returned instead. Materials may use this function
+    in place of uniform() to draw their BSDF samples from the sequence.
+
+    :return: A value in the range [0, 1).
+    """
+
+    global _sequence_dimension
+
+    cdef double value
+
+    if not _sequence_drawing or _sequence_dimension >= _sequence._max_dimensions:
+        return uniform()
+
+    value = _sequence._sample(_sequence_index, _sequence_dimension, _sequence_seed)
+    _sequence_dimension += 1
+    return value
+
+
+cdef void sequence_uniform2d(double *u1, double *u2):
+    """
+    Returns the next two dimensions of the current sequence point.
+
+    The dimensions are drawn as a pair so both values lie in the same, well
+    stratified, projection of the sequence. Falls back to uniform pseudo-random
+    numbers as described for sequence_uniform().
+
+    :param u1: Pointer to the first value.
+    :param u2: Pointer to the second value.
+    """
+
+    global _sequence_dimension
+
+    if _sequence_drawing:
+
+        # keep pairs aligned with the sequence's stratified dimension pairs
+        _sequence_dimension += _sequence_dimension & 1
+
+    if not _sequence_drawing or _sequence_dimension + 1 >= _sequence._max_dimensions:
+        u1[0] = uniform()
+        u2[0] = uniform()
+        return
+
+    u1[0] = _sequence._sample(_sequence_index, _sequence_dimension, _sequence_seed)
+    u2[0] = _sequence._sample(_sequence_index, _sequence_dimension + 1, _sequence_seed)
+    _sequence_dimension += 2
+
+
+cdef uint64_t new_sequence_seed():
+    """
+    Draws a new scrambling seed from the pseudo-random number generator.
+
+    Drawing the seed from the generator makes scrambles reproducible when the
+    generator is seeded, for example by a seeded render engine.
+    """
+
+    return <uint64_t> (uniform() / UINT53_NORM)
+
+
+cdef bint acquire_sequence(LowDiscrepancySequence sequence):
+    """
+    Activates a sampler's own sequence if no other sequence is active.
+
+    A newly drawn scrambling seed is used, so each call produces an independent
+    scramble. If True is returned the caller must call end_sequence() once
+    its samples are generated.
+
+    :param LowDiscrepancySequence sequence: The sequence, may be None.
+    :return: True if the sequence was activated.
+    """
+
+    if sequence is None or _sequence is not None:
+        return False
+
+    begin_sequence(sequence, new_sequence_seed())
+    return True
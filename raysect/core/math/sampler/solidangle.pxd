@@ -33,6 +33,8 @@ from libc.math cimport M_PI, M_1_PI, sqrt, sin, cos
 from raysect.core.math cimport Point2D, new_point2d, Point3D, new_point3d, Vector3D, new_vector3d
 from raysect.core.math.random cimport uniform
 from raysect.core.math.cython cimport barycentric_coords, barycentric_interpolation
+from numpy cimport ndarray
+from raysect.core.math.sampler.sequence cimport LowDiscrepancySequence
 
 DEF R_2_PI = 0.15915494309189535  # 1 / (2 * pi)
 DEF R_4_PI = 0.07957747154594767  # 1 / (4 * pi)
@@ -40,6 +42,8 @@ DEF R_4_PI = 0.07957747154594767  # 1 / (4 * pi)
 
 cdef class SolidAngleSampler:
 
+    cdef LowDiscrepancySequence _sequence
+
     cpdef double pdf(self, Vector3D sample)
 
     cdef Vector3D sample(self)
@@ -50,6 +54,14 @@ cdef class SolidAngleSampler:
 
     cdef list samples_with_pdfs(self, int samples)
 
+    cdef ndarray samples_array(self, int samples)
+
+    cdef tuple samples_array_with_pdfs(self, int samples)
+
+    cdef object _fill_array(self, double[:, ::1] results, double[::1] pdfs)
+
+    cdef double _map_sample(self, double u1, double u2, double *sample) except? -1
+
 
 cdef class SphereSampler(SolidAngleSampler):
     pass
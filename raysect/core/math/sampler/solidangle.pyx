@@ -30,8 +30,13 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 from libc.math cimport M_PI, M_1_PI, sqrt, sin, cos, asin
+from libc.stdint cimport uint32_t
+cimport cython
+import numpy as np
+from numpy cimport ndarray
 from raysect.core.math cimport Vector3D, new_vector3d
-from raysect.core.math.random cimport uniform
+from raysect.core.math.sampler.sequence cimport LowDiscrepancySequence, acquire_sequence, end_sequence, sequence_generating, \
+    sequence_dimension, sequence_seek, sequence_pause, sequence_uniform2d
 
 # TODO: add tests - idea: solve the lighting equation with a uniform emitting surface with each sampler and check the mean radiance is unity
 
@@ -42,9 +47,33 @@ DEF R_4_PI = 0.07957747154594767  # 1 / (4 * pi)
 cdef class SolidAngleSampler:
     """
     Base class for an object that generates samples over a solid angle.
+
+    By default samples are generated with the pseudo-random number generator.
+    If a low-discrepancy sequence is assigned to the sequence attribute, lists
+    of samples are generated from the sequence instead. Each list is generated
+    with a new scramble of the sequence.
+
+    If an observer has activated a sequence, samples are generated from the
+    observer's sequence. This includes the single samples drawn by materials
+    while a ray is traced.
     """
 
-    def __call__(self, object samples=None, bint pdf=False):
+    @property
+    def sequence(self):
+        """
+        The low-discrepancy sequence used to generate lists of samples.
+
+        Set to None (the default) for pseudo-random sampling.
+
+        :rtype: LowDiscrepancySequence
+        """
+        return self._sequence
+
+    @sequence.setter
+    def sequence(self, LowDiscrepancySequence value):
+        self._sequence = value
+
+    def __call__(self, object samples=None, bint pdf=False, bint array=False):
         """
         If samples is not provided, returns a single Vector3D sample from
         the distribution. If samples is set to a value then a number of
@@ -53,11 +82,25 @@ cdef class SolidAngleSampler:
         If pdf is set to True the Vector3D sample is returned inside a tuple
         with its associated pdf value as the second element.
 
+        If array is set to True the samples are returned as an (N, 3) numpy
+        array of vector coordinates, where N is the number of samples (default=1).
+        If pdf is also set to True a tuple is returned containing the sample
+        array and an array of the pdf values.
+
         :param int samples: Number of points to generate (default=None).
         :param bool pdf: Toggle for returning associated sample pdfs (default=False).
+        :param bool array: Toggle for returning the samples as a numpy array (default=False).
         :return: A Vector3D, tuple or list of Vector3D objects.
         """
 
+        if array:
+            samples = int(samples or 1)
+            if samples <= 0:
+                raise ValueError("Number of samples must be greater than 0.")
+            if pdf:
+                return self.samples_array_with_pdfs(samples)
+            return self.samples_array(samples)
+
         if samples:
             samples = int(samples)
             if samples <= 0:
@@ -89,7 +132,13 @@ cdef class SolidAngleSampler:
 
         :rtype: Vector3D
         """
-        raise NotImplemented("The method sample() is not implemented for this sampler.")
+
+        cdef double u1, u2
+        cdef double sample[3]
+
+        sequence_uniform2d(&u1, &u2)
+        self._map_sample(u1, u2, sample)
+        return new_vector3d(sample[0], sample[1], sample[2])
 
     cdef tuple sample_with_pdf(self):
         """
@@ -103,7 +152,28 @@ cdef class SolidAngleSampler:
 
         :rtype: tuple
         """
-        raise NotImplemented("The method pdf() is not implemented for this sampler.")
+
+        cdef double u1, u2, pdf
+        cdef double sample[3]
+
+        sequence_uniform2d(&u1, &u2)
+        pdf = self._map_sample(u1, u2, sample)
+        return new_vector3d(sample[0], sample[1], sample[2]), pdf
+
+    cdef double _map_sample(self, double u1, double u2, double *sample) except? -1:
+        """
+        Maps a point on the unit square to a sample.
+
+        This is a virtual method to be implemented by derived classes. The
+        single, list and array sample methods are all generated by mapping
+        pairs of uniform random (or sequence) numbers with this method.
+
+        :param double u1: The first coordinate on the unit square.
+        :param double u2: The second coordinate on the unit square.
+        :param double *sample: Array of 3 doubles that receives the sample vector coordinates.
+        :return: The pdf of the sample.
+        """
+        raise NotImplementedError("The method _map_sample() is not implemented for this sampler.")
 
     cdef list samples(self, int samples):
         """
@@ -115,12 +185,33 @@ cdef class SolidAngleSampler:
         :rtype: list
         """
 
-        cdef list results
-        cdef int i
+        cdef:
+            list results
+            int i
+            uint32_t dimension
+            bint owner
+
+        owner = acquire_sequence(self._sequence)
+        try:
+
+            results = []
+            if sequence_generating():
+
+                # one sequence point per sample, each point uses the same dimensions
+                dimension = sequence_dimension()
+                for i in range(samples):
+                    sequence_seek(i, dimension)
+                    results.append(self.sample())
+                sequence_pause(sequence_dimension())
+
+            else:
+                for i in range(samples):
+                    results.append(self.sample())
+
+        finally:
+            if owner:
+                end_sequence()
 
-        results = []
-        for i in range(samples):
-            results.append(self.sample())
         return results
 
     cdef list samples_with_pdfs(self, int samples):
@@ -137,14 +228,107 @@ cdef class SolidAngleSampler:
         :rtype: list
         """
 
-        cdef list results
-        cdef int i
+        cdef:
+            list results
+            int i
+            uint32_t dimension
+            bint owner
+
+        owner = acquire_sequence(self._sequence)
+        try:
+
+            results = []
+            if sequence_generating():
+
+                # one sequence point per sample, each point uses the same dimensions
+                dimension = sequence_dimension()
+                for i in range(samples):
+                    sequence_seek(i, dimension)
+                    results.append(self.sample_with_pdf())
+                sequence_pause(sequence_dimension())
+
+            else:
+                for i in range(samples):
+                    results.append(self.sample_with_pdf())
+
+        finally:
+            if owner:
+                end_sequence()
+
+        return results
+
+    cdef ndarray samples_array(self, int samples):
+        """
+        Generates an array of samples.
+
+        Generating an array avoids the creation of a Python object per sample
+        and is substantially faster than generating a list of samples.
 
-        results = []
-        for i in range(samples):
-            results.append(self.sample_with_pdf())
+        If pdfs are required please see samples_array_with_pdfs().
+
+        :param int samples: Number of samples to generate.
+        :return: An (N, 3) array of vector coordinates.
+        :rtype: ndarray
+        """
+
+        cdef ndarray results = np.empty((samples, 3), dtype=np.float64)
+        self._fill_array(results, None)
         return results
 
+    cdef tuple samples_array_with_pdfs(self, int samples):
+        """
+        Generates an array of samples and an array of their associated pdfs.
+
+        :param int samples: Number of samples to generate.
+        :return: A tuple of an (N, 3) array of vector coordinates and an (N,) array of pdfs.
+        :rtype: tuple
+        """
+
+        cdef ndarray results = np.empty((samples, 3), dtype=np.float64)
+        cdef ndarray pdfs = np.empty(samples, dtype=np.float64)
+        self._fill_array(results, pdfs)
+        return results, pdfs
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef object _fill_array(self, double[:, ::1] results, double[::1] pdfs):
+
+        cdef:
+            int i
+            uint32_t dimension
+            bint owner, generating
+            double u1, u2, pdf
+            double sample[3]
+
+        owner = acquire_sequence(self._sequence)
+        try:
+
+            # one sequence point per sample, each point uses the same dimensions
+            generating = sequence_generating()
+            dimension = sequence_dimension()
+
+            for i in range(results.shape[0]):
+
+                if generating:
+                    sequence_seek(i, dimension)
+
+                sequence_uniform2d(&u1, &u2)
+                pdf = self._map_sample(u1, u2, sample)
+
+                results[i, 0] = sample[0]
+                results[i, 1] = sample[1]
+                results[i, 2] = sample[2]
+                if pdfs is not None:
+                    pdfs[i] = pdf
+
+            if generating:
+                sequence_pause(sequence_dimension())
+
+        finally:
+            if owner:
+                end_sequence()
+
 
 cdef class SphereSampler(SolidAngleSampler):
     """
@@ -161,16 +345,17 @@ cdef class SphereSampler(SolidAngleSampler):
     cpdef double pdf(self, Vector3D sample):
         return R_4_PI
 
-    cdef Vector3D sample(self):
-        cdef double z = 1.0 - 2.0 * uniform()
-        cdef double r = sqrt(max(0, 1.0 - z*z))
-        cdef double phi = 2.0 * M_PI * uniform()
-        cdef double x = r * cos(phi)
-        cdef double y = r * sin(phi)
-        return new_vector3d(x, y, z)
+    cdef double _map_sample(self, double u1, double u2, double *sample) except? -1:
 
-    cdef tuple sample_with_pdf(self):
-        return self.sample(), R_4_PI
+        cdef double z, r, phi
+
+        z = 1.0 - 2.0 * u1
+        r = sqrt(max(0, 1.0 - z*z))
+        phi = 2.0 * M_PI * u2
+        sample[0] = r * cos(phi)
+        sample[1] = r * sin(phi)
+        sample[2] = z
+        return R_4_PI
 
 
 cdef class HemisphereUniformSampler(SolidAngleSampler):
@@ -193,16 +378,17 @@ cdef class HemisphereUniformSampler(SolidAngleSampler):
             return R_2_PI
         return 0.0
 
-    cdef Vector3D sample(self):
-        cdef double z = uniform()
-        cdef double r = sqrt(max(0, 1.0 - z*z))
-        cdef double phi = 2.0 * M_PI * uniform()
-        cdef double x = r * cos(phi)
-        cdef double y = r * sin(phi)
-        return new_vector3d(x, y, z)
+    cdef double _map_sample(self, double u1, double u2, double *sample) except? -1:
 
-    cdef tuple sample_with_pdf(self):
-        return self.sample(), R_2_PI
+        cdef double z, r, phi
+
+        z = u1
+        r = sqrt(max(0, 1.0 - z*z))
+        phi = 2.0 * M_PI * u2
+        sample[0] = r * cos(phi)
+        sample[1] = r * sin(phi)
+        sample[2] = z
+        return R_2_PI
 
 
 cdef class HemisphereCosineSampler(SolidAngleSampler):
@@ -225,16 +411,18 @@ cdef class HemisphereCosineSampler(SolidAngleSampler):
             return  M_1_PI * sample.z
         return 0.0
 
-    cdef Vector3D sample(self):
-        cdef double r = sqrt(uniform())
-        cdef double phi = 2.0 * M_PI * uniform()
-        cdef double x = r * cos(phi)
-        cdef double y = r * sin(phi)
-        return new_vector3d(x, y, sqrt(max(0, 1.0 - x*x - y*y)))
+    cdef double _map_sample(self, double u1, double u2, double *sample) except? -1:
 
-    cdef tuple sample_with_pdf(self):
-        cdef Vector3D sample = self.sample()
-        return sample, M_1_PI * sample.z
+        cdef double x, y, r, phi
+
+        r = sqrt(u1)
+        phi = 2.0 * M_PI * u2
+        x = r * cos(phi)
+        y = r * sin(phi)
+        sample[0] = x
+        sample[1] = y
+        sample[2] = sqrt(max(0, 1.0 - x*x - y*y))
+        return M_1_PI * sample[2]
 
 
 cdef class ConeUniformSampler(SolidAngleSampler):
@@ -270,14 +458,14 @@ cdef class ConeUniformSampler(SolidAngleSampler):
             return self._solid_angle_inv
         return 0.0
 
-    cdef Vector3D sample(self):
-        cdef double phi = 2.0 * M_PI * uniform()
-        cdef double cos_theta = cos(self._angle_radians)
-        cdef double z = uniform()*(1 - cos_theta) + cos_theta
-        cdef double r = sqrt(max(0, 1.0 - z*z))
-        cdef double x = r * cos(phi)
-        cdef double y = r * sin(phi)
-        return new_vector3d(x, y, z)
+    cdef double _map_sample(self, double u1, double u2, double *sample) except? -1:
 
-    cdef tuple sample_with_pdf(self):
-        return self.sample(), self._solid_angle_inv
+        cdef double z, r, phi
+
+        phi = 2.0 * M_PI * u1
+        z = u2 * (1 - self._angle_cosine) + self._angle_cosine
+        r = sqrt(max(0, 1.0 - z*z))
+        sample[0] = r * cos(phi)
+        sample[1] = r * sin(phi)
+        sample[2] = z
+        return self._solid_angle_inv
@@ -30,10 +30,14 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 from raysect.core.math cimport Point3D
+from numpy cimport ndarray
+from raysect.core.math.sampler.sequence cimport LowDiscrepancySequence
 
 
 cdef class SurfaceSampler3D:
 
+    cdef LowDiscrepancySequence _sequence
+
     cdef Point3D sample(self)
 
     cdef tuple sample_with_pdf(self)
@@ -42,6 +46,14 @@ cdef class SurfaceSampler3D:
 
     cdef list samples_with_pdfs(self, int samples)
 
+    cdef ndarray samples_array(self, int samples)
+
+    cdef tuple samples_array_with_pdfs(self, int samples)
+
+    cdef object _fill_array(self, double[:, ::1] results, double[::1] pdfs)
+
+    cdef double _map_sample(self, double u1, double u2, double *sample) except? -1
+
 
 cdef class DiskSampler3D(SurfaceSampler3D):
 
@@ -30,18 +30,46 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 from libc.math cimport M_PI as PI, sqrt, sin, cos
+from libc.stdint cimport uint32_t
+cimport cython
+import numpy as np
+from numpy cimport ndarray
 
 from raysect.core.math cimport Point3D, new_point3d, Vector3D
-from raysect.core.math.random cimport uniform
 from raysect.core.math.cython cimport barycentric_interpolation
+from raysect.core.math.sampler.sequence cimport LowDiscrepancySequence, acquire_sequence, end_sequence, sequence_generating, \
+    sequence_dimension, sequence_seek, sequence_pause, sequence_uniform2d
 
 
 cdef class SurfaceSampler3D:
     """
     Base class for an object that generates samples from a surface in 3D.
+
+    By default samples are generated with the pseudo-random number generator.
+    If a low-discrepancy sequence is assigned to the sequence attribute, lists
+    of samples are generated from the sequence instead. Each list is generated
+    with a new scramble of the sequence.
+
+    If an observer has activated a sequence, samples are generated from the
+    observer's sequence.
     """
 
-    def __call__(self, object samples=None, bint pdf=False):
+    @property
+    def sequence(self):
+        """
+        The low-discrepancy sequence used to generate lists of samples.
+
+        Set to None (the default) for pseudo-random sampling.
+
+        :rtype: LowDiscrepancySequence
+        """
+        return self._sequence
+
+    @sequence.setter
+    def sequence(self, LowDiscrepancySequence value):
+        self._sequence = value
+
+    def __call__(self, object samples=None, bint pdf=False, bint array=False):
         """
         If samples is not provided, returns a single Point3D sample from
         the distribution. If samples is set to a value then a number of
@@ -50,11 +78,25 @@ cdef class SurfaceSampler3D:
         If pdf is set to True the Point3D sample is returned inside a tuple
         with its associated pdf value as the second element.
 
+        If array is set to True the samples are returned as an (N, 3) numpy
+        array of point coordinates, where N is the number of samples (default=1).
+        If pdf is also set to True a tuple is returned containing the sample
+        array and an array of the pdf values.
+
         :param int samples: Number of points to generate (default=None).
         :param bool pdf: Toggle for returning associated sample pdfs (default=False).
+        :param bool array: Toggle for returning the samples as a numpy array (default=False).
         :return: A Point3D, tuple or list.
         """
 
+        if array:
+            samples = int(samples or 1)
+            if samples <= 0:
+                raise ValueError("Number of samples must be greater than 0.")
+            if pdf:
+                return self.samples_array_with_pdfs(samples)
+            return self.samples_array(samples)
+
         if samples:
             samples = int(samples)
             if samples <= 0:
@@ -75,7 +117,13 @@ cdef class SurfaceSampler3D:
 
         :rtype: Point3D
         """
-        raise NotImplemented("The method sample() is not implemented for this sampler.")
+
+        cdef double u1, u2
+        cdef double sample[3]
+
+        sequence_uniform2d(&u1, &u2)
+        self._map_sample(u1, u2, sample)
+        return new_point3d(sample[0], sample[1], sample[2])
 
     cdef tuple sample_with_pdf(self):
         """
@@ -89,7 +137,28 @@ cdef class SurfaceSampler3D:
 
         :rtype: tuple
         """
-        raise NotImplemented("The method pdf() is not implemented for this sampler.")
+
+        cdef double u1, u2, pdf
+        cdef double sample[3]
+
+        sequence_uniform2d(&u1, &u2)
+        pdf = self._map_sample(u1, u2, sample)
+        return new_point3d(sample[0], sample[1], sample[2]), pdf
+
+    cdef double _map_sample(self, double u1, double u2, double *sample) except? -1:
+        """
+        Maps a point on the unit square to a sample.
+
+        This is a virtual method to be implemented by derived classes. The
+        single, list and array sample methods are all generated by mapping
+        pairs of uniform random (or sequence) numbers with this method.
+
+        :param double u1: The first coordinate on the unit square.
+        :param double u2: The second coordinate on the unit square.
+        :param double *sample: Array of 3 doubles that receives the sample point coordinates.
+        :return: The pdf of the sample.
+        """
+        raise NotImplementedError("The method _map_sample() is not implemented for this sampler.")
 
     cdef list samples(self, int samples):
         """
@@ -101,12 +170,33 @@ cdef class SurfaceSampler3D:
         :rtype: list
         """
 
-        cdef list results
-        cdef int i
+        cdef:
+            list results
+            int i
+            uint32_t dimension
+            bint owner
+
+        owner = acquire_sequence(self._sequence)
+        try:
+
+            results = []
+            if sequence_generating():
+
+                # one sequence point per sample, each point uses the same dimensions
+                dimension = sequence_dimension()
+                for i in range(samples):
+                    sequence_seek(i, dimension)
+                    results.append(self.sample())
+                sequence_pause(sequence_dimension())
+
+            else:
+                for i in range(samples):
+                    results.append(self.sample())
+
+        finally:
+            if owner:
+                end_sequence()
 
-        results = []
-        for i in range(samples):
-            results.append(self.sample())
         return results
 
     cdef list samples_with_pdfs(self, int samples):
@@ -123,14 +213,107 @@ cdef class SurfaceSampler3D:
         :rtype: list
         """
 
-        cdef list results
-        cdef int i
+        cdef:
+            list results
+            int i
+            uint32_t dimension
+            bint owner
+
+        owner = acquire_sequence(self._sequence)
+        try:
+
+            results = []
+            if sequence_generating():
+
+                # one sequence point per sample, each point uses the same dimensions
+                dimension = sequence_dimension()
+                for i in range(samples):
+                    sequence_seek(i, dimension)
+                    results.append(self.sample_with_pdf())
+                sequence_pause(sequence_dimension())
+
+            else:
+                for i in range(samples):
+                    results.append(self.sample_with_pdf())
+
+        finally:
+            if owner:
+                end_sequence()
 
-        results = []
-        for i in range(samples):
-            results.append(self.sample_with_pdf())
         return results
 
+    cdef ndarray samples_array(self, int samples):
+        """
+        Generates an array of samples.
+
+        Generating an array avoids the creation of a Python object per sample
+        and is substantially faster than generating a list of samples.
+
+        If pdfs are required please see samples_array_with_pdfs().
+
+        :param int samples: Number of samples to generate.
+        :return: An (N, 3) array of point coordinates.
+        :rtype: ndarray
+        """
+
+        cdef ndarray results = np.empty((samples, 3), dtype=np.float64)
+        self._fill_array(results, None)
+        return results
+
+    cdef tuple samples_array_with_pdfs(self, int samples):
+        """
+        Generates an array of samples and an array of their associated pdfs.
+
+        :param int samples: Number of samples to generate.
+        :return: A tuple of an (N, 3) array of point coordinates and an (N,) array of pdfs.
+        :rtype: tuple
+        """
+
+        cdef ndarray results = np.empty((samples, 3), dtype=np.float64)
+        cdef ndarray pdfs = np.empty(samples, dtype=np.float64)
+        self._fill_array(results, pdfs)
+        return results, pdfs
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef object _fill_array(self, double[:, ::1] results, double[::1] pdfs):
+
+        cdef:
+            int i
+            uint32_t dimension
+            bint owner, generating
+            double u1, u2, pdf
+            double sample[3]
+
+        owner = acquire_sequence(self._sequence)
+        try:
+
+            # one sequence point per sample, each point uses the same dimensions
+            generating = sequence_generating()
+            dimension = sequence_dimension()
+
+            for i in range(results.shape[0]):
+
+                if generating:
+                    sequence_seek(i, dimension)
+
+                sequence_uniform2d(&u1, &u2)
+                pdf = self._map_sample(u1, u2, sample)
+
+                results[i, 0] = sample[0]
+                results[i, 1] = sample[1]
+                results[i, 2] = sample[2]
+                if pdfs is not None:
+                    pdfs[i] = pdf
+
+            if generating:
+                sequence_pause(sequence_dimension())
+
+        finally:
+            if owner:
+                end_sequence()
+
 
 # TODO - implement stratified sampling for samples and samples_with_pdfs
 cdef class DiskSampler3D(SurfaceSampler3D):
@@ -156,13 +339,16 @@ cdef class DiskSampler3D(SurfaceSampler3D):
         self.area = PI * self.radius * self.radius
         self._area_inv = 1 / self.area
 
-    cdef Point3D sample(self):
-        cdef double r = sqrt(uniform()) * self.radius
-        cdef double theta = 2.0 * PI * uniform()
-        return new_point3d(r * cos(theta), r * sin(theta), 0)
+    cdef double _map_sample(self, double u1, double u2, double *sample) except? -1:
 
-    cdef tuple sample_with_pdf(self):
-        return self.sample(), self._area_inv
+        cdef double r, theta
+
+        r = sqrt(u1) * self.radius
+        theta = 2.0 * PI * u2
+        sample[0] = r * cos(theta)
+        sample[1] = r * sin(theta)
+        sample[2] = 0
+        return self._area_inv
 
 
 # TODO - implement stratified sampling for samples and samples_with_pdfs
@@ -194,11 +380,11 @@ cdef class RectangleSampler3D(SurfaceSampler3D):
         self._width_offset = 0.5 * width
         self._height_offset = 0.5 * height
 
-    cdef Point3D sample(self):
-        return new_point3d(uniform() * self.width - self._width_offset, uniform() * self.height - self._height_offset, 0)
-
-    cdef tuple sample_with_pdf(self):
-        return self.sample(), self._area_inv
+    cdef double _map_sample(self, double u1, double u2, double *sample) except? -1:
+        sample[0] = u1 * self.width - self._width_offset
+        sample[1] = u2 * self.height - self._height_offset
+        sample[2] = 0
+        return self._area_inv
 
 
 # TODO - implement stratified sampling for samples and samples_with_pdfs
@@ -239,22 +425,18 @@ cdef class TriangleSampler3D(SurfaceSampler3D):
         cdef Vector3D e2 = v1.vector_to(v3)
         return 0.5 * e1.cross(e2).get_length()
 
-    cdef Point3D sample(self):
+    cdef double _map_sample(self, double u1, double u2, double *sample) except? -1:
 
         cdef double temp, alpha, beta, gamma
 
         # generate barycentric coordinate
-        temp = sqrt(uniform())
+        temp = sqrt(u1)
         alpha = 1 - temp
-        beta = uniform() * temp
+        beta = u2 * temp
         gamma = 1 - alpha - beta
 
         # interpolate vertex coordinates to generate sample point coordinate
-        return new_point3d(
-            barycentric_interpolation(alpha, beta, gamma, self._v1.x, self._v2.x, self._v3.x),
-            barycentric_interpolation(alpha, beta, gamma, self._v1.y, self._v2.y, self._v3.y),
-            barycentric_interpolation(alpha, beta, gamma, self._v1.z, self._v2.z, self._v3.z)
-        )
-
-    cdef tuple sample_with_pdf(self):
-        return self.sample(), self._area_inv
+        sample[0] = barycentric_interpolation(alpha, beta, gamma, self._v1.x, self._v2.x, self._v3.x)
+        sample[1] = barycentric_interpolation(alpha, beta, gamma, self._v1.y, self._v2.y, self._v3.y)
+        sample[2] = barycentric_interpolation(alpha, beta, gamma, self._v1.z, self._v2.z, self._v3.z)
+        return self._area_inv
@@ -52,6 +52,10 @@ cdef class _TargettedSampler:
 
     cdef list samples_with_pdfs(self, Point3D point, int samples)
 
+    cdef np.ndarray samples_array(self, Point3D point, int samples)
+
+    cdef tuple samples_array_with_pdfs(self, Point3D point, int samples)
+
     cdef object _calculate_cdf(self)
 
     cdef tuple _pick_sphere(self)
@@ -86,7 +86,7 @@ cdef class _TargettedSampler:
             if weight <= 0:
                 raise ValueError('Target weight must be greater than zero.')
 
-    def __call__(self, Point3D point, object samples=None, bint pdf=False):
+    def __call__(self, Point3D point, object samples=None, bint pdf=False, bint array=False):
         """
         If samples is not provided, returns a single Vector3D sample from
         the distribution. If samples is set to a value then a number of
@@ -95,11 +95,26 @@ cdef class _TargettedSampler:
         If pdf is set to True the Vector3D sample is returned inside a tuple
         with its associated pdf value as the second element.
 
+        If array is set to True the samples are returned as an (N, 3) numpy
+        array of vector coordinates, where N is the number of samples (default=1).
+        If pdf is also set to True a tuple is returned containing the sample
+        array and an array of the pdf values.
+
+        :param Point3D point: The point from which to sample.
         :param int samples: Number of points to generate (default=None).
         :param bool pdf: Toggle for returning associated sample pdfs (default=False).
+        :param bool array: Toggle for returning the samples as a numpy array (default=False).
         :return: A Vector3D, tuple or list of Vector3D objects.
         """
 
+        if array:
+            samples = int(samples or 1)
+            if samples <= 0:
+                raise ValueError("Number of samples must be greater than 0.")
+            if pdf:
+                return self.samples_array_with_pdfs(point, samples)
+            return self.samples_array(point, samples)
+
         if samples:
             samples = int(samples)
             if samples <= 0:
@@ -198,6 +213,68 @@ cdef class _TargettedSampler:
             results.append(self.sample_with_pdf(point))
         return results
 
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef np.ndarray samples_array(self, Point3D point, int samples):
+        """
+        Generates an array of samples.
+
+        If pdfs are required please see samples_array_with_pdfs().
+
+        :param Point3D point: The point from which to sample.
+        :param int samples: Number of samples to generate.
+        :return: An (N, 3) array of vector coordinates.
+        :rtype: ndarray
+        """
+
+        cdef:
+            np.ndarray results
+            double[:, ::1] results_mv
+            Vector3D sample
+            int i
+
+        results = np.empty((samples, 3), dtype=np.float64)
+        results_mv = results
+        for i in range(samples):
+            sample = self.sample(point)
+            results_mv[i, 0] = sample.x
+            results_mv[i, 1] = sample.y
+            results_mv[i, 2] = sample.z
+        return results
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef tuple samples_array_with_pdfs(self, Point3D point, int samples):
+        """
+        Generates an array of samples and an array of their associated pdfs.
+
+        :param Point3D point: The point from which to sample.
+        :param int samples: Number of samples to generate.
+        :return: A tuple of an (N, 3) array of vector coordinates and an (N,) array of pdfs.
+        :rtype: tuple
+        """
+
+        cdef:
+            np.ndarray results, pdfs
+            double[:, ::1] results_mv
+            double[::1] pdfs_mv
+            Vector3D sample
+            int i
+
+        results = np.empty((samples, 3), dtype=np.float64)
+        pdfs = np.empty(samples, dtype=np.float64)
+        results_mv = results
+        pdfs_mv = pdfs
+        for i in range(samples):
+            sample = self.sample(point)
+            results_mv[i, 0] = sample.x
+            results_mv[i, 1] = sample.y
+            results_mv[i, 2] = sample.z
+            pdfs_mv[i] = self.pdf(point, sample)
+        return results, pdfs
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
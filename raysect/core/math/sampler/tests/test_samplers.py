@@ -0,0 +1,119 @@
+# Copyright (c) 2014-2015, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Unit tests for the surface, solid angle and targetted samplers.
+"""
+
+import unittest
+import numpy as np
+from raysect.core.math import Point3D
+from raysect.core.math.random import seed
+from raysect.core.math.sampler import DiskSampler3D, RectangleSampler3D, TriangleSampler3D, SphereSampler, \
+    HemisphereUniformSampler, HemisphereCosineSampler, ConeUniformSampler, TargettedHemisphereSampler, \
+    TargettedSphereSampler, SobolSequence
+
+
+class TestSamplerArrays(unittest.TestCase):
+
+    samplers = [
+        DiskSampler3D(2.0),
+        RectangleSampler3D(2.0, 3.0),
+        TriangleSampler3D(Point3D(0, 0, 0), Point3D(1, 0, 0), Point3D(1, 1, 1)),
+        SphereSampler(),
+        HemisphereUniformSampler(),
+        HemisphereCosineSampler(),
+        ConeUniformSampler(20)
+    ]
+
+    def test_array_matches_list(self):
+
+        for sampler in self.samplers:
+
+            seed(10)
+            samples = sampler(50)
+            seed(10)
+            array = sampler(50, array=True)
+
+            self.assertEqual(array.shape, (50, 3))
+            np.testing.assert_array_equal(array, [(s.x, s.y, s.z) for s in samples],
+                                          err_msg="{} array samples do not match the list samples.".format(type(sampler).__name__))
+
+    def test_array_with_pdfs_matches_list(self):
+
+        for sampler in self.samplers:
+
+            seed(20)
+            samples = sampler(50, pdf=True)
+            seed(20)
+            array, pdfs = sampler(50, pdf=True, array=True)
+
+            self.assertEqual(array.shape, (50, 3))
+            self.assertEqual(pdfs.shape, (50, ))
+            np.testing.assert_array_equal(array, [(s.x, s.y, s.z) for s, _ in samples])
+            np.testing.assert_array_equal(pdfs, [pdf for _, pdf in samples],
+                                          err_msg="{} array pdfs do not match the list pdfs.".format(type(sampler).__name__))
+
+    def test_array_sequence(self):
+
+        sampler = RectangleSampler3D(1, 1)
+        sampler.sequence = SobolSequence()
+
+        points = sampler(16, array=True) + 0.5
+        cells = np.floor(points[:, 0] * 4).astype(int) * 4 + np.floor(points[:, 1] * 4).astype(int)
+        self.assertEqual(len(np.unique(cells)), 16, msg="Sequence sampler failed to stratify the array samples.")
+
+    def test_array_single(self):
+
+        self.assertEqual(DiskSampler3D()(array=True).shape, (1, 3))
+
+        with self.assertRaises(ValueError):
+            DiskSampler3D()(-1, array=True)
+
+    def test_targetted_array(self):
+
+        targets = [(Point3D(0, 0, 5), 1.0, 1.0), (Point3D(3, 0, 5), 0.5, 2.0)]
+        point = Point3D(0, 0, 0)
+
+        for sampler in (TargettedHemisphereSampler(targets), TargettedSphereSampler(targets)):
+
+            seed(30)
+            samples = sampler(point, 20, pdf=True)
+            seed(30)
+            array, pdfs = sampler(point, 20, pdf=True, array=True)
+
+            np.testing.assert_array_equal(array, [(s.x, s.y, s.z) for s, _ in samples])
+            np.testing.assert_array_equal(pdfs, [pdf for _, pdf in samples])
+
+            seed(30)
+            np.testing.assert_array_equal(sampler(point, 20, array=True), array)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,229 @@
+# Copyright (c) 2014-2015, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Unit tests for the low-discrepancy sample sequences.
+"""
+
+import unittest
+import numpy as np
+from raysect.core.math.random import seed
+from raysect.core.math.sampler import SobolSequence, HaltonSequence, RectangleSampler3D, HemisphereCosineSampler
+
+
+class TestSobolSequence(unittest.TestCase):
+
+    def assert_net(self, points, m, msg):
+        """
+        Checks the first 2**m 2D points form a (0, m, 2)-net in base 2.
+
+        Every elementary interval of area 2**-m must contain exactly one point.
+        """
+
+        for k in range(m + 1):
+            nx = 2 ** k
+            ny = 2 ** (m - k)
+            cells = np.floor(points[:, 0] * nx).astype(int) * ny + np.floor(points[:, 1] * ny).astype(int)
+            self.assertEqual(len(np.unique(cells)), 2 ** m, msg=msg)
+
+    def test_unscrambled_values(self):
+
+        sobol = SobolSequence(scramble=False)
+        points = sobol.generate(8, 3)
+
+        expected = [
+            [0.0, 0.0, 0.0],
+            [0.5, 0.5, 0.5],
+            [0.25, 0.75, 0.75],
+            [0.75, 0.25, 0.25],
+            [0.125, 0.625, 0.375],
+            [0.625, 0.125, 0.875],
+            [0.375, 0.375, 0.625],
+            [0.875, 0.875, 0.125]
+        ]
+
+        np.testing.assert_array_equal(points, expected)
+
+    def test_unscrambled_stratification(self):
+
+        # every dimension of the sequence is a (0, 1)-sequence in base 2
+        sobol = SobolSequence(scramble=False)
+        points = sobol.generate(256, 16)
+        for d in range(16):
+            cells = np.floor(points[:, d] * 256).astype(int)
+            self.assertEqual(len(np.unique(cells)), 256, msg="Sobol dimension {} is not stratified.".format(d))
+
+        self.assert_net(points[:, 0:2], 8, "The first two Sobol dimensions do not form a (0, 8, 2)-net.")
+
+    def test_scrambled_stratification(self):
+
+        # owen scrambling must preserve the net properties of each padded block of dimensions
+        sobol = SobolSequence()
+        for s in (0, 1, 12345678901234):
+            points = sobol.generate(256, 8, seed=s)
+            for d in range(8):
+                cells = np.floor(points[:, d] * 256).astype(int)
+                self.assertEqual(len(np.unique(cells)), 256, msg="Scrambled Sobol dimension {} is not stratified.".format(d))
+
+            for d in (0, 2, 4, 6):
+                self.assert_net(points[:, d:d + 2], 8, "Scrambled Sobol dimensions {} and {} do not form a net.".format(d, d + 1))
+
+    def test_scrambled_seeds(self):
+
+        sobol = SobolSequence()
+
+        a = sobol.generate(64, 4, seed=1)
+        b = sobol.generate(64, 4, seed=1)
+        c = sobol.generate(64, 4, seed=2)
+
+        np.testing.assert_array_equal(a, b, err_msg="Scrambled sequence is not reproducible.")
+        self.assertFalse(np.array_equal(a, c), msg="Different seeds produced the same scramble.")
+        self.assertTrue(np.all(a >= 0) and np.all(a < 1), msg="Sequence values out of range [0, 1).")
+
+        # the padded blocks must not repeat the same points
+        self.assertFalse(np.array_equal(sobol.generate(64, 8, seed=1)[:, 0:4], sobol.generate(64, 8, seed=1)[:, 4:8]))
+
+    def test_dimensions(self):
+
+        self.assertEqual(SobolSequence(scramble=False).max_dimensions, 16)
+        self.assertIsNone(SobolSequence().max_dimensions)
+
+        with self.assertRaises(ValueError):
+            SobolSequence(scramble=False).sample(0, 16)
+
+        with self.assertRaises(ValueError):
+            SobolSequence(scramble=False).generate(4, 17)
+
+        with self.assertRaises(ValueError):
+            SobolSequence().generate(0, 2)
+
+
+class TestHaltonSequence(unittest.TestCase):
+
+    def test_unscrambled_values(self):
+
+        halton = HaltonSequence(scramble=False)
+        points = halton.generate(5, 3)
+
+        expected = [
+            [0.0, 0.0, 0.0],
+            [1/2, 1/3, 1/5],
+            [1/4, 2/3, 2/5],
+            [3/4, 1/9, 3/5],
+            [1/8, 4/9, 4/5]
+        ]
+
+        np.testing.assert_allclose(points, expected, rtol=0, atol=1e-15)
+
+    def test_scrambled_stratification(self):
+
+        # nested digit scrambling must preserve the stratification in each base
+        halton = HaltonSequence()
+        bases = (2, 3, 5, 7, 11)
+        for s in (0, 7, 98765):
+            points = halton.generate(125, 5, seed=s)
+            self.assertTrue(np.all(points >= 0) and np.all(points < 1), msg="Sequence values out of range [0, 1).")
+            for d, b in enumerate(bases):
+                n = b ** int(np.log(125) / np.log(b) + 1e-9)
+                cells = np.floor(points[:n, d] * n).astype(int)
+                self.assertEqual(len(np.unique(cells)), n, msg="Scrambled Halton dimension {} is not stratified.".format(d))
+
+        np.testing.assert_array_equal(halton.generate(16, 4, seed=3), halton.generate(16, 4, seed=3))
+        self.assertFalse(np.array_equal(halton.generate(16, 4, seed=3), halton.generate(16, 4, seed=4)))
+
+    def test_dimensions(self):
+
+        self.assertEqual(HaltonSequence().max_dimensions, 64)
+
+        with self.assertRaises(ValueError):
+            HaltonSequence().sample(0, 64)
+
+
+class TestSequenceSamplers(unittest.TestCase):
+
+    def test_surface_sampler(self):
+
+        sampler = RectangleSampler3D(1, 1)
+        self.assertIsNone(sampler.sequence)
+
+        sampler.sequence = SobolSequence()
+        points = np.array([(p.x + 0.5, p.y + 0.5) for p in sampler(16)])
+
+        # 16 points of a (0, 4, 2)-net occupy every cell of a 4x4 grid
+        cells = np.floor(points[:, 0] * 4).astype(int) * 4 + np.floor(points[:, 1] * 4).astype(int)
+        self.assertEqual(len(np.unique(cells)), 16, msg="Sequence sampler failed to stratify the samples.")
+
+        # each call uses a new scramble, reproducible if the generator is seeded
+        seed(1)
+        a = [(p.x, p.y) for p in sampler(16)]
+        b = [(p.x, p.y) for p in sampler(16)]
+        seed(1)
+        c = [(p.x, p.y) for p in sampler(16)]
+        self.assertNotEqual(a, b)
+        self.assertEqual(a, c)
+
+        with self.assertRaises(TypeError):
+            sampler.sequence = "sobol"
+
+    def test_solid_angle_sampler(self):
+
+        sampler = HemisphereCosineSampler()
+        sampler.sequence = HaltonSequence()
+
+        samples = sampler(100, pdf=True)
+        self.assertEqual(len(samples), 100)
+        for vector, pdf in samples:
+            self.assertAlmostEqual(vector.length, 1.0, places=12)
+            self.assertTrue(vector.z >= 0)
+            self.assertAlmostEqual(pdf, vector.z / np.pi, places=12)
+
+        # the mean of z over the cosine weighted hemisphere is 2/3
+        sampler.sequence = SobolSequence()
+        estimate = np.mean([vector.z for vector in sampler(256)])
+        self.assertAlmostEqual(estimate, 2 / 3, delta=0.002)
+
+    def test_pseudo_random_unchanged(self):
+
+        # without a sequence the samplers consume the generator as before
+        sampler = RectangleSampler3D(2, 4)
+        seed(5)
+        a = [(p.x, p.y) for p in sampler(4)]
+
+        from raysect.core.math.random import uniform
+        seed(5)
+        b = []
+        for _ in range(4):
+            u1 = uniform()
+            u2 = uniform()
+            b.append((u1 * 2 - 1, u2 * 4 - 2))
+        self.assertEqual(a, b)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -32,7 +32,7 @@
 from raysect.core.boundingbox cimport BoundingBox3D
 from raysect.core.ray cimport Ray
 from raysect.core.math.point cimport Point3D
-from libc.stdint cimport int32_t
+from libc.stdint cimport int32_t, uint32_t
 
 # c-structure that represent a kd-tree node
 cdef struct kdnode:
@@ -43,6 +43,25 @@ cdef struct kdnode:
     int32_t *items      # array of item ids
 
 
+cdef union kdcompact_data:
+
+    float split         # split position (BRANCH)
+    uint32_t node       # index of node in the node array (LEAF)
+
+
+cdef struct kdcompact:
+
+    kdcompact_data data
+    uint32_t flags      # bits 0-1: axis (BRANCH) or 3 (LEAF), bits 2-31: upper index (BRANCH)
+
+
+cdef struct kdstack:
+
+    uint32_t id
+    double min_range
+    double max_range
+
+
 cdef struct edge:
 
     bint is_upper_edge
@@ -62,6 +81,9 @@ cdef class KDTree3DCore:
         kdnode *_nodes
         int32_t _allocated_nodes
         int32_t _next_node
+        kdcompact *_compact_nodes
+        int32_t *_leaf_items
+        bint _compact_traversal
         readonly BoundingBox3D bounds
         int32_t _max_depth
         int32_t _min_items
@@ -86,16 +108,36 @@ cdef class KDTree3DCore:
 
     cdef int32_t _new_node(self)
 
+    cdef void _compact(self) except *
+
     cpdef bint trace(self, Ray ray)
 
     cdef bint _trace(self, Ray ray)
 
-    cdef bint _trace_node(self, int32_t id, Ray ray, double min_range, double max_range)
+    cpdef bint trace_any(self, Ray ray)
+
+    cdef bint _trace_any(self, Ray ray)
 
-    cdef bint _trace_branch(self, int32_t id, Ray ray, double min_range, double max_range)
+    cdef bint _trace_compact(self, Ray ray, double min_range, double max_range, bint any_hit)
+
+    cdef bint _trace_node(self, int32_t id, Ray ray, double min_range, double max_range, bint any_hit)
+
+    cdef bint _trace_branch(self, int32_t id, Ray ray, double min_range, double max_range, bint any_hit)
 
     cdef bint _trace_leaf(self, int32_t id, Ray ray, double max_range)
 
+    cdef bint _trace_any_leaf(self, int32_t id, Ray ray)
+
+    cpdef bint is_contained(self, Point3D point)
+
+    cdef bint _is_contained(self, Point3D point)
+
+    cdef bint _is_contained_node(self, int32_t id, Point3D point)
+
+    cdef bint _is_contained_branch(self, int32_t id, Point3D point)
+
+    cdef bint _is_contained_leaf(self, int32_t id, Point3D point)
+
     cpdef list items_containing(self, Point3D point)
 
     cdef list _items_containing(self, Point3D point)
@@ -119,6 +161,10 @@ cdef class KDTree3D(KDTree3DCore):
 
     cpdef bint _trace_items(self, list items, Ray ray, double max_range)
 
+    cdef bint _is_contained_leaf(self, int32_t id, Point3D point)
+
+    cpdef bint _is_contained_items(self, list items, Point3D point)
+
     cdef list _items_containing_leaf(self, int32_t id, Point3D point)
 
     cpdef list _items_containing_items(self, list items, Point3D point)
\ No newline at end of file
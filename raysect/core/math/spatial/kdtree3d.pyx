@@ -33,10 +33,11 @@ import io
 import struct
 
 from raysect.core.boundingbox cimport new_boundingbox3d
+from raysect.core.statistics cimport RAYSECT_STATISTICS, count_event, KDTREE_NODES
 from cpython.mem cimport PyMem_Malloc, PyMem_Realloc, PyMem_Free
 from cpython.bytes cimport PyBytes_AsString
 from libc.stdlib cimport qsort
-from libc.stdint cimport int32_t
+from libc.stdint cimport int32_t, uint32_t
 from libc.math cimport log, ceil
 cimport cython
 
@@ -52,6 +53,12 @@ DEF X_AXIS = 0  # branch, x-axis split
 DEF Y_AXIS = 1  # branch, y-axis split
 DEF Z_AXIS = 2  # branch, z-axis split
 
+# compact node type flag, the branch flags are the axis index
+DEF COMPACT_LEAF = 3
+
+# size of the explicit stack used by the iterative traversal, limits the tree depth
+DEF STACK_SIZE = 64
+
 
 cdef class Item3D:
     """
@@ -116,6 +123,9 @@ cdef class KDTree3DCore:
         self._nodes = NULL
         self._allocated_nodes = 0
         self._next_node = 0
+        self._compact_nodes = NULL
+        self._leaf_items = NULL
+        self._compact_traversal = False
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -147,6 +157,7 @@ cdef class KDTree3DCore:
 
         # start build
         self._build(items, self.bounds)
+        self._compact()
 
     def __getstate__(self):
         state = io.BytesIO()
@@ -159,6 +170,31 @@ cdef class KDTree3DCore:
     def __reduce__(self):
         return self.__new__, (self.__class__, ), self.__getstate__()
 
+    @property
+    def compact_traversal(self):
+        """
+        True if rays traverse the tree using the compact node layout.
+
+        The compact layout encodes each node in 8 bytes and is traversed
+        iteratively with an explicit stack, rather than by recursion. Trees
+        with split positions that are not representable in single precision,
+        such as trees loaded from files saved by earlier versions, are
+        traversed recursively.
+
+        Setting this attribute to False forces the recursive traversal, this
+        is intended for benchmarking.
+
+        :rtype: bool
+        """
+        return self._compact_traversal
+
+    @compact_traversal.setter
+    def compact_traversal(self, bint value):
+
+        if value and self._compact_nodes == NULL:
+            raise ValueError("The kd-tree does not have a compact node layout.")
+        self._compact_traversal = value
+
     cdef int32_t _build(self, list items, BoundingBox3D bounds, int32_t depth=0):
         """
         Extends the kd-Tree by creating a new node.
@@ -244,7 +280,8 @@ cdef class KDTree3DCore:
 
                 # a split on the node boundary serves no useful purpose
                 # only consider edges that lie inside the node bounds
-                split = edges[index].value
+                # splits are rounded to single precision so they are exactly represented by the compact nodes
+                split = <float> edges[index].value
                 if bounds.lower.get_index(axis) < split < bounds.upper.get_index(axis):
 
                     # calculate surface area of split volumes
@@ -481,6 +518,80 @@ cdef class KDTree3DCore:
         self._next_node += 1
         return id
 
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef void _compact(self) except *:
+        """
+        Generates the compact node layout used by the iterative traversal.
+
+        The leaf item ids are gathered into a single contiguous array and each
+        node is encoded in 8 bytes: the split position (as a float) or leaf node
+        index, followed by a flags word holding the axis or leaf flag and the
+        index of the upper child. The lower child is always the next node.
+
+        If the tree cannot be represented, the compact layout is not generated
+        and the recursive traversal is used.
+        """
+
+        cdef:
+            int32_t id, index, total, offset
+            int32_t *items
+            kdcompact *nodes
+
+        self._compact_traversal = False
+        if self._next_node == 0:
+            return
+
+        # gather the leaf items into a contiguous array, the leaves are re-pointed into the new array
+        total = 0
+        for id in range(self._next_node):
+            if self._nodes[id].type == LEAF:
+                total += self._nodes[id].count
+
+        if total > 0:
+
+            items = <int32_t *> PyMem_Malloc(sizeof(int32_t) * total)
+            if not items:
+                raise MemoryError()
+
+            offset = 0
+            for id in range(self._next_node):
+                if self._nodes[id].type == LEAF and self._nodes[id].count > 0:
+                    for index in range(self._nodes[id].count):
+                        items[offset + index] = self._nodes[id].items[index]
+                    PyMem_Free(self._nodes[id].items)
+                    self._nodes[id].items = items + offset
+                    offset += self._nodes[id].count
+
+            self._leaf_items = items
+
+        # the traversal stack limits the tree depth and 30 bits are available for the node indices
+        if self._max_depth >= STACK_SIZE or self._next_node >= (1 << 30):
+            return
+
+        nodes = <kdcompact *> PyMem_Malloc(sizeof(kdcompact) * self._next_node)
+        if not nodes:
+            raise MemoryError()
+
+        for id in range(self._next_node):
+
+            if self._nodes[id].type == LEAF:
+                nodes[id].data.node = id
+                nodes[id].flags = COMPACT_LEAF
+
+            else:
+
+                # the split must survive conversion to single precision, otherwise the traversal would be inexact
+                if <double> (<float> self._nodes[id].split) != self._nodes[id].split:
+                    PyMem_Free(nodes)
+                    return
+
+                nodes[id].data.split = <float> self._nodes[id].split
+                nodes[id].flags = (<uint32_t> self._nodes[id].count << 2) | <uint32_t> self._nodes[id].type
+
+        self._compact_nodes = nodes
+        self._compact_traversal = True
+
     cpdef bint trace(self, Ray ray):
         """
         Traverses the kd-Tree to find the first intersection with an item stored in the tree.
@@ -511,9 +622,160 @@ cdef class KDTree3DCore:
             return False
 
         # start exploration of kd-Tree
-        return self._trace_node(ROOT_NODE, ray, min_range, max_range)
+        if self._compact_traversal:
+            return self._trace_compact(ray, min_range, max_range, False)
+        return self._trace_node(ROOT_NODE, ray, min_range, max_range, False)
 
-    cdef bint _trace_node(self, int32_t id, Ray ray, double min_range, double max_range):
+    cpdef bint trace_any(self, Ray ray):
+        """
+        Traverses the kd-Tree to find any intersection with an item stored in the tree.
+
+        Unlike trace(), the intersection found need not be the closest to the
+        ray origin. The traversal terminates as soon as any leaf reports an
+        intersection within the ray's maximum distance, which makes this the
+        cheaper query when only the visibility along the ray is required.
+
+        :param ray: A Ray object.
+        :return: True is an intersection occurs, false otherwise.
+        """
+
+        return self._trace_any(ray)
+
+    cdef bint _trace_any(self, Ray ray):
+        """
+        Starts the any-hit ray traversal of the kd tree.
+
+        :param ray: A Ray object.
+        :return: True is a hit occurs, false otherwise.
+        """
+
+        cdef:
+            bint hit
+            double min_range, max_range
+
+        # check tree bounds
+        hit = self.bounds.intersect(ray, &min_range, &max_range)
+        if not hit or min_range > ray.max_distance:
+            return False
+
+        # nodes beyond the ray's maximum distance cannot occlude the ray
+        max_range = min(max_range, ray.max_distance)
+
+        # start exploration of kd-Tree
+        if self._compact_traversal:
+            return self._trace_compact(ray, min_range, max_range, True)
+        return self._trace_node(ROOT_NODE, ray, min_range, max_range, True)
+
+    @cython.cdivision(True)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef bint _trace_compact(self, Ray ray, double min_range, double max_range, bint any_hit):
+        """
+        Iteratively traverses the compact kd-Tree nodes along the ray path.
+
+        Performs the same front-to-back traversal as _trace_node(). The far
+        nodes that must be visited if the near node does not contain an
+        intersection are held on an explicit stack.
+
+        :param ray: Ray object.
+        :param min_range: The minimum intersection search range.
+        :param max_range: The maximum intersection search range.
+        :param any_hit: If True, leaves are tested for any intersection rather than the closest.
+        :return: True is a hit occurs, false otherwise.
+        """
+
+        cdef:
+            kdstack stack[STACK_SIZE]
+            int32_t top
+            uint32_t id, axis, near_id, far_id
+            double origin[3]
+            double direction[3]
+            double split, plane_distance
+            bint below_split
+            kdcompact *node
+
+        origin[0] = ray.origin.x
+        origin[1] = ray.origin.y
+        origin[2] = ray.origin.z
+
+        direction[0] = ray.direction.x
+        direction[1] = ray.direction.y
+        direction[2] = ray.direction.z
+
+        top = 0
+        id = ROOT_NODE
+        while True:
+
+            node = &self._compact_nodes[id]
+            axis = node.flags & 3
+
+            if RAYSECT_STATISTICS:
+                count_event(KDTREE_NODES, 1)
+
+            if axis == COMPACT_LEAF:
+
+                if any_hit:
+                    if self._trace_any_leaf(node.data.node, ray):
+                        return True
+                elif self._trace_leaf(node.data.node, ray, max_range):
+                    return True
+
+                # no intersection in this leaf, resume with the next far node
+                if top == 0:
+                    return False
+
+                top -= 1
+                id = stack[top].id
+                min_range = stack[top].min_range
+                max_range = stack[top].max_range
+                continue
+
+            # the lower node is always the next node, the upper node index is stored in the flags
+            split = node.data.split
+
+            # is the ray propagating parallel to the split plane?
+            if direction[axis] == 0:
+
+                if origin[axis] < split:
+                    id = id + 1
+                else:
+                    id = node.flags >> 2
+                continue
+
+            # ray propagation is not parallel to split plane
+            plane_distance = (split - origin[axis]) / direction[axis]
+
+            # does the ray origin sit below the split
+            below_split = origin[axis] < split or (origin[axis] == split and direction[axis] < 0)
+
+            # identify the order in which the ray will interact with the nodes
+            if below_split:
+                near_id = id + 1
+                far_id = node.flags >> 2
+            else:
+                near_id = node.flags >> 2
+                far_id = id + 1
+
+            # does ray only intersect with the near node?
+            if plane_distance > max_range or plane_distance <= 0:
+                id = near_id
+                continue
+
+            # does ray only intersect with the far node?
+            if plane_distance < min_range:
+                id = far_id
+                continue
+
+            # ray must intersect both nodes, defer the far node and visit the nearest node first
+            stack[top].id = far_id
+            stack[top].min_range = plane_distance
+            stack[top].max_range = max_range
+            top += 1
+
+            id = near_id
+            max_range = plane_distance
+
+    cdef bint _trace_node(self, int32_t id, Ray ray, double min_range, double max_range, bint any_hit):
         """
         Dispatches trace calculation to the relevant node handler.
 
@@ -521,16 +783,22 @@ cdef class KDTree3DCore:
         :param ray: Ray object.
         :param min_range: The minimum intersection search range.
         :param max_range: The maximum intersection search range.
+        :param any_hit: If True, leaves are tested for any intersection rather than the closest.
         :return: True is a hit occurs, false otherwise.
         """
 
+        if RAYSECT_STATISTICS:
+            count_event(KDTREE_NODES, 1)
+
         if self._nodes[id].type == LEAF:
+            if any_hit:
+                return self._trace_any_leaf(id, ray)
             return self._trace_leaf(id, ray, max_range)
         else:
-            return self._trace_branch(id, ray, min_range, max_range)
+            return self._trace_branch(id, ray, min_range, max_range, any_hit)
 
     @cython.cdivision(True)
-    cdef bint _trace_branch(self, int32_t id, Ray ray, double min_range, double max_range):
+    cdef bint _trace_branch(self, int32_t id, Ray ray, double min_range, double max_range, bint any_hit):
         """
         Traverses a kd-Tree branch node along the ray path.
 
@@ -538,6 +806,7 @@ cdef class KDTree3DCore:
         :param ray: Ray object.
         :param min_range: The minimum intersection search range.
         :param max_range: The maximum intersection search range.
+        :param any_hit: If True, leaves are tested for any intersection rather than the closest.
         :return: True is a hit occurs, false otherwise.
         """
 
@@ -569,9 +838,9 @@ cdef class KDTree3DCore:
 
             # a ray propagating parallel to the split plane
             if origin < split:
-                return self._trace_node(lower_id, ray, min_range, max_range)
+                return self._trace_node(lower_id, ray, min_range, max_range, any_hit)
             else:
-                return self._trace_node(upper_id, ray, min_range, max_range)
+                return self._trace_node(upper_id, ray, min_range, max_range, any_hit)
 
         else:
 
@@ -591,20 +860,20 @@ cdef class KDTree3DCore:
 
             # does ray only intersect with the near node?
             if plane_distance > max_range or plane_distance <= 0:
-                return self._trace_node(near_id, ray, min_range, max_range)
+                return self._trace_node(near_id, ray, min_range, max_range, any_hit)
 
             # does ray only intersect with the far node?
             if plane_distance < min_range:
-                return self._trace_node(far_id, ray, min_range, max_range)
+                return self._trace_node(far_id, ray, min_range, max_range, any_hit)
 
             # ray must intersect both nodes, try nearest node first
             # note: this could theoretically be an OR operation, but we don't
             # want to risk an optimiser inverting the logic (paranoia!)
-            hit = self._trace_node(near_id, ray, min_range, plane_distance)
+            hit = self._trace_node(near_id, ray, min_range, plane_distance, any_hit)
             if hit:
                 return True
             else:
-                return self._trace_node(far_id, ray, plane_distance, max_range)
+                return self._trace_node(far_id, ray, plane_distance, max_range, any_hit)
 
     cdef bint _trace_leaf(self, int32_t id, Ray ray, double max_range):
         """
@@ -629,6 +898,113 @@ cdef class KDTree3DCore:
         # virtual function that must be implemented by derived classes
         raise NotImplementedError("KDTree3DCore _trace_leaf() method not implemented.")
 
+    cdef bint _trace_any_leaf(self, int32_t id, Ray ray):
+        """
+        Tests the items in the kd-Tree leaf node to identify if any intersection occurs.
+
+        Used by the any-hit traversal. This method must return True as soon as
+        an intersection is found anywhere within the ray's maximum distance and
+        False otherwise. Derived classes may override this method to skip the
+        search for the closest intersection.
+
+        By default the leaf is tested with _trace_leaf().
+
+        :param id: Index of node in node array.
+        :param ray: Ray object.
+        :return: True is a hit occurs, false otherwise.
+        """
+
+        return self._trace_leaf(id, ray, ray.max_distance)
+
+    cpdef bint is_contained(self, Point3D point):
+        """
+        Traverses the kd-Tree to identify if the point is contained by an item.
+
+        :param Point3D point: A Point3D object.
+        :return: True if the point lies inside an item, false otherwise.
+        """
+
+        return self._is_contained(point)
+
+    cdef bint _is_contained(self, Point3D point):
+        """
+        Starts contains traversal of the kd-Tree.
+
+        :param point: A Point3D object.
+        :return: True if the point lies inside an item, false otherwise.
+        """
+
+        # exit early if point is not inside bounds of the kd-Tree
+        if not self.bounds.contains(point):
+            return False
+
+        # start search
+        return self._is_contained_node(ROOT_NODE, point)
+
+    cdef bint _is_contained_node(self, int32_t id, Point3D point):
+        """
+        Dispatches contains point look-ups to the relevant node handler.
+
+        :param id: Index of node in node array.
+        :param point: Point3D to evaluate.
+        :return: True if the point lies inside an item, false otherwise.
+        """
+
+        if self._nodes[id].type == LEAF:
+            return self._is_contained_leaf(id, point)
+        else:
+            return self._is_contained_branch(id, point)
+
+    cdef bint _is_contained_branch(self, int32_t id, Point3D point):
+        """
+        Locates the kd-Tree node containing the point.
+
+        :param id: Index of node in node array.
+        :param point: Point3D to evaluate.
+        :return: True if the point lies inside an item, false otherwise.
+        """
+
+        cdef:
+            int32_t axis
+            double split
+            int32_t lower_id, upper_id
+
+        # unpack branch kdnode
+        # notes:
+        #  * the branch type enumeration is the same as axis index
+        #  * the lower_id is always the next node in the array
+        #  * the upper_id is stored in the count attribute
+        axis = self._nodes[id].type
+        split = self._nodes[id].split
+        lower_id = id + 1
+        upper_id = self._nodes[id].count
+
+        if point.get_index(axis) < split:
+            return self._is_contained_node(lower_id, point)
+        else:
+            return self._is_contained_node(upper_id, point)
+
+    cdef bint _is_contained_leaf(self, int32_t id, Point3D point):
+        """
+        Tests each item in the node to identify if they enclose the point.
+
+        This is a virtual method and must be implemented in a derived class if
+        the identification of an item enclosing a point is required. This method
+        must return True is the point lies inside an item or False otherwise.
+
+        Derived classes may need to wish to return additional information about
+        the enclosing item(s). This can be done by setting object attributes
+        prior to returning. Any attributes set when _is_contained_leaf() returns
+        are guaranteed not to be further modified.
+
+        :param id: Index of node in node array.
+        :param point: Point3D to evaluate.
+        :return: True if the point lies inside an item, false otherwise.
+        """
+
+        # virtual function that must be implemented by derived classes
+        raise NotImplementedError("KDTree3DCore _is_contained_leaf() method not implemented.")
+
     cpdef list items_containing(self, Point3D point):
         """
         Starts contains traversal of the kd-Tree.
@@ -730,10 +1106,16 @@ cdef class KDTree3DCore:
             int32_t index
             kdnode *node
 
-        # free all leaf node item arrays
-        for index in range(self._next_node):
-            if self._nodes[index].type == LEAF and self._nodes[index].count > 0:
-                PyMem_Free(self._nodes[index].items)
+        # free all leaf node item arrays, compacted leaves share a single array
+        if self._leaf_items != NULL:
+            PyMem_Free(self._leaf_items)
+        else:
+            for index in range(self._next_node):
+                if self._nodes[index].type == LEAF and self._nodes[index].count > 0:
+                    PyMem_Free(self._nodes[index].items)
+
+        # free the compact nodes
+        PyMem_Free(self._compact_nodes)
 
         # free the nodes
         PyMem_Free(self._nodes)
@@ -742,6 +1124,9 @@ cdef class KDTree3DCore:
         self._nodes = NULL
         self._allocated_nodes = 0
         self._next_node = 0
+        self._compact_nodes = NULL
+        self._leaf_items = NULL
+        self._compact_traversal = False
 
     def __dealloc__(self):
         """
@@ -886,6 +1271,8 @@ cdef class KDTree3DCore:
                 self._nodes[id].split = self._read_double(file)
                 self._nodes[id].count = self._read_int32(file)
 
+        self._compact()
+
         # if we opened a file, we should close it
         if close:
             file.close()
@@ -958,6 +1345,49 @@ cdef class KDTree3D(KDTree3DCore):
         raise NotImplementedError("KDTree3D Virtual function _trace_items() has not been implemented.")
 
 
+    cdef bint _is_contained_leaf(self, int32_t id, Point3D point):
+        """
+        Wraps the C-level API so users can derive a class from KDTree3D using Python.
+
+        Converts the arguments to types accessible from Python and re-exposes
+        _is_contained_leaf() as the Python accessible method _is_contained_items().
+
+        :param id: Index of node in node array.
+        :param point: Point3D to evaluate.
+        :return: True if the point lies inside an item, false otherwise.
+        """
+
+        cdef:
+            int32_t index
+            list items
+
+        # convert list of items in C-array into a list
+        items = []
+        for index in range(self._nodes[id].count):
+            items.append(self._nodes[id].items[index])
+
+        return self._is_contained_items(items, point)
+
+    cpdef bint _is_contained_items(self, list item_ids, Point3D point):
+        """
+        Tests each item in the list to identify if any enclose the point.
+
+        This is a virtual method and must be implemented in a derived class if
+        the identification of an item enclosing a point is required. This method
+        must return True is the point lies inside an item or False otherwise.
+
+        Derived classes may need to wish to return additional information about
+        the enclosing item(s). This can be done by setting object attributes
+        prior to returning. Any attributes set when _is_contained_items()
+        returns are guaranteed not to be further modified.
+
+        :param item_ids: List of item ids.
+        :param point: Point3D to evaluate.
+        :return: True if the point lies inside an item, false otherwise.
+        """
+
+        raise NotImplementedError("KDTree3D Virtual function _is_contained_items() has not been implemented.")
+
     cdef list _items_containing_leaf(self, int32_t id, Point3D point):
         """
         Wraps the C-level API so users can derive a class from KDTree3D using Python.
@@ -32,7 +32,7 @@ Unit tests for the core functions of the pseudo random number generator.
 """
 
 import unittest
-from raysect.core.math.random import seed, uniform
+from raysect.core.math.random import seed, uniform, normal, seed_stream, clear_stream, _test_philox4x32
 
 # generated with seed(1234567890)
 _random_reference = [
@@ -251,3 +251,70 @@ class TestRandom(unittest.TestCase):
             self.assertEqual(uniform(), v, msg="Random failed to reproduce the reference data.")
 
 
+class TestRandomStream(unittest.TestCase):
+
+    def tearDown(self):
+        clear_stream()
+
+    def test_philox_known_answers(self):
+        """
+        Tests the Philox-4x32-10 bijection against the Random123 known answer vectors.
+        """
+
+        self.assertEqual(
+            _test_philox4x32((0, 0, 0, 0), (0, 0)),
+            (0x6627e8d5, 0xe169c58d, 0xbc57ac4c, 0x9b00dbd8)
+        )
+
+        self.assertEqual(
+            _test_philox4x32((0xffffffff, 0xffffffff, 0xffffffff, 0xffffffff), (0xffffffff, 0xffffffff)),
+            (0x408f276d, 0x41c83b0e, 0xa20bc7c6, 0x6d5451fd)
+        )
+
+        self.assertEqual(
+            _test_philox4x32((0x243f6a88, 0x85a308d3, 0x13198a2e, 0x03707344), (0xa4093822, 0x299f31d0)),
+            (0xd16cfe09, 0x94fdcceb, 0x5001e420, 0x24126ea1)
+        )
+
+    def test_stream_reproducible(self):
+
+        seed_stream(12345, 678)
+        reference = [uniform() for _ in range(100)] + [normal(0, 1) for _ in range(10)]
+
+        seed_stream(12345, 678)
+        values = [uniform() for _ in range(100)] + [normal(0, 1) for _ in range(10)]
+
+        self.assertEqual(values, reference, msg="Random stream failed to reproduce the sequence.")
+
+    def test_stream_independence(self):
+
+        seed_stream(12345, 678)
+        reference = [uniform() for _ in range(10)]
+
+        seed_stream(12345, 679)
+        self.assertNotEqual([uniform() for _ in range(10)], reference, msg="Different stream ids generated the same sequence.")
+
+        seed_stream(12346, 678)
+        self.assertNotEqual([uniform() for _ in range(10)], reference, msg="Different seeds generated the same sequence.")
+
+    def test_stream_range(self):
+
+        seed_stream(0, 0)
+        for _ in range(10000):
+            v = uniform()
+            self.assertTrue(0 <= v < 1, msg="Random stream generated a value outside the range [0, 1).")
+
+    def test_clear_stream(self):
+        """
+        The Mersenne Twister sequence must resume unaffected once the stream is cleared.
+        """
+
+        seed(1234567890)
+        self.assertEqual(uniform(), _random_reference[0])
+
+        seed_stream(1, 2)
+        uniform()
+        clear_stream()
+
+        self.assertEqual(uniform(), _random_reference[1])
+
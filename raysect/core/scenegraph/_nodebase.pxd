@@ -31,6 +31,18 @@
 
 from raysect.core.math.affinematrix cimport AffineMatrix3D
 
+
+# classification of a root transform, identifies transforms that allow the transform arithmetic to be reduced
+cdef enum TransformClass:
+    TRANSFORM_IDENTITY = 0
+    TRANSFORM_TRANSLATION = 1
+    TRANSFORM_AFFINE = 2
+    TRANSFORM_GENERAL = 3
+
+
+cdef TransformClass classify_transform(AffineMatrix3D m)
+
+
 cdef class _NodeBase:
 
     cdef str _name
@@ -40,6 +52,7 @@ cdef class _NodeBase:
     cdef AffineMatrix3D _transform
     cdef readonly AffineMatrix3D _root_transform
     cdef readonly AffineMatrix3D _root_transform_inverse
+    cdef TransformClass _root_transform_class
     cdef bint _track_modifications
     cdef public dict meta
 
@@ -33,6 +33,33 @@ from raysect.core.scenegraph.signal import GEOMETRY
 from raysect.core.scenegraph.signal cimport ChangeSignal
 
 
+cdef TransformClass classify_transform(AffineMatrix3D m):
+    """
+    Classifies an affine matrix by the arithmetic required to apply it.
+
+    Identity transforms leave points and vectors unchanged and translations
+    only offset points. Affine transforms have a bottom row of (0, 0, 0, 1)
+    so the homogeneous coordinate of a transformed point is always one. Any
+    other matrix requires the full homogeneous transform.
+
+    :param AffineMatrix3D m: The matrix to classify.
+    :return: The transform class.
+    """
+
+    if m.m[3][0] != 0.0 or m.m[3][1] != 0.0 or m.m[3][2] != 0.0 or m.m[3][3] != 1.0:
+        return TRANSFORM_GENERAL
+
+    if (m.m[0][0] != 1.0 or m.m[0][1] != 0.0 or m.m[0][2] != 0.0 or
+        m.m[1][0] != 0.0 or m.m[1][1] != 1.0 or m.m[1][2] != 0.0 or
+        m.m[2][0] != 0.0 or m.m[2][1] != 0.0 or m.m[2][2] != 1.0):
+        return TRANSFORM_AFFINE
+
+    if m.m[0][3] != 0.0 or m.m[1][3] != 0.0 or m.m[2][3] != 0.0:
+        return TRANSFORM_TRANSLATION
+
+    return TRANSFORM_IDENTITY
+
+
 cdef class _NodeBase:
     """
     The base class from which all scene-graph objects are derived.
@@ -51,6 +78,7 @@ cdef class _NodeBase:
         self._transform = AffineMatrix3D()
         self._root_transform = AffineMatrix3D()
         self._root_transform_inverse = AffineMatrix3D()
+        self._root_transform_class = TRANSFORM_IDENTITY
         self._track_modifications = True
 
         # user meta data dictionary
@@ -103,6 +131,7 @@ cdef class _NodeBase:
             # this node is now a root node
             self._root_transform = AffineMatrix3D()
             self._root_transform_inverse = AffineMatrix3D()
+            self._root_transform_class = TRANSFORM_IDENTITY
 
             # report root transforms have changed
             if self._track_modifications:
@@ -121,6 +150,7 @@ cdef class _NodeBase:
             # update root transforms
             self._root_transform = (<_NodeBase> self._parent)._root_transform.mul(self._transform)
             self._root_transform_inverse = self._root_transform.inverse()
+            self._root_transform_class = classify_transform(self._root_transform_inverse)
 
             # report root transforms have changed
             if self._track_modifications:
@@ -29,8 +29,10 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
-from raysect.core.scenegraph._nodebase cimport _NodeBase
+from raysect.core.scenegraph._nodebase cimport _NodeBase, TRANSFORM_IDENTITY, TRANSFORM_TRANSLATION, TRANSFORM_AFFINE
 from raysect.core.math.affinematrix cimport AffineMatrix3D
+from raysect.core.math.point cimport Point3D
+from raysect.core.math.vector cimport Vector3D
 
 cdef class Node(_NodeBase):
 
@@ -39,3 +41,7 @@ cdef class Node(_NodeBase):
     cpdef AffineMatrix3D to_local(self)
 
     cpdef AffineMatrix3D to_root(self)
+
+    cdef int _point_to_local(self, Point3D point, Point3D local_point) except -1
+
+    cdef void _vector_to_local(self, Vector3D vector, Vector3D local_vector)
@@ -179,6 +179,74 @@ cdef class Node(_NodeBase):
         """
         return self._root_transform_inverse
 
+    cdef int _point_to_local(self, Point3D point, Point3D local_point) except -1:
+        """
+        Transforms a world space point into this node's local coordinate space.
+
+        The result is written into the supplied point, avoiding the allocation
+        of a new object in the hot ray intersection paths. The transform
+        arithmetic is skipped or reduced if the node's root transform is an
+        identity or translation. The point may be passed as its own result.
+
+        :param Point3D point: The world space point.
+        :param Point3D local_point: The point that receives the local space coordinates.
+        """
+
+        cdef:
+            AffineMatrix3D m = self._root_transform_inverse
+            double x = point.x, y = point.y, z = point.z
+            Point3D result
+
+        if self._root_transform_class == TRANSFORM_IDENTITY:
+            local_point.x = x
+            local_point.y = y
+            local_point.z = z
+
+        elif self._root_transform_class == TRANSFORM_TRANSLATION:
+            local_point.x = x + m.m[0][3]
+            local_point.y = y + m.m[1][3]
+            local_point.z = z + m.m[2][3]
+
+        elif self._root_transform_class == TRANSFORM_AFFINE:
+            local_point.x = m.m[0][0] * x + m.m[0][1] * y + m.m[0][2] * z + m.m[0][3]
+            local_point.y = m.m[1][0] * x + m.m[1][1] * y + m.m[1][2] * z + m.m[1][3]
+            local_point.z = m.m[2][0] * x + m.m[2][1] * y + m.m[2][2] * z + m.m[2][3]
+
+        else:
+            result = point.transform(m)
+            local_point.x = result.x
+            local_point.y = result.y
+            local_point.z = result.z
+
+        return 0
+
+    cdef void _vector_to_local(self, Vector3D vector, Vector3D local_vector):
+        """
+        Transforms a world space vector into this node's local coordinate space.
+
+        The result is written into the supplied vector, avoiding the allocation
+        of a new object in the hot ray intersection paths. Identity and
+        translation transforms leave the vector unchanged. The vector may be
+        passed as its own result.
+
+        :param Vector3D vector: The world space vector.
+        :param Vector3D local_vector: The vector that receives the local space components.
+        """
+
+        cdef:
+            AffineMatrix3D m = self._root_transform_inverse
+            double x = vector.x, y = vector.y, z = vector.z
+
+        if self._root_transform_class == TRANSFORM_IDENTITY or self._root_transform_class == TRANSFORM_TRANSLATION:
+            local_vector.x = x
+            local_vector.y = y
+            local_vector.z = z
+
+        else:
+            local_vector.x = m.m[0][0] * x + m.m[0][1] * y + m.m[0][2] * z
+            local_vector.y = m.m[1][0] * x + m.m[1][1] * y + m.m[1][2] * z
+            local_vector.z = m.m[2][0] * x + m.m[2][1] * y + m.m[2][2] * z
+
     cpdef AffineMatrix3D to_root(self):
         """
         Returns an affine transform from local space into the parent node's
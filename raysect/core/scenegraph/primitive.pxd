@@ -42,11 +42,16 @@ from raysect.core.boundingsphere cimport BoundingSphere3D
 cdef class Primitive(Node):
 
     cdef Material _material
+    cdef Intersection _pending_intersection
 
     cdef Material get_material(self)
 
     cpdef Intersection hit(self, Ray ray)
 
+    cpdef double hit_distance(self, Ray ray) except? -1
+
+    cpdef Intersection materialise_intersection(self)
+
     cpdef Intersection next_intersection(self)
 
     cpdef bint contains(self, Point3D p) except -1
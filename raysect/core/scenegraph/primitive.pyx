@@ -31,6 +31,9 @@
 
 from raysect.core.scenegraph.signal import GEOMETRY, MATERIAL
 
+# cython doesn't have a built-in infinity constant, this compiles to +infinity
+DEF INFINITY = 1e999
+
 
 cdef class Primitive(Node):
     """
@@ -102,6 +105,52 @@ cdef class Primitive(Node):
 
         raise NotImplementedError("Primitive surface has not been defined. Virtual method hit() has not been implemented.")
 
+    cpdef double hit_distance(self, Ray ray) except? -1:
+        """
+        Calculates the distance along the Ray to the closest intersection with
+        the Primitive surface, if such an intersection exists.
+
+        This is the first half of a deferred intersection test. Only the ray
+        distance is returned, the full Intersection object for the hit is only
+        constructed if materialise_intersection() is subsequently called.
+        Accelerators use this split to avoid building Intersection objects for
+        candidate primitives that are not the closest to the ray origin.
+
+        After a call to hit_distance(), next_intersection() behaves as if hit()
+        had been called.
+
+        The default implementation calls hit() and holds the returned
+        Intersection until it is requested with materialise_intersection().
+        Derived classes should override both methods to defer the construction
+        of the Intersection object.
+
+        :param Ray ray: The ray to test for intersection.
+        :return: The distance to the intersection or infinity if no intersection occurs.
+        :rtype: float
+        """
+
+        self._pending_intersection = self.hit(ray)
+        if self._pending_intersection is None:
+            return INFINITY
+        return self._pending_intersection.ray_distance
+
+    cpdef Intersection materialise_intersection(self):
+        """
+        Returns the Intersection found by the last call to hit_distance().
+
+        This method may only be called following a call to hit_distance(). If
+        hit_distance() did not find an intersection, or the intersection has
+        already been materialised, None is returned.
+
+        :rtype: Intersection
+        """
+
+        cdef Intersection intersection
+
+        intersection = self._pending_intersection
+        self._pending_intersection = None
+        return intersection
+
     cpdef Intersection next_intersection(self):
         """
         Virtual method - to be implemented by derived classes.
@@ -29,8 +29,8 @@
 
 import unittest
 from raysect.core.scenegraph import Primitive, Node
-from raysect.core.math import Point3D, AffineMatrix3D, translate
-from raysect.core import Material, Ray
+from raysect.core.math import Point3D, Vector3D, AffineMatrix3D, translate
+from raysect.core import Material, Ray, Intersection, Normal3D
 
 # TODO: Port to Cython to allow testing of the Cython API and allow access to internal structures
 # TODO: Add tests for functionality inherited from Node.
@@ -116,6 +116,36 @@ class TestPrimitive(unittest.TestCase):
         with self.assertRaises(NotImplementedError, msg="Virtual method did not raise NotImplementedError exception when called."):
             n.hit(Ray())
 
+    def test_hit_distance(self):
+        """Method hit_distance() calls the virtual hit() method by default and should raise an exception if called."""
+
+        n = Primitive()
+
+        with self.assertRaises(NotImplementedError, msg="Virtual method did not raise NotImplementedError exception when called."):
+            n.hit_distance(Ray())
+
+    def test_deferred_intersection_fallback(self):
+        """Primitives implementing only hit() support the deferred intersection methods."""
+
+        class HitOnly(Primitive):
+
+            def hit(self, ray):
+                if ray.direction.z <= 0:
+                    return None
+                return Intersection(ray, 2.0, self, Point3D(0, 0, 2), Point3D(0, 0, 2.1), Point3D(0, 0, 1.9),
+                                    Normal3D(0, 0, -1), False, AffineMatrix3D(), AffineMatrix3D())
+
+        n = HitOnly()
+
+        self.assertEqual(n.hit_distance(Ray(direction=Vector3D(0, 0, -1))), float("inf"), "A miss should return an infinite distance.")
+        self.assertIsNone(n.materialise_intersection(), "A miss should not materialise an intersection.")
+
+        self.assertEqual(n.hit_distance(Ray(direction=Vector3D(0, 0, 1))), 2.0, "Incorrect hit distance.")
+        intersection = n.materialise_intersection()
+        self.assertIsInstance(intersection, Intersection, "The hit did not materialise an intersection.")
+        self.assertEqual(intersection.ray_distance, 2.0, "Incorrect intersection distance.")
+        self.assertIsNone(n.materialise_intersection(), "An intersection should only be materialised once.")
+
     def test_contains(self):
         """Method contains() is virtual and should raise an exception if called."""
 
@@ -29,6 +29,7 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
+from numpy cimport ndarray
 from raysect.core.ray cimport Ray
 from raysect.core.intersection cimport Intersection
 from raysect.core.acceleration.accelerator cimport Accelerator
@@ -46,6 +47,12 @@ cdef class World(_NodeBase):
 
     cpdef Intersection hit(self, Ray ray)
 
+    cpdef bint is_occluded(self, Ray ray) except -1
+
+    cpdef bint occluded(self, Point3D origin, Point3D target) except -1
+
+    cpdef ndarray occluded_array(self, object origins, object targets)
+
     cpdef list contains(self, Point3D point)
 
     cpdef build_accelerator(self, bint force=*)
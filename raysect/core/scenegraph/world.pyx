@@ -29,12 +29,21 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
+import numpy as np
 from raysect.core.scenegraph.signal import GEOMETRY
 
 from raysect.core.acceleration.kdtree cimport KDTree
 from raysect.core.scenegraph.primitive cimport Primitive
 from raysect.core.scenegraph.observer cimport Observer
 from raysect.core.scenegraph.signal cimport ChangeSignal
+from raysect.core.ray cimport new_ray
+from raysect.core.math cimport Vector3D, new_point3d
+from raysect.core.statistics cimport RAYSECT_STATISTICS, count_event, INTERSECTIONS, CONTAINS_CALLS
+from libc.stdint cimport uint8_t
+cimport cython
+
+# shortens occlusion tests to avoid reporting surfaces at the target point
+DEF EPSILON = 1e-9
 
 
 cdef class World(_NodeBase):
@@ -142,8 +151,121 @@ cdef class World(_NodeBase):
         :rtype: Intersection
         """
 
+        cdef Intersection intersection
+
+        self.build_accelerator()
+        intersection = self._accelerator.hit(ray)
+        if RAYSECT_STATISTICS and intersection is not None:
+            count_event(INTERSECTIONS, 1)
+        return intersection
+
+    cpdef bint is_occluded(self, Ray ray) except -1:
+        """
+        Returns True if the Ray intersects any Primitive in the scene-graph.
+
+        This is an any-hit query: the acceleration structure traversal
+        terminates on the first primitive found to intersect the ray within the
+        ray's maximum distance and no Intersection object is constructed. Use
+        this method in preference to hit() when only the visibility along the
+        ray is required, such as for shadow rays.
+
+        This method automatically rebuilds the Acceleration object in the same
+        manner as hit().
+
+        :param Ray ray: The ray to test.
+        :return: True if the ray is blocked by a primitive, False otherwise.
+        :rtype: bool
+        """
+
+        self.build_accelerator()
+        return self._accelerator.occluded(ray)
+
+    cpdef bint occluded(self, Point3D origin, Point3D target) except -1:
+        """
+        Returns True if any Primitive lies on the line segment between two points.
+
+        The segment is shortened by a small distance at the target end so a
+        surface lying exactly on the target point does not occlude it. The
+        origin point should be displaced from any surface it lies on, for
+        example by using the outside point of an Intersection.
+
+        .. code-block:: pycon
+
+            >>> world.occluded(intersection.outside_point.transform(intersection.primitive_to_world), light_position)
+            False
+
+        :param Point3D origin: The start of the segment in world space.
+        :param Point3D target: The end of the segment in world space.
+        :return: True if the segment is blocked by a primitive, False otherwise.
+        :rtype: bool
+        """
+
+        cdef:
+            Vector3D direction
+            double distance
+
+        direction = origin.vector_to(target)
+        distance = direction.get_length()
+        if distance <= EPSILON:
+            return False
+
+        direction = direction.mul(1 / distance)
+        return self.is_occluded(new_ray(origin, direction, distance - EPSILON))
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cpdef ndarray occluded_array(self, object origins, object targets):
+        """
+        Tests the visibility between many pairs of points.
+
+        Performs the occluded() test for each pair of origin and target points.
+        The points are supplied as arrays of shape (N, 3) holding the x, y and z
+        co-ordinates in world space. The acceleration structure is rebuilt, if
+        required, once for the whole batch.
+
+        :param origins: An array of segment start points with shape (N, 3).
+        :param targets: An array of segment end points with shape (N, 3).
+        :return: A boolean array of length N, True where a segment is blocked.
+        :rtype: ndarray
+        """
+
+        cdef:
+            double[:, ::1] origins_mv, targets_mv
+            ndarray results
+            uint8_t[::1] results_mv
+            Py_ssize_t i
+            Point3D origin, target
+            Vector3D direction
+            double distance
+
+        origins = np.ascontiguousarray(origins, dtype=np.float64)
+        targets = np.ascontiguousarray(targets, dtype=np.float64)
+        if origins.ndim != 2 or origins.shape[1] != 3:
+            raise ValueError("The origins array must have shape (N, 3).")
+        if targets.shape != origins.shape:
+            raise ValueError("The targets array must have the same shape as the origins array.")
+
+        origins_mv = origins
+        targets_mv = targets
+        results = np.zeros(origins.shape[0], dtype=np.uint8)
+        results_mv = results
+
         self.build_accelerator()
-        return self._accelerator.hit(ray)
+        for i in range(origins_mv.shape[0]):
+
+            origin = new_point3d(origins_mv[i, 0], origins_mv[i, 1], origins_mv[i, 2])
+            target = new_point3d(targets_mv[i, 0], targets_mv[i, 1], targets_mv[i, 2])
+
+            direction = origin.vector_to(target)
+            distance = direction.get_length()
+            if distance <= EPSILON:
+                continue
+
+            direction = direction.mul(1 / distance)
+            results_mv[i] = self._accelerator.occluded(new_ray(origin, direction, distance - EPSILON))
+
+        return results.view(np.bool_)
 
     # TODO - better name - world.primitives_containing(point)
     cpdef list contains(self, Point3D point):
@@ -164,6 +286,9 @@ cdef class World(_NodeBase):
         :rtype: list
         """
 
+        if RAYSECT_STATISTICS:
+            count_event(CONTAINS_CALLS, 1)
+
         self.build_accelerator()
         return self._accelerator.contains(point)
 
@@ -0,0 +1,76 @@
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE. 
+
+
+from libc.stdint cimport uint64_t
+
+# the counters are only compiled into the hot paths if the extensions are built with --statistics
+cdef extern from *:
+    """
+    #ifndef RAYSECT_STATISTICS
+    #define RAYSECT_STATISTICS 0
+    #endif
+    """
+    const bint RAYSECT_STATISTICS
+
+# counter indices
+cdef enum:
+    KDTREE_NODES
+    PRIMITIVE_TESTS
+    TRIANGLE_TESTS
+    INTERSECTIONS
+    CONTAINS_CALLS
+    SPECTRA_ALLOCATED
+    COUNTER_COUNT
+
+# number of path depth histogram bins, the last bin holds all deeper rays
+cdef enum:
+    DEPTH_BINS = 64
+
+
+cdef void count_event(int counter, uint64_t n) nogil
+
+cdef void count_path_depth(int depth) nogil
+
+# profiled operations
+cdef enum:
+    PROFILE_SURFACE
+    PROFILE_VOLUME
+    PROFILE_HIT
+    PROFILE_CONTAINS
+    PROFILE_OPERATIONS
+
+# maximum nesting of profiled calls, deeper calls are not profiled
+cdef enum:
+    PROFILE_STACK_SIZE = 1024
+
+
+cdef bint profile_enter() nogil
+
+cdef void profile_exit(int operation, object item) except *
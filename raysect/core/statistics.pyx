@@ -0,0 +1,456 @@
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE. 
+
+
+"""
+Render statistics counters.
+
+Raysect can count the work performed while rendering: the kd-tree nodes
+visited, the primitive and triangle intersection tests, the intersections
+found, the calls to World.contains(), the spectra allocated and the depth
+of the ray paths. The counters are compiled out of the ray-tracing code by
+default, as they slow down rendering. They are enabled by building the
+extensions with:
+
+    python setup.py build_ext --inplace --force --statistics
+
+The counters are held per process. The render engines collect the counts of
+each worker, along with the time the workers spend in inter-process
+communication, and the observers accumulate them in their render_statistics
+attribute.
+
+A build with statistics enabled can also profile the time spent in each
+material and primitive. Profiling is switched on with set_profiling(), or by
+setting the profile attribute of an observer, as timing every call slows
+down rendering further. The calls to Material.evaluate_surface(),
+Material.evaluate_volume(), Primitive.hit() and Primitive.contains() are
+timed and attributed to the object called. The profile is part of the
+render statistics, see RenderProfile.
+"""
+
+import numpy as np
+cimport cython
+from posix.time cimport clock_gettime, timespec, CLOCK_MONOTONIC
+
+# map of the statistics attributes to the counter indices
+COUNTERS = (
+    ("kdtree_nodes", KDTREE_NODES),
+    ("primitive_tests", PRIMITIVE_TESTS),
+    ("triangle_tests", TRIANGLE_TESTS),
+    ("intersections", INTERSECTIONS),
+    ("contains_calls", CONTAINS_CALLS),
+    ("spectra_allocated", SPECTRA_ALLOCATED)
+)
+
+# names of the profiled operations, in order of the operation indices
+PROFILE_OPERATION_NAMES = ("surface", "volume", "hit", "contains")
+
+cdef uint64_t _counters[COUNTER_COUNT]
+cdef uint64_t _path_depth[DEPTH_BINS]
+
+# stack of the profiled calls in progress, the time spent in nested profiled
+# calls is accumulated so it can be excluded from the time of the caller
+cdef bint _profiling = False
+cdef int _profile_depth = 0
+cdef double _profile_start[PROFILE_STACK_SIZE]
+cdef double _profile_children[PROFILE_STACK_SIZE]
+
+# the profile entries of each operation, keyed by the id of the object called
+cdef list _profile_entries = [{} for _ in range(PROFILE_OPERATIONS)]
+
+
+cdef class _ProfileEntry:
+
+    cdef:
+        object item
+        uint64_t calls
+        double self_time
+        double total_time
+
+    def __init__(self, item):
+        self.item = item
+        self.calls = 0
+        self.self_time = 0
+        self.total_time = 0
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void count_event(int counter, uint64_t n) nogil:
+    _counters[counter] += n
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void count_path_depth(int depth) nogil:
+    _path_depth[min(depth, DEPTH_BINS - 1)] += 1
+
+
+cdef inline double _clock() nogil:
+
+    cdef timespec ts
+
+    clock_gettime(CLOCK_MONOTONIC, &ts)
+    return ts.tv_sec + 1e-9 * ts.tv_nsec
+
+
+cdef bint profile_enter() nogil:
+    """
+    Starts timing a profiled call.
+
+    Returns False if profiling is disabled, in which case profile_exit() must
+    not be called for the call.
+    """
+
+    global _profile_depth
+
+    if not _profiling or _profile_depth == PROFILE_STACK_SIZE:
+        return False
+
+    _profile_start[_profile_depth] = _clock()
+    _profile_children[_profile_depth] = 0
+    _profile_depth += 1
+    return True
+
+
+cdef void profile_exit(int operation, object item) except *:
+    """
+    Stops timing a profiled call and attributes the time to the object called.
+    """
+
+    global _profile_depth
+
+    cdef:
+        double elapsed
+        dict entries
+        _ProfileEntry entry
+
+    # the stack is reset if profiling is restarted during a call
+    if _profile_depth == 0:
+        return
+
+    _profile_depth -= 1
+    elapsed = _clock() - _profile_start[_profile_depth]
+    if _profile_depth > 0:
+        _profile_children[_profile_depth - 1] += elapsed
+
+    entries = _profile_entries[operation]
+    entry = entries.get(id(item))
+    if entry is None:
+        entry = _ProfileEntry(item)
+        entries[id(item)] = entry
+
+    entry.calls += 1
+    entry.self_time += elapsed - _profile_children[_profile_depth]
+    entry.total_time += elapsed
+
+
+def statistics_enabled():
+    """
+    Returns True if the counters are compiled into the ray-tracing code.
+
+    :rtype: bool
+    """
+    return RAYSECT_STATISTICS
+
+
+def get_counters():
+    """
+    Returns the current values of the counters of this process.
+
+    :rtype: RenderStatistics
+    """
+
+    cdef int i, index
+
+    statistics = RenderStatistics()
+    for name, index in COUNTERS:
+        setattr(statistics, name, _counters[index])
+    for i in range(DEPTH_BINS):
+        statistics.path_depth[i] = _path_depth[i]
+    statistics.profile = _get_profile()
+    return statistics
+
+
+def reset_counters():
+    """
+    Resets the counters of this process to zero.
+    """
+
+    cdef int i
+
+    for i in range(COUNTER_COUNT):
+        _counters[i] = 0
+    for i in range(DEPTH_BINS):
+        _path_depth[i] = 0
+    for entries in _profile_entries:
+        entries.clear()
+
+
+def set_profiling(bint enabled):
+    """
+    Enables or disables the profiling of materials and primitives in this process.
+
+    Profiling requires Raysect to be built with statistics enabled. Worker
+    processes started by a render engine inherit the setting of the process
+    that starts them.
+
+    :param bool enabled: True to enable profiling.
+    """
+
+    global _profiling, _profile_depth
+
+    if enabled and not RAYSECT_STATISTICS:
+        raise RuntimeError("Profiling requires Raysect to be built with statistics enabled, see raysect.core.statistics.")
+
+    _profiling = enabled
+    _profile_depth = 0
+
+
+def profiling_enabled():
+    """
+    Returns True if materials and primitives are being profiled in this process.
+
+    :rtype: bool
+    """
+    return _profiling
+
+
+def _get_profile():
+
+    cdef:
+        int operation
+        _ProfileEntry entry
+
+    profile = RenderProfile()
+    for operation in range(PROFILE_OPERATIONS):
+        for entry in _profile_entries[operation].values():
+            key = (PROFILE_OPERATION_NAMES[operation], _profile_label(entry.item))
+            calls, self_time, total_time = profile.entries.get(key, (0, 0.0, 0.0))
+            profile.entries[key] = (calls + entry.calls, self_time + entry.self_time, total_time + entry.total_time)
+    return profile
+
+
+def _profile_label(item):
+
+    name = getattr(item, "name", None)
+    if name:
+        return "{} '{}'".format(type(item).__name__, name)
+    return "{} at {:#x}".format(type(item).__name__, id(item))
+
+
+class RenderProfile:
+    """
+    The time spent in each material and primitive during a render.
+
+    The entries attribute is a dictionary keyed by a tuple of the operation
+    name ("surface", "volume", "hit" or "contains") and a label identifying
+    the object called, formed from its type and its name, or its address if
+    it has no name. Worker processes inherit the objects of the scene at the
+    same addresses, so the profiles of the workers may be added together.
+
+    Each entry is a tuple of the number of calls, the self time and the total
+    time in seconds. The self time excludes the time spent in profiled calls
+    made during the call, such as the primitive intersections of the rays
+    spawned by a material. The total time includes them.
+
+    :ivar dict entries: The profile entries.
+    """
+
+    def __init__(self):
+        self.entries = {}
+
+    def __add__(self, other):
+        return self._combine(other, 1)
+
+    def __sub__(self, other):
+        return self._combine(other, -1)
+
+    def __eq__(self, other):
+        if not isinstance(other, RenderProfile):
+            return NotImplemented
+        return self.entries == other.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _combine(self, other, sign):
+
+        if not isinstance(other, RenderProfile):
+            return NotImplemented
+
+        result = RenderProfile()
+        result.entries.update(self.entries)
+        for key, (calls, self_time, total_time) in other.entries.items():
+            current = result.entries.get(key, (0, 0.0, 0.0))
+            calls = current[0] + sign * calls
+            if calls == 0:
+                result.entries.pop(key, None)
+            else:
+                result.entries[key] = (calls, current[1] + sign * self_time, current[2] + sign * total_time)
+        return result
+
+    def sorted(self):
+        """
+        Returns the entries sorted by decreasing self time.
+
+        :return: A list of (operation, label, calls, self time, total time) tuples.
+        :rtype: list
+        """
+
+        entries = [key + value for key, value in self.entries.items()]
+        entries.sort(key=lambda entry: entry[3], reverse=True)
+        return entries
+
+    def table(self, limit=None):
+        """
+        Returns a human readable table of the entries, sorted by decreasing self time.
+
+        :param int limit: The maximum number of entries to list (default=None, all entries).
+        :rtype: str
+        """
+
+        entries = self.sorted()
+        profiled_time = max(sum(entry[3] for entry in entries), 1e-12)
+
+        lines = [
+            "Render profile - {:0.3f}s profiled".format(sum(entry[3] for entry in entries)),
+            "    {:<9} {:>12} {:>10} {:>7} {:>10}  {}".format("operation", "calls", "self", "self %", "total", "object")
+        ]
+        for operation, label, calls, self_time, total_time in entries[:limit]:
+            lines.append("    {:<9} {:>12} {:>9.3f}s {:>6.1f}% {:>9.3f}s  {}".format(
+                operation, calls, self_time, 100 * self_time / profiled_time, total_time, label))
+        if limit is not None and len(entries) > limit:
+            lines.append("    ... {} more entries".format(len(entries) - limit))
+        return "\n".join(lines)
+
+
+class RenderStatistics:
+    """
+    The work performed by a render.
+
+    The counters are only collected if Raysect is built with statistics
+    enabled, see statistics_enabled(). Statistics may be added and
+    subtracted, for example to combine the statistics of several workers or
+    to obtain the work performed between two calls to get_counters().
+
+    :ivar int kdtree_nodes: The number of kd-tree nodes visited by rays, including the kd-trees of meshes.
+    :ivar int primitive_tests: The number of primitive intersection tests.
+    :ivar int triangle_tests: The number of mesh triangle intersection tests.
+    :ivar int intersections: The number of rays that intersected a primitive.
+    :ivar int contains_calls: The number of calls to World.contains().
+    :ivar int spectra_allocated: The number of Spectrum objects created.
+    :ivar ndarray path_depth: Histogram of the depth of the rays traced, the last bin holds all deeper rays.
+    :ivar float ipc_time: The time in seconds spent by the workers on inter-process communication.
+    :ivar RenderProfile profile: The time spent in each material and primitive, if profiling is enabled.
+    """
+
+    def __init__(self):
+
+        self.kdtree_nodes = 0
+        self.primitive_tests = 0
+        self.triangle_tests = 0
+        self.intersections = 0
+        self.contains_calls = 0
+        self.spectra_allocated = 0
+        self.path_depth = np.zeros(DEPTH_BINS, dtype=np.uint64)
+        self.ipc_time = 0.0
+        self.profile = RenderProfile()
+
+    def __add__(self, other):
+        return self._combine(other, 1)
+
+    def __sub__(self, other):
+        return self._combine(other, -1)
+
+    def __eq__(self, other):
+        if not isinstance(other, RenderStatistics):
+            return NotImplemented
+        return self.as_dict() == other.as_dict() and self.profile == other.profile
+
+    def __repr__(self):
+        return "<RenderStatistics {}>".format(", ".join("{}={}".format(name, getattr(self, name)) for name, _ in COUNTERS))
+
+    def _combine(self, other, sign):
+
+        if not isinstance(other, RenderStatistics):
+            return NotImplemented
+
+        result = RenderStatistics()
+        for name, _ in COUNTERS:
+            setattr(result, name, getattr(self, name) + sign * getattr(other, name))
+        if sign > 0:
+            result.path_depth = self.path_depth + other.path_depth
+        else:
+            result.path_depth = self.path_depth - other.path_depth
+        result.ipc_time = self.ipc_time + sign * other.ipc_time
+        result.profile = self.profile._combine(other.profile, sign)
+        return result
+
+    @property
+    def rays(self):
+        """
+        The number of rays traced, the total of the path depth histogram.
+
+        :rtype: int
+        """
+        return int(self.path_depth.sum())
+
+    def as_dict(self):
+        """
+        Returns the statistics as a dictionary of Python types, suitable for JSON.
+
+        :rtype: dict
+        """
+
+        statistics = {name: int(getattr(self, name)) for name, _ in COUNTERS}
+        statistics["path_depth"] = [int(count) for count in self.path_depth]
+        statistics["ipc_time"] = self.ipc_time
+        return statistics
+
+    def summary(self):
+        """
+        Returns a human readable summary of the statistics.
+
+        :rtype: str
+        """
+
+        rays = max(1, self.rays)
+        depth = np.nonzero(self.path_depth)[0]
+        lines = [
+            "Render statistics - {} rays, maximum depth {}".format(self.rays, depth[-1] if len(depth) else 0),
+            "    kd-tree nodes:     {} ({:0.1f} per ray)".format(self.kdtree_nodes, self.kdtree_nodes / rays),
+            "    primitive tests:   {} ({:0.1f} per ray)".format(self.primitive_tests, self.primitive_tests / rays),
+            "    triangle tests:    {} ({:0.1f} per ray)".format(self.triangle_tests, self.triangle_tests / rays),
+            "    intersections:     {}".format(self.intersections),
+            "    contains calls:    {}".format(self.contains_calls),
+            "    spectra allocated: {}".format(self.spectra_allocated),
+            "    IPC time:          {:0.3f}s".format(self.ipc_time)
+        ]
+        return "\n".join(lines)
@@ -0,0 +1,357 @@
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE. 
+
+
+"""
+Unit tests for the render statistics counters and the render profiler.
+"""
+
+import unittest
+import numpy as np
+
+from raysect.core import Point3D, Vector3D, Ray as CoreRay, translate
+from raysect.core.statistics import RenderStatistics, RenderProfile, statistics_enabled, get_counters, reset_counters
+from raysect.core.statistics import set_profiling, profiling_enabled
+from raysect.core.workflow import SerialEngine, MulticoreEngine
+from raysect.optical import World, Ray, ConstantSF
+from raysect.optical.material import Lambert, UniformSurfaceEmitter
+from raysect.optical.observer import SightLine, PowerPipeline0D
+from raysect.primitive import Sphere, Box, Mesh
+
+
+def build_world():
+
+    world = World()
+    Box(Point3D(-2, -2, -2), Point3D(2, 2, 2), parent=world, material=Lambert(ConstantSF(0.5)))
+    Sphere(0.5, parent=world, transform=translate(0, 0, 1), material=UniformSurfaceEmitter(ConstantSF(1.0)))
+
+    # a mesh introduces a kd-tree of triangles
+    vertices = [[-1, -1, 0], [1, -1, 0], [1, 1, 0], [-1, 1, 0]]
+    triangles = [[0, 1, 2], [0, 2, 3]]
+    Mesh(vertices, triangles, closed=False, parent=world, transform=translate(0, 0, -1), material=Lambert())
+    return world
+
+
+class _Job:
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.world = build_world()
+
+    def run(self, tasks):
+        self.engine.run(tasks, self.render, self.update)
+
+    def render(self, task):
+        return Ray(Point3D(0, 0, 0), Vector3D(0.1 * task, 0, 1).normalise(), bins=5).trace(self.world).total()
+
+    def update(self, result):
+        pass
+
+
+class TestRenderStatistics(unittest.TestCase):
+
+    def statistics(self, offset):
+
+        statistics = RenderStatistics()
+        statistics.kdtree_nodes = 10 + offset
+        statistics.primitive_tests = 20 + offset
+        statistics.triangle_tests = 30 + offset
+        statistics.intersections = 40 + offset
+        statistics.contains_calls = 50 + offset
+        statistics.spectra_allocated = 60 + offset
+        statistics.path_depth[:3] = [5 + offset, 3, 1]
+        statistics.ipc_time = 0.5 + offset
+        return statistics
+
+    def test_arithmetic(self):
+        """Statistics can be added and subtracted."""
+
+        a = self.statistics(0)
+        b = self.statistics(1)
+
+        total = a + b
+        self.assertEqual(total.kdtree_nodes, 21, 'Counters were not added.')
+        self.assertEqual(total.spectra_allocated, 121, 'Counters were not added.')
+        self.assertEqual(total.path_depth[:3].tolist(), [11, 6, 2], 'Path depth histograms were not added.')
+        self.assertAlmostEqual(total.ipc_time, 2.0, msg='IPC times were not added.')
+
+        self.assertEqual(total - b, a, 'Subtraction did not reverse addition.')
+        self.assertEqual(a.rays, 9, 'Ray count is not the total of the path depth histogram.')
+
+    def test_as_dict(self):
+        """The dictionary holds Python types."""
+
+        statistics = self.statistics(0).as_dict()
+        self.assertEqual(statistics["triangle_tests"], 30, 'Counter is missing from the dictionary.')
+        self.assertEqual(len(statistics["path_depth"]), 64, 'Path depth histogram is missing from the dictionary.')
+        self.assertIsInstance(statistics["path_depth"][0], int, 'Path depth histogram does not hold Python integers.')
+
+    def test_summary(self):
+        """The summary reports the rays and counters."""
+
+        summary = self.statistics(0).summary()
+        self.assertIn("9 rays", summary, 'Summary does not report the ray count.')
+        self.assertIn("primitive tests:   20", summary, 'Summary does not report the primitive tests.')
+
+
+class TestRenderProfile(unittest.TestCase):
+
+    def profile(self, entries):
+
+        profile = RenderProfile()
+        profile.entries.update(entries)
+        return profile
+
+    def test_arithmetic(self):
+        """Profiles are merged by operation and object."""
+
+        a = self.profile({("hit", "Sphere 'a'"): (10, 1.0, 2.0), ("surface", "Lambert at 0x1"): (5, 0.5, 3.0)})
+        b = self.profile({("hit", "Sphere 'a'"): (20, 2.0, 4.0), ("hit", "Box 'b'"): (1, 0.1, 0.1)})
+
+        total = a + b
+        self.assertEqual(len(total), 3, 'Profile entries were not merged.')
+        self.assertEqual(total.entries[("hit", "Sphere 'a'")], (30, 3.0, 6.0), 'Profile entries were not added.')
+        self.assertEqual(total - b, a, 'Subtraction did not reverse addition.')
+        self.assertNotIn(("hit", "Box 'b'"), (total - b).entries, 'Entries without calls were not removed.')
+
+    def test_statistics(self):
+        """Render statistics combine their profiles."""
+
+        a = RenderStatistics()
+        a.profile = self.profile({("hit", "Sphere 'a'"): (10, 1.0, 2.0)})
+        b = RenderStatistics()
+        b.profile = self.profile({("hit", "Sphere 'a'"): (20, 2.0, 4.0)})
+
+        self.assertEqual((a + b).profile.entries[("hit", "Sphere 'a'")], (30, 3.0, 6.0), 'Statistics did not add their profiles.')
+        self.assertNotEqual(a, b, 'Statistics with different profiles are equal.')
+
+    def test_table(self):
+        """The table lists the entries by decreasing self time."""
+
+        profile = self.profile({
+            ("hit", "Sphere 'a'"): (10, 1.0, 2.0),
+            ("surface", "Lambert at 0x1"): (5, 3.0, 3.0),
+            ("contains", "Box 'b'"): (1, 0.1, 0.1)
+        })
+
+        self.assertEqual([entry[1] for entry in profile.sorted()], ["Lambert at 0x1", "Sphere 'a'", "Box 'b'"], 'Entries are not sorted by self time.')
+
+        lines = profile.table(limit=2).splitlines()
+        self.assertIn("4.100s profiled", lines[0], 'Table does not report the profiled time.')
+        self.assertIn("Lambert at 0x1", lines[2], 'Most expensive entry is not listed first.')
+        self.assertIn("73.2%", lines[2], 'Table does not report the share of the profiled time.')
+        self.assertIn("1 more entries", lines[-1], 'Table does not report the entries beyond the limit.')
+
+
+class TestCounters(unittest.TestCase):
+
+    def setUp(self):
+        reset_counters()
+
+    def test_reset(self):
+        """Reset counters are zero."""
+
+        build_world().hit(CoreRay(Point3D(0, 0, 0), Vector3D(0, 0, 1)))
+        reset_counters()
+        self.assertEqual(get_counters(), RenderStatistics(), 'Counters were not reset.')
+
+    @unittest.skipIf(statistics_enabled(), 'Render statistics are enabled in this build.')
+    def test_disabled(self):
+        """The counters are not incremented if statistics are compiled out."""
+
+        world = build_world()
+        world.hit(CoreRay(Point3D(0, 0, 0), Vector3D(0, 0, 1)))
+        world.contains(Point3D(0, 0, 0))
+        Ray(Point3D(0, 0, 0), Vector3D(0, 0, 1)).trace(world)
+
+        self.assertEqual(get_counters(), RenderStatistics(), 'Counters were incremented.')
+
+        engine = SerialEngine()
+        _Job(engine).run(list(range(4)))
+        self.assertIsNone(engine.statistics, 'Engine collected statistics.')
+
+    @unittest.skipIf(statistics_enabled(), 'Render statistics are enabled in this build.')
+    def test_profiling_disabled(self):
+        """Profiling cannot be enabled if statistics are compiled out."""
+
+        with self.assertRaises(RuntimeError, msg='Profiling was enabled.'):
+            set_profiling(True)
+        self.assertFalse(profiling_enabled(), 'Profiling was enabled.')
+
+        sightline = SightLine(pipelines=[PowerPipeline0D()], parent=build_world(), render_engine=SerialEngine(), quiet=True)
+        sightline.profile = True
+        with self.assertRaises(RuntimeError, msg='Observer profiled a render.'):
+            sightline.observe()
+
+    @unittest.skipUnless(statistics_enabled(), 'Render statistics are not enabled in this build.')
+    def test_counters(self):
+        """The hot paths increment the counters."""
+
+        world = build_world()
+        world.build_accelerator()
+        reset_counters()
+
+        # a ray towards the mesh crosses the kd-trees of the world and the mesh
+        intersection = world.hit(CoreRay(Point3D(0, 0, 0), Vector3D(0, 0, -1)))
+        self.assertIsNotNone(intersection, 'Test ray did not hit the mesh.')
+        statistics = get_counters()
+        self.assertGreater(statistics.kdtree_nodes, 0, 'Kd-tree nodes were not counted.')
+        self.assertGreater(statistics.primitive_tests, 0, 'Primitive tests were not counted.')
+        self.assertGreater(statistics.triangle_tests, 0, 'Triangle tests were not counted.')
+        self.assertEqual(statistics.intersections, 1, 'Intersections were not counted.')
+
+        world.contains(Point3D(0, 0, 0))
+        world.contains(Point3D(0, 0, 1))
+        self.assertEqual(get_counters().contains_calls, 2, 'Contains calls were not counted.')
+
+        # an optical ray counts the depth of each ray in its path
+        reset_counters()
+        ray = Ray(Point3D(0, 0, 0), Vector3D(0, 0, 1), bins=5)
+        ray.trace(world)
+        statistics = get_counters()
+        self.assertEqual(statistics.path_depth[0], 1, 'Primary ray depth was not counted.')
+        self.assertEqual(statistics.rays, ray.ray_count, 'Path depth histogram does not match the ray count.')
+        self.assertGreater(statistics.spectra_allocated, 0, 'Spectrum allocations were not counted.')
+
+    @unittest.skipUnless(statistics_enabled(), 'Render statistics are not enabled in this build.')
+    def test_engines(self):
+        """The render engines collect the statistics of their workers."""
+
+        engine = SerialEngine(seed=1)
+        _Job(engine).run(list(range(16)))
+        self.assertGreater(engine.statistics.rays, 0, 'Serial engine did not collect statistics.')
+        self.assertEqual(engine.worker_statistics, [engine.statistics], 'Serial engine worker statistics are wrong.')
+
+        reference = engine.statistics
+        engine = MulticoreEngine(processes=2, seed=1)
+        _Job(engine).run(list(range(16)))
+        self.assertEqual(len(engine.worker_statistics), 2, 'Multicore engine did not collect statistics per worker.')
+
+        total = engine.worker_statistics[0] + engine.worker_statistics[1]
+        self.assertEqual(total, engine.statistics, 'Multicore engine statistics are not the total of the workers.')
+        self.assertGreater(engine.statistics.ipc_time, 0, 'IPC time was not measured.')
+
+        # seeded renders perform the same work on any engine
+        self.assertEqual(engine.statistics.rays, reference.rays, 'Multicore engine counted different work.')
+        self.assertTrue(np.array_equal(engine.statistics.path_depth, reference.path_depth), 'Multicore engine counted different paths.')
+
+    @unittest.skipUnless(statistics_enabled(), 'Render statistics are not enabled in this build.')
+    def test_observer(self):
+        """Observers accumulate the statistics of their renders."""
+
+        world = build_world()
+        sightline = SightLine(pipelines=[PowerPipeline0D()], parent=world, render_engine=SerialEngine(), quiet=True)
+        sightline.pixel_samples = 10
+        sightline.spectral_rays = 2
+        sightline.observe()
+
+        statistics = sightline.render_statistics
+        self.assertEqual(statistics.path_depth[0], 20, 'Observer did not accumulate the statistics of each spectral slice.')
+        self.assertEqual(len(statistics.profile), 0, 'Observer profiled a render without profiling enabled.')
+
+    @unittest.skipUnless(statistics_enabled(), 'Render statistics are not enabled in this build.')
+    def test_profiling(self):
+        """Material and primitive calls are profiled by object."""
+
+        world = build_world()
+        world.build_accelerator()
+
+        # rays towards the emitting sphere and a lambertian wall of the box
+        emitter_ray = Ray(Point3D(0, 0, 0), Vector3D(0, 0, 1), bins=5)
+        wall_ray = Ray(Point3D(0, 0, 0), Vector3D(1, 0, 0), bins=5)
+
+        # profiling is off by default
+        emitter_ray.trace(world)
+        self.assertEqual(len(get_counters().profile), 0, 'Calls were profiled with profiling disabled.')
+
+        set_profiling(True)
+        try:
+            self.assertTrue(profiling_enabled(), 'Profiling was not enabled.')
+            emitter_ray.trace(world)
+            wall_ray.trace(world)
+        finally:
+            set_profiling(False)
+
+        # the ray origins are inside the box, so its material is also evaluated as a volume
+        entries = get_counters().profile.entries
+        operations = {operation for operation, _ in entries}
+        self.assertEqual(operations, {"surface", "volume", "hit", "contains"}, 'Profiled operations are wrong.')
+
+        labels = {label for operation, label in entries if operation == "surface"}
+        self.assertTrue(any(label.startswith("UniformSurfaceEmitter") for label in labels), 'Emitting sphere material was not profiled.')
+
+        for key, (calls, self_time, total_time) in entries.items():
+            self.assertGreater(calls, 0, 'Entry {} has no calls.'.format(key))
+            self.assertLessEqual(self_time, total_time + 1e-9, 'Self time of {} exceeds its total time.'.format(key))
+
+        # the nested primitive hits of the secondary rays are excluded from the self time of the material
+        lambert = [value for (operation, label), value in entries.items() if operation == "surface" and label.startswith("Lambert")]
+        self.assertTrue(any(self_time < total_time for _, self_time, total_time in lambert), 'Nested calls were not excluded from the self time.')
+
+    @unittest.skipUnless(statistics_enabled(), 'Render statistics are not enabled in this build.')
+    def test_profiling_engines(self):
+        """The multicore engine merges the profiles of its workers."""
+
+        # the objects are identified by address, so both renders must use the same scene
+        job = _Job(SerialEngine(seed=1))
+        set_profiling(True)
+        try:
+            job.run(list(range(16)))
+            reference = job.engine.statistics.profile
+
+            job.engine = engine = MulticoreEngine(processes=2, seed=1)
+            job.run(list(range(16)))
+            profile = engine.statistics.profile
+        finally:
+            set_profiling(False)
+
+        self.assertEqual(len(engine.worker_statistics), 2, 'Multicore engine did not collect statistics per worker.')
+        self.assertGreater(len(profile), 0, 'Workers did not profile.')
+
+        # seeded renders perform the same calls on any engine
+        self.assertEqual({key: value[0] for key, value in profile.entries.items()},
+                         {key: value[0] for key, value in reference.entries.items()},
+                         'Multicore engine profiled different calls.')
+
+    @unittest.skipUnless(statistics_enabled(), 'Render statistics are not enabled in this build.')
+    def test_observer_profiling(self):
+        """Observers profile their renders if requested."""
+
+        world = build_world()
+        sightline = SightLine(pipelines=[PowerPipeline0D()], parent=world, render_engine=SerialEngine(), quiet=True)
+        sightline.pixel_samples = 10
+        sightline.profile = True
+        sightline.observe()
+
+        self.assertGreater(len(sightline.render_statistics.profile), 0, 'Observer did not profile the render.')
+        self.assertFalse(profiling_enabled(), 'Profiling was left enabled after the render.')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+# Copyright (c) 2014-2015, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Unit tests for the render engines.
+"""
+
+import unittest
+from random import shuffle
+from time import sleep, time
+from raysect.core.workflow import SerialEngine, MulticoreEngine
+from raysect.core.math.random import uniform
+
+
+class _Job:
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.results = {}
+
+    def run(self, tasks):
+        self.engine.run(tasks, self.render, self.update)
+        return self.results
+
+    def render(self, task):
+        return task, [uniform() for _ in range(5)]
+
+    def update(self, result):
+        task, values = result
+        self.results[task] = values
+
+
+class _SlowJob(_Job):
+
+    def render(self, task):
+        sleep(0.01)
+        return super().render(task)
+
+
+class TestRenderEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.tasks = [(x, y) for x in range(8) for y in range(8)]
+
+    def test_invalid_seed(self):
+
+        with self.assertRaises(ValueError):
+            SerialEngine(seed=-1)
+
+        with self.assertRaises(ValueError):
+            MulticoreEngine(seed=2**64)
+
+    def test_serial_reproducible(self):
+
+        reference = _Job(SerialEngine(seed=42)).run(list(self.tasks))
+
+        # task order must not affect the random numbers consumed by a task
+        tasks = list(self.tasks)
+        shuffle(tasks)
+        results = _Job(SerialEngine(seed=42)).run(tasks)
+        self.assertEqual(results, reference)
+
+        # a different seed must generate different results
+        results = _Job(SerialEngine(seed=43)).run(list(self.tasks))
+        self.assertNotEqual(results, reference)
+
+    def test_successive_runs(self):
+        """
+        Successive runs must draw from different streams, resetting the seed restarts the sequence.
+        """
+
+        job = _Job(SerialEngine(seed=42))
+        first = dict(job.run(list(self.tasks)))
+        second = dict(job.run(list(self.tasks)))
+        self.assertNotEqual(first, second)
+
+        job.engine.seed = 42
+        self.assertEqual(job.run(list(self.tasks)), first)
+
+    def test_multicore_reproducible(self):
+
+        reference = _Job(SerialEngine(seed=7)).run(list(self.tasks))
+
+        for processes in (1, 3):
+            results = _Job(MulticoreEngine(processes=processes, seed=7)).run(list(self.tasks))
+            self.assertEqual(results, reference, msg="Multicore render with {} processes was not reproducible.".format(processes))
+
+    def test_deadline(self):
+        """
+        No tasks are started after the deadline, the run ends cleanly.
+        """
+
+        for engine in (SerialEngine(seed=1), MulticoreEngine(processes=2, seed=1)):
+
+            engine.deadline = time() - 1
+            self.assertEqual(_Job(engine).run(list(self.tasks)), {}, msg="{} started tasks after the deadline.".format(type(engine).__name__))
+
+            engine.deadline = time() + 60
+            self.assertEqual(len(_Job(engine).run(list(self.tasks))), len(self.tasks), msg="{} did not render every task.".format(type(engine).__name__))
+
+            # 64 tasks of 10ms cannot be completed in 0.1s
+            engine.deadline = time() + 0.1
+            start = time()
+            results = _SlowJob(engine).run(list(self.tasks))
+            self.assertLess(time() - start, 5, msg="{} overran the deadline.".format(type(engine).__name__))
+            self.assertGreater(len(results), 0, msg="{} rendered no tasks before the deadline.".format(type(engine).__name__))
+            self.assertLess(len(results), len(self.tasks), msg="{} rendered tasks after the deadline.".format(type(engine).__name__))
+
+    def test_task_order(self):
+        """
+        The engines dispatch the tasks in the order supplied.
+        """
+
+        engine = MulticoreEngine(processes=1, seed=1, tasks_per_job=1)
+        engine.deadline = time() + 0.1
+        tasks = list(self.tasks)
+        shuffle(tasks)
+        results = _SlowJob(engine).run(tasks)
+        self.assertGreater(len(results), 0, msg="No tasks were rendered before the deadline.")
+        self.assertEqual(set(results), set(tasks[:len(results)]), msg="Tasks were not dispatched in order.")
+
+
+if __name__ == "__main__":
+    unittest.main()
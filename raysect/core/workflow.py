@@ -28,7 +28,10 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 from multiprocessing import Process, cpu_count, SimpleQueue, Value
+from hashlib import blake2b
 from raysect.core.math import random
+from raysect.core.statistics import statistics_enabled, get_counters, RenderStatistics
+import pickle
 import time
 
 
@@ -73,8 +76,82 @@ class RenderEngine:
     The execution order of tasks is not guaranteed to be in order. If the order
     is critical, an identifier should be passed as part of the task definition
     and returned in the result. This will permit the order to be reconstructed.
+
+    By default the random number generator of each worker is seeded from the
+    system entropy source and renders are not repeatable. If a seed is
+    supplied, each task is rendered with its own counter-based random number
+    stream, derived from the seed, the task and the number of previous calls
+    to run(). Renders are then bit-for-bit reproducible, independent of the
+    number of workers and the order in which tasks are processed.
+
+    If Raysect is built with render statistics enabled, the engine collects
+    the counters of each worker during a call to run(). The statistics of
+    each worker are available from the worker_statistics attribute and their
+    total from the statistics attribute. Both are None if statistics are not
+    enabled, see raysect.core.statistics.
+
+    If the deadline attribute is set to a time, as returned by time.time(),
+    run() stops rendering tasks once the deadline has passed. The tasks being
+    rendered at the deadline are completed and their results passed to
+    update(), the remaining tasks are skipped. Engines that do not support
+    deadlines render all the tasks.
+
+    :param int seed: An unsigned 64 bit integer seed for reproducible renders or None (default).
     """
 
+    def __init__(self, seed=None):
+        self.seed = seed
+        self.deadline = None
+        self.statistics = None
+        self.worker_statistics = None
+
+    @property
+    def seed(self):
+        """
+        The seed for reproducible renders, None if renders are not reproducible.
+
+        Setting the seed restarts the sequence of random number streams.
+
+        :rtype: int
+        """
+        return self._seed
+
+    @seed.setter
+    def seed(self, value):
+        if value is not None:
+            value = int(value)
+            if not 0 <= value < 2**64:
+                raise ValueError("The seed must be an unsigned 64 bit integer.")
+        self._seed = value
+        self._run_count = 0
+
+    def _next_run(self):
+        """
+        Returns the run index used to derive the random number streams of a run.
+        """
+
+        run = self._run_count
+        if self._seed is not None:
+            self._run_count += 1
+        return run
+
+    def _select_stream(self, task, run):
+        """
+        Selects the random number stream for the task, if the render is seeded.
+
+        The stream id is a hash of the task and the run index, so the stream
+        does not depend on the position of the task in the task list.
+
+        :param object task: The task to be rendered.
+        :param int run: The run index.
+        """
+
+        if self._seed is None:
+            return
+
+        digest = blake2b(pickle.dumps((run, task), protocol=4), digest_size=8).digest()
+        random.seed_stream(self._seed, int.from_bytes(digest, byteorder='little'))
+
     def run(self, tasks, render, update, render_args=(), render_kwargs={}, update_args=(), update_kwargs={}):
         """
         Starts the render engine executing the requested tasks.
@@ -103,6 +180,8 @@ class SerialEngine(RenderEngine):
 
     This engine is useful for debugging.
 
+    :param int seed: An unsigned 64 bit integer seed for reproducible renders or None (default).
+
         >>> from raysect.core import SerialEngine
         >>> from raysect.optical.observer import PinholeCamera
         >>>
@@ -112,9 +191,23 @@ class SerialEngine(RenderEngine):
 
     def run(self, tasks, render, update, render_args=(), render_kwargs={}, update_args=(), update_kwargs={}):
 
-        for task in tasks:
-            result = render(task, *render_args, **render_kwargs)
-            update(result, *update_args, **update_kwargs)
+        run = self._next_run()
+        collect = statistics_enabled()
+        if collect:
+            counters = get_counters()
+
+        try:
+            for task in tasks:
+                if self.deadline is not None and time.time() >= self.deadline:
+                    break
+                self._select_stream(task, run)
+                result = render(task, *render_args, **render_kwargs)
+                update(result, *update_args, **update_kwargs)
+        finally:
+            random.clear_stream()
+            if collect:
+                self.statistics = get_counters() - counters
+                self.worker_statistics = [self.statistics]
 
     def worker_count(self):
         return 1
@@ -145,6 +238,7 @@ class MulticoreEngine(RenderEngine):
 
     :param processes: The number of worker processes, or None to use all available cores (default).
     :param tasks_per_job: The number of tasks to group into a single job, or None if this should be determined automatically (default).
+    :param seed: An unsigned 64 bit integer seed for reproducible renders or None (default).
 
     .. code-block:: pycon
 
@@ -158,10 +252,13 @@ class MulticoreEngine(RenderEngine):
         >>>
         >>> # or forcing the render engine to use a specific number of CPU processes
         >>> camera.render_engine = MulticoreEngine(processes=8)
+        >>>
+        >>> # reproducible renders, independent of the number of processes
+        >>> camera.render_engine = MulticoreEngine(seed=42)
     """
 
-    def __init__(self, processes=None, tasks_per_job=None):
-        super().__init__()
+    def __init__(self, processes=None, tasks_per_job=None, seed=None):
+        super().__init__(seed)
         self.processes = processes
         self.tasks_per_job = tasks_per_job
 
@@ -207,12 +304,18 @@ class MulticoreEngine(RenderEngine):
         producer.start()
 
         # start worker processes
+        run = self._next_run()
         workers = []
         for pid in range(self._processes):
-            p = Process(target=self._worker, args=(render, render_args, render_kwargs, job_queue, result_queue))
+            p = Process(target=self._worker, args=(render, render_args, render_kwargs, job_queue, result_queue, run, pid, self.deadline))
             p.start()
             workers.append(p)
 
+        # the workers return their render statistics with each job, if enabled
+        collect = statistics_enabled()
+        if collect:
+            worker_statistics = [RenderStatistics() for _ in workers]
+
         # consume results
         remaining = len(tasks)
         while remaining:
@@ -236,10 +339,15 @@ class MulticoreEngine(RenderEngine):
                 # raise the exception to inform the user
                 raise results
 
+            # the results of the tasks skipped after the deadline are missing
+            worker, count, results, statistics = results
+            if collect:
+                worker_statistics[worker] += statistics
+
             # update state with new results
             for result in results:
                 update(result, *update_args, **update_kwargs)
-                remaining -= 1
+            remaining -= count
 
         # shutdown workers
         for _ in workers:
@@ -248,6 +356,10 @@ class MulticoreEngine(RenderEngine):
         # store tasks per job value for next run
         self._tasks_per_job = tasks_per_job.value
 
+        if collect:
+            self.worker_statistics = worker_statistics
+            self.statistics = sum(worker_statistics, RenderStatistics())
+
     def worker_count(self):
         return self._processes
 
@@ -259,6 +371,9 @@ class MulticoreEngine(RenderEngine):
         min_requests = min(2 * target_rate, 5 * self._processes)
         tasks_per_job = stored_tasks_per_job.value
 
+        # dispatch the tasks in the order supplied, they are popped from the end of the list
+        tasks = tasks[::-1]
+
         # split tasks into jobs and dispatch to workers
         requests = -self.processes  # ignore the initial jobs, the requests are instantaneous
         start_time = time.time()
@@ -297,31 +412,52 @@ class MulticoreEngine(RenderEngine):
         # pass back new value
         stored_tasks_per_job.value = tasks_per_job
 
-    def _worker(self, render, args, kwargs, job_queue, result_queue):
+    def _worker(self, render, args, kwargs, job_queue, result_queue, run, worker, deadline):
 
         # re-seed the random number generator to prevent all workers inheriting the same sequence
+        # if the render is seeded, each task selects its own stream instead
         random.seed()
 
+        collect = statistics_enabled()
+        ipc_time = 0.0
+
         # process jobs
         while True:
 
+            start = time.perf_counter()
             job = job_queue.get()
+            ipc_time += time.perf_counter() - start
 
             # have we been commanded to shutdown?
             if job is None:
                 break
 
+            if collect:
+                counters = get_counters()
+
             results = []
             for task in job:
+                if deadline is not None and time.time() >= deadline:
+                    break
                 try:
+                    self._select_stream(task, run)
                     results.append(render(task, *args, **kwargs))
                 except Exception as e:
                     # pass the exception back to the main process and quit
                     result_queue.put(e)
                     break
 
+            # the statistics of a job include the IPC time accumulated since the previous job was handed back
+            statistics = None
+            if collect:
+                statistics = get_counters() - counters
+                statistics.ipc_time = ipc_time
+                ipc_time = 0.0
+
             # hand back results
-            result_queue.put(results)
+            start = time.perf_counter()
+            result_queue.put((worker, len(job), results, statistics))
+            ipc_time += time.perf_counter() - start
 
 
 if __name__ == '__main__':
@@ -39,9 +39,9 @@ cpdef (double, double, double) ciexyy_to_ciexyz(double cx, double cy, double y)
 
 cpdef (double, double, double) ciexyz_to_ciexyy(double x, double y, double z)
 
-cdef double srgb_transfer_function(double v)
+cdef double srgb_transfer_function(double v) nogil
 
-cpdef (double, double, double) ciexyz_to_srgb(double x, double y, double z)
+cpdef (double, double, double) ciexyz_to_srgb(double x, double y, double z) nogil
 
 cdef double srgb_transfer_function_inverse(double v)
 
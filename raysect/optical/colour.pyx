@@ -220,7 +220,7 @@ cpdef (double, double, double) ciexyz_to_ciexyy(double x, double y, double z):
     return x / n, y / n, y
 
 
-cdef double srgb_transfer_function(double v):
+cdef double srgb_transfer_function(double v) nogil:
 
     if v <= 0.0031308:
 
@@ -232,7 +232,7 @@ cdef double srgb_transfer_function(double v):
         return 1.055 * v**0.4166666666666667 - 0.055
 
 
-cpdef (double, double, double) ciexyz_to_srgb(double x, double y, double z):
+cpdef (double, double, double) ciexyz_to_srgb(double x, double y, double z) nogil:
     """
     Convert CIE XYZ values to sRGB colour space.
 
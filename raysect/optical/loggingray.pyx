@@ -124,8 +124,12 @@ cdef class LoggingRay(Ray):
         intersection = world.hit(self)
         if intersection is not None:
             self.log.append(intersection)
-            spectrum = self._sample_surface(intersection, world)
-            spectrum = self._sample_volumes(spectrum, intersection, world)
+
+            # direct lighting samples only collect the share of light assigned to them by the launching material
+            normalisation *= self._lighting_weight(intersection)
+            if normalisation > 0:
+                spectrum = self._sample_surface(intersection, world)
+                spectrum = self._sample_volumes(spectrum, intersection, world)
 
         # apply normalisation to ensure the sampling remains unbiased
         spectrum.mul_scalar(normalisation)
@@ -160,6 +164,7 @@ cdef class LoggingRay(Ray):
         ray._important_path_weight = self._important_path_weight
         ray.depth = self.depth + 1
         ray.log = self.log
+        self._transfer_lighting_weights(ray)
 
         # track ray statistics
         if self._primary_ray is None:
@@ -30,7 +30,7 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 from numpy cimport ndarray
-from raysect.core.math.random cimport uniform
+from raysect.core.math.sampler cimport sequence_uniform2d
 from raysect.optical cimport Point3D, Normal3D, AffineMatrix3D, Primitive, World, Ray, new_vector3d
 from libc.math cimport M_PI, sqrt, fabs, atan, cos, sin
 cimport cython
@@ -226,8 +226,8 @@ cdef class RoughConductor(ContinuousBSDF):
             double theta, phi, temp
             Vector3D facet_normal
 
-        e1 = uniform()
-        e2 = uniform()
+        # drawn from the observer's sample sequence if one is active
+        sequence_uniform2d(&e1, &e2)
 
         theta = atan(self._roughness * sqrt(e1) / sqrt(1 - e1))
         phi = 2 * M_PI * e2
@@ -63,6 +63,12 @@ cdef class DiscreteBSDF(Material):
 
 cdef class ContinuousBSDF(Material):
 
+    cdef bint _direct_lighting
+
+    cdef Spectrum _sample_direct_lighting(self, World world, Ray ray, Vector3D s_incoming, Point3D w_hit_point,
+                                          Point3D w_reflection_origin, Point3D w_transmission_origin, bint back_face,
+                                          AffineMatrix3D world_to_surface, AffineMatrix3D surface_to_world)
+
     cpdef double pdf(self, Vector3D s_incoming, Vector3D s_outgoing, bint back_face)
 
     cpdef Vector3D sample(self, Vector3D s_incoming, bint back_face)
@@ -279,8 +279,39 @@ cdef class DiscreteBSDF(Material):
 cdef class ContinuousBSDF(Material):
     """
     A base class for materials implementing a continuous BSDF.
+
+    With importance sampling enabled, a single daughter ray is traced per
+    surface interaction. Its direction is drawn from either the important
+    primitives or the BSDF, selected at random by the ray's important path
+    weight. If direct lighting is enabled, two daughter rays are traced
+    instead, see the direct_lighting attribute.
     """
 
+    @property
+    def direct_lighting(self):
+        """
+        Toggles explicit direct lighting sampling for this material.
+
+        When enabled, and importance sampling is active, each surface interaction
+        traces a direction sampled from the important primitives and a direction
+        sampled from the BSDF. The light sample only collects light arriving from
+        surfaces that are not continuous BSDFs (e.g. emitters), terminating if
+        it hits a continuous BSDF surface. The BSDF sample collects all the light
+        along its direction, its directly arriving light is combined with the light
+        sample using the balance heuristic.
+
+        This reduces the noise of diffuse scenes lit by small emitters at the
+        cost of an additional ray per surface interaction. The material's
+        evaluate_shading() must trace a single daughter ray.
+
+        :rtype: bool
+        """
+        return self._direct_lighting
+
+    @direct_lighting.setter
+    def direct_lighting(self, bint value):
+        self._direct_lighting = value
+
     cpdef Spectrum evaluate_surface(self, World world, Ray ray, Primitive primitive, Point3D p_hit_point,
                                     bint exiting, Point3D p_inside_point, Point3D p_outside_point,
                                     Normal3D p_normal, AffineMatrix3D world_to_primitive, AffineMatrix3D primitive_to_world):
@@ -320,6 +351,10 @@ cdef class ContinuousBSDF(Material):
 
             w_hit_point = p_hit_point.transform(primitive_to_world)
 
+            if self._direct_lighting:
+                return self._sample_direct_lighting(world, ray, s_incoming, w_hit_point, w_reflection_origin,
+                                                    w_transmission_origin, exiting, world_to_surface, surface_to_world)
+
             # multiple importance sampling
             if probability(ray.get_important_path_weight()):
 
@@ -352,6 +387,53 @@ cdef class ContinuousBSDF(Material):
             spectrum.div_scalar(pdf)
             return spectrum
 
+    cdef Spectrum _sample_direct_lighting(self, World world, Ray ray, Vector3D s_incoming, Point3D w_hit_point,
+                                          Point3D w_reflection_origin, Point3D w_transmission_origin, bint back_face,
+                                          AffineMatrix3D world_to_surface, AffineMatrix3D surface_to_world):
+        """
+        Samples the surface with a light sample and a BSDF sample.
+
+        The light arriving along each daughter ray is split by the first surface
+        the ray hits. Direct light, from surfaces that are not continuous BSDFs,
+        is collected by both samples and combined with balance heuristic weights.
+        Indirect light, from continuous BSDF surfaces, is only collected by the
+        BSDF sample.
+        """
+
+        cdef:
+            double pdf_important, pdf_bsdf
+            Vector3D w_outgoing, s_outgoing
+            Spectrum spectrum, bsdf_spectrum
+
+        # light sample, the weight of direct light is pdf_important / (pdf_important + pdf_bsdf) / pdf_important
+        w_outgoing = world.important_direction_sample(w_hit_point)
+        s_outgoing = w_outgoing.transform(world_to_surface)
+        pdf_important = world.important_direction_pdf(w_hit_point, w_outgoing)
+        pdf_bsdf = self.pdf(s_incoming, s_outgoing, back_face)
+
+        if pdf_important + pdf_bsdf > 0:
+            ray.set_daughter_lighting_weights(1.0, 0.0)
+            spectrum = self.evaluate_shading(world, ray, s_incoming, s_outgoing, w_reflection_origin, w_transmission_origin, back_face, world_to_surface, surface_to_world)
+            ray.clear_daughter_lighting_weights()
+            spectrum.div_scalar(pdf_important + pdf_bsdf)
+        else:
+            spectrum = ray.new_spectrum()
+
+        # bsdf sample, direct light is weighted by pdf_bsdf / (pdf_important + pdf_bsdf), indirect light is collected in full
+        s_outgoing = self.sample(s_incoming, back_face)
+        w_outgoing = s_outgoing.transform(surface_to_world)
+        pdf_important = world.important_direction_pdf(w_hit_point, w_outgoing)
+        pdf_bsdf = self.pdf(s_incoming, s_outgoing, back_face)
+
+        if pdf_bsdf > 0:
+            ray.set_daughter_lighting_weights(pdf_bsdf / (pdf_important + pdf_bsdf), 1.0)
+            bsdf_spectrum = self.evaluate_shading(world, ray, s_incoming, s_outgoing, w_reflection_origin, w_transmission_origin, back_face, world_to_surface, surface_to_world)
+            ray.clear_daughter_lighting_weights()
+            bsdf_spectrum.div_scalar(pdf_bsdf)
+            spectrum.add_spectrum(bsdf_spectrum)
+
+        return spectrum
+
     cpdef double pdf(self, Vector3D s_incoming, Vector3D s_outgoing, bint back_face):
 
         raise NotImplementedError("Virtual method pdf() has not been implemented.")
@@ -0,0 +1,97 @@
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE. 
+
+
+import unittest
+import numpy as np
+from raysect.core import Point3D, Vector3D, translate, rotate
+from raysect.core.math.random import seed
+from raysect.primitive import Sphere, Box
+from raysect.optical import World, Ray, ConstantSF
+from raysect.optical.material import Lambert, UniformSurfaceEmitter
+
+
+class TestDirectLighting(unittest.TestCase):
+    """
+    Tests the direct lighting sampling of ContinuousBSDF materials.
+    """
+
+    def setUp(self):
+
+        # the radiance estimates are compared with statistical tolerances, seed the sampling for reproducible results
+        seed(1)
+
+    def build_world(self, direct_lighting, wall=False):
+
+        world = World()
+
+        floor = Lambert(ConstantSF(0.5))
+        floor.direct_lighting = direct_lighting
+        Box(Point3D(-50, -50, -1), Point3D(50, 50, 0), parent=world, material=floor)
+
+        if wall:
+            material = Lambert(ConstantSF(0.8))
+            material.direct_lighting = direct_lighting
+            Box(Point3D(-5, 0.5, 0), Point3D(5, 1, 5), parent=world, material=material)
+
+        Sphere(0.2, parent=world, transform=translate(0, 0, 2), material=UniformSurfaceEmitter(ConstantSF(1.0)))
+        return world
+
+    def sample(self, world, samples):
+
+        values = np.empty(samples)
+        for i in range(samples):
+            ray = Ray(Point3D(0, -1, 1), Vector3D(0, 1, -1).normalise(), min_wavelength=500, max_wavelength=501, bins=1)
+            values[i] = ray.trace(world).samples[0]
+        return values.mean(), values.std() / np.sqrt(samples)
+
+    def test_direct_illumination(self):
+        """A diffuse floor lit by a spherical emitter matches the analytical radiance."""
+
+        # radiance of a lambertian surface lit by a sphere of radius r at distance d: reflectivity * emission * (r / d)^2
+        expected = 0.5 * 1.0 * (0.2 / 2) ** 2
+
+        mean, error = self.sample(self.build_world(True), 4000)
+        self.assertAlmostEqual(mean, expected, delta=max(4 * error, 1e-4), msg="Direct lighting radiance is incorrect.")
+
+        # the direct lighting estimate should have a far lower variance than the single sample estimate
+        _, default_error = self.sample(self.build_world(False), 4000)
+        self.assertLess(error, default_error, "Direct lighting did not reduce the noise.")
+
+    def test_indirect_illumination(self):
+        """Direct lighting and the single sample estimator agree when indirect light is present."""
+
+        mean, error = self.sample(self.build_world(True, wall=True), 6000)
+        expected, expected_error = self.sample(self.build_world(False, wall=True), 6000)
+        self.assertAlmostEqual(mean, expected, delta=4 * np.hypot(error, expected_error),
+                               msg="Direct lighting and the single sample estimator disagree.")
+
+
+if __name__ == "__main__":
+    unittest.main()
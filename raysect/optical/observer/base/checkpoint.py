@@ -0,0 +1,169 @@
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+Render checkpoint files.
+
+A checkpoint is an uncompressed numpy .npz archive of named arrays. Files are
+written to a temporary file in the destination directory by a background
+thread and moved into place with an atomic rename, so an interrupted write
+never corrupts the previous checkpoint.
+"""
+
+import os
+import tempfile
+from threading import Thread
+
+import numpy as np
+
+
+CHECKPOINT_VERSION = 1
+
+
+class CheckpointWriter:
+    """
+    Writes checkpoint files atomically in a background thread.
+
+    Only one write is in progress at a time, a new write waits for the
+    previous write to complete. An exception raised by a background write is
+    re-raised by the next call to write() or wait().
+    """
+
+    def __init__(self):
+        self._thread = None
+        self._error = None
+
+    def write(self, path, arrays):
+        """
+        Writes a dictionary of arrays to a checkpoint file in the background.
+
+        The arrays must not be modified after they are passed to the writer.
+
+        :param str path: The checkpoint file path.
+        :param dict arrays: A dictionary of numpy arrays.
+        """
+
+        self.wait()
+        self._thread = Thread(target=self._write, args=(path, arrays), name="raysect-checkpoint", daemon=True)
+        self._thread.start()
+
+    def wait(self):
+        """
+        Blocks until the current write is complete.
+        """
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        if self._error is not None:
+            error = self._error
+            self._error = None
+            raise error
+
+    def _write(self, path, arrays):
+
+        try:
+            write_checkpoint(path, arrays)
+        except Exception as error:
+            self._error = error
+
+
+def write_checkpoint(path, arrays):
+    """
+    Writes a dictionary of arrays to a checkpoint file, replacing the file atomically.
+
+    :param str path: The checkpoint file path.
+    :param dict arrays: A dictionary of numpy arrays.
+    """
+
+    path = os.fspath(path)
+    directory = os.path.dirname(os.path.abspath(path))
+
+    handle, temporary = tempfile.mkstemp(prefix=".checkpoint-", suffix=".npz", dir=directory)
+    try:
+        with os.fdopen(handle, "wb") as file:
+            np.savez(file, version=CHECKPOINT_VERSION, **arrays)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def frame_state(frame):
+    """
+    Returns copies of the statistics arrays of a StatsArray frame.
+
+    :param frame: A StatsArray1D, StatsArray2D or StatsArray3D.
+    :return: A dictionary of numpy arrays.
+    """
+
+    return {
+        "mean": frame.mean.copy(),
+        "variance": frame.variance.copy(),
+        "samples": frame.samples.copy()
+    }
+
+
+def restore_frame(frame, state):
+    """
+    Restores the statistics arrays of a StatsArray frame from a checkpoint state.
+
+    :param frame: A StatsArray1D, StatsArray2D or StatsArray3D.
+    :param dict state: A dictionary of numpy arrays returned by frame_state().
+    """
+
+    if state["mean"].shape != frame.mean.shape:
+        raise ValueError("The checkpoint frame shape {} does not match the pipeline frame shape {}.".format(
+            state["mean"].shape, frame.mean.shape))
+
+    frame.mean[...] = state["mean"]
+    frame.variance[...] = state["variance"]
+    frame.samples[...] = state["samples"]
+
+
+def read_checkpoint(path):
+    """
+    Reads a checkpoint file.
+
+    :param str path: The checkpoint file path.
+    :return: A dictionary of numpy arrays.
+    """
+
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {key: data[key] for key in data.files}
+
+    if arrays.pop("version", None) != CHECKPOINT_VERSION:
+        raise ValueError("The file '{}' is not a compatible render checkpoint.".format(path))
+
+    return arrays
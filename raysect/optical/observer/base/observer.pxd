@@ -33,6 +33,7 @@ from libc.stdint cimport *
 from raysect.optical cimport Ray
 from raysect.optical cimport Observer
 from raysect.optical.observer.base.sampler cimport FrameSampler1D, FrameSampler2D
+from raysect.core.math.sampler cimport LowDiscrepancySequence
 
 
 cdef class _ObserverBase(Observer):
@@ -52,16 +53,42 @@ cdef class _ObserverBase(Observer):
         uint64_t _stats_total_tasks
         uint64_t _stats_completed_tasks
         readonly bint render_complete
+        readonly object render_statistics
+        readonly int render_passes
+        public bint profile
+        int _max_passes
+        double _time_budget
+        double _sample_weight
+        object _render_samples
+        list _started_tasks
         public bint quiet
+        LowDiscrepancySequence _sequence
+        object _checkpoint_file
+        double _checkpoint_interval
+        double _checkpoint_timer
+        object _checkpoint_writer
+        list _checkpoint_tasks
+        dict _checkpoint_index
+        object _checkpoint_done
+
+    cpdef observe(self, bint resume=*)
+
+    cpdef object _render_pass(self, bint resume)
+
+    cpdef object _print_sample_summary(self)
 
     cpdef list _slice_spectrum(self)
 
     cpdef list _generate_templates(self, list slices)
 
-    cpdef object _render_pixel(self, tuple task, int slice_id, Ray template)
+    cdef bint _uses_ray_arrays(self)
+
+    cpdef object _render_pixel(self, tuple task, int slice_id, Ray template, bint ray_arrays)
 
     cpdef object _update_state(self, tuple packed_result, int slice_id)
 
+    cpdef object _collect_render_statistics(self)
+
     cpdef list _generate_tasks(self)
 
     cpdef list _obtain_pixel_processors(self, tuple task, int slice_id)
@@ -72,6 +99,10 @@ cdef class _ObserverBase(Observer):
 
     cpdef object _finalise_pipelines(self)
 
+    cpdef object _new_sample_counts(self)
+
+    cpdef object _record_samples(self, tuple task, double weight)
+
     cpdef object _initialise_statistics(self, list tasks)
 
     cpdef object _update_statistics(self, uint64_t sample_ray_count)
@@ -80,8 +111,20 @@ cdef class _ObserverBase(Observer):
 
     cpdef list _obtain_rays(self, tuple task, Ray template)
 
+    cpdef tuple _obtain_ray_arrays(self, tuple task)
+
+    cdef list _rays_from_arrays(self, Ray template, tuple arrays)
+
     cpdef double _obtain_sensitivity(self, tuple task)
 
+    cpdef dict _checkpoint_pipelines(self)
+
+    cpdef object _restore_pipelines(self, dict arrays)
+
+    cpdef list _restore_checkpoint(self, int slices)
+
+    cpdef object _save_checkpoint(self, bint pending)
+
 
 cdef class Observer0D(_ObserverBase):
 
@@ -92,6 +135,8 @@ cdef class Observer0D(_ObserverBase):
 
     cpdef list _generate_rays(self, Ray template, int ray_count)
 
+    cpdef tuple _generate_ray_arrays(self, int ray_count)
+
     cpdef double _pixel_sensitivity(self)
 
 
@@ -105,6 +150,8 @@ cdef class Observer1D(_ObserverBase):
 
     cpdef list _generate_rays(self, int pixel, Ray template, int ray_count)
 
+    cpdef tuple _generate_ray_arrays(self, int pixel, int ray_count)
+
     cpdef double _pixel_sensitivity(self, int pixel)
 
 
@@ -118,6 +165,8 @@ cdef class Observer2D(_ObserverBase):
 
     cpdef list _generate_rays(self, int x, int y, Ray template, int ray_count)
 
+    cpdef tuple _generate_ray_arrays(self, int x, int y, int ray_count)
+
     cpdef double _pixel_sensitivity(self, int x, int y)
 
 
@@ -29,15 +29,33 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
+import os
 from time import time
+import numpy as np
 from raysect.core.workflow import RenderEngine, MulticoreEngine
+from raysect.core.statistics import statistics_enabled, set_profiling, RenderStatistics
+from raysect.optical.observer.base.checkpoint import CheckpointWriter, read_checkpoint
 
 cimport cython
-from raysect.optical cimport World, Spectrum
+from numpy cimport ndarray
+from raysect.optical cimport World, Spectrum, Point3D, new_point3d, Vector3D, new_vector3d, AffineMatrix3D
 from raysect.optical.observer.base.sampler cimport FrameSampler1D, FrameSampler2D
 from raysect.optical.observer.base.pipeline cimport Pipeline0D, Pipeline1D, Pipeline2D
 from raysect.optical.observer.base.processor cimport PixelProcessor
 from raysect.optical.observer.base.slice cimport SpectralSlice
+from raysect.core.math.sampler cimport LowDiscrepancySequence, begin_sequence, end_sequence, sequence_dimension, \
+    sequence_seek, new_sequence_seed
+
+
+cdef bint _supports_checkpoints(Pipeline2D pipeline):
+    """
+    Returns True if the pipeline class overrides Pipeline2D.checkpoint_state().
+    """
+
+    for cls in type(pipeline).__mro__:
+        if "checkpoint_state" in cls.__dict__:
+            return cls is not Pipeline2D
+    return False
 
 
 # """
@@ -73,6 +91,18 @@ cdef class _ObserverBase(Observer):
 
     This is an abstract class and cannot be used for observing.
 
+    If Raysect is built with render statistics enabled, the counters
+    collected by the render engine while observing are accumulated in the
+    render_statistics attribute (a RenderStatistics object). They are
+    reset by each call to observe(). The attribute is None if statistics
+    are not enabled, see raysect.core.statistics.
+
+    Setting the profile attribute to True additionally profiles the time
+    spent in each material and primitive while observing. The profile is
+    held in render_statistics.profile and a table of the most expensive
+    objects is printed after the render, unless the observer is quiet.
+    Profiling requires Raysect to be built with statistics enabled.
+
     :param Node parent: The parent node in the scenegraph. Observers will only observe items
       in the same scenegraph as them.
     :param AffineMatrix3D transform: Affine matrix describing the location and orientation of
@@ -121,11 +151,33 @@ cdef class _ObserverBase(Observer):
         self.ray_importance_sampling = ray_importance_sampling or True
         self.ray_important_path_weight = ray_important_path_weight or 0.2
 
+        # pseudo-random sampling by default
+        self._sequence = None
+
         # flag indicating if the frame sampler is not supplying any tasks (in which case the rendering process is over)
         self.render_complete = False
+        self.render_statistics = None
+        self.render_passes = 0
+        self.profile = False
+
+        # a single pass per call to observe() by default, unless there is a time budget
+        self._max_passes = -1
+        self._time_budget = 0
+        self._sample_weight = 1.0
+        self._render_samples = None
+        self._started_tasks = None
 
         self.quiet = quiet or False
 
+        # render checkpoints are disabled by default
+        self._checkpoint_file = None
+        self._checkpoint_interval = 600
+        self._checkpoint_timer = 0
+        self._checkpoint_writer = None
+        self._checkpoint_tasks = None
+        self._checkpoint_index = None
+        self._checkpoint_done = None
+
     @property
     def spectral_bins(self):
         """
@@ -260,15 +312,215 @@ cdef class _ObserverBase(Observer):
             raise ValueError("The ray important path weight must be in the range [0, 1].")
         self._ray_important_path_weight = value
 
+    @property
+    def sequence(self):
+        """
+        The low-discrepancy sequence used to sample the pixels (default=None).
+
+        By default the observer samples with pseudo-random numbers. If a
+        sequence, such as SobolSequence, is set the samplers used to
+        generate each pixel's rays draw their samples from the sequence. The
+        BSDF samples of the materials encountered along each ray's path are
+        drawn from the subsequent dimensions of the same sequence point.
+
+        For smooth integrands a quasi-Monte Carlo sequence reaches the same
+        noise level with fewer pixel samples. Each pixel (and each pass of
+        a pixel) uses an independent scramble of the sequence, so the
+        sequence should be scrambled.
+
+        .. code-block:: pycon
+
+            >>> from raysect.core.math import SobolSequence
+            >>>
+            >>> camera.sequence = SobolSequence()
+
+        :rtype: LowDiscrepancySequence
+        """
+        return self._sequence
+
+    @sequence.setter
+    def sequence(self, LowDiscrepancySequence value):
+        self._sequence = value
+
+    @property
+    def max_passes(self):
+        """
+        The maximum number of passes rendered by each call to observe() (default=None).
+
+        Passes are rendered until the frame sampler generates no more tasks,
+        the maximum number of passes have been rendered or the time budget is
+        used. A value of 0 removes the limit, observe() then renders until
+        the render is complete or the time budget is used. For example, with
+        an adaptive frame sampler, a single call to observe() renders the
+        frame until every pixel has converged to the sampler's cutoff error.
+
+        If None, a single pass is rendered unless a time budget is set, in
+        which case passes are rendered until the time budget is used.
+
+        .. code-block:: pycon
+
+            >>> camera.frame_sampler = MonoAdaptiveSampler2D(pipeline, cutoff=0.01)
+            >>> camera.max_passes = 0
+            >>> camera.time_budget = 3600
+            >>> camera.observe()
+
+        :rtype: int
+        """
+        if self._max_passes < 0:
+            return None
+        return self._max_passes
+
+    @max_passes.setter
+    def max_passes(self, value):
+        if value is None:
+            self._max_passes = -1
+            return
+        if value < 0:
+            raise ValueError("The maximum number of passes cannot be negative.")
+        self._max_passes = value
+
+    @property
+    def time_budget(self):
+        """
+        The time in seconds available to each call to observe() (default=None).
+
+        Once the time budget is used the render engine stops issuing render
+        tasks, ending the render part way through a pass. The pixels already
+        rendered are kept, the adaptive frame samplers render the noisiest
+        pixels first so the remaining time is spent where it is most needed.
+        The deadline is only observed by the first spectral slice, pixels
+        started before the deadline are rendered for the remaining slices so
+        the render may overrun the time budget if spectral_rays > 1.
+        Render engines that do not support deadlines finish the current pass.
+        None removes the limit.
+
+        .. code-block:: pycon
+
+            >>> camera.frame_sampler = MonoAdaptiveSampler2D(pipeline, cutoff=0.01)
+            >>> camera.time_budget = 600
+            >>> camera.observe()
+            >>> camera.render_samples.mean()
+
+        :rtype: float
+        """
+        return self._time_budget or None
+
+    @time_budget.setter
+    def time_budget(self, value):
+        if value is None:
+            self._time_budget = 0
+            return
+        if value <= 0:
+            raise ValueError("The time budget must be greater than zero seconds.")
+        self._time_budget = value
+
+    @property
+    def render_samples(self):
+        """
+        The number of samples per pixel rendered by the last call to observe().
+
+        Samples of each spectral slice count as a fraction of a sample, so a
+        pixel that has been sampled over the whole spectral range has a whole
+        number of samples.
+
+        :rtype: ndarray
+        """
+        return self._render_samples
+
+    cpdef observe(self, bint resume=False):
+        """
+        Ask this Camera to Observe its world.
+
+        Each call renders a single pass over the tasks generated by the frame
+        sampler by default, see max_passes and time_budget to render further
+        passes. The pipelines are initialised and finalised for each pass.
+        With a time budget, the render stops at the deadline even part way
+        through a pass, the number of samples achieved per pixel is then
+        available from render_samples.
+
+        If the observer has a checkpoint file, the render state is saved to
+        the file periodically. With resume set to True the render state is
+        first restored from the checkpoint file. If the checkpoint was saved
+        part way through a pass, only the remaining tasks of that pass are
+        rendered, otherwise a new pass is rendered on top of the restored
+        state. A new render is started if the checkpoint file does not exist.
+
+        :param bool resume: Resume the render from the checkpoint file (default=False).
+        """
+
+        cdef:
+            double start
+            int max_passes
+
+        if resume and self._checkpoint_file is None:
+            raise ValueError("A checkpoint file must be set to resume a render.")
+
+        if self.profile and not statistics_enabled():
+            raise RuntimeError("Profiling requires Raysect to be built with statistics enabled, see raysect.core.statistics.")
+
+        self.render_statistics = RenderStatistics() if statistics_enabled() else None
+        self.render_passes = 0
+        self._render_samples = self._new_sample_counts()
+
+        max_passes = self._max_passes
+        if max_passes < 0:
+            max_passes = 0 if self._time_budget else 1
+
+        # the render engine stops issuing tasks at the deadline
+        start = time()
+        if self._time_budget:
+            self.render_engine.deadline = start + self._time_budget
+
+        set_profiling(self.profile)
+        try:
+            while True:
+
+                self._render_pass(resume and self.render_passes == 0)
+                if self.render_complete:
+                    break
+
+                self.render_passes += 1
+                if max_passes and self.render_passes >= max_passes:
+                    break
+
+                if self._time_budget and (time() - start) >= self._time_budget:
+                    break
+        finally:
+            set_profiling(False)
+            if self._time_budget:
+                self.render_engine.deadline = None
+
+        if not self.quiet and max_passes != 1:
+            self._print_sample_summary()
+
+    cpdef object _print_sample_summary(self):
+        """
+        Prints the minimum, mean and maximum samples per pixel of the sampled pixels.
+        """
+
+        samples = self._render_samples[self._render_samples > 0]
+        if samples.size == 0:
+            return
+
+        print("Samples per pixel - min: {:0.1f}, mean: {:0.1f}, max: {:0.1f} ({} passes)".format(
+            samples.min(), samples.mean(), samples.max(), self.render_passes
+        ))
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
-    cpdef observe(self):
-        """ Ask this Camera to Observe its world. """
+    cpdef object _render_pass(self, bint resume):
+        """
+        Renders a pass over the tasks generated by the frame sampler.
+
+        :param bool resume: Resume the pass from the checkpoint file.
+        """
 
         cdef:
-            list slices, templates, tasks
+            list slices, templates, tasks, pending
             int slice_id
             Ray template
+            double pass_start
+            bint interrupted, ray_arrays
 
         self.render_complete = False
 
@@ -279,35 +531,101 @@ cdef class _ObserverBase(Observer):
         # generate spectral configuration and ray templates
         slices = self._slice_spectrum()
         templates = self._generate_templates(slices)
+        self._sample_weight = 1.0 / len(slices)
+        ray_arrays = self._uses_ray_arrays()
 
         # initialise pipelines for rendering
         self._initialise_pipelines(self._min_wavelength, self._max_wavelength, self._spectral_bins, slices, self.quiet)
 
+        # restore the render state, the tasks of an interrupted pass are resumed
+        self._checkpoint_done = None
+        tasks = None
+        if resume:
+            tasks = self._restore_checkpoint(len(slices))
+
         # request render tasks and escape early if there is no work to perform
         # if there is no work to perform then the render is considered "complete"
-        tasks = self._generate_tasks()
+        if tasks is None:
+            tasks = self._generate_tasks()
         if not tasks:
             if not self.quiet:
                 print("Render complete - No render tasks were generated.")
             self.render_complete = True
             return
 
+        # track the completed tasks of the pass for checkpoints
+        if self._checkpoint_file is not None:
+            self._checkpoint_tasks = tasks
+            self._checkpoint_index = {task: index for index, task in enumerate(tasks)}
+            if self._checkpoint_done is None:
+                self._checkpoint_done = np.zeros((len(slices), len(tasks)), dtype=np.bool_)
+            if self._checkpoint_timer == 0:
+                self._checkpoint_timer = time()
+        pass_start = time()
+
         # initialise statistics with total task count
         self._initialise_statistics(tasks)
+        if self._checkpoint_done is not None and not self.quiet:
+            self._stats_completed_tasks = np.count_nonzero(self._checkpoint_done)
 
-        # render each spectral slice
-        for slice_id, template in enumerate(templates):
+        # the render deadline is only observed by the first spectral slice, the later slices
+        # render the tasks started by the first slice so every rendered pixel samples the
+        # full spectral range, partially sampled pixels would bias the pipeline frames
+        deadline = getattr(self.render_engine, "deadline", None)
+        self._started_tasks = None
+        if deadline is not None and len(templates) > 1:
+            self._started_tasks = []
 
-            self.render_engine.run(
-                tasks, self._render_pixel, self._update_state,
-                render_args=(slice_id, template),
-                update_args=(slice_id, )
-            )
+        # render each spectral slice
+        try:
+            for slice_id, template in enumerate(templates):
+
+                # skip the tasks completed before a checkpoint, the engine is still run for
+                # an empty slice so a seeded render resumes with the same random streams
+                pending = tasks
+                if self._checkpoint_done is not None:
+                    pending = [task for task, done in zip(tasks, self._checkpoint_done[slice_id]) if not done]
+
+                if slice_id > 0 and self._started_tasks is not None:
+                    pending = self._started_tasks
+                    if self._checkpoint_done is not None:
+                        pending = [
+                            task for task, first, done in zip(tasks, self._checkpoint_done[0], self._checkpoint_done[slice_id])
+                            if first and not done
+                        ]
+                    self.render_engine.deadline = None
+
+                self.render_engine.run(
+                    pending, self._render_pixel, self._update_state,
+                    render_args=(slice_id, template, ray_arrays),
+                    update_args=(slice_id, )
+                )
+                self._collect_render_statistics()
+        finally:
+            if deadline is not None:
+                self.render_engine.deadline = deadline
+            self._started_tasks = None
+
+        # checkpoint the remaining tasks of a pass stopped at the render deadline, the
+        # pipeline state must be saved before the pipelines are finalised
+        interrupted = self._checkpoint_done is not None and not self._checkpoint_done.all()
+        if interrupted:
+            self._save_checkpoint(True)
 
         # close pipelines and statistics
         self._finalise_pipelines()
         self._finalise_statistics()
 
+        # checkpoint the completed pass, always replacing a checkpoint of an incomplete pass
+        if self._checkpoint_file is not None:
+            self._checkpoint_done = None
+            if not interrupted and ((time() - self._checkpoint_timer) > self._checkpoint_interval or self._checkpoint_timer > pass_start):
+                self._save_checkpoint(False)
+
+            # no checkpoint has been written if the render has been shorter than the checkpoint interval
+            if self._checkpoint_writer is not None:
+                self._checkpoint_writer.wait()
+
     cpdef list _slice_spectrum(self):
         """
         Sub-divides the spectral range into smaller wavelength slices.
@@ -354,13 +672,31 @@ cdef class _ObserverBase(Observer):
             ) for slice in slices
         ]
 
+    cdef bint _uses_ray_arrays(self):
+        """
+        Returns True if the observer's rays are generated by _generate_ray_arrays().
+
+        A subclass that overrides _generate_rays() but not _generate_ray_arrays()
+        customises its rays, the arrays of its base class must not be used. The
+        class hierarchy is searched, so this is evaluated once per render pass.
+        """
+
+        rays = arrays = None
+        for cls in type(self).__mro__:
+            if rays is None and "_generate_rays" in cls.__dict__:
+                rays = cls
+            if arrays is None and "_generate_ray_arrays" in cls.__dict__:
+                arrays = cls
+        return arrays is not None and (rays is None or issubclass(arrays, rays))
+
     #################
     # WORKER THREAD #
     #################
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
-    cpdef object _render_pixel(self, tuple task, int slice_id, Ray template):
+    @cython.initializedcheck(False)
+    cpdef object _render_pixel(self, tuple task, int slice_id, Ray template, bint ray_arrays):
         """
         - passed in are ray_template and pipeline object references
         - unpack task ID (pixel id)
@@ -376,42 +712,85 @@ cdef class _ObserverBase(Observer):
         cdef:
             World world
             list rays, pixel_processors
+            tuple arrays
+            double[:, ::1] origins, directions
+            double[::1] weights
             PixelProcessor processor
             uint64_t ray_count
             double sensitivity, projection_weight
             Ray ray
             Spectrum spectrum
             list results
+            uint32_t path_dimension
+            int index, count
+            AffineMatrix3D to_root
 
         # obtain reference to world
         world = self.root
 
-        # generate rays and obtain pixel processors from each pipeline
-        rays = self._obtain_rays(task, template)
-        pixel_processors = self._obtain_pixel_processors(task, slice_id)
-
-        # initialise ray statistics
-        ray_count = 0
-
-        # obtain pixel sensitivity to convert spectral radiance to spectral power
-        sensitivity = self._obtain_sensitivity(task)
-
-        # launch rays and accumulate spectral samples
-        for ray, projection_weight in rays:
-
-            # convert ray from local space to world space
-            ray.origin = ray.origin.transform(self.to_root())
-            ray.direction = ray.direction.transform(self.to_root())
-
-            # sample, apply projection weight
-            spectrum = ray.trace(world)
-            spectrum.mul_scalar(projection_weight)
-
-            for processor in pixel_processors:
-                processor.add_sample(spectrum, sensitivity)
-
-            # accumulate statistics
-            ray_count += ray.ray_count
+        # select an independent scramble of the sample sequence for this pixel
+        if self._sequence is not None:
+            begin_sequence(self._sequence, new_sequence_seed())
+
+        try:
+
+            # generate rays and obtain pixel processors from each pipeline
+            # observers that support it generate ray arrays, avoiding a list of Ray objects
+            # the ray generation samplers reserve the leading sequence dimensions
+            arrays = None
+            if ray_arrays:
+                arrays = self._obtain_ray_arrays(task)
+            if arrays is None:
+                rays = self._obtain_rays(task, template)
+                count = len(rays)
+            else:
+                origins, directions, weights = arrays
+                count = weights.shape[0]
+                if origins.shape[0] != count or directions.shape[0] != count:
+                    raise ValueError("The ray origin, direction and weight arrays must have the same length.")
+
+            pixel_processors = self._obtain_pixel_processors(task, slice_id)
+            path_dimension = sequence_dimension()
+            to_root = self.to_root()
+
+            # initialise ray statistics
+            ray_count = 0
+
+            # obtain pixel sensitivity to convert spectral radiance to spectral power
+            sensitivity = self._obtain_sensitivity(task)
+
+            # launch rays and accumulate spectral samples
+            for index in range(count):
+
+                # convert ray from local space to world space
+                if arrays is None:
+                    ray, projection_weight = rays[index]
+                    ray.origin = ray.origin.transform(to_root)
+                    ray.direction = ray.direction.transform(to_root)
+                else:
+                    ray = template.copy(
+                        new_point3d(origins[index, 0], origins[index, 1], origins[index, 2]).transform(to_root),
+                        new_vector3d(directions[index, 0], directions[index, 1], directions[index, 2]).transform(to_root)
+                    )
+                    projection_weight = weights[index]
+
+                # path samples are drawn from the remaining dimensions of the ray's sequence point
+                if self._sequence is not None:
+                    sequence_seek(index, path_dimension)
+
+                # sample, apply projection weight
+                spectrum = ray.trace(world)
+                spectrum.mul_scalar(projection_weight)
+
+                for processor in pixel_processors:
+                    processor.add_sample(spectrum, sensitivity)
+
+                # accumulate statistics
+                ray_count += ray.ray_count
+
+        finally:
+            if self._sequence is not None:
+                end_sequence()
 
         # acquire results from pixel processors
         results = [processor.pack_results() for processor in pixel_processors]
@@ -444,6 +823,26 @@ cdef class _ObserverBase(Observer):
         # update pipelines and statistics
         self._update_pipelines(task, results, slice_id)
         self._update_statistics(ray_count)
+        self._record_samples(task, self._sample_weight)
+
+        # record the tasks started before the render deadline
+        if slice_id == 0 and self._started_tasks is not None:
+            self._started_tasks.append(task)
+
+        # record the completed task and periodically checkpoint the render state
+        if self._checkpoint_done is not None:
+            self._checkpoint_done[slice_id, self._checkpoint_index[task]] = True
+            if (time() - self._checkpoint_timer) > self._checkpoint_interval:
+                self._save_checkpoint(True)
+
+    cpdef object _collect_render_statistics(self):
+        """
+        Adds the statistics of the last render engine run to the render statistics.
+        """
+
+        statistics = getattr(self.render_engine, "statistics", None)
+        if self.render_statistics is not None and statistics is not None:
+            self.render_statistics += statistics
 
     cpdef list _generate_tasks(self):
         raise NotImplementedError("To be defined in subclass.")
@@ -460,6 +859,12 @@ cdef class _ObserverBase(Observer):
     cpdef object _finalise_pipelines(self):
         raise NotImplementedError("To be defined in subclass.")
 
+    cpdef object _new_sample_counts(self):
+        raise NotImplementedError("To be defined in subclass.")
+
+    cpdef object _record_samples(self, tuple task, double weight):
+        raise NotImplementedError("To be defined in subclass.")
+
     cpdef object _initialise_statistics(self, list tasks):
         """
         Initialise statistics.
@@ -510,6 +915,11 @@ cdef class _ObserverBase(Observer):
         print("Render complete - time elapsed {:0.3f}s - {:0.1f}k rays/s".format(
             elapsed_time, mean_rays_per_sec / 1000))
 
+        if self.render_statistics is not None:
+            print(self.render_statistics.summary())
+            if self.profile:
+                print(self.render_statistics.profile.table(limit=20))
+
     cpdef list _obtain_rays(self, tuple task, Ray template):
         """
         Returns a list of Rays that sample over the sensitivity of the pixel.
@@ -534,6 +944,53 @@ cdef class _ObserverBase(Observer):
 
         raise NotImplementedError("To be defined in subclass.")
 
+    cpdef tuple _obtain_ray_arrays(self, tuple task):
+        """
+        Returns arrays describing the rays that sample over the sensitivity of the pixel.
+
+        This is a virtual method to be implemented by derived classes.
+
+        Observers may optionally generate the ray origins, directions and
+        weights as arrays rather than a list of Ray objects. If None is returned
+        the rays are obtained with _obtain_rays().
+
+        :param tuple task: The render task configuration.
+        :return: A tuple of (origins, directions, weights) arrays or None.
+        """
+
+        return None
+
+    cdef list _rays_from_arrays(self, Ray template, tuple arrays):
+        """
+        Converts the arrays returned by _generate_ray_arrays() to a list of (ray, weight) tuples.
+
+        Allows observers that generate ray arrays to implement _generate_rays()
+        without duplicating the sampling code.
+
+        :param Ray template: The template ray from which all rays should be generated.
+        :param tuple arrays: A tuple of (origins, directions, weights) arrays.
+        :return list: A list of tuples of (ray, weight)
+        """
+
+        cdef:
+            double[:, ::1] origins, directions
+            double[::1] weights
+            list rays
+            int i
+
+        origins, directions, weights = arrays
+
+        rays = []
+        for i in range(weights.shape[0]):
+            rays.append((
+                template.copy(
+                    new_point3d(origins[i, 0], origins[i, 1], origins[i, 2]),
+                    new_vector3d(directions[i, 0], directions[i, 1], directions[i, 2])
+                ),
+                weights[i]
+            ))
+        return rays
+
     cpdef double _obtain_sensitivity(self, tuple task):
         """
 
@@ -543,6 +1000,88 @@ cdef class _ObserverBase(Observer):
 
         raise NotImplementedError("To be defined in subclass.")
 
+    cpdef dict _checkpoint_pipelines(self):
+        """
+        Returns the render state of the pipelines as a dictionary of numpy arrays.
+
+        This is a virtual method to be implemented by observers that support
+        render checkpoints.
+        """
+
+        raise NotImplementedError("Render checkpoints are not supported by this observer.")
+
+    cpdef object _restore_pipelines(self, dict arrays):
+        """
+        Restores the render state of the pipelines from a checkpoint.
+
+        This is a virtual method to be implemented by observers that support
+        render checkpoints.
+
+        :param dict arrays: The checkpoint arrays.
+        """
+
+        raise NotImplementedError("Render checkpoints are not supported by this observer.")
+
+    cpdef list _restore_checkpoint(self, int slices):
+        """
+        Restores the render state from the checkpoint file.
+
+        :param int slices: The number of spectral slices.
+        :return: The task list of an interrupted pass or None.
+        """
+
+        cdef list tasks
+
+        if not os.path.exists(self._checkpoint_file):
+            return None
+
+        arrays = read_checkpoint(self._checkpoint_file)
+
+        spectral = (self._min_wavelength, self._max_wavelength, self._spectral_bins, self._spectral_rays)
+        if tuple(arrays["spectral"]) != spectral:
+            raise ValueError("The spectral configuration of the checkpoint does not match the observer.")
+
+        self._restore_pipelines(arrays)
+
+        # was the checkpoint saved part way through a pass?
+        if "tasks" not in arrays:
+            return None
+
+        if arrays["done"].shape != (slices, len(arrays["tasks"])):
+            raise ValueError("The task record of the checkpoint is inconsistent.")
+
+        self._checkpoint_done = arrays["done"].copy()
+        tasks = [tuple(task) for task in arrays["tasks"].tolist()]
+
+        if not self.quiet:
+            print("Resuming render from checkpoint - {} of {} tasks complete.".format(
+                np.count_nonzero(self._checkpoint_done), self._checkpoint_done.size))
+
+        return tasks
+
+    cpdef object _save_checkpoint(self, bint pending):
+        """
+        Writes the render state to the checkpoint file in the background.
+
+        :param bool pending: True if the current pass is incomplete.
+        """
+
+        arrays = self._checkpoint_pipelines()
+        arrays["spectral"] = np.array([self._min_wavelength, self._max_wavelength, self._spectral_bins, self._spectral_rays], dtype=np.float64)
+
+        # the task list and completed tasks of an incomplete pass
+        if pending:
+            arrays["tasks"] = np.array(self._checkpoint_tasks, dtype=np.int64)
+            arrays["done"] = self._checkpoint_done.copy()
+
+        if self._checkpoint_writer is None:
+            self._checkpoint_writer = CheckpointWriter()
+        self._checkpoint_writer.write(self._checkpoint_file, arrays)
+        self._checkpoint_timer = time()
+
+        if not self.quiet:
+            print("Saving render checkpoint to '{}'.".format(self._checkpoint_file))
+
 
 cdef class Observer0D(_ObserverBase):
     """
@@ -558,6 +1097,8 @@ cdef class Observer0D(_ObserverBase):
     :param kwargs: **kwargs from _ObserverBase.
 
     .. automethod:: raysect.optical.observer.base.observer.Observer0D._generate_rays
+
+    .. automethod:: raysect.optical.observer.base.observer.Observer0D._generate_ray_arrays
     """
 
     def __init__(self, pipelines, parent=None, transform=None, name=None,
@@ -667,11 +1208,24 @@ cdef class Observer0D(_ObserverBase):
         for pipeline in self._pipelines:
             pipeline.finalise()
 
+    cpdef object _new_sample_counts(self):
+        return np.zeros(1)
+
+    cpdef object _record_samples(self, tuple task, double weight):
+        cdef int samples
+        samples, = task
+        self._render_samples[0] += samples * weight
+
     cpdef list _obtain_rays(self, tuple task, Ray template):
         cdef int samples
         samples, = task
         return self._generate_rays(template, samples)
 
+    cpdef tuple _obtain_ray_arrays(self, tuple task):
+        cdef int samples
+        samples, = task
+        return self._generate_ray_arrays(samples)
+
     cpdef double _obtain_sensitivity(self, tuple task):
         return self._pixel_sensitivity()
 
@@ -705,6 +1259,29 @@ cdef class Observer0D(_ObserverBase):
 
         raise NotImplementedError("To be defined in subclass.")
 
+    cpdef tuple _generate_ray_arrays(self, int ray_count):
+        """
+        Generate arrays describing the rays that sample over the sensitivity of the pixel.
+
+        This is an optional virtual method that may be implemented by derived classes.
+
+        Generating the ray origins, directions and weights as arrays is
+        substantially faster than building a list of Ray objects. If this
+        method returns None (the default), the rays are obtained from
+        _generate_rays() instead. A subclass that overrides _generate_rays()
+        must also override this method for its ray arrays to be used.
+
+        The method must return a tuple of three numpy arrays (origins, directions,
+        weights). The origins and directions are (N, 3) float64 arrays of local
+        space coordinates, the weights are an (N,) float64 array of the ray
+        weights described in _generate_rays(). N must be equal to ray_count.
+
+        :param int ray_count: The number of rays to be generated.
+        :return: A tuple of (origins, directions, weights) arrays or None.
+        """
+
+        return None
+
     cpdef double _pixel_sensitivity(self):
         """
 
@@ -842,11 +1419,24 @@ cdef class Observer1D(_ObserverBase):
         for pipeline in self._pipelines:
             pipeline.finalise()
 
+    cpdef object _new_sample_counts(self):
+        return np.zeros(self._pixels)
+
+    cpdef object _record_samples(self, tuple task, double weight):
+        cdef int pixel
+        pixel, = task
+        self._render_samples[pixel] += self._pixel_samples * weight
+
     cpdef list _obtain_rays(self, tuple task, Ray template):
         cdef int pixel
         pixel, = task
         return self._generate_rays(pixel, template, self._pixel_samples)
 
+    cpdef tuple _obtain_ray_arrays(self, tuple task):
+        cdef int pixel
+        pixel, = task
+        return self._generate_ray_arrays(pixel, self._pixel_samples)
+
     cpdef double _obtain_sensitivity(self, tuple task):
         cdef int pixel
         pixel, = task
@@ -883,6 +1473,30 @@ cdef class Observer1D(_ObserverBase):
 
         raise NotImplementedError("To be defined in subclass.")
 
+    cpdef tuple _generate_ray_arrays(self, int pixel, int ray_count):
+        """
+        Generate arrays describing the rays that sample over the sensitivity of the pixel.
+
+        This is an optional virtual method that may be implemented by derived classes.
+
+        Generating the ray origins, directions and weights as arrays is
+        substantially faster than building a list of Ray objects. If this
+        method returns None (the default), the rays are obtained from
+        _generate_rays() instead. A subclass that overrides _generate_rays()
+        must also override this method for its ray arrays to be used.
+
+        The method must return a tuple of three numpy arrays (origins, directions,
+        weights). The origins and directions are (N, 3) float64 arrays of local
+        space coordinates, the weights are an (N,) float64 array of the ray
+        weights described in _generate_rays(). N must be equal to ray_count.
+
+        :param int pixel: Pixel index.
+        :param int ray_count: The number of rays to be generated.
+        :return: A tuple of (origins, directions, weights) arrays or None.
+        """
+
+        return None
+
     cpdef double _pixel_sensitivity(self, int pixel):
         """
 
@@ -906,6 +1520,17 @@ cdef class Observer2D(_ObserverBase):
     :param int pixel_samples: Number of samples to generate per pixel with one call to
       observe() (default=1000).
     :param kwargs: **kwargs from _ObserverBase.
+
+    Long renders may be checkpointed. If checkpoint_file is set, the frames of
+    the pipelines and the progress of the current pass are periodically saved
+    to the file. An interrupted render is resumed with observe(resume=True).
+
+    .. code-block:: pycon
+
+        >>> camera.checkpoint_file = 'render.npz'
+        >>> camera.checkpoint_interval = 300
+        >>> for _ in range(passes):
+        >>>     camera.observe(resume=True)
     """
 
     def __init__(self, pixels, frame_sampler, pipelines, parent=None, transform=None, name=None,
@@ -994,6 +1619,40 @@ cdef class Observer2D(_ObserverBase):
                 raise TypeError("Processing pipelines for a 2d observer must be a subclass of Pipeline2D.")
         self._pipelines = pipelines
 
+    @property
+    def checkpoint_file(self):
+        """
+        Path of the render checkpoint file or None if checkpoints are disabled (default=None).
+
+        The render state of the pipelines is written to the file at intervals of
+        checkpoint_interval seconds and at the end of each pass. Files are
+        written in the background and replaced atomically. All the pipelines
+        must support checkpoints.
+
+        :rtype: str
+        """
+        return self._checkpoint_file
+
+    @checkpoint_file.setter
+    def checkpoint_file(self, value):
+        self._checkpoint_file = None if value is None else os.fspath(value)
+        self._checkpoint_timer = 0
+
+    @property
+    def checkpoint_interval(self):
+        """
+        The minimum time in seconds between render checkpoints (default=600).
+
+        :rtype: float
+        """
+        return self._checkpoint_interval
+
+    @checkpoint_interval.setter
+    def checkpoint_interval(self, value):
+        if value <= 0:
+            raise ValueError("The checkpoint interval must be greater than zero seconds.")
+        self._checkpoint_interval = value
+
     cpdef list _generate_tasks(self):
         return self._frame_sampler.generate_tasks(self._pixels)
 
@@ -1007,7 +1666,15 @@ cdef class Observer2D(_ObserverBase):
         return [pipeline.pixel_processor(x, y, slice_id) for pipeline in self._pipelines]
 
     cpdef object _initialise_pipelines(self, double min_wavelength, double max_wavelength, int spectral_bins, list slices, bint quiet):
+
         cdef Pipeline2D pipeline
+
+        # fail before rendering if a pipeline cannot be checkpointed
+        if self._checkpoint_file is not None:
+            for pipeline in self._pipelines:
+                if not _supports_checkpoints(pipeline):
+                    raise TypeError("The pipeline '{}' does not support render checkpoints.".format(type(pipeline).__name__))
+
         for pipeline in self._pipelines:
             pipeline.initialise(self._pixels, self._pixel_samples, self._min_wavelength, self._max_wavelength, self._spectral_bins, slices, quiet)
 
@@ -1027,11 +1694,64 @@ cdef class Observer2D(_ObserverBase):
         for pipeline in self._pipelines:
             pipeline.finalise()
 
+    cpdef object _new_sample_counts(self):
+        return np.zeros(self._pixels)
+
+    cpdef object _record_samples(self, tuple task, double weight):
+        cdef int x, y
+        x, y = task
+        self._render_samples[x, y] += self._pixel_samples * weight
+
+    cpdef dict _checkpoint_pipelines(self):
+
+        cdef:
+            dict arrays
+            int index
+            Pipeline2D pipeline
+
+        arrays = {
+            "pixels": np.array(self._pixels, dtype=np.int64),
+            "pixel_samples": np.array(self._pixel_samples, dtype=np.int64),
+            "pipelines": np.array([type(pipeline).__name__ for pipeline in self._pipelines])
+        }
+
+        for index, pipeline in enumerate(self._pipelines):
+            for key, value in pipeline.checkpoint_state().items():
+                arrays["pipeline{}/{}".format(index, key)] = value
+
+        return arrays
+
+    cpdef object _restore_pipelines(self, dict arrays):
+
+        cdef:
+            int index
+            str prefix
+            Pipeline2D pipeline
+
+        if tuple(arrays["pixels"]) != self._pixels:
+            raise ValueError("The pixel dimensions of the checkpoint do not match the observer.")
+
+        # the partial results of an interrupted pass are normalised by the pixel samples
+        if "tasks" in arrays and arrays["pixel_samples"] != self._pixel_samples:
+            raise ValueError("The pixel samples of the checkpoint do not match the interrupted pass.")
+
+        if list(arrays["pipelines"]) != [type(pipeline).__name__ for pipeline in self._pipelines]:
+            raise ValueError("The pipelines of the checkpoint do not match the observer.")
+
+        for index, pipeline in enumerate(self._pipelines):
+            prefix = "pipeline{}/".format(index)
+            pipeline.restore_state({key[len(prefix):]: value for key, value in arrays.items() if key.startswith(prefix)})
+
     cpdef list _obtain_rays(self, tuple task, Ray template):
         cdef int x, y
         x, y = task
         return self._generate_rays(x, y, template, self._pixel_samples)
 
+    cpdef tuple _obtain_ray_arrays(self, tuple task):
+        cdef int x, y
+        x, y = task
+        return self._generate_ray_arrays(x, y, self._pixel_samples)
+
     cpdef double _obtain_sensitivity(self, tuple task):
         cdef int x, y
         x, y = task
@@ -1069,6 +1789,31 @@ cdef class Observer2D(_ObserverBase):
 
         raise NotImplementedError("To be defined in subclass.")
 
+    cpdef tuple _generate_ray_arrays(self, int x, int y, int ray_count):
+        """
+        Generate arrays describing the rays that sample over the sensitivity of the pixel.
+
+        This is an optional virtual method that may be implemented by derived classes.
+
+        Generating the ray origins, directions and weights as arrays is
+        substantially faster than building a list of Ray objects. If this
+        method returns None (the default), the rays are obtained from
+        _generate_rays() instead. A subclass that overrides _generate_rays()
+        must also override this method for its ray arrays to be used.
+
+        The method must return a tuple of three numpy arrays (origins, directions,
+        weights). The origins and directions are (N, 3) float64 arrays of local
+        space coordinates, the weights are an (N,) float64 array of the ray
+        weights described in _generate_rays(). N must be equal to ray_count.
+
+        :param int x: Pixel x index.
+        :param int y: Pixel y index.
+        :param int ray_count: The number of rays to be generated.
+        :return: A tuple of (origins, directions, weights) arrays or None.
+        """
+
+        return None
+
     cpdef double _pixel_sensitivity(self, int x, int y):
         """
 
@@ -64,3 +64,7 @@ cdef class Pipeline2D:
 
     cpdef object finalise(self)
 
+    cpdef dict checkpoint_state(self)
+
+    cpdef object restore_state(self, dict state)
+
@@ -264,3 +264,33 @@ cdef class Pipeline2D:
         This is a virtual method and must be implemented in a sub class.
         """
         raise NotImplementedError("Virtual method must be implemented by a sub-class.")
+
+    cpdef dict checkpoint_state(self):
+        """
+        Returns a snapshot of the pipeline's render state for a render checkpoint.
+
+        The state is a dictionary of numpy arrays holding the accumulated
+        frame and any partial results of the current pass, sufficient for
+        restore_state() to resume an interrupted render. The arrays must be
+        copies as they are written to disk in the background.
+
+        This is a virtual method and must be implemented in a sub class for
+        the pipeline to support render checkpoints.
+
+        :return: A dictionary of numpy arrays.
+        """
+        raise NotImplementedError("Virtual method must be implemented by a sub-class.")
+
+    cpdef object restore_state(self, dict state):
+        """
+        Restores the render state returned by checkpoint_state().
+
+        Called after initialise() when an observer resumes a render from a
+        checkpoint.
+
+        This is a virtual method and must be implemented in a sub class for
+        the pipeline to support render checkpoints.
+
+        :param dict state: A dictionary of numpy arrays.
+        """
+        raise NotImplementedError("Virtual method must be implemented by a sub-class.")
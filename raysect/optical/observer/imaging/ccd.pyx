@@ -33,10 +33,14 @@
 from raysect.optical.observer.sampler2d import FullFrameSampler2D
 from raysect.optical.observer.pipeline import RGBPipeline2D
 
+import numpy as np
+
 from raysect.core cimport RectangleSampler3D, HemisphereCosineSampler, SolidAngleSampler, SurfaceSampler3D
-from raysect.optical cimport Ray, AffineMatrix3D, Point3D, Vector3D, translate
+from raysect.optical cimport Ray
 from libc.math cimport M_PI
+from numpy cimport ndarray
 from raysect.optical.observer.base cimport Observer2D
+cimport cython
 
 
 cdef class CCDArray(Observer2D):
@@ -116,41 +120,40 @@ cdef class CCDArray(Observer2D):
         self.point_sampler = RectangleSampler3D(self.image_delta, self.image_delta)
         self._pixel_area = (self._width / self._pixels[0])**2
 
-    cpdef list _generate_rays(self, int ix, int iy, Ray template, int ray_count):
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cpdef tuple _generate_ray_arrays(self, int ix, int iy, int ray_count):
 
         cdef:
             double pixel_x, pixel_y
-            list origin_points, direction_vectors, rays
-            Point3D origin
-            Vector3D direction
-            Ray ray
-            AffineMatrix3D pixel_to_local
+            ndarray origins, directions, weights
+            double[:, ::1] origins_mv
+            int i
 
         # generate pixel transform
         pixel_x = self.image_start_x - self.image_delta * ix
         pixel_y = self.image_start_y - self.image_delta * iy
-        pixel_to_local = translate(pixel_x, pixel_y, 0)
 
         # generate origin and direction vectors
-        origin_points = self.point_sampler.samples(ray_count)
-        direction_vectors = self.vector_sampler.samples(ray_count)
+        origins = self.point_sampler.samples_array(ray_count)
+        directions = self.vector_sampler.samples_array(ray_count)
 
-        # assemble rays
-        rays = []
-        for origin, direction in zip(origin_points, direction_vectors):
+        # transform origins to local space from pixel space, the translation does not affect the directions
+        origins_mv = origins
+        for i in range(ray_count):
+            origins_mv[i, 0] += pixel_x
+            origins_mv[i, 1] += pixel_y
 
-            # transform to local space from pixel space
-            origin = origin.transform(pixel_to_local)
-            direction = direction.transform(pixel_to_local)
+        # cosine weighted distribution
+        # projected area cosine is implicit in distribution
+        # weight = (1 / 2*pi) * (pi / cos(theta)) * cos(theta) = 0.5
+        weights = np.full(ray_count, 0.5)
 
-            ray = template.copy(origin, direction)
+        return origins, directions, weights
 
-            # cosine weighted distribution
-            # projected area cosine is implicit in distribution
-            # weight = (1 / 2*pi) * (pi / cos(theta)) * cos(theta) = 0.5
-            rays.append((ray, 0.5))
-
-        return rays
+    cpdef list _generate_rays(self, int ix, int iy, Ray template, int ray_count):
+        return self._rays_from_arrays(template, self._generate_ray_arrays(ix, iy, ray_count))
 
     cpdef double _pixel_sensitivity(self, int x, int y):
         return self._pixel_area * 2 * M_PI
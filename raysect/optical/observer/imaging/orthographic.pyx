@@ -31,9 +31,13 @@ from raysect.optical.observer.sampler2d import FullFrameSampler2D
 from raysect.optical.observer.pipeline import RGBPipeline2D
 from raysect.optical.observer.sampler2d import RGBAdaptiveSampler2D
 
-from raysect.core cimport Point3D, new_vector3d, translate, RectangleSampler3D, AffineMatrix3D
+import numpy as np
+
+from raysect.core cimport RectangleSampler3D
 from raysect.optical cimport Ray
+from numpy cimport ndarray
 from raysect.optical.observer.base cimport Observer2D
+cimport cython
 
 
 cdef class OrthographicCamera(Observer2D):
@@ -113,35 +117,39 @@ cdef class OrthographicCamera(Observer2D):
         self.image_start_y = 0.5 * self._pixels[1] * self.image_delta
         self._point_sampler = RectangleSampler3D(self.image_delta, self.image_delta)
 
-    cpdef list _generate_rays(self, int ix, int iy, Ray template, int ray_count):
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cpdef tuple _generate_ray_arrays(self, int ix, int iy, int ray_count):
 
         cdef:
             double pixel_x, pixel_y
-            list points, rays
-            Point3D origin
-            Ray ray
-            AffineMatrix3D to_local
+            ndarray origins, directions, weights
+            double[:, ::1] origins_mv
+            int i
 
         # generate pixel transform
         pixel_x = self.image_start_x - self.image_delta * ix
         pixel_y = self.image_start_y - self.image_delta * iy
-        to_local = translate(pixel_x, pixel_y, 0)
 
-        # generate origin and direction vectors
-        points = self._point_sampler.samples(self._pixel_samples)
+        # generate origins and transform to local space from pixel space
+        origins = self._point_sampler.samples_array(ray_count)
+        origins_mv = origins
+        for i in range(ray_count):
+            origins_mv[i, 0] += pixel_x
+            origins_mv[i, 1] += pixel_y
 
-        # assemble rays
-        rays = []
-        for origin in points:
+        # rays are fired along the normal
+        directions = np.zeros((ray_count, 3))
+        directions[:, 2] = 1
 
-            # transform to local space from pixel space
-            origin = origin.transform(to_local)
-            ray = template.copy(origin, new_vector3d(0, 0, 1))
+        # non-physical camera samples radiance directly, rays fired along normal so no projection
+        weights = np.ones(ray_count)
 
-            # non-physical camera samples radiance directly, rays fired along normal so no projection
-            rays.append((ray, 1.0))
+        return origins, directions, weights
 
-        return rays
+    cpdef list _generate_rays(self, int ix, int iy, Ray template, int ray_count):
+        return self._rays_from_arrays(template, self._generate_ray_arrays(ix, iy, ray_count))
 
     cpdef double _pixel_sensitivity(self, int ix, int iy):
         return self._sensitivity
@@ -31,10 +31,14 @@ from raysect.optical.observer.sampler2d import FullFrameSampler2D
 from raysect.optical.observer.pipeline import RGBPipeline2D
 from raysect.optical.observer.sampler2d import RGBAdaptiveSampler2D
 
-from raysect.core cimport Point3D, new_point3d, Vector3D, new_vector3d, RectangleSampler3D
+import numpy as np
+
+from raysect.core cimport RectangleSampler3D
 from raysect.optical cimport Ray
-from libc.math cimport M_PI as pi, tan
+from libc.math cimport M_PI as pi, tan, sqrt
+from numpy cimport ndarray
 from raysect.optical.observer.base cimport Observer2D
+cimport cython
 
 
 cdef class PinholeCamera(Observer2D):
@@ -144,42 +148,54 @@ cdef class PinholeCamera(Observer2D):
         else:
             raise RuntimeError("Number of Pinhole camera Pixels must be > 1.")
 
-    cpdef list _generate_rays(self, int x, int y, Ray template, int ray_count):
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    @cython.cdivision(True)
+    cpdef tuple _generate_ray_arrays(self, int x, int y, int ray_count):
 
         cdef:
-            double pixel_x, pixel_y
-            list points, rays
-            Point3D pixel_centre, point, origin
-            Vector3D direction
-            Ray ray
+            double pixel_x, pixel_y, dx, dy, dz, inv_length
+            ndarray origins, directions, weights
+            double[:, ::1] directions_mv
+            double[::1] weights_mv
+            int i
 
         # generate pixel transform
         pixel_x = self.image_start_x - self.image_delta * x
         pixel_y = self.image_start_y - self.image_delta * y
-        pixel_centre = new_point3d(pixel_x, pixel_y, 1)
 
-        points = self.point_sampler.samples(ray_count)
+        # rays are launched from the pinhole at the origin
+        origins = np.zeros((ray_count, 3))
+
+        # the sample points are converted to directions in place
+        directions = self.point_sampler.samples_array(ray_count)
+        directions_mv = directions
 
-        # assemble rays
-        rays = []
-        for point in points:
+        weights = np.empty(ray_count)
+        weights_mv = weights
+
+        for i in range(ray_count):
 
             # calculate point in virtual image plane to be used for ray direction
-            origin = new_point3d(0, 0, 0)
-            direction = new_vector3d(
-                point.x + pixel_centre.x,
-                point.y + pixel_centre.y,
-                point.z + pixel_centre.z
-            ).normalise()
+            dx = directions_mv[i, 0] + pixel_x
+            dy = directions_mv[i, 1] + pixel_y
+            dz = directions_mv[i, 2] + 1
+            inv_length = 1.0 / sqrt(dx * dx + dy * dy + dz * dz)
 
-            ray = template.copy(origin, direction)
+            directions_mv[i, 0] = dx * inv_length
+            directions_mv[i, 1] = dy * inv_length
+            directions_mv[i, 2] = dz * inv_length
 
             # non-physical camera, samples radiance directly
             # projected area weight is normal.incident which simplifies
             # to incident.z here as the normal is (0, 0 ,1)
-            rays.append((ray, direction.z))
+            weights_mv[i] = directions_mv[i, 2]
+
+        return origins, directions, weights
 
-        return rays
+    cpdef list _generate_rays(self, int x, int y, Ray template, int ray_count):
+        return self._rays_from_arrays(template, self._generate_ray_arrays(x, y, ray_count))
 
     cpdef double _pixel_sensitivity(self, int x, int y):
         return self._sensitivity
@@ -36,3 +36,4 @@ from .targetted_pixel import TargettedPixel
 from .mesh_pixel import MeshPixel
 from .mesh_camera import MeshCamera
 
+from .observer_group import ObserverGroup
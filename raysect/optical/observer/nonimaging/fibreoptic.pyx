@@ -31,9 +31,11 @@
 
 from libc.math cimport cos, M_PI as PI
 
-from raysect.core cimport Vector3D
+import numpy as np
+
 from raysect.core.math.sampler cimport DiskSampler3D, ConeUniformSampler
 from raysect.optical cimport Ray
+from numpy cimport ndarray
 from raysect.optical.observer.base cimport Observer0D
 from raysect.optical.observer.pipeline.spectral import SpectralPowerPipeline0D
 cimport cython
@@ -135,30 +137,34 @@ cdef class FibreOptic(Observer0D):
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
-    cpdef list _generate_rays(self, Ray template, int ray_count):
+    @cython.initializedcheck(False)
+    cpdef tuple _generate_ray_arrays(self, int ray_count):
 
         cdef:
-            list rays, origins, directions
-            double pdf
-            Vector3D direction
-            int n
-
-        origins = self._point_sampler.samples(ray_count)
-        directions = self._vector_sampler.samples_with_pdfs(ray_count)
-
-        rays = []
-        for n in range(ray_count):
-
-            # projected area weight is normal.incident which simplifies
-            # to incident.z here as the normal is (0, 0 ,1)
-            # weight = 1/(Omega) * 1/(omega_sample_pdf) * 1/(Area) * 1/(x_sample_pdf) * cos(theta)
-            # Note: 1/area * 1/area_pdf cancels when doing uniform area point sampling
-            # Note: 1/(Omega) * 1/(omega_sample_pdf) cancels when doing uniform vector sampling
-            # Therefore, weight = cos(theta) term only.
-            direction, pdf = directions[n]
-            rays.append((template.copy(origins[n], direction), direction.z))
-
-        return rays
+            ndarray origins, directions, weights
+            double[:, ::1] directions_mv
+            double[::1] weights_mv
+            int i
+
+        origins = self._point_sampler.samples_array(ray_count)
+        directions = self._vector_sampler.samples_array(ray_count)
+
+        # projected area weight is normal.incident which simplifies
+        # to incident.z here as the normal is (0, 0 ,1)
+        # weight = 1/(Omega) * 1/(omega_sample_pdf) * 1/(Area) * 1/(x_sample_pdf) * cos(theta)
+        # Note: 1/area * 1/area_pdf cancels when doing uniform area point sampling
+        # Note: 1/(Omega) * 1/(omega_sample_pdf) cancels when doing uniform vector sampling
+        # Therefore, weight = cos(theta) term only.
+        weights = np.empty(ray_count)
+        weights_mv = weights
+        directions_mv = directions
+        for i in range(ray_count):
+            weights_mv[i] = directions_mv[i, 2]
+
+        return origins, directions, weights
+
+    cpdef list _generate_rays(self, Ray template, int ray_count):
+        return self._rays_from_arrays(template, self._generate_ray_arrays(ray_count))
 
     @property
     def collection_area(self):
@@ -0,0 +1,296 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2017, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+from time import time
+from libc.stdint cimport uint64_t
+from raysect.core.workflow import RenderEngine, MulticoreEngine
+from raysect.core.statistics import statistics_enabled, set_profiling
+
+from raysect.optical cimport World, Ray
+from raysect.optical.observer.base cimport Observer0D
+
+
+cdef class ObserverGroup:
+    """
+    Renders a group of 0D observers with a single render engine run.
+
+    Diagnostics are frequently composed of many 0D observers, such as
+    sight-lines, fibres and pixels. Each observe() call only generates a
+    handful of tasks, which cannot keep a multicore render engine busy. The
+    observer group collects the render tasks of all its observers, and all
+    their spectral slices, and processes them in a single run of the group's
+    render engine. The tasks of the different observers are interleaved so
+    the work is spread evenly over the render engine's workers.
+
+    The observers may be of different types and configurations. Each observer
+    keeps its own pipelines, spectral configuration, pixel samples and ray
+    settings. The render engines of the individual observers are not used.
+
+    If Raysect is built with render statistics enabled, the counters of the
+    group's render are held in the render_statistics attribute. Setting the
+    profile attribute to True additionally profiles the time spent in each
+    material and primitive, see raysect.core.statistics.
+
+    :param list observers: A list of 0D observers.
+    :param object render_engine: A workflow manager for controlling whether tasks will be
+      executed in serial, parallel or on a cluster (default=MulticoreEngine()).
+    :param bool quiet: When True, suppresses the printing of render statistics (default=False).
+
+    .. code-block:: pycon
+
+        >>> from raysect.optical.observer import FibreOptic, SightLine, ObserverGroup, PowerPipeline0D
+        >>>
+        >>> fibres = [FibreOptic([PowerPipeline0D()], parent=world, transform=transform)
+                      for transform in fibre_transforms]
+        >>> sightline = SightLine([PowerPipeline0D()], parent=world)
+        >>>
+        >>> group = ObserverGroup(fibres + [sightline])
+        >>> group.observe()
+    """
+
+    cdef:
+        list _observers
+        public object render_engine
+        public bint quiet
+        readonly bint render_complete
+        readonly object render_statistics
+        public bint profile
+        list _templates
+        list _ray_arrays
+        double _stats_start_time
+        double _stats_progress_timer
+        uint64_t _stats_ray_count
+        uint64_t _stats_total_rays
+        uint64_t _stats_total_tasks
+        uint64_t _stats_completed_tasks
+
+    def __init__(self, observers=None, render_engine=None, quiet=False):
+
+        self.observers = observers or []
+        self.render_engine = render_engine or MulticoreEngine()
+        self.quiet = quiet
+        self.render_complete = False
+        self.render_statistics = None
+        self.profile = False
+        self._templates = []
+        self._ray_arrays = []
+
+    @property
+    def observers(self):
+        """
+        The list of 0D observers in the group.
+
+        :rtype: list
+        """
+        return list(self._observers)
+
+    @observers.setter
+    def observers(self, value):
+
+        observers = list(value)
+        for observer in observers:
+            if not isinstance(observer, Observer0D):
+                raise TypeError("The observers in an observer group must be 0D observers.")
+
+        self._observers = observers
+
+    def add(self, Observer0D observer):
+        """
+        Adds an observer to the group.
+
+        :param Observer0D observer: The 0D observer to add.
+        """
+
+        self._observers.append(observer)
+
+    cpdef observe(self):
+        """
+        Ask each observer in the group to observe its world.
+
+        All the render tasks of the observers are processed with a single run
+        of the group's render engine.
+        """
+
+        cdef:
+            list slices, templates, tasks, observer_tasks, queues, rendered
+            int index, slice_id
+            Observer0D observer
+            tuple task
+
+        self.render_complete = False
+        self.render_statistics = None
+        for observer in self._observers:
+            observer.render_complete = False
+
+        if self.profile and not statistics_enabled():
+            raise RuntimeError("Profiling requires Raysect to be built with statistics enabled, see raysect.core.statistics.")
+
+        # all observers must be connected to a world to be able to perform a ray trace
+        for observer in self._observers:
+            if not isinstance(observer.root, World):
+                raise TypeError("Observer '{}' is not connected to a scene graph containing a World object.".format(observer.name))
+
+        # configure each observer and build a task queue per observer
+        # a group task identifies the observer, the spectral slice and the observer's own task
+        self._templates = []
+        self._ray_arrays = []
+        queues = []
+        rendered = []
+        for index, observer in enumerate(self._observers):
+
+            # generate spectral configuration and ray templates
+            slices = observer._slice_spectrum()
+            templates = observer._generate_templates(slices)
+            self._templates.append(templates)
+            self._ray_arrays.append(observer._uses_ray_arrays())
+
+            # initialise pipelines for rendering
+            observer._initialise_pipelines(observer._min_wavelength, observer._max_wavelength, observer._spectral_bins, slices, observer.quiet)
+
+            # as in observe(), the pipelines of an observer without tasks are not finalised
+            observer_tasks = observer._generate_tasks()
+            queues.append([(index, slice_id, task) for slice_id in range(len(templates)) for task in observer_tasks])
+            if observer_tasks:
+                rendered.append(observer)
+
+        # interleave the task queues so each part of the task list contains work from every observer
+        tasks = []
+        index = 0
+        while queues:
+            queues = [queue for queue in queues if len(queue) > index]
+            for queue in queues:
+                tasks.append(queue[index])
+            index += 1
+
+        if not tasks:
+            if not self.quiet:
+                print("Render complete - No render tasks were generated.")
+            self._complete()
+            return
+
+        self._initialise_statistics(tasks)
+        set_profiling(self.profile)
+        try:
+            self.render_engine.run(tasks, self._render_task, self._update_state)
+        finally:
+            set_profiling(False)
+        self.render_statistics = getattr(self.render_engine, "statistics", None)
+
+        # close pipelines and statistics
+        for observer in rendered:
+            observer._finalise_pipelines()
+        self._finalise_statistics()
+        self._complete()
+
+    cdef void _complete(self):
+
+        cdef Observer0D observer
+
+        for observer in self._observers:
+            observer.render_complete = True
+        self.render_complete = True
+
+    cpdef object _render_task(self, tuple task):
+
+        cdef:
+            int index, slice_id
+            tuple observer_task
+            Observer0D observer
+            Ray template
+
+        index, slice_id, observer_task = task
+        observer = self._observers[index]
+        template = self._templates[index][slice_id]
+
+        return index, slice_id, observer._render_pixel(observer_task, slice_id, template, self._ray_arrays[index])
+
+    cpdef object _update_state(self, tuple packed_result):
+
+        cdef:
+            int index, slice_id
+            tuple observer_task
+            list results
+            uint64_t ray_count
+            Observer0D observer
+
+        # unpack worker results
+        index, slice_id, (observer_task, results, ray_count) = packed_result
+        observer = self._observers[index]
+
+        # update the observer's pipelines and the group statistics
+        observer._update_pipelines(observer_task, results, slice_id)
+        self._update_statistics(ray_count)
+
+    cpdef object _initialise_statistics(self, list tasks):
+
+        if self.quiet:
+            return
+
+        self._stats_ray_count = 0
+        self._stats_total_rays = 0
+        self._stats_start_time = time()
+        self._stats_progress_timer = time()
+        self._stats_total_tasks = len(tasks)
+        self._stats_completed_tasks = 0
+
+    cpdef object _update_statistics(self, uint64_t sample_ray_count):
+
+        if self.quiet:
+            return
+
+        self._stats_completed_tasks += 1
+        self._stats_ray_count += sample_ray_count
+        self._stats_total_rays += sample_ray_count
+
+        if (time() - self._stats_progress_timer) > 1.0:
+
+            current_time = time() - self._stats_start_time
+            completion = 100 * (self._stats_completed_tasks / self._stats_total_tasks)
+            print("Render time: {:0.3f}s ({:0.2f}% complete, {:0.1f}k rays)".format(
+                current_time, completion, self._stats_ray_count / 1000))
+
+            self._stats_ray_count = 0
+            self._stats_progress_timer = time()
+
+    cpdef object _finalise_statistics(self):
+
+        if self.quiet:
+            return
+
+        elapsed_time = time() - self._stats_start_time
+        mean_rays_per_sec = self._stats_total_rays / elapsed_time
+        print("Render complete - {} observers - time elapsed {:0.3f}s - {:0.1f}k rays/s".format(
+            len(self._observers), elapsed_time, mean_rays_per_sec / 1000))
+
+        if self.render_statistics is not None:
+            print(self.render_statistics.summary())
+            if self.profile:
+                print(self.render_statistics.profile.table(limit=20))
@@ -29,10 +29,13 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
+import numpy as np
+
 from libc.math cimport cos, M_PI as PI
 
 from raysect.core.math.sampler cimport RectangleSampler3D, HemisphereCosineSampler
-from raysect.optical cimport Ray, new_point3d, new_vector3d
+from raysect.optical cimport Ray
+from numpy cimport ndarray
 from raysect.optical.observer.base cimport Observer0D
 from raysect.optical.observer.pipeline.spectral import SpectralPowerPipeline0D
 cimport cython
@@ -152,27 +155,22 @@ cdef class Pixel(Observer0D):
         """
         return self._pixel_sensitivity()
 
-    @cython.boundscheck(False)
-    @cython.wraparound(False)
-    cpdef list _generate_rays(self, Ray template, int ray_count):
+    cpdef tuple _generate_ray_arrays(self, int ray_count):
 
-        cdef:
-            list rays, origins, directions
-            int n
-            double weight
+        cdef ndarray origins, directions, weights
 
-        origins = self._point_sampler.samples(ray_count)
-        directions = self._vector_sampler.samples(ray_count)
+        origins = self._point_sampler.samples_array(ray_count)
+        directions = self._vector_sampler.samples_array(ray_count)
 
-        rays = []
-        for n in range(ray_count):
+        # cosine weighted distribution
+        # projected area cosine is implicit in distribution
+        # weight = 1 / (2 * pi) * (pi / cos(theta)) * cos(theta) = 0.5
+        weights = np.full(ray_count, 0.5)
 
-            # cosine weighted distribution
-            # projected area cosine is implicit in distribution
-            # weight = 1 / (2 * pi) * (pi / cos(theta)) * cos(theta) = 0.5
-            rays.append((template.copy(origins[n], directions[n]), 0.5))
+        return origins, directions, weights
 
-        return rays
+    cpdef list _generate_rays(self, Ray template, int ray_count):
+        return self._rays_from_arrays(template, self._generate_ray_arrays(ray_count))
 
     cpdef double _pixel_sensitivity(self):
         return self._solid_angle * self._collection_area
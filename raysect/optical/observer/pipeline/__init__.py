@@ -27,6 +27,7 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
+from raysect.optical.observer.pipeline.display import set_display_backend, get_display_backend
 from raysect.optical.observer.pipeline.rgb import RGBPipeline2D
 from raysect.optical.observer.pipeline.bayer import BayerPipeline2D
 from raysect.optical.observer.pipeline.spectral import *
@@ -0,0 +1,262 @@
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+Deferred access to the plotting library used by the pipeline displays.
+
+Matplotlib (and the GUI backend it selects) is only imported the first time a
+pipeline needs to draw or save an image, i.e. when display_progress is enabled
+for a render or display()/save() is called. Importing the observer packages
+therefore remains cheap for worker processes and batch jobs on headless nodes.
+
+Live render previews are generated from periodic frame snapshots by a
+DisplayThread, so the expensive image processing (auto exposure, colour
+conversion) does not throttle the consumption of render results.
+"""
+
+from threading import Thread, Lock, Event
+
+_backend = None
+_pyplot = None
+
+
+def set_display_backend(backend):
+    """
+    Selects the matplotlib backend used by the pipeline displays.
+
+    The backend is applied when pyplot is first imported by a pipeline. Use
+    a non-interactive backend such as 'Agg' on headless nodes. Passing None
+    leaves the choice of backend to matplotlib.
+
+    :param str backend: Name of a matplotlib backend or None.
+    """
+
+    global _backend
+
+    if backend is not None and not isinstance(backend, str):
+        raise TypeError("The display backend must be the name of a matplotlib backend or None.")
+
+    _backend = backend
+
+    # if pyplot is already loaded, switch the backend immediately
+    if _pyplot is not None and backend is not None:
+        _pyplot.switch_backend(backend)
+
+
+def get_display_backend():
+    """
+    Returns the name of the requested display backend or None if matplotlib chooses.
+
+    :rtype: str
+    """
+
+    return _backend
+
+
+def pyplot():
+    """
+    Returns the matplotlib.pyplot module, importing it on first use.
+
+    :return: The matplotlib.pyplot module.
+    """
+
+    global _pyplot
+
+    if _pyplot is None:
+
+        import matplotlib
+        if _backend is not None:
+            matplotlib.use(_backend)
+
+        import matplotlib.pyplot
+        _pyplot = matplotlib.pyplot
+
+    return _pyplot
+
+
+def set_window_title(figure, title):
+    """
+    Sets the window title of a figure, if the backend provides a window.
+
+    :param figure: A matplotlib figure.
+    :param str title: The window title.
+    """
+
+    # matplotlib >= 3.4 moved the window title to the figure manager
+    manager = getattr(figure.canvas, 'manager', None)
+    if manager is not None:
+        manager.set_window_title(title)
+    elif hasattr(figure.canvas, 'set_window_title'):
+        figure.canvas.set_window_title(title)
+
+
+def decimate_frame(frame, factor):
+    """
+    Returns a snapshot of a 2D or 3D StatsArray, keeping every n-th pixel.
+
+    The first two axes of the frame are the image axes. A factor of 1 returns
+    a full resolution copy of the frame.
+
+    :param frame: A StatsArray2D or StatsArray3D frame.
+    :param int factor: The decimation factor.
+    :return: A new StatsArray of the same type.
+    """
+
+    if factor == 1:
+        return frame.copy()
+
+    mean = frame.mean[::factor, ::factor]
+    snapshot = type(frame)(*mean.shape)
+    snapshot.mean[...] = mean
+    snapshot.variance[...] = frame.variance[::factor, ::factor]
+    snapshot.samples[...] = frame.samples[::factor, ::factor]
+    return snapshot
+
+
+class DisplayThread:
+    """
+    Generates live render preview images in a background thread.
+
+    The render loop submits frame snapshots, the thread converts them into
+    display images with the supplied generator and the render loop collects
+    and draws the finished images. Only the most recent snapshot is kept, a
+    snapshot submitted while the generator is busy replaces any snapshot that
+    is still waiting. Drawing stays on the calling thread as the matplotlib
+    GUI backends are not thread safe.
+
+    :param object generate: Callable converting a frame snapshot into a display image.
+    """
+
+    def __init__(self, generate):
+
+        self._generate = generate
+        self._lock = Lock()
+        self._wake = Event()
+        self._snapshot = None
+        self._image = None
+        self._error = None
+        self._busy = False
+        self._running = True
+
+        self._thread = Thread(target=self._run, name="raysect-display", daemon=True)
+        self._thread.start()
+
+    @property
+    def ready(self):
+        """
+        True if a preview image is waiting to be collected.
+
+        :rtype: bool
+        """
+        return self._image is not None or self._error is not None
+
+    @property
+    def busy(self):
+        """
+        True if a snapshot is waiting or being processed.
+
+        :rtype: bool
+        """
+        return self._busy or self._snapshot is not None
+
+    def submit(self, snapshot):
+        """
+        Queues a frame snapshot for processing, replacing any waiting snapshot.
+
+        :param object snapshot: The frame snapshot.
+        """
+
+        with self._lock:
+            self._snapshot = snapshot
+        self._wake.set()
+
+    def collect(self):
+        """
+        Returns the latest preview image or None if no image is ready.
+
+        An exception raised by the generator is re-raised here.
+        """
+
+        with self._lock:
+            image, error = self._image, self._error
+            self._image = None
+            self._error = None
+
+        if error is not None:
+            raise error
+        return image
+
+    def wait(self):
+        """
+        Blocks until all submitted snapshots have been processed.
+        """
+
+        while self.busy and self._thread.is_alive():
+            self._thread.join(0.001)
+
+    def stop(self):
+        """
+        Discards any waiting snapshot and stops the thread.
+        """
+
+        with self._lock:
+            self._snapshot = None
+            self._running = False
+        self._wake.set()
+        self._thread.join()
+
+    def _run(self):
+
+        while True:
+
+            self._wake.wait()
+
+            with self._lock:
+                self._wake.clear()
+                if not self._running:
+                    return
+                snapshot = self._snapshot
+                self._snapshot = None
+                self._busy = snapshot is not None
+
+            if snapshot is None:
+                continue
+
+            try:
+                image = self._generate(snapshot)
+            except Exception as error:
+                with self._lock:
+                    self._error = error
+                    self._busy = False
+                continue
+
+            with self._lock:
+                self._image = image
+                self._busy = False
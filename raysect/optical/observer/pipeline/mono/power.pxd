@@ -77,6 +77,8 @@ cdef class PowerPipeline2D(Pipeline2D):
         tuple _pixels
         int _samples
         object _display_figure
+        object _display_thread
+        int _display_decimation
         double _display_black_point, _display_white_point, _display_unsaturated_fraction, _display_gamma
         bint _display_auto_exposure
         public bint display_persist_figure
@@ -90,8 +92,12 @@ cdef class PowerPipeline2D(Pipeline2D):
 
     cpdef object _render_display(self, StatsArray2D frame, str status=*)
 
+    cpdef object _draw_display(self, np.ndarray image, str status=*)
+
     cpdef np.ndarray _generate_display_image(self, StatsArray2D frame)
 
+    cpdef tuple _generate_display(self, StatsArray2D frame)
+
     cpdef double _calculate_white_point(self, np.ndarray image)
 
     cpdef object display(self)
@@ -28,7 +28,8 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 from time import time
-import matplotlib.pyplot as plt
+from raysect.optical.observer.pipeline.display import pyplot, set_window_title, decimate_frame, DisplayThread
+from raysect.optical.observer.base.checkpoint import frame_state, restore_frame
 import numpy as np
 
 cimport cython
@@ -303,13 +304,16 @@ cdef class PowerPipeline2D(Pipeline2D):
       be saturated. Display values will be scaled to satisfy this value
       (default=1.0).
     :param float display_gamma:
+    :param int display_decimation: Live render previews are generated from every
+      n-th pixel along each image axis (default=1).
     :param str name: User friendly name for this pipeline.
     """
 
     def __init__(self, SpectralFunction filter=None, bint display_progress=True,
                  double display_update_time=15, bint accumulate=True,
                  bint display_auto_exposure=True, double display_black_point=0.0, double display_white_point=1.0,
-                 double display_unsaturated_fraction=1.0, display_gamma=2.2, str name=None):
+                 double display_unsaturated_fraction=1.0, display_gamma=2.2, str name=None,
+                 int display_decimation=1):
 
         self.name = name or _DEFAULT_PIPELINE_NAME
 
@@ -323,6 +327,7 @@ cdef class PowerPipeline2D(Pipeline2D):
 
         self.display_progress = display_progress
         self.display_update_time = display_update_time
+        self.display_decimation = display_decimation
         self.display_persist_figure = True
 
         self.display_gamma = display_gamma
@@ -342,6 +347,7 @@ cdef class PowerPipeline2D(Pipeline2D):
         self._display_frame = None
         self._display_timer = 0
         self._display_figure = None
+        self._display_thread = None
 
         self._resampled_filter = None
 
@@ -358,6 +364,7 @@ cdef class PowerPipeline2D(Pipeline2D):
             self.filter,
             self.display_progress,
             self.display_update_time,
+            self.display_decimation,
             self.display_persist_figure,
             self.display_gamma,
             self._display_black_point,
@@ -376,6 +383,7 @@ cdef class PowerPipeline2D(Pipeline2D):
             self.filter,
             self.display_progress,
             self.display_update_time,
+            self.display_decimation,
             self.display_persist_figure,
             self.display_gamma,
             self._display_black_point,
@@ -392,6 +400,7 @@ cdef class PowerPipeline2D(Pipeline2D):
         self._display_frame = None
         self._display_timer = 0
         self._display_figure = None
+        self._display_thread = None
         self._resampled_filter = None
         self._pixels = None
         self._samples = 0
@@ -483,6 +492,24 @@ cdef class PowerPipeline2D(Pipeline2D):
             raise ValueError('Display update time must be greater than zero seconds.')
         self._display_update_time = value
 
+    @property
+    def display_decimation(self):
+        """
+        Live render previews are generated from every n-th pixel along each image axis.
+
+        Decimation reduces the cost of generating and drawing previews of large frames.
+        The final image is always displayed at full resolution.
+
+        :rtype: int
+        """
+        return self._display_decimation
+
+    @display_decimation.setter
+    def display_decimation(self, value):
+        if value < 1:
+            raise ValueError('Display decimation must be greater than zero.')
+        self._display_decimation = value
+
     cpdef object initialise(self, tuple pixels, int pixel_samples, double min_wavelength, double max_wavelength, int spectral_bins, list spectral_slices, bint quiet):
 
         nx, ny = pixels
@@ -546,13 +573,36 @@ cdef class PowerPipeline2D(Pipeline2D):
                     self.frame.combine_samples(x, y, self._working_mean[x, y], self._working_variance[x, y], self._samples)
 
         if self.display_progress:
+            self._stop_display_thread()
             self._render_display(self.frame)
 
+    cpdef dict checkpoint_state(self):
+
+        state = frame_state(self.frame)
+        state['working_mean'] = np.array(self._working_mean)
+        state['working_variance'] = np.array(self._working_variance)
+        state['working_touched'] = np.array(self._working_touched)
+        return state
+
+    cpdef object restore_state(self, dict state):
+
+        restore_frame(self.frame, state)
+        np.asarray(self._working_mean)[...] = state['working_mean']
+        np.asarray(self._working_variance)[...] = state['working_variance']
+        np.asarray(self._working_touched)[...] = state['working_touched']
+
+        # restart the live display from the restored frame
+        if self.display_progress and self._display_frame is not None:
+            self._display_frame = self.frame.copy()
+
     cpdef object _start_display(self):
         """
         Display live render.
         """
 
+        # discard any preview thread left by an interrupted render
+        self._stop_display_thread()
+
         # reset figure handle if we are not persisting across observation runs
         if not self.display_persist_figure:
             self._display_figure = None
@@ -565,10 +615,12 @@ cdef class PowerPipeline2D(Pipeline2D):
 
         # workaround for interactivity for QT backend
         try:
-            plt.pause(0.1)
+            pyplot().pause(0.1)
         except NotImplementedError:
             pass
 
+        # previews are generated from frame snapshots off the render loop
+        self._display_thread = DisplayThread(self._generate_display)
         self._display_timer = time()
 
     @cython.boundscheck(False)
@@ -586,21 +638,36 @@ cdef class PowerPipeline2D(Pipeline2D):
 
         self._display_frame.combine_samples(x, y, self._working_mean[x, y], self._working_variance[x, y], self._samples)
 
-        # update live render display
+        # draw the latest preview generated by the display thread
+        if self._display_thread.ready:
+            image, white_point = self._display_thread.collect()
+            if self._display_auto_exposure:
+                self._display_white_point = white_point
+            self._draw_display(image, 'rendering...')
+
+            # process gui events without blocking the render loop
+            try:
+                self._display_figure.canvas.flush_events()
+            except NotImplementedError:
+                pass
+
+        # request a new preview
         if (time() - self._display_timer) > self.display_update_time:
 
             if not self._quiet:
                 print("{} - updating display...".format(self.name))
 
-            self._render_display(self._display_frame, 'rendering...')
+            self._display_thread.submit(decimate_frame(self._display_frame, self._display_decimation))
+            self._display_timer = time()
 
-            # workaround for interactivity for QT backend
-            try:
-                plt.pause(0.1)
-            except NotImplementedError:
-                pass
+    def _stop_display_thread(self):
+        """
+        Stops the preview thread, discarding any pending previews.
+        """
 
-            self._display_timer = time()
+        if self._display_thread is not None:
+            self._display_thread.stop()
+            self._display_thread = None
 
     cpdef object _refresh_display(self):
         """
@@ -618,6 +685,8 @@ cdef class PowerPipeline2D(Pipeline2D):
         if not self._display_figure:
             return
 
+        plt = pyplot()
+
         # does the figure have an active window?
         if not plt.fignum_exists(self._display_figure.number):
             return
@@ -627,11 +696,13 @@ cdef class PowerPipeline2D(Pipeline2D):
     @cython.boundscheck(False)
     @cython.wraparound(False)
     cpdef object _render_display(self, StatsArray2D frame, str status=None):
+        self._draw_display(self._generate_display_image(frame), status)
+
+    cpdef object _draw_display(self, np.ndarray image, str status=None):
 
         INTERPOLATION = 'nearest'
 
-        # generate display image
-        image = self._generate_display_image(frame)
+        plt = pyplot()
 
         # create a fresh figure if the existing figure window has gone missing
         if not self._display_figure or not plt.fignum_exists(self._display_figure.number):
@@ -640,9 +711,9 @@ cdef class PowerPipeline2D(Pipeline2D):
 
         # set window title
         if status:
-            fig.canvas.set_window_title("{} - {}".format(self.name, status))
+            set_window_title(fig, "{} - {}".format(self.name, status))
         else:
-            fig.canvas.set_window_title(self.name)
+            set_window_title(fig, self.name)
 
         # populate figure
         fig.clf()
@@ -659,14 +730,36 @@ cdef class PowerPipeline2D(Pipeline2D):
     @cython.initializedcheck(False)
     cpdef np.ndarray _generate_display_image(self, StatsArray2D frame):
 
+        cdef np.ndarray image
+
+        image, white_point = self._generate_display(frame)
+        if self._display_auto_exposure:
+            self._display_white_point = white_point
+        return image
+
+    @cython.cdivision(True)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cpdef tuple _generate_display(self, StatsArray2D frame):
+        """
+        Returns the display image of a frame and the white point used to generate it.
+
+        The pipeline state is not modified and the pixel loops release the
+        GIL, so previews can be generated by the display thread while the
+        render results are consumed.
+        """
+
         cdef:
             int nx, ny, x, y
             np.ndarray image
             double[:,::1] image_mv
-            double gamma_exponent
+            double gamma_exponent, black_point, white_point
 
-        if self.display_auto_exposure:
-            self._display_white_point = self._calculate_white_point(frame.mean)
+        black_point = self._display_black_point
+        white_point = self._display_white_point
+        if self._display_auto_exposure:
+            white_point = self._calculate_white_point(frame.mean)
 
         image = frame.mean.copy()
         image_mv = image
@@ -675,12 +768,13 @@ cdef class PowerPipeline2D(Pipeline2D):
         nx = frame.shape[0]
         ny = frame.shape[1]
         gamma_exponent = 1.0 / self._display_gamma
-        for x in range(nx):
-            for y in range(ny):
-                image_mv[x, y] = clamp(image_mv[x, y], self._display_black_point, self._display_white_point) - self._display_black_point
-                image_mv[x, y] = pow(image_mv[x, y], gamma_exponent)
+        with nogil:
+            for x in range(nx):
+                for y in range(ny):
+                    image_mv[x, y] = clamp(image_mv[x, y], black_point, white_point) - black_point
+                    image_mv[x, y] = pow(image_mv[x, y], gamma_exponent)
 
-        return image
+        return image, white_point
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -690,7 +784,7 @@ cdef class PowerPipeline2D(Pipeline2D):
 
         cdef:
             int nx, ny, pixels, x, y, i
-            double peak_luminance
+            double peak_luminance, black_point
             np.ndarray luminance
             double[:,::1] imv
             double[::1] lmv
@@ -698,17 +792,19 @@ cdef class PowerPipeline2D(Pipeline2D):
         nx = image.shape[0]
         ny = image.shape[1]
         imv = image  # memory view
+        black_point = self._display_black_point
 
         pixels = nx * ny
         luminance = np.zeros(pixels)
         lmv = luminance  # memory view
 
         # calculate luminance values for frame
-        for x in range(nx):
-            for y in range(ny):
-                lmv[y*nx + x] = max(imv[x, y] - self._display_black_point, 0)
+        with nogil:
+            for x in range(nx):
+                for y in range(ny):
+                    lmv[y*nx + x] = max(imv[x, y] - black_point, 0)
 
-        # sort by luminance
+        # sort by luminance, numpy releases the GIL while sorting
         luminance.sort()
 
         # if all pixels black, return default sensitivity
@@ -717,15 +813,15 @@ cdef class PowerPipeline2D(Pipeline2D):
                 break
 
         if i == pixels:
-            return self._display_black_point
+            return black_point
 
         # identify luminance at threshold
         peak_luminance = lmv[<int> min(pixels - 1, pixels * self._display_unsaturated_fraction)]
 
         if peak_luminance == 0:
-            return self._display_black_point
+            return black_point
 
-        return peak_luminance + self._display_black_point
+        return peak_luminance + black_point
 
     cpdef object display(self):
         if not self.frame:
@@ -746,6 +842,7 @@ cdef class PowerPipeline2D(Pipeline2D):
             raise ValueError("There is no frame to save.")
 
         image = self._generate_display_image(self.frame)
+        plt = pyplot()
         plt.imsave(filename, np.transpose(image), cmap='gray', vmin=0.0)
 
 
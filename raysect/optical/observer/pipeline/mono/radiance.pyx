@@ -145,20 +145,23 @@ cdef class RadiancePipeline2D(PowerPipeline2D):
       be saturated. Display values will be scaled to satisfy this value
       (default=1.0).
     :param float display_gamma:
+    :param int display_decimation: Live render previews are generated from every
+      n-th pixel along each image axis (default=1).
     :param str name: User friendly name for this pipeline.
     """
 
     def __init__(self, SpectralFunction filter=None, bint display_progress=True,
                  double display_update_time=15, bint accumulate=True,
                  bint display_auto_exposure=True, double display_black_point=0.0, double display_white_point=1.0,
-                 double display_unsaturated_fraction=1.0, display_gamma=2.2, str name=None):
+                 double display_unsaturated_fraction=1.0, display_gamma=2.2, str name=None,
+                 int display_decimation=1):
 
         name = name or _DEFAULT_PIPELINE_NAME
         super().__init__(filter=filter, display_progress=display_progress, display_update_time=display_update_time,
                          accumulate=accumulate, display_auto_exposure=display_auto_exposure,
                          display_black_point=display_black_point, display_white_point=display_white_point,
                          display_unsaturated_fraction=display_unsaturated_fraction, display_gamma=display_gamma,
-                         name=name)
+                         name=name, display_decimation=display_decimation)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
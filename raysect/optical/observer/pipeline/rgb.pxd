@@ -48,6 +48,8 @@ cdef class RGBPipeline2D(Pipeline2D):
         tuple _pixels
         int _samples
         object _display_figure
+        object _display_thread
+        int _display_decimation
         double _display_sensitivity, _display_unsaturated_fraction
         bint _display_auto_exposure
         public bint display_persist_figure
@@ -61,8 +63,12 @@ cdef class RGBPipeline2D(Pipeline2D):
 
     cpdef object _render_display(self, StatsArray3D frame, str status=*)
 
+    cpdef object _draw_display(self, np.ndarray image, str status=*)
+
     cpdef np.ndarray _generate_display_image(self, StatsArray3D frame)
 
+    cpdef tuple _generate_display(self, StatsArray3D frame)
+
     cpdef double _calculate_sensitivity(self, np.ndarray image)
 
     cpdef np.ndarray _generate_srgb_image(self, double[:,:,::1] xyz_image_mv)
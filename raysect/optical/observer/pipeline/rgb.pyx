@@ -28,7 +28,8 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 from time import time
-import matplotlib.pyplot as plt
+from raysect.optical.observer.pipeline.display import pyplot, set_window_title, decimate_frame, DisplayThread
+from raysect.optical.observer.base.checkpoint import frame_state, restore_frame
 import numpy as np
 
 cimport cython
@@ -68,18 +69,22 @@ cdef class RGBPipeline2D(Pipeline2D):
     :param float display_unsaturated_fraction: Fraction of pixels that must not
       be saturated. Display values will be scaled to satisfy this value
       (default=1.0).
+    :param int display_decimation: Live render previews are generated from every
+      n-th pixel along each image axis (default=1).
     :param str name: User friendly name for this pipeline.
     """
 
     def __init__(self, bint display_progress=True,
                  double display_update_time=15, bint accumulate=True,
                  bint display_auto_exposure=True, double display_sensitivity=1.0,
-                 double display_unsaturated_fraction=1.0, str name=None):
+                 double display_unsaturated_fraction=1.0, str name=None,
+                 int display_decimation=1):
 
         self.name = name or _DEFAULT_PIPELINE_NAME
 
         self.display_progress = display_progress
         self.display_update_time = display_update_time
+        self.display_decimation = display_decimation
         self.display_persist_figure = True
 
         if display_sensitivity <= 0:
@@ -100,6 +105,7 @@ cdef class RGBPipeline2D(Pipeline2D):
         self._display_frame = None
         self._display_timer = 0
         self._display_figure = None
+        self._display_thread = None
 
         self._processors = None
 
@@ -114,6 +120,7 @@ cdef class RGBPipeline2D(Pipeline2D):
             self.name,
             self.display_progress,
             self.display_update_time,
+            self.display_decimation,
             self.display_persist_figure,
             self._display_sensitivity,
             self._display_auto_exposure,
@@ -128,6 +135,7 @@ cdef class RGBPipeline2D(Pipeline2D):
             self.name,
             self.display_progress,
             self.display_update_time,
+            self.display_decimation,
             self.display_persist_figure,
             self._display_sensitivity,
             self._display_auto_exposure,
@@ -142,6 +150,7 @@ cdef class RGBPipeline2D(Pipeline2D):
         self._display_frame = None
         self._display_timer = 0
         self._display_figure = None
+        self._display_thread = None
         self._pixels = None
         self._samples = 0
         self._quiet = False
@@ -213,6 +222,24 @@ cdef class RGBPipeline2D(Pipeline2D):
             raise ValueError('Display update time must be greater than zero seconds.')
         self._display_update_time = value
 
+    @property
+    def display_decimation(self):
+        """
+        Live render previews are generated from every n-th pixel along each image axis.
+
+        Decimation reduces the cost of generating and drawing previews of large frames.
+        The final image is always displayed at full resolution.
+
+        :rtype: int
+        """
+        return self._display_decimation
+
+    @display_decimation.setter
+    def display_decimation(self, value):
+        if value < 1:
+            raise ValueError('Display decimation must be greater than zero.')
+        self._display_decimation = value
+
     cpdef object initialise(self, tuple pixels, int pixel_samples, double min_wavelength, double max_wavelength, int spectral_bins, list spectral_slices, bint quiet):
 
         nx, ny = pixels
@@ -286,13 +313,36 @@ cdef class RGBPipeline2D(Pipeline2D):
                     self.xyz_frame.combine_samples(x, y, 2, self._working_mean[x, y, 2], self._working_variance[x, y, 2], self._samples)
 
         if self.display_progress:
+            self._stop_display_thread()
             self._render_display(self.xyz_frame)
 
+    cpdef dict checkpoint_state(self):
+
+        state = frame_state(self.xyz_frame)
+        state['working_mean'] = np.array(self._working_mean)
+        state['working_variance'] = np.array(self._working_variance)
+        state['working_touched'] = np.array(self._working_touched)
+        return state
+
+    cpdef object restore_state(self, dict state):
+
+        restore_frame(self.xyz_frame, state)
+        np.asarray(self._working_mean)[...] = state['working_mean']
+        np.asarray(self._working_variance)[...] = state['working_variance']
+        np.asarray(self._working_touched)[...] = state['working_touched']
+
+        # restart the live display from the restored frame
+        if self.display_progress and self._display_frame is not None:
+            self._display_frame = self.xyz_frame.copy()
+
     cpdef object _start_display(self):
         """
         Display live render.
         """
 
+        # discard any preview thread left by an interrupted render
+        self._stop_display_thread()
+
         # reset figure handle if we are not persisting across observation runs
         if not self.display_persist_figure:
             self._display_figure = None
@@ -305,10 +355,12 @@ cdef class RGBPipeline2D(Pipeline2D):
 
         # workaround for interactivity for QT backend
         try:
-            plt.pause(0.1)
+            pyplot().pause(0.1)
         except NotImplementedError:
             pass
 
+        # previews are generated from frame snapshots off the render loop
+        self._display_thread = DisplayThread(self._generate_display)
         self._display_timer = time()
 
     @cython.boundscheck(False)
@@ -328,21 +380,36 @@ cdef class RGBPipeline2D(Pipeline2D):
         self._display_frame.combine_samples(x, y, 1, self._working_mean[x, y, 1], self._working_variance[x, y, 1], self._samples)
         self._display_frame.combine_samples(x, y, 2, self._working_mean[x, y, 2], self._working_variance[x, y, 2], self._samples)
 
-        # update live render display
+        # draw the latest preview generated by the display thread
+        if self._display_thread.ready:
+            image, sensitivity = self._display_thread.collect()
+            if self._display_auto_exposure:
+                self._display_sensitivity = sensitivity
+            self._draw_display(image, 'rendering...')
+
+            # process gui events without blocking the render loop
+            try:
+                self._display_figure.canvas.flush_events()
+            except NotImplementedError:
+                pass
+
+        # request a new preview
         if (time() - self._display_timer) > self.display_update_time:
 
             if not self._quiet:
                 print("{} - updating display...".format(self.name))
 
-            self._render_display(self._display_frame, 'rendering...')
+            self._display_thread.submit(decimate_frame(self._display_frame, self._display_decimation))
+            self._display_timer = time()
 
-            # workaround for interactivity for QT backend
-            try:
-                plt.pause(0.1)
-            except NotImplementedError:
-                pass
+    def _stop_display_thread(self):
+        """
+        Stops the preview thread, discarding any pending previews.
+        """
 
-            self._display_timer = time()
+        if self._display_thread is not None:
+            self._display_thread.stop()
+            self._display_thread = None
 
     cpdef object _refresh_display(self):
         """
@@ -360,6 +427,8 @@ cdef class RGBPipeline2D(Pipeline2D):
         if not self._display_figure:
             return
 
+        plt = pyplot()
+
         # does the figure have an active window?
         if not plt.fignum_exists(self._display_figure.number):
             return
@@ -369,11 +438,13 @@ cdef class RGBPipeline2D(Pipeline2D):
     @cython.boundscheck(False)
     @cython.wraparound(False)
     cpdef object _render_display(self, StatsArray3D frame, str status=None):
+        self._draw_display(self._generate_display_image(frame), status)
+
+    cpdef object _draw_display(self, np.ndarray image, str status=None):
 
         INTERPOLATION = 'nearest'
 
-        # generate display image
-        image = self._generate_display_image(frame)
+        plt = pyplot()
 
         # create a fresh figure if the existing figure window has gone missing
         if not self._display_figure or not plt.fignum_exists(self._display_figure.number):
@@ -382,9 +453,9 @@ cdef class RGBPipeline2D(Pipeline2D):
 
         # set window title
         if status:
-            fig.canvas.set_window_title("{} - {}".format(self.name, status))
+            set_window_title(fig, "{} - {}".format(self.name, status))
         else:
-            fig.canvas.set_window_title(self.name)
+            set_window_title(fig, self.name)
 
         # populate figure
         fig.clf()
@@ -401,28 +472,53 @@ cdef class RGBPipeline2D(Pipeline2D):
     @cython.initializedcheck(False)
     cpdef np.ndarray _generate_display_image(self, StatsArray3D frame):
 
+        cdef np.ndarray image
+
+        image, sensitivity = self._generate_display(frame)
+        if self._display_auto_exposure:
+            self._display_sensitivity = sensitivity
+        return image
+
+    @cython.cdivision(True)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cpdef tuple _generate_display(self, StatsArray3D frame):
+        """
+        Returns the display image of a frame and the sensitivity used to generate it.
+
+        The pipeline state is not modified and the pixel loops release the
+        GIL, so previews can be generated by the display thread while the
+        render results are consumed.
+        """
+
         cdef:
-            int x, y, c
+            int nx, ny, nz, x, y, c
             np.ndarray xyz_image, rgb_image
             double[:,:,::1] xyz_image_mv
-            double gamma_exponent
+            double sensitivity
 
+        sensitivity = self._display_sensitivity
         if self._display_auto_exposure:
-            self._display_sensitivity = self._calculate_sensitivity(frame.mean)
+            sensitivity = self._calculate_sensitivity(frame.mean)
 
         xyz_image = frame.mean.copy()
         xyz_image_mv = xyz_image
 
         # apply sensitivity
-        for x in range(frame.nx):
-            for y in range(frame.ny):
-                for c in range(frame.nz):
-                    xyz_image_mv[x, y, c] *= self._display_sensitivity
+        nx = frame.nx
+        ny = frame.ny
+        nz = frame.nz
+        with nogil:
+            for x in range(nx):
+                for y in range(ny):
+                    for c in range(nz):
+                        xyz_image_mv[x, y, c] *= sensitivity
 
         # convert XYZ to sRGB
         rgb_image = self._generate_srgb_image(xyz_image_mv)
 
-        return rgb_image
+        return rgb_image, sensitivity
 
     @cython.cdivision(True)
     @cython.boundscheck(False)
@@ -447,11 +543,12 @@ cdef class RGBPipeline2D(Pipeline2D):
 
         # TODO - should really consider X and Z when working out brightness
         # calculate luminance values for frame (XYZ Y component is luminance)
-        for x in range(nx):
-            for y in range(ny):
-                lmv[y*nx + x] = imv[x, y, 1]
+        with nogil:
+            for x in range(nx):
+                for y in range(ny):
+                    lmv[y*nx + x] = imv[x, y, 1]
 
-        # sort by luminance
+        # sort by luminance, numpy releases the GIL while sorting
         luminance.sort()
 
         # if all pixels black, return default sensitivity
@@ -489,18 +586,19 @@ cdef class RGBPipeline2D(Pipeline2D):
         rgb_image_mv = rgb_image
 
         # convert to sRGB colour space
-        for ix in range(nx):
-            for iy in range(ny):
+        with nogil:
+            for ix in range(nx):
+                for iy in range(ny):
 
-                rgb_pixel = ciexyz_to_srgb(
-                    xyz_image_mv[ix, iy, 0],
-                    xyz_image_mv[ix, iy, 1],
-                    xyz_image_mv[ix, iy, 2]
-                )
+                    rgb_pixel = ciexyz_to_srgb(
+                        xyz_image_mv[ix, iy, 0],
+                        xyz_image_mv[ix, iy, 1],
+                        xyz_image_mv[ix, iy, 2]
+                    )
 
-                rgb_image_mv[ix, iy, 0] = rgb_pixel[0]
-                rgb_image_mv[ix, iy, 1] = rgb_pixel[1]
-                rgb_image_mv[ix, iy, 2] = rgb_pixel[2]
+                    rgb_image_mv[ix, iy, 0] = rgb_pixel[0]
+                    rgb_image_mv[ix, iy, 1] = rgb_pixel[1]
+                    rgb_image_mv[ix, iy, 2] = rgb_pixel[2]
 
         return rgb_image
 
@@ -526,6 +624,7 @@ cdef class RGBPipeline2D(Pipeline2D):
             raise ValueError("There is no frame to save.")
 
         image = self._generate_display_image(self.xyz_frame)
+        plt = pyplot()
         plt.imsave(filename, np.transpose(image, (1, 0, 2)))
 
 
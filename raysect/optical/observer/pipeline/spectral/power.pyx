@@ -29,7 +29,8 @@
 
 cimport cython
 import numpy as np
-from matplotlib import pyplot as plt
+from raysect.optical.observer.pipeline.display import pyplot, set_window_title
+from raysect.optical.observer.base.checkpoint import frame_state, restore_frame
 
 from raysect.optical.spectrum cimport Spectrum
 from raysect.optical.observer.base.slice cimport SpectralSlice
@@ -156,7 +157,7 @@ cdef class SpectralPowerPipeline0D(Pipeline0D):
             self._render_display()
             # workaround for interactivity for QT backend
             try:
-                plt.pause(0.1)
+                pyplot().pause(0.1)
             except NotImplementedError:
                 pass
 
@@ -175,13 +176,15 @@ cdef class SpectralPowerPipeline0D(Pipeline0D):
         for i in range(self.samples.length):
             errors_mv[i] = self.samples.error(i)
 
+        plt = pyplot()
+
         # create a fresh figure if the existing figure window has gone missing
         if not self._display_figure or not plt.fignum_exists(self._display_figure.number):
             self._display_figure = plt.figure(facecolor=(1, 1, 1), figsize=_DISPLAY_SIZE, dpi=_DISPLAY_DPI)
         fig = self._display_figure
 
         # set window title
-        fig.canvas.set_window_title(self.name)
+        set_window_title(fig, self.name)
 
         fig.clf()
         plt.plot(self.wavelengths, self.samples.mean[:], color=(0, 0, 1))
@@ -320,6 +323,8 @@ cdef class SpectralPowerPipeline1D(Pipeline1D):
         for i in range(self.frame.ny):
             errors_mv[i] = self.frame.error(pixel, i)
 
+        plt = pyplot()
+
         plt.figure()
         plt.plot(self.wavelengths, self.frame.mean[pixel, :], color=(0, 0, 1))
         plt.plot(self.wavelengths, self.frame.mean[pixel, :] + errors[:], color=(0.685, 0.685, 1.0))
@@ -438,6 +443,12 @@ cdef class SpectralPowerPipeline2D(Pipeline2D):
     cpdef object finalise(self):
         pass
 
+    cpdef dict checkpoint_state(self):
+        return frame_state(self.frame)
+
+    cpdef object restore_state(self, dict state):
+        restore_frame(self.frame, state)
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
@@ -453,6 +464,8 @@ cdef class SpectralPowerPipeline2D(Pipeline2D):
         for i in range(self.frame.nz):
             errors_mv[i] = self.frame.error(x, y, i)
 
+        plt = pyplot()
+
         plt.figure()
         plt.plot(self.wavelengths, self.frame.mean[x, y, :], color=(0, 0, 1))
         plt.plot(self.wavelengths, self.frame.mean[x, y, :] + errors[:], color=(0.685, 0.685, 1.0))
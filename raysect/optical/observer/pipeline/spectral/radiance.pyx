@@ -29,7 +29,7 @@
 
 import numpy as np
 cimport numpy as np
-import matplotlib.pyplot as plt
+from raysect.optical.observer.pipeline.display import pyplot, set_window_title
 
 cimport cython
 from raysect.optical cimport Spectrum
@@ -82,13 +82,15 @@ cdef class SpectralRadiancePipeline0D(SpectralPowerPipeline0D):
         for i in range(self.samples.length):
             errors_mv[i] = self.samples.error(i)
 
+        plt = pyplot()
+
         # create a fresh figure if the existing figure window has gone missing
         if not self._display_figure or not plt.fignum_exists(self._display_figure.number):
             self._display_figure = plt.figure(facecolor=(1, 1, 1), figsize=_DISPLAY_SIZE, dpi=_DISPLAY_DPI)
         fig = self._display_figure
 
         # set window title
-        fig.canvas.set_window_title(self.name)
+        set_window_title(fig, self.name)
 
         fig.clf()
         plt.plot(self.wavelengths, self.samples.mean[:], color=(0, 0, 1))
@@ -153,6 +155,8 @@ cdef class SpectralRadiancePipeline1D(SpectralPowerPipeline1D):
         for i in range(self.frame.ny):
             errors_mv[i] = self.frame.error(pixel, i)
 
+        plt = pyplot()
+
         plt.figure()
         plt.plot(self.wavelengths, self.frame.mean[pixel, :], color=(0, 0, 1))
         plt.plot(self.wavelengths, self.frame.mean[pixel, :] + errors[:], color=(0.685, 0.685, 1.0))
@@ -216,6 +220,8 @@ cdef class SpectralRadiancePipeline2D(SpectralPowerPipeline2D):
         for i in range(self.frame.nz):
             errors_mv[i] = self.frame.error(x, y, i)
 
+        plt = pyplot()
+
         plt.figure()
         plt.plot(self.wavelengths, self.frame.mean[x, y, :], color=(0, 0, 1))
         plt.plot(self.wavelengths, self.frame.mean[x, y, :] + errors[:], color=(0.685, 0.685, 1.0))
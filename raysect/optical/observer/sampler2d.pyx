@@ -29,14 +29,75 @@
 
 import warnings
 import numpy as np
-from random import shuffle
 
 from raysect.optical.observer.base cimport FrameSampler2D
 from raysect.optical.observer.pipeline cimport RGBPipeline2D, RadiancePipeline2D, PowerPipeline2D, SpectralRadiancePipeline2D, SpectralPowerPipeline2D
 from raysect.core.math cimport StatsArray2D, StatsArray3D
 cimport numpy as np
-cimport cython
-ctypedef np.uint8_t uint8  # numpy boolean arrays are stored as 8-bit values
+
+
+cdef list _pixel_tasks(np.ndarray select, np.ndarray priority=None):
+    """
+    Returns the tasks of the pixels selected by a 2D boolean array.
+
+    If a 2D array of pixel priorities is supplied, the tasks are ordered by
+    decreasing priority so the most important pixels are rendered first if
+    the render is stopped part way through a pass. Pixels of equal priority
+    are in random order.
+    """
+
+    cdef np.ndarray index, x, y
+
+    # perform tasks in random order so that image is assembled randomly rather than sequentially
+    index = np.flatnonzero(select)
+    np.random.shuffle(index)
+
+    if priority is not None:
+        index = index[np.argsort(-priority.ravel()[index], kind='stable')]
+
+    x, y = np.divmod(index, select.shape[1])
+    return list(zip(x.tolist(), y.tolist()))
+
+
+cdef np.ndarray _normalised_errors(object frame, np.ndarray select):
+    """
+    Returns the standard errors of a StatsArray's values normalised by their means.
+
+    The errors are only calculated for the selected values, which must have a
+    mean greater than zero, the other values are zero.
+    """
+
+    cdef np.ndarray normalised
+
+    normalised = np.zeros(frame.mean.shape)
+    np.divide(frame.variance, frame.samples, out=normalised, where=select)
+    np.sqrt(np.maximum(normalised, 0, out=normalised), out=normalised)
+    np.divide(normalised, frame.mean, out=normalised, where=select)
+    return normalised
+
+
+cdef np.ndarray _percentile(np.ndarray values, np.ndarray valid, double percentile):
+    """
+    Returns the percentile of the valid values of each row of a 2D array.
+
+    The percentile is linearly interpolated, as np.percentile(). Each row must
+    have at least one valid value.
+    """
+
+    cdef np.ndarray ordered, count, position, lower, upper, fraction, low, high
+
+    # the invalid values are sorted to the end of each row
+    ordered = np.sort(np.where(valid, values, np.inf), axis=1)
+    count = valid.sum(1)
+
+    position = (percentile / 100) * (count - 1)
+    lower = np.floor(position).astype(np.intp)
+    upper = np.minimum(lower + 1, count - 1)
+    fraction = position - lower
+
+    low = np.take_along_axis(ordered, lower[:, np.newaxis], 1)[:, 0]
+    high = np.take_along_axis(ordered, upper[:, np.newaxis], 1)[:, 0]
+    return low + fraction * (high - low)
 
 
 cdef class FullFrameSampler2D(FrameSampler2D):
@@ -49,7 +110,6 @@ cdef class FullFrameSampler2D(FrameSampler2D):
     """
     cdef:
         np.ndarray _mask
-        uint8[:, ::1] _mask_mv
 
     def __init__(self, np.ndarray mask=None):
 
@@ -67,17 +127,9 @@ cdef class FullFrameSampler2D(FrameSampler2D):
             if value.ndim != 2:
                 raise ValueError("Mask must be a 2D array.")
             self._mask = value.astype(np.bool)
-            self._mask_mv = np.frombuffer(self._mask, dtype=np.uint8).reshape(self.mask.shape)
 
-    @cython.boundscheck(False)
-    @cython.wraparound(False)
-    @cython.initializedcheck(False)
     cpdef list generate_tasks(self, tuple pixels):
 
-        cdef:
-            list tasks
-            int nx, ny
-
         # The all-true mask is created during the first call of generate_tasks if no mask was provided
         if self.mask is None:
             self.mask = np.ones(pixels, dtype=np.bool)
@@ -85,17 +137,7 @@ cdef class FullFrameSampler2D(FrameSampler2D):
         if pixels != (self._mask.shape[0], self._mask.shape[1]):
             raise ValueError('The pixel geometry passed to the frame sampler is inconsistent with the mask frame size.')
 
-        tasks = []
-        nx, ny = pixels
-        for iy in range(ny):
-            for ix in range(nx):
-                if self._mask_mv[ix, iy]:
-                    tasks.append((ix, iy))
-
-        # perform tasks in random order so that image is assembled randomly rather than sequentially
-        shuffle(tasks)
-
-        return tasks
+        return _pixel_tasks(self._mask)
 
 
 cdef class MonoAdaptiveSampler2D(FrameSampler2D):
@@ -128,8 +170,7 @@ cdef class MonoAdaptiveSampler2D(FrameSampler2D):
         PowerPipeline2D _pipeline
         double _fraction, _ratio, _cutoff
         int _min_samples
-        np.ndarray _mask
-        uint8[:, ::1] _mask_mv
+        np.ndarray _mask, _converged
 
     def __init__(self, object pipeline, double fraction=0.2, double ratio=10.0, int min_samples=1000, double cutoff=0.0, mask=None):
 
@@ -190,6 +231,20 @@ cdef class MonoAdaptiveSampler2D(FrameSampler2D):
             raise ValueError("Attribute 'cutoff' must be in the range [0, 1].")
         self._cutoff = value
 
+    @property
+    def converged(self):
+        """
+        The pixels that have converged, a 2D boolean array.
+
+        A pixel has converged once it has at least min_samples samples and its
+        normalised error is no greater than the cutoff. Converged pixels are
+        not sampled further. The array is updated by each call to
+        generate_tasks() and is None before the first call.
+
+        :rtype: np.ndarray
+        """
+        return self._converged
+
     @property
     def mask(self):
         return self._mask
@@ -202,21 +257,14 @@ cdef class MonoAdaptiveSampler2D(FrameSampler2D):
             if value.ndim != 2:
                 raise ValueError("Mask must be a 2D array.")
             self._mask = value.astype(np.bool)
-            self._mask_mv = np.frombuffer(self._mask, dtype=np.uint8).reshape(self.mask.shape)
 
-    @cython.boundscheck(False)
-    @cython.wraparound(False)
-    @cython.cdivision(True)
-    @cython.initializedcheck(False)
     cpdef list generate_tasks(self, tuple pixels):
 
         cdef:
             StatsArray2D frame
-            int x, y, min_samples
+            int min_samples
             np.ndarray normalised
-            double[:, ::1] error, normalised_mv
             double percentile_error, cutoff
-            list tasks
 
         # The all-true mask is created during the first call of generate_tasks if no mask was provided
         if self.mask is None:
@@ -236,55 +284,25 @@ cdef class MonoAdaptiveSampler2D(FrameSampler2D):
 
         min_samples = max(self._min_samples, <int>(frame.samples[self._mask].max() / self._ratio))
 
-        error = frame.errors()
-        normalised = np.zeros((frame.nx, frame.ny))
-        normalised_mv = normalised
-
         # calculated normalised standard error
-        for x in range(frame.nx):
-            for y in range(frame.ny):
-                if self._mask_mv[x, y] and frame.mean_mv[x, y] > 0:
-                    normalised_mv[x, y] = error[x, y] / frame.mean_mv[x, y]
+        normalised = _normalised_errors(frame, self._mask & (frame.mean > 0))
 
         # locate error value corresponding to fraction of frame to process
         percentile_error = np.percentile(normalised[self._mask], (1 - self._fraction) * 100)
         cutoff = max(self._cutoff, percentile_error)
 
         # build tasks
-        tasks = []
-        for x in range(frame.nx):
-            for y in range(frame.ny):
-                if self._mask_mv[x, y] and (frame.samples_mv[x, y] < min_samples or normalised_mv[x, y] > cutoff):
-                    tasks.append((x, y))
+        self._converged = self._mask & (frame.samples >= min_samples) & (normalised <= self._cutoff)
+        return _pixel_tasks(self._mask & ((frame.samples < min_samples) | (normalised > cutoff)),
+                            np.where(frame.samples < min_samples, np.inf, normalised))
 
-        # perform tasks in random order so that image is assembled randomly rather than sequentially
-        shuffle(tasks)
-
-        return tasks
-
-    @cython.boundscheck(False)
-    @cython.wraparound(False)
-    @cython.initializedcheck(False)
     cpdef list _full_frame(self, tuple pixels):
 
-        cdef:
-            list tasks
-            int nx, ny, x, y
-
         if self.mask is None:  # just in case if _full_frame() is called before generate_tasks()
             self.mask = np.ones(pixels, dtype=np.bool)
 
-        tasks = []
-        nx, ny = pixels
-        for x in range(nx):
-            for y in range(ny):
-                if self._mask_mv[x, y]:
-                    tasks.append((x, y))
-
-        # perform tasks in random order so that image is assembled randomly rather than sequentially
-        shuffle(tasks)
-
-        return tasks
+        self._converged = np.zeros(pixels, dtype=np.bool)
+        return _pixel_tasks(self._mask)
 
 
 cdef class MaskedMonoAdaptiveSampler2D(MonoAdaptiveSampler2D):
@@ -358,8 +376,7 @@ cdef class SpectralAdaptiveSampler2D(FrameSampler2D):
         double _fraction, _ratio, _cutoff, _percentile
         str _reduction_method
         int _min_samples
-        np.ndarray _mask
-        uint8[:, ::1] _mask_mv
+        np.ndarray _mask, _converged
 
     def __init__(self, object pipeline, double fraction=0.2, double ratio=10.0, int min_samples=1000, double cutoff=0.0,
                  str reduction_method='percentile', double percentile=100., np.ndarray mask=None):
@@ -443,6 +460,20 @@ cdef class SpectralAdaptiveSampler2D(FrameSampler2D):
             raise ValueError("Percentiles must be in the range [0, 100].")
         self._percentile = value
 
+    @property
+    def converged(self):
+        """
+        The pixels that have converged, a 2D boolean array.
+
+        A pixel has converged once it has at least min_samples samples and its
+        normalised error is no greater than the cutoff. Converged pixels are
+        not sampled further. The array is updated by each call to
+        generate_tasks() and is None before the first call.
+
+        :rtype: np.ndarray
+        """
+        return self._converged
+
     @property
     def mask(self):
         return self._mask
@@ -455,22 +486,14 @@ cdef class SpectralAdaptiveSampler2D(FrameSampler2D):
             if value.ndim != 2:
                 raise ValueError("Mask must be a 2D array.")
             self._mask = value.astype(np.bool)
-            self._mask_mv = np.frombuffer(self._mask, dtype=np.uint8).reshape(self.mask.shape)
 
-    @cython.boundscheck(False)
-    @cython.wraparound(False)
-    @cython.cdivision(True)
-    @cython.initializedcheck(False)
     cpdef list generate_tasks(self, tuple pixels):
 
         cdef:
             StatsArray3D frame
-            int x, y, min_samples
-            np.ndarray normalised
-            double[:, ::1] normalised_mv
-            int[:, ::1] frame_min_samples
+            int min_samples
+            np.ndarray valid, spectral, normalised, frame_min_samples
             double percentile_error, cutoff
-            list tasks
 
         # The all-true mask is created during the first call of generate_tasks if no mask was provided
         if self.mask is None:
@@ -490,196 +513,93 @@ cdef class SpectralAdaptiveSampler2D(FrameSampler2D):
 
         min_samples = max(self._min_samples, <int>(frame.samples.max(2)[self._mask].max() / self._ratio))
 
+        # the spectral bins with power of the masked pixels and their normalised standard errors
+        valid = self._mask[:, :, np.newaxis] & (frame.mean > 0)
+        spectral = _normalised_errors(frame, valid)
+
         # calculated normalised standard error
         if self._reduction_method == 'weighted':
-            normalised = self._reduce_weighted()
+            normalised = self._reduce_weighted(frame, valid, spectral)
 
         elif self._reduction_method == 'mean':
-            normalised = self._reduce_mean()
+            normalised = self._reduce_mean(frame, valid, spectral)
 
         elif self._reduction_method == 'percentile':
-            normalised = self._reduce_percentile()
+            normalised = self._reduce_percentile(frame, valid, spectral)
 
         elif self._reduction_method == 'power_percentile':
-            normalised = self._reduce_power_percentile()
+            normalised = self._reduce_power_percentile(frame, valid, spectral)
 
         else:
             raise ValueError("Attribute 'reduction_method' has wrong value: %s. " % self._reduction_method +
                              "Must be 'weighted', 'mean', 'percentile' or 'power_percentile'.")
 
-        normalised_mv = normalised
-
         # locate error value corresponding to fraction of frame to process
         percentile_error = np.percentile(normalised[self._mask], (1 - self._fraction) * 100)
         cutoff = max(self._cutoff, percentile_error)
 
         # build tasks
-        tasks = []
         frame_min_samples = frame.samples.min(2)
-        for x in range(frame.nx):
-            for y in range(frame.ny):
-                if self._mask_mv[x, y] and (frame_min_samples[x, y] < min_samples or normalised_mv[x, y] > cutoff):
-                    tasks.append((x, y))
+        self._converged = self._mask & (frame_min_samples >= min_samples) & (normalised <= self._cutoff)
+        return _pixel_tasks(self._mask & ((frame_min_samples < min_samples) | (normalised > cutoff)),
+                            np.where(frame_min_samples < min_samples, np.inf, normalised))
 
-        # perform tasks in random order so that image is assembled randomly rather than sequentially
-        shuffle(tasks)
+    cdef np.ndarray _reduce_weighted(self, StatsArray3D frame, np.ndarray valid, np.ndarray spectral):
 
-        return tasks
+        cdef np.ndarray power, error, normalised, select
 
-    @cython.boundscheck(False)
-    @cython.wraparound(False)
-    @cython.cdivision(True)
-    @cython.initializedcheck(False)
-    cdef np.ndarray _reduce_weighted(self):
+        power = frame.mean.sum(2, where=valid)
+        error = np.einsum('xyz,xyz->xy', spectral, frame.mean)
 
-        cdef:
-            StatsArray3D frame
-            int x, y, z
-            np.ndarray normalised
-            double[:, :, ::1] error
-            double[:, ::1] normalised_mv
-            double pixel_power
-
-        frame = self._pipeline.frame
-        error = frame.errors()
         normalised = np.zeros((frame.nx, frame.ny))
-        normalised_mv = normalised
-        for x in range(frame.nx):
-            for y in range(frame.ny):
-                if self._mask_mv[x, y]:
-                    pixel_power = 0
-                    for z in range(frame.nz):
-                        if frame.mean_mv[x, y, z] > 0:
-                            normalised_mv[x, y] += error[x, y, z]
-                            pixel_power += frame.mean_mv[x, y, z]
-                    if pixel_power:
-                        normalised_mv[x, y] /= pixel_power
-
+        select = power > 0
+        normalised[select] = error[select] / power[select]
         return normalised
 
-    @cython.boundscheck(False)
-    @cython.wraparound(False)
-    @cython.cdivision(True)
-    @cython.initializedcheck(False)
-    cdef np.ndarray _reduce_mean(self):
+    cdef np.ndarray _reduce_mean(self, StatsArray3D frame, np.ndarray valid, np.ndarray spectral):
 
-        cdef:
-            StatsArray3D frame
-            int x, y, z, count
-            np.ndarray normalised
-            double[:, :, ::1] error
-            double[:, ::1] normalised_mv
+        cdef np.ndarray count, normalised, select
 
-        frame = self._pipeline.frame
-        error = frame.errors()
-        normalised = np.zeros((frame.nx, frame.ny))
-        normalised_mv = normalised
-        for x in range(frame.nx):
-            for y in range(frame.ny):
-                if self._mask_mv[x, y]:
-                    count = 0
-                    for z in range(frame.nz):
-                        if frame.mean_mv[x, y, z] > 0:
-                            normalised_mv[x, y] += error[x, y, z] / frame.mean_mv[x, y, z]
-                            count += 1
-                    if count:
-                        normalised_mv[x, y] /= count
+        count = valid.sum(2)
 
+        normalised = np.zeros((frame.nx, frame.ny))
+        select = count > 0
+        normalised[select] = spectral.sum(2)[select] / count[select]
         return normalised
 
-    @cython.boundscheck(False)
-    @cython.wraparound(False)
-    @cython.cdivision(True)
-    @cython.initializedcheck(False)
-    cdef np.ndarray _reduce_percentile(self):
+    cdef np.ndarray _reduce_percentile(self, StatsArray3D frame, np.ndarray valid, np.ndarray spectral):
 
-        cdef:
-            StatsArray3D frame
-            int x, y, z, count
-            np.ndarray spectral_normalised, normalised
-            double[:, :, ::1] error
-            double[:, ::1] normalised_mv
-            double[:] spectral_normalised_mv
+        cdef np.ndarray normalised, select
 
-        frame = self._pipeline.frame
-        error = frame.errors()
+        # the percentile of each pixel only includes the bins with power
         normalised = np.zeros((frame.nx, frame.ny))
-        normalised_mv = normalised
-        spectral_normalised = np.zeros(frame.nz)
-        spectral_normalised_mv = spectral_normalised
-        for x in range(frame.nx):
-            for y in range(frame.ny):
-                if self._mask_mv[x, y]:
-                    count = 0
-                    for z in range(frame.nz):
-                        if frame.mean_mv[x, y, z] > 0:
-                            spectral_normalised_mv[count] = error[x, y, z] / frame.mean_mv[x, y, z]
-                            count += 1
-                    if count:
-                        normalised_mv[x, y] = np.percentile(spectral_normalised[:count], self._percentile)
-
+        select = valid.any(2)
+        normalised[select] = _percentile(spectral[select], valid[select], self._percentile)
         return normalised
 
-    @cython.boundscheck(False)
-    @cython.wraparound(False)
-    @cython.cdivision(True)
-    @cython.initializedcheck(False)
-    cdef np.ndarray _reduce_power_percentile(self):
+    cdef np.ndarray _reduce_power_percentile(self, StatsArray3D frame, np.ndarray valid, np.ndarray spectral):
 
-        cdef:
-            StatsArray3D frame
-            int x, y, z, count
-            np.ndarray normalised, spectral_power
-            double[:, :, ::1] error
-            double[:, ::1] normalised_mv
-            double[:] spectral_power_mv
-            double power_threshold
+        cdef np.ndarray normalised, select, power, threshold, bright
 
-        frame = self._pipeline.frame
-        error = frame.errors()
         normalised = np.zeros((frame.nx, frame.ny))
-        normalised_mv = normalised
-        spectral_power = np.zeros(frame.nz)
-        spectral_power_mv = spectral_power
-        for x in range(frame.nx):
-            for y in range(frame.ny):
-                if self._mask_mv[x, y]:
-                    count = 0
-                    for z in range(frame.nz):
-                        if frame.mean_mv[x, y, z] > 0:
-                            spectral_power_mv[count] = frame.mean_mv[x, y, z]
-                            count += 1
-                    if count:
-                        power_threshold = np.percentile(spectral_power[:count], (100. - self._percentile))
-                        for z in range(frame.nz):
-                            if frame.mean_mv[x, y, z] >= power_threshold:
-                                normalised_mv[x, y] = max(normalised_mv[x, y], error[x, y, z] / frame.mean_mv[x, y, z])
+        select = valid.any(2)
 
+        # the power threshold of each pixel, excluding the bins without power
+        power = frame.mean[select]
+        threshold = _percentile(power, valid[select], 100. - self._percentile)
+
+        # the highest error of the bins above the threshold
+        bright = power >= threshold[:, np.newaxis]
+        normalised[select] = np.where(bright, spectral[select], 0).max(1)
         return normalised
 
-    @cython.boundscheck(False)
-    @cython.wraparound(False)
-    @cython.initializedcheck(False)
     cpdef list _full_frame(self, tuple pixels):
 
-        cdef:
-            list tasks
-            int nx, ny, x, y
-
         if self.mask is None:  # just in case if _full_frame() is called before generate_tasks()
             self.mask = np.ones(pixels, dtype=np.bool)
 
-        tasks = []
-        nx, ny = pixels
-        for x in range(nx):
-            for y in range(ny):
-                if self._mask_mv[x, y]:
-                    tasks.append((x, y))
-
-        # perform tasks in random order so that image is assembled randomly rather than sequentially
-        shuffle(tasks)
-
-        return tasks
+        self._converged = np.zeros(pixels, dtype=np.bool)
+        return _pixel_tasks(self._mask)
 
 
 cdef class RGBAdaptiveSampler2D(FrameSampler2D):
@@ -711,8 +631,7 @@ cdef class RGBAdaptiveSampler2D(FrameSampler2D):
         RGBPipeline2D _pipeline
         double _fraction, _ratio, _cutoff
         int _min_samples
-        np.ndarray _mask
-        uint8[:, ::1] _mask_mv
+        np.ndarray _mask, _converged
 
     def __init__(self, RGBPipeline2D pipeline, double fraction=0.2, double ratio=10.0, int min_samples=1000, double cutoff=0.0, np.ndarray mask=None):
 
@@ -773,6 +692,20 @@ cdef class RGBAdaptiveSampler2D(FrameSampler2D):
             raise ValueError("Attribute 'cutoff' must be in the range [0, 1].")
         self._cutoff = value
 
+    @property
+    def converged(self):
+        """
+        The pixels that have converged, a 2D boolean array.
+
+        A pixel has converged once it has at least min_samples samples and its
+        normalised error is no greater than the cutoff. Converged pixels are
+        not sampled further. The array is updated by each call to
+        generate_tasks() and is None before the first call.
+
+        :rtype: np.ndarray
+        """
+        return self._converged
+
     @property
     def mask(self):
         return self._mask
@@ -785,23 +718,14 @@ cdef class RGBAdaptiveSampler2D(FrameSampler2D):
             if value.ndim != 2:
                 raise ValueError("Mask must be a 2D array.")
             self._mask = value.astype(np.bool)
-            self._mask_mv = np.frombuffer(self._mask, dtype=np.uint8).reshape(self.mask.shape)
 
-    @cython.boundscheck(False)
-    @cython.wraparound(False)
-    @cython.cdivision(True)
-    @cython.initializedcheck(False)
     cpdef list generate_tasks(self, tuple pixels):
 
         cdef:
             StatsArray3D frame
-            int x, y, c, min_samples, min_pixel_samples
-            np.ndarray normalised
-            double[:, :, ::1] error
-            double[:, ::1] normalised_mv
+            int min_samples
+            np.ndarray normalised, frame_min_samples
             double percentile_error, cutoff
-            list tasks
-            double[3] pixel_normalised
 
         # The all-true mask is created during the first call of generate_tasks if no mask was provided
         if self.mask is None:
@@ -820,60 +744,27 @@ cdef class RGBAdaptiveSampler2D(FrameSampler2D):
             raise ValueError('The number of pixels passed to the frame sampler are inconsistent with the pipeline frame size.')
 
         min_samples = max(self._min_samples, <int>(frame.samples[self._mask].max() / self._ratio))
-        error = frame.errors()
-        normalised = np.zeros((frame.nx, frame.ny))
-        normalised_mv = normalised
 
-        # calculated normalised standard error
-        for x in range(frame.nx):
-            for y in range(frame.ny):
-                if self._mask_mv[x, y]:
-                    for c in range(3):
-                        if frame.mean_mv[x, y, c] > 0:
-                            pixel_normalised[c] = error[x, y, c] / frame.mean_mv[x, y, c]
-                    normalised_mv[x, y] = max(pixel_normalised[0], pixel_normalised[1], pixel_normalised[2])
+        # calculated normalised standard error, the largest of the channels
+        normalised = _normalised_errors(frame, self._mask[:, :, np.newaxis] & (frame.mean > 0)).max(2)
 
         # locate error value corresponding to fraction of frame to process
         percentile_error = np.percentile(normalised[self._mask], (1 - self._fraction) * 100)
         cutoff = max(self._cutoff, percentile_error)
 
         # build tasks
-        tasks = []
-        for x in range(frame.nx):
-            for y in range(frame.ny):
-                if self._mask_mv[x, y]:
-                    min_pixel_samples = min(frame.samples_mv[x, y, 0], frame.samples_mv[x, y, 1], frame.samples_mv[x, y, 2])
-                    if min_pixel_samples < min_samples or normalised_mv[x, y] > cutoff:
-                        tasks.append((x, y))
-
-        # perform tasks in random order so that image is assembled randomly rather than sequentially
-        shuffle(tasks)
-
-        return tasks
-
-    @cython.boundscheck(False)
-    @cython.wraparound(False)
-    @cython.initializedcheck(False)
-    cpdef list _full_frame(self, tuple pixels):
+        frame_min_samples = frame.samples.min(2)
+        self._converged = self._mask & (frame_min_samples >= min_samples) & (normalised <= self._cutoff)
+        return _pixel_tasks(self._mask & ((frame_min_samples < min_samples) | (normalised > cutoff)),
+                            np.where(frame_min_samples < min_samples, np.inf, normalised))
 
-        cdef:
-            list tasks
-            int nx, ny, x, y
+    cpdef list _full_frame(self, tuple pixels):
 
         if self.mask is None:  # just in case if _full_frame() is called before generate_tasks()
             self.mask = np.ones(pixels, dtype=np.bool)
 
-        tasks = []
-        nx, ny = pixels
-        for x in range(nx):
-            for y in range(ny):
-                if self._mask_mv[x, y]:
-                    tasks.append((x, y))
-
-        # perform tasks in random order so that image is assembled randomly rather than sequentially
-        shuffle(tasks)
-
-        return tasks
+        self._converged = np.zeros(pixels, dtype=np.bool)
+        return _pixel_tasks(self._mask)
 
 
 cdef class MaskedRGBAdaptiveSampler2D(RGBAdaptiveSampler2D):
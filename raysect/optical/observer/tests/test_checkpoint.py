@@ -0,0 +1,284 @@
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE. 
+
+
+"""
+Unit tests for render checkpoints.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+from raysect.core import SerialEngine
+from raysect.optical import World, ConstantSF
+from raysect.optical.material import UniformSurfaceEmitter
+from raysect.optical.observer import PinholeCamera, RGBPipeline2D, PowerPipeline2D, SpectralPowerPipeline2D, Pipeline2D
+from raysect.optical.observer.base.checkpoint import write_checkpoint, read_checkpoint
+from raysect.primitive import Sphere
+
+
+class Interrupted(Exception):
+    pass
+
+
+class RecordingEngine(SerialEngine):
+    """Serial engine that counts the rendered tasks and optionally fails after a number of tasks."""
+
+    def __init__(self, limit=None, seed=None):
+        super().__init__(seed)
+        self.limit = limit
+        self.count = 0
+
+    def run(self, tasks, render, update, render_args=(), render_kwargs={}, update_args=(), update_kwargs={}):
+
+        def recorded_update(result, *args, **kwargs):
+            if self.count == self.limit:
+                raise Interrupted()
+            self.count += 1
+            update(result, *args, **kwargs)
+
+        super().run(tasks, render, recorded_update, render_args, render_kwargs, update_args, update_kwargs)
+
+
+class DeadlineEngine(SerialEngine):
+    """Serial engine that reaches its deadline after a number of tasks."""
+
+    def __init__(self, limit, seed=None):
+        super().__init__(seed)
+        self.limit = limit
+        self.count = 0
+
+    def run(self, tasks, render, update, render_args=(), render_kwargs={}, update_args=(), update_kwargs={}):
+
+        def deadline_update(result, *args, **kwargs):
+            self.count += 1
+            if self.count == self.limit:
+                self.deadline = 0
+            update(result, *args, **kwargs)
+
+        super().run(tasks, render, deadline_update, render_args, render_kwargs, update_args, update_kwargs)
+
+
+class UnsupportedPipeline(Pipeline2D):
+    pass
+
+
+class TestCheckpointFile(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'checkpoint.npz')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+
+        arrays = {'a': np.arange(5.0), 'b/c': np.ones((2, 3), dtype=np.bool_)}
+        write_checkpoint(self.path, arrays)
+        result = read_checkpoint(self.path)
+
+        self.assertEqual(set(result), {'a', 'b/c'}, 'Checkpoint keys were not preserved.')
+        np.testing.assert_array_equal(result['a'], arrays['a'], 'Checkpoint array was not preserved.')
+        np.testing.assert_array_equal(result['b/c'], arrays['b/c'], 'Checkpoint array was not preserved.')
+        self.assertEqual(os.listdir(self.directory), ['checkpoint.npz'], 'Temporary files were left behind.')
+
+    def test_replace(self):
+
+        write_checkpoint(self.path, {'a': np.zeros(3)})
+        write_checkpoint(self.path, {'a': np.ones(3)})
+        np.testing.assert_array_equal(read_checkpoint(self.path)['a'], 1, 'Checkpoint was not replaced.')
+
+    def test_invalid_file(self):
+
+        np.savez(self.path, a=np.zeros(3))
+        with self.assertRaises(ValueError, msg='A file without a checkpoint version was accepted.'):
+            read_checkpoint(self.path)
+
+
+class TestCheckpointResume(unittest.TestCase):
+
+    pixels = (5, 4)
+    pixel_samples = 3
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'render.npz')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def build_camera(self, engine):
+
+        # the camera is enclosed by a uniform emitter, every sample measures the same radiance
+        world = World()
+        Sphere(10, parent=world, material=UniformSurfaceEmitter(ConstantSF(1.0)))
+
+        pipelines = [
+            RGBPipeline2D(display_progress=False),
+            PowerPipeline2D(display_progress=False),
+            SpectralPowerPipeline2D()
+        ]
+
+        camera = PinholeCamera(self.pixels, parent=world, pipelines=pipelines)
+        camera.render_engine = engine
+        camera.pixel_samples = self.pixel_samples
+        camera.spectral_bins = 4
+        camera.spectral_rays = 2
+        camera.quiet = True
+        camera.checkpoint_file = self.path
+        camera.checkpoint_interval = 1e-9
+        return camera
+
+    def test_resume_interrupted_pass(self):
+        """An interrupted pass is completed by rendering only the remaining tasks."""
+
+        # seeded renders are repeatable, so the resumed render must match an uninterrupted render
+        reference = self.build_camera(SerialEngine(seed=7))
+        reference.checkpoint_file = None
+        reference.observe()
+
+        tasks = self.pixels[0] * self.pixels[1] * 2
+
+        interrupted = self.build_camera(RecordingEngine(limit=tasks // 2 + 3, seed=7))
+        with self.assertRaises(Interrupted):
+            interrupted.observe()
+
+        engine = RecordingEngine(seed=7)
+        resumed = self.build_camera(engine)
+        resumed.observe(resume=True)
+
+        self.assertGreater(engine.count, 0, 'No tasks were rendered after resuming.')
+        self.assertLess(engine.count, tasks, 'Completed tasks were rendered again after resuming.')
+
+        for pipeline, expected in zip(resumed.pipelines, reference.pipelines):
+            frame = pipeline.xyz_frame if isinstance(pipeline, RGBPipeline2D) else pipeline.frame
+            expected = expected.xyz_frame if isinstance(expected, RGBPipeline2D) else expected.frame
+            np.testing.assert_array_equal(frame.samples, expected.samples, 'Resumed render has the wrong sample counts.')
+            np.testing.assert_array_equal(frame.mean, expected.mean, 'Resumed render has the wrong mean.')
+            np.testing.assert_array_equal(frame.variance, expected.variance, 'Resumed render has the wrong variance.')
+
+    def test_resume_deadline(self):
+        """A pass stopped at the render deadline is checkpointed and completed by resuming."""
+
+        reference = self.build_camera(SerialEngine(seed=7))
+        reference.checkpoint_file = None
+        reference.observe()
+
+        tasks = self.pixels[0] * self.pixels[1] * 2
+
+        stopped = self.build_camera(DeadlineEngine(limit=tasks // 2 + 3, seed=7))
+        stopped.observe()
+        self.assertEqual(stopped.render_engine.count, tasks // 2 + 3, 'Tasks were rendered after the deadline.')
+
+        engine = RecordingEngine(seed=7)
+        resumed = self.build_camera(engine)
+        resumed.observe(resume=True)
+        self.assertEqual(engine.count, tasks - tasks // 2 - 3, 'The remaining tasks of the pass were not rendered.')
+
+        for pipeline, expected in zip(resumed.pipelines, reference.pipelines):
+            frame = pipeline.xyz_frame if isinstance(pipeline, RGBPipeline2D) else pipeline.frame
+            expected = expected.xyz_frame if isinstance(expected, RGBPipeline2D) else expected.frame
+            np.testing.assert_array_equal(frame.samples, expected.samples, 'Resumed render has the wrong sample counts.')
+            np.testing.assert_array_equal(frame.mean, expected.mean, 'Resumed render has the wrong mean.')
+
+    def test_resume_completed_pass(self):
+        """Resuming after a completed pass accumulates a new pass on the restored frames."""
+
+        self.build_camera(SerialEngine()).observe()
+
+        camera = self.build_camera(SerialEngine())
+        camera.observe(resume=True)
+
+        np.testing.assert_array_equal(camera.pipelines[1].frame.samples, 2 * self.pixel_samples,
+                                      'The restored frame was not accumulated.')
+
+    def test_resume_missing_file(self):
+        """Resuming without a checkpoint file on disk starts a new render."""
+
+        camera = self.build_camera(SerialEngine())
+        camera.observe(resume=True)
+
+        np.testing.assert_array_equal(camera.pipelines[1].frame.samples, self.pixel_samples, 'Render did not complete.')
+        self.assertTrue(os.path.exists(self.path), 'No checkpoint was written at the end of the pass.')
+
+    def test_default_interval(self):
+        """A render shorter than the default checkpoint interval completes without writing a checkpoint."""
+
+        camera = self.build_camera(SerialEngine())
+        camera.checkpoint_interval = 600
+        camera.observe()
+        np.testing.assert_array_equal(camera.pipelines[1].frame.samples, self.pixel_samples, 'Render did not complete.')
+        self.assertFalse(os.path.exists(self.path), 'A checkpoint was written before the checkpoint interval.')
+
+        camera = self.build_camera(SerialEngine())
+        camera.checkpoint_interval = 600
+        camera.observe(resume=True)
+        np.testing.assert_array_equal(camera.pipelines[1].frame.samples, self.pixel_samples, 'Resume without a checkpoint did not start a new render.')
+
+    def test_resume_mismatch(self):
+
+        self.build_camera(SerialEngine()).observe()
+
+        camera = self.build_camera(SerialEngine())
+        camera.pixels = (3, 3)
+        with self.assertRaises(ValueError, msg='A checkpoint with different pixel dimensions was accepted.'):
+            camera.observe(resume=True)
+
+        camera = self.build_camera(SerialEngine())
+        camera.spectral_bins = 6
+        with self.assertRaises(ValueError, msg='A checkpoint with a different spectral configuration was accepted.'):
+            camera.observe(resume=True)
+
+    def test_resume_without_file(self):
+
+        camera = self.build_camera(SerialEngine())
+        camera.checkpoint_file = None
+        with self.assertRaises(ValueError, msg='Resume without a checkpoint file did not raise.'):
+            camera.observe(resume=True)
+
+    def test_unsupported_pipeline(self):
+
+        camera = self.build_camera(SerialEngine())
+        camera.pipelines = [UnsupportedPipeline()]
+        with self.assertRaises(TypeError, msg='A pipeline without checkpoint support was accepted.'):
+            camera.observe()
+
+    def test_checkpoint_interval(self):
+
+        camera = self.build_camera(SerialEngine())
+        with self.assertRaises(ValueError, msg='A checkpoint interval of zero was accepted.'):
+            camera.checkpoint_interval = 0
+
+
+if __name__ == "__main__":
+    unittest.main()
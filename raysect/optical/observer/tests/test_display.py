@@ -0,0 +1,279 @@
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE. 
+
+
+"""
+Unit tests for the deferred pipeline display support.
+"""
+
+import subprocess
+import sys
+import threading
+import unittest
+import numpy as np
+
+from raysect.core.math import StatsArray2D, StatsArray3D
+from raysect.optical.observer.pipeline.display import DisplayThread, decimate_frame
+
+
+def _run(code):
+    """Runs code in a fresh interpreter and returns its stripped stdout."""
+
+    result = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+    return result.stdout.decode().strip()
+
+
+class TestDisplay(unittest.TestCase):
+
+    def test_observer_import_is_headless(self):
+        """Importing the observers must not import matplotlib."""
+
+        code = (
+            "import sys\n"
+            "import raysect.optical\n"
+            "import raysect.optical.observer\n"
+            "print('matplotlib' in sys.modules)\n"
+        )
+        self.assertEqual(_run(code), 'False', 'Importing raysect.optical.observer imported matplotlib.')
+
+    def test_pipeline_creation_is_headless(self):
+        """Creating pipelines with display_progress disabled must not import matplotlib."""
+
+        code = (
+            "import sys\n"
+            "from raysect.optical.observer import RGBPipeline2D, PowerPipeline2D, BayerPipeline2D, SpectralPowerPipeline0D\n"
+            "RGBPipeline2D(display_progress=False)\n"
+            "PowerPipeline2D(display_progress=False)\n"
+            "BayerPipeline2D(None, None, None, display_progress=False)\n"
+            "SpectralPowerPipeline0D(display_progress=False).finalise()\n"
+            "print('matplotlib' in sys.modules)\n"
+        )
+        self.assertEqual(_run(code), 'False', 'Creating a pipeline imported matplotlib.')
+
+    def test_display_backend(self):
+        """The requested backend is applied when pyplot is first imported."""
+
+        code = (
+            "import sys\n"
+            "from raysect.optical.observer import set_display_backend, get_display_backend\n"
+            "from raysect.optical.observer.pipeline.display import pyplot\n"
+            "set_display_backend('Agg')\n"
+            "assert get_display_backend() == 'Agg'\n"
+            "assert 'matplotlib' not in sys.modules\n"
+            "import matplotlib\n"
+            "pyplot()\n"
+            "print(matplotlib.get_backend().lower())\n"
+        )
+        self.assertEqual(_run(code), 'agg', 'The display backend was not applied.')
+
+    def test_display_backend_invalid(self):
+        """Backend names must be strings."""
+
+        from raysect.optical.observer import set_display_backend, get_display_backend
+
+        backend = get_display_backend()
+        with self.assertRaises(TypeError, msg='A non-string backend was accepted.'):
+            set_display_backend(1)
+        self.assertEqual(get_display_backend(), backend, 'A rejected backend replaced the current backend.')
+
+
+class TestDisplayThread(unittest.TestCase):
+
+    def test_generate(self):
+        """Snapshots are converted into images by the background thread."""
+
+        thread = DisplayThread(lambda snapshot: 2 * snapshot)
+        try:
+            self.assertFalse(thread.ready, 'Thread reported an image before any snapshot was submitted.')
+            self.assertIsNone(thread.collect(), 'Thread returned an image before any snapshot was submitted.')
+            thread.submit(np.ones(3))
+            thread.wait()
+            self.assertTrue(thread.ready, 'Thread did not report the generated image.')
+            np.testing.assert_array_equal(thread.collect(), [2, 2, 2], 'Generated image is incorrect.')
+            self.assertFalse(thread.ready, 'Collected image was not cleared.')
+        finally:
+            thread.stop()
+
+    def test_latest_snapshot(self):
+        """Snapshots submitted while the generator is busy are replaced by newer snapshots."""
+
+        started = threading.Event()
+        release = threading.Event()
+        processed = []
+
+        def generate(snapshot):
+            started.set()
+            release.wait()
+            processed.append(snapshot)
+            return snapshot
+
+        thread = DisplayThread(generate)
+        try:
+            thread.submit(0)
+            started.wait()
+            for i in range(1, 5):
+                thread.submit(i)
+            release.set()
+            thread.wait()
+            self.assertEqual(processed, [0, 4], 'Outdated snapshots were processed.')
+            self.assertEqual(thread.collect(), 4, 'The latest image was not returned.')
+        finally:
+            thread.stop()
+
+    def test_error(self):
+        """Generator exceptions are raised by collect()."""
+
+        def generate(snapshot):
+            raise ValueError()
+
+        thread = DisplayThread(generate)
+        try:
+            thread.submit(0)
+            thread.wait()
+            with self.assertRaises(ValueError, msg='Generator exception was not raised.'):
+                thread.collect()
+        finally:
+            thread.stop()
+
+    def test_stop(self):
+        """Stopping the thread terminates it."""
+
+        thread = DisplayThread(lambda snapshot: snapshot)
+        thread.stop()
+        self.assertFalse(thread._thread.is_alive(), 'Display thread is still running.')
+
+
+class TestDecimateFrame(unittest.TestCase):
+
+    def test_decimate_2d(self):
+
+        frame = StatsArray2D(5, 4)
+        frame.mean[:] = np.arange(20).reshape(5, 4)
+        frame.variance[:] = 1
+        frame.samples[:] = 2
+
+        snapshot = decimate_frame(frame, 2)
+        self.assertIsInstance(snapshot, StatsArray2D, 'Decimated frame has the wrong type.')
+        self.assertEqual(snapshot.shape, (3, 2), 'Decimated frame has the wrong shape.')
+        np.testing.assert_array_equal(snapshot.mean, frame.mean[::2, ::2], 'Decimated mean is incorrect.')
+        np.testing.assert_array_equal(snapshot.variance, 1, 'Decimated variance is incorrect.')
+        np.testing.assert_array_equal(snapshot.samples, 2, 'Decimated samples are incorrect.')
+
+    def test_decimate_3d(self):
+
+        frame = StatsArray3D(4, 7, 3)
+        frame.mean[:] = np.arange(84).reshape(4, 7, 3)
+
+        snapshot = decimate_frame(frame, 3)
+        self.assertEqual(snapshot.shape, (2, 3, 3), 'Decimated frame has the wrong shape.')
+        np.testing.assert_array_equal(snapshot.mean, frame.mean[::3, ::3, :], 'Decimated mean is incorrect.')
+
+    def test_decimate_copy(self):
+        """A factor of 1 returns an independent full resolution copy."""
+
+        frame = StatsArray2D(3, 3)
+        snapshot = decimate_frame(frame, 1)
+        frame.mean[0, 0] = 1
+        self.assertEqual(snapshot.shape, (3, 3), 'Copied frame has the wrong shape.')
+        self.assertEqual(snapshot.mean[0, 0], 0, 'Snapshot shares data with the frame.')
+
+
+class TestLiveDisplay(unittest.TestCase):
+
+    def test_render_with_preview(self):
+        """A render with live previews completes and leaves no display threads running."""
+
+        code = (
+            "import threading\n"
+            "from raysect.optical.observer import set_display_backend\n"
+            "set_display_backend('Agg')\n"
+            "from raysect.core import SerialEngine\n"
+            "from raysect.optical import World, translate, ConstantSF\n"
+            "from raysect.optical.observer import PinholeCamera, RGBPipeline2D, PowerPipeline2D, BayerPipeline2D\n"
+            "from raysect.optical.material import UniformSurfaceEmitter\n"
+            "from raysect.primitive import Sphere\n"
+            "world = World()\n"
+            "Sphere(0.5, parent=world, transform=translate(0, 0, 3), material=UniformSurfaceEmitter(ConstantSF(1.0)))\n"
+            "pipelines = [\n"
+            "    RGBPipeline2D(display_update_time=0.01, display_decimation=2),\n"
+            "    PowerPipeline2D(display_update_time=0.01, display_decimation=3),\n"
+            "    BayerPipeline2D(ConstantSF(1), ConstantSF(1), ConstantSF(1), display_update_time=0.01)\n"
+            "]\n"
+            "camera = PinholeCamera((8, 6), parent=world, pipelines=pipelines)\n"
+            "camera.render_engine = SerialEngine()\n"
+            "camera.pixel_samples = 1\n"
+            "camera.spectral_bins = 5\n"
+            "camera.quiet = True\n"
+            "camera.observe()\n"
+            "print(threading.active_count(), pipelines[1].frame.shape, pipelines[1].frame.mean.max() > 0)\n"
+        )
+        self.assertEqual(_run(code), '1 (8, 6) True', 'Live preview render failed.')
+
+    def test_generate_display(self):
+        """Preview generation returns the auto exposure with the image and leaves the pipeline state unchanged."""
+
+        from raysect.optical import ConstantSF
+        from raysect.optical.observer import RGBPipeline2D, PowerPipeline2D, BayerPipeline2D
+
+        rgb = RGBPipeline2D(display_progress=False)
+        rgb.initialise((4, 3), 1, 375, 740, 1, [], True)
+        rgb.xyz_frame.mean[:] = 2.0
+
+        image, sensitivity = rgb._generate_display(rgb.xyz_frame)
+        self.assertEqual(image.shape, (4, 3, 3), 'Preview image has the wrong shape.')
+        self.assertAlmostEqual(sensitivity, 0.5, msg='Auto exposure sensitivity is wrong.')
+        self.assertEqual(rgb.display_sensitivity, 1.0, 'Preview generation modified the pipeline sensitivity.')
+
+        np.testing.assert_array_equal(rgb._generate_display_image(rgb.xyz_frame), image, 'Display image does not match the preview.')
+        self.assertAlmostEqual(rgb.display_sensitivity, 0.5, msg='Display image did not update the sensitivity.')
+
+        for mono in (PowerPipeline2D(display_progress=False), BayerPipeline2D(ConstantSF(1), ConstantSF(1), ConstantSF(1), display_progress=False)):
+            mono.initialise((4, 3), 1, 375, 740, 1, [], True)
+            mono.frame.mean[:] = 2.0
+
+            image, white_point = mono._generate_display(mono.frame)
+            self.assertEqual(image.shape, (4, 3), 'Preview image has the wrong shape.')
+            self.assertAlmostEqual(white_point, 2.0, msg='Auto exposure white point is wrong.')
+            self.assertEqual(mono.display_white_point, 1.0, 'Preview generation modified the pipeline white point.')
+
+            mono._generate_display_image(mono.frame)
+            self.assertAlmostEqual(mono.display_white_point, 2.0, msg='Display image did not update the white point.')
+
+    def test_display_decimation(self):
+
+        from raysect.optical.observer import RGBPipeline2D
+
+        pipeline = RGBPipeline2D(display_progress=False, display_decimation=4)
+        self.assertEqual(pipeline.display_decimation, 4, 'Display decimation was not set.')
+        with self.assertRaises(ValueError, msg='A display decimation of zero was accepted.'):
+            pipeline.display_decimation = 0
+
+
+if __name__ == "__main__":
+    unittest.main()
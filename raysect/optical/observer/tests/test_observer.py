@@ -0,0 +1,98 @@
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE. 
+
+
+"""
+Unit tests for the observer base classes.
+"""
+
+import unittest
+
+from raysect.core import SerialEngine
+from raysect.optical import World, ConstantSF
+from raysect.optical.material import UniformSurfaceEmitter
+from raysect.optical.observer import PinholeCamera, PowerPipeline2D
+from raysect.primitive import Sphere
+
+
+class RaysCamera(PinholeCamera):
+    """Customises the rays by overriding _generate_rays()."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = 0
+
+    def _generate_rays(self, x, y, template, ray_count):
+        self.calls += 1
+        return super()._generate_rays(x, y, template, ray_count)
+
+
+class ArraysCamera(RaysCamera):
+    """Customises both the rays and the ray arrays."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.array_calls = 0
+
+    def _generate_ray_arrays(self, x, y, ray_count):
+        self.array_calls += 1
+        return super()._generate_ray_arrays(x, y, ray_count)
+
+
+class TestRayGeneration(unittest.TestCase):
+
+    def render(self, cls):
+
+        world = World()
+        Sphere(10, parent=world, material=UniformSurfaceEmitter(ConstantSF(1.0)))
+
+        camera = cls((4, 3), parent=world, pipelines=[PowerPipeline2D(display_progress=False)])
+        camera.render_engine = SerialEngine(seed=1)
+        camera.pixel_samples = 5
+        camera.spectral_bins = 4
+        camera.quiet = True
+        camera.observe()
+        return camera
+
+    def test_generate_rays_override(self):
+        """A subclass overriding _generate_rays() is used in place of the ray arrays of its base class."""
+
+        camera = self.render(RaysCamera)
+        self.assertEqual(camera.calls, 12, 'The overridden _generate_rays() was not called for every pixel.')
+
+    def test_generate_ray_arrays_override(self):
+        """A subclass overriding both methods renders with its ray arrays."""
+
+        camera = self.render(ArraysCamera)
+        self.assertEqual(camera.array_calls, 12, 'The overridden _generate_ray_arrays() was not called for every pixel.')
+        self.assertEqual(camera.calls, 0, 'The rays were generated from lists.')
+
+
+if __name__ == "__main__":
+    unittest.main()
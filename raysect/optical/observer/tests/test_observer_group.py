@@ -0,0 +1,165 @@
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE. 
+
+
+"""
+Unit tests for the observer group.
+"""
+
+import unittest
+import numpy as np
+
+from raysect.core import SerialEngine
+from raysect.optical import World, InterpolatedSF
+from raysect.optical.material import UniformSurfaceEmitter
+from raysect.optical.observer import SightLine, Pixel, FibreOptic, PinholeCamera, ObserverGroup
+from raysect.optical.observer import PowerPipeline0D, SpectralRadiancePipeline0D, PowerPipeline2D
+from raysect.primitive import Sphere
+
+
+class EmptySightLine(SightLine):
+    """A sight-line that generates no render tasks."""
+
+    def _generate_tasks(self):
+        return []
+
+
+def build_observers(types):
+    """
+    0D observers of each type, enclosed by an emitter with a non-uniform spectrum.
+
+    The observers use different pixel samples and spectral slices.
+    """
+
+    world = World()
+    Sphere(10, parent=world, material=UniformSurfaceEmitter(InterpolatedSF([375, 500, 740], [1, 3, 0.5])))
+
+    observers = []
+    for index, cls in enumerate(types):
+        observer = cls(pipelines=[PowerPipeline0D(), SpectralRadiancePipeline0D()], parent=world)
+        observer.render_engine = SerialEngine(seed=1)
+        observer.quiet = True
+        observer.pixel_samples = 20 + 10 * index
+        observer.spectral_bins = 6
+        observer.spectral_rays = index + 1
+        observers.append(observer)
+
+    return observers
+
+
+class TestObserverGroup(unittest.TestCase):
+
+    types = [SightLine, Pixel, FibreOptic]
+
+    def assert_same_results(self, observers, expected):
+        """The pipelines must hold the same number of samples and agree within the sampling errors."""
+
+        for observer, reference in zip(observers, expected):
+            name = type(observer).__name__
+
+            value, reference_value = observer.pipelines[0].value, reference.pipelines[0].value
+            self.assertEqual(value.samples, reference_value.samples, '{} has the wrong sample count.'.format(name))
+            tolerance = 5 * np.hypot(value.error(), reference_value.error()) + 1e-12 * abs(reference_value.mean)
+            self.assertAlmostEqual(value.mean, reference_value.mean, delta=tolerance, msg='{} has the wrong power.'.format(name))
+
+            samples, reference_samples = observer.pipelines[1].samples, reference.pipelines[1].samples
+            np.testing.assert_array_equal(samples.samples, reference_samples.samples, '{} has the wrong spectral sample counts.'.format(name))
+            tolerance = 5 * np.hypot(samples.errors(), reference_samples.errors()) + 1e-12 * np.abs(reference_samples.mean)
+            self.assertTrue((np.abs(samples.mean - reference_samples.mean) <= tolerance).all(), '{} has the wrong spectral radiance.'.format(name))
+
+    def test_matches_observers(self):
+        """The group renders the same results as observing each observer individually."""
+
+        expected = build_observers(self.types)
+        for observer in expected:
+            observer.observe()
+
+        observers = build_observers(self.types)
+        group = ObserverGroup(observers, render_engine=SerialEngine(seed=1), quiet=True)
+        group.observe()
+
+        self.assertTrue(group.render_complete, 'Group render is not complete.')
+        self.assertTrue(all(observer.render_complete for observer in observers), 'Observer renders are not complete.')
+        self.assert_same_results(observers, expected)
+
+        # every spectral slice of the observers with several spectral rays must be rendered
+        self.assertEqual(observers[2].spectral_rays, 3, 'Test observer does not have several spectral slices.')
+        self.assertTrue((observers[2].pipelines[1].samples.samples == observers[2].pixel_samples).all(), 'Spectral slices were not rendered.')
+
+    def test_reproducible(self):
+        """Seeded group renders are reproducible."""
+
+        results = []
+        for _ in range(2):
+            observers = build_observers(self.types)
+            ObserverGroup(observers, render_engine=SerialEngine(seed=3), quiet=True).observe()
+            results.append([observer.pipelines[1].samples.mean for observer in observers])
+
+        for first, second in zip(*results):
+            np.testing.assert_array_equal(first, second, 'Seeded group render was not reproducible.')
+
+    def test_empty_observer(self):
+        """An observer without render tasks does not affect the other observers."""
+
+        expected = build_observers(self.types)
+        for observer in expected:
+            observer.observe()
+
+        observers = build_observers(self.types + [EmptySightLine])
+        group = ObserverGroup(observers, render_engine=SerialEngine(seed=1), quiet=True)
+        group.observe()
+
+        self.assertTrue(group.render_complete, 'Group render is not complete.')
+        self.assertEqual(observers[-1].pipelines[0].value.samples, 0, 'The empty observer was rendered.')
+        self.assert_same_results(observers[:-1], expected)
+
+        # a group of observers without render tasks is complete immediately
+        group = ObserverGroup(build_observers([EmptySightLine, EmptySightLine]), render_engine=SerialEngine(seed=1), quiet=True)
+        group.observe()
+        self.assertTrue(group.render_complete, 'Group render without tasks is not complete.')
+
+    def test_observer_types(self):
+        """The group only accepts 0D observers."""
+
+        observers = build_observers(self.types)
+        camera = PinholeCamera((4, 4), pipelines=[PowerPipeline2D(display_progress=False)], parent=observers[0].root)
+
+        with self.assertRaises(TypeError, msg='A 2D observer was accepted.'):
+            ObserverGroup(observers + [camera])
+
+        group = ObserverGroup(observers)
+        with self.assertRaises(TypeError, msg='A 2D observer was added.'):
+            group.add(camera)
+
+        with self.assertRaises(TypeError, msg='A 2D observer was accepted.'):
+            group.observers = [camera]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,320 @@
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE. 
+
+
+"""
+Unit tests for the 2D frame samplers and multi-pass rendering.
+"""
+
+import unittest
+import numpy as np
+from time import time
+
+from raysect.core import SerialEngine, translate, rotate_basis, Point3D, Vector3D
+from raysect.optical import World, ConstantSF, InterpolatedSF
+from raysect.optical.material import Lambert, UniformSurfaceEmitter
+from raysect.optical.observer import PinholeCamera, PowerPipeline2D, SpectralPowerPipeline2D, RGBPipeline2D
+from raysect.optical.observer import FullFrameSampler2D, MonoAdaptiveSampler2D, SpectralAdaptiveSampler2D, RGBAdaptiveSampler2D
+from raysect.primitive import Box, Sphere
+
+
+def build_scene(pipelines, pixels=(8, 8), pixel_samples=10):
+    """
+    A lambertian floor lit by a sphere emitting in part of the spectrum.
+
+    Half of the camera's view is empty, so the frame has pixels without power.
+    """
+
+    world = World()
+    emission = InterpolatedSF([375, 500, 501, 740], [1, 1, 0, 0])
+    Sphere(0.5, parent=world, transform=translate(0, 1, 0), material=UniformSurfaceEmitter(emission))
+    Box(Point3D(-5, -0.1, -5), Point3D(5, 0, 5), parent=world, material=Lambert(ConstantSF(0.5)))
+
+    camera = PinholeCamera(pixels, fov=40, pipelines=pipelines, parent=world,
+                           transform=translate(0, 0.5, -4) * rotate_basis(Vector3D(0, 0, 1), Vector3D(0, 1, 0)))
+    camera.render_engine = SerialEngine(seed=1)
+    camera.quiet = True
+    camera.pixel_samples = pixel_samples
+    camera.spectral_bins = 10
+    return world, camera
+
+
+def reference_tasks(mask, samples, normalised, min_samples, fraction, cutoff):
+    """The pixel selection of the previous per-pixel implementation of the adaptive samplers."""
+
+    percentile_error = np.percentile(normalised[mask], (1 - fraction) * 100)
+    cutoff = max(cutoff, percentile_error)
+
+    tasks = set()
+    for x in range(mask.shape[0]):
+        for y in range(mask.shape[1]):
+            if mask[x, y] and (samples[x, y] < min_samples or normalised[x, y] > cutoff):
+                tasks.add((x, y))
+    return tasks
+
+
+def reference_spectral_errors(frame, mask, method, percentile):
+    """The spectral error reductions of the previous per-pixel implementation."""
+
+    error = frame.errors()
+    normalised = np.zeros((frame.nx, frame.ny))
+    for x in range(frame.nx):
+        for y in range(frame.ny):
+            if not mask[x, y]:
+                continue
+            mean = frame.mean[x, y]
+            valid = mean > 0
+            if not valid.any():
+                continue
+            if method == 'weighted':
+                normalised[x, y] = error[x, y][valid].sum() / mean[valid].sum()
+            elif method == 'mean':
+                normalised[x, y] = (error[x, y][valid] / mean[valid]).mean()
+            elif method == 'percentile':
+                normalised[x, y] = np.percentile(error[x, y][valid] / mean[valid], percentile)
+            else:
+                threshold = np.percentile(mean[valid], 100 - percentile)
+                for z in range(frame.nz):
+                    if mean[z] >= threshold:
+                        normalised[x, y] = max(normalised[x, y], error[x, y, z] / mean[z])
+    return normalised
+
+
+class TestAdaptiveSamplers(unittest.TestCase):
+
+    def setUp(self):
+        self.mask = np.ones((8, 8), dtype=bool)
+        self.mask[0, :] = False
+
+    def test_full_frame(self):
+        """The full frame sampler generates a task for every masked pixel."""
+
+        tasks = FullFrameSampler2D(self.mask).generate_tasks((8, 8))
+        self.assertEqual(len(tasks), 56, 'Wrong number of tasks.')
+        self.assertEqual(set(tasks), set(zip(*np.nonzero(self.mask))), 'Tasks do not match the mask.')
+        self.assertTrue(all(type(x) is int and type(y) is int for x, y in tasks), 'Task coordinates are not Python integers.')
+
+    def test_mono(self):
+        """The mono sampler selects the noisiest pixels."""
+
+        pipeline = PowerPipeline2D(display_progress=False)
+        world, camera = build_scene([pipeline])
+        sampler = MonoAdaptiveSampler2D(pipeline, fraction=0.3, min_samples=5, cutoff=0.05, mask=self.mask)
+
+        # no frame is available before the first render
+        self.assertEqual(len(sampler.generate_tasks((8, 8))), 56, 'Sampler did not generate the full frame.')
+        self.assertFalse(sampler.converged.any(), 'Pixels converged before rendering.')
+
+        camera.observe()
+        frame = pipeline.frame
+        self.assertTrue((frame.mean[self.mask] == 0).any(), 'Test scene has no pixels without power.')
+
+        normalised = np.zeros((8, 8))
+        valid = self.mask & (frame.mean > 0)
+        normalised[valid] = frame.errors()[valid] / frame.mean[valid]
+        expected = reference_tasks(self.mask, frame.samples, normalised, 5, 0.3, 0.05)
+
+        tasks = sampler.generate_tasks((8, 8))
+        self.assertEqual(set(tasks), expected, 'Sampler selected different pixels.')
+        self.assertEqual(len(tasks), len(expected), 'Sampler generated duplicate tasks.')
+
+        converged = self.mask & (frame.samples >= 5) & (normalised <= 0.05)
+        self.assertTrue(np.array_equal(sampler.converged, converged), 'Convergence mask is wrong.')
+        self.assertFalse(any(sampler.converged[task] for task in tasks), 'Converged pixels were sampled.')
+
+    def test_spectral(self):
+        """The spectral sampler reduces the spectral errors of each pixel."""
+
+        pipeline = SpectralPowerPipeline2D()
+        world, camera = build_scene([pipeline])
+        camera.observe()
+        frame = pipeline.frame
+        self.assertTrue(((frame.mean == 0) & (frame.mean.max(2) > 0)[:, :, np.newaxis]).any(), 'Test scene has no bins without power.')
+
+        for method in ('weighted', 'mean', 'percentile', 'power_percentile'):
+            sampler = SpectralAdaptiveSampler2D(pipeline, fraction=0.3, min_samples=5, cutoff=0.05, reduction_method=method,
+                                                percentile=80, mask=self.mask)
+
+            normalised = reference_spectral_errors(frame, self.mask, method, 80)
+            expected = reference_tasks(self.mask, frame.samples.min(2), normalised, 5, 0.3, 0.05)
+            self.assertEqual(set(sampler.generate_tasks((8, 8))), expected, 'Reduction {} selected different pixels.'.format(method))
+
+    def test_rgb(self):
+        """The RGB sampler uses the largest error of the colour channels."""
+
+        pipeline = RGBPipeline2D(display_progress=False)
+        world, camera = build_scene([pipeline])
+        camera.observe()
+        frame = pipeline.xyz_frame
+
+        valid = self.mask[:, :, np.newaxis] & (frame.mean > 0)
+        normalised = np.zeros(frame.shape)
+        normalised[valid] = frame.errors()[valid] / frame.mean[valid]
+        normalised = normalised.max(2)
+        expected = reference_tasks(self.mask, frame.samples.min(2), normalised, 5, 0.3, 0.05)
+
+        sampler = RGBAdaptiveSampler2D(pipeline, fraction=0.3, min_samples=5, cutoff=0.05, mask=self.mask)
+        self.assertEqual(set(sampler.generate_tasks((8, 8))), expected, 'Sampler selected different pixels.')
+
+    def test_priority(self):
+        """The adaptive samplers generate the tasks of the noisiest pixels first."""
+
+        pipeline = PowerPipeline2D(display_progress=False)
+        world, camera = build_scene([pipeline])
+        camera.observe()
+        frame = pipeline.frame
+
+        normalised = np.zeros((8, 8))
+        valid = frame.mean > 0
+        normalised[valid] = frame.errors()[valid] / frame.mean[valid]
+
+        sampler = MonoAdaptiveSampler2D(pipeline, fraction=0.5, min_samples=5, cutoff=0.0)
+        errors = [normalised[task] for task in sampler.generate_tasks((8, 8))]
+        self.assertEqual(errors, sorted(errors, reverse=True), 'Tasks are not ordered by decreasing error.')
+
+        # pixels below the minimum sample count take precedence
+        frame.samples[0, :] = 2
+        tasks = sampler.generate_tasks((8, 8))
+        self.assertEqual({task[0] for task in tasks[:8]}, {0}, 'Under-sampled pixels were not rendered first.')
+
+
+class TestMultiPass(unittest.TestCase):
+
+    def test_max_passes(self):
+        """Observe renders the requested number of passes."""
+
+        pipeline = PowerPipeline2D(display_progress=False)
+        world, camera = build_scene([pipeline], pixels=(4, 4), pixel_samples=2)
+        self.assertIsNone(camera.max_passes, 'Observers should render a single pass by default.')
+        self.assertIsNone(camera.time_budget, 'Observers should not have a time budget by default.')
+
+        camera.max_passes = 3
+        camera.observe()
+        self.assertEqual(camera.render_passes, 3, 'Wrong number of passes rendered.')
+        self.assertTrue((pipeline.frame.samples == 6).all(), 'Passes were not accumulated.')
+
+        with self.assertRaises(ValueError, msg='Negative pass limit was accepted.'):
+            camera.max_passes = -1
+        with self.assertRaises(ValueError, msg='Zero time budget was accepted.'):
+            camera.time_budget = 0
+
+    def test_time_budget(self):
+        """No further passes are started once the time budget is used."""
+
+        pipeline = PowerPipeline2D(display_progress=False)
+        world, camera = build_scene([pipeline], pixels=(4, 4), pixel_samples=2)
+        camera.max_passes = 0
+        camera.time_budget = 1e-6
+        camera.observe()
+        self.assertEqual(camera.render_passes, 1, 'Passes were started after the time budget was used.')
+        self.assertFalse(camera.render_complete, 'Render should not be complete.')
+
+    def test_converge(self):
+        """Observe renders an adaptive frame until it converges."""
+
+        pipeline = PowerPipeline2D(display_progress=False)
+        world, camera = build_scene([pipeline], pixels=(4, 4), pixel_samples=20)
+        camera.frame_sampler = MonoAdaptiveSampler2D(pipeline, fraction=0.5, min_samples=20, cutoff=0.2)
+        camera.max_passes = 0
+        camera.time_budget = 60
+        camera.observe()
+
+        sampler = camera.frame_sampler
+        self.assertTrue(camera.render_complete, 'Render did not converge.')
+        self.assertGreater(camera.render_passes, 1, 'Render converged in a single pass, the test scene is not noisy enough.')
+        self.assertTrue(sampler.converged.all(), 'Not all pixels converged.')
+        self.assertGreater(pipeline.frame.samples.max(), pipeline.frame.samples.min(), 'Pixels were not sampled adaptively.')
+
+    def test_time_budget_deadline(self):
+        """The render stops at the time budget part way through a pass and reports the samples per pixel."""
+
+        pipeline = PowerPipeline2D(display_progress=False)
+        world, camera = build_scene([pipeline], pixels=(64, 64), pixel_samples=200)
+        camera.frame_sampler = MonoAdaptiveSampler2D(pipeline, fraction=0.5, min_samples=200, cutoff=0.0)
+        self.assertIsNone(camera.render_samples, 'Samples were reported before rendering.')
+
+        camera.time_budget = 0.5
+        start = time()
+        camera.observe()
+        self.assertLess(time() - start, 5, 'The render overran the time budget.')
+        self.assertIsNone(camera.render_engine.deadline, 'The render engine deadline was not cleared.')
+        self.assertFalse(camera.render_complete, 'Render should not be complete.')
+
+        # a partly rendered pass leaves pixels without samples
+        samples = camera.render_samples
+        self.assertEqual(samples.shape, (64, 64), 'Samples per pixel has the wrong shape.')
+        self.assertTrue((samples == 0).any(), 'The first pass was not stopped at the deadline.')
+        self.assertTrue((samples > 0).any(), 'No pixels were rendered.')
+        np.testing.assert_array_equal(samples, pipeline.frame.samples, 'Reported samples do not match the frame.')
+
+    def test_time_budget_spectral_rays(self):
+        """Pixels rendered before the deadline sample every spectral slice, the frame is unbiased."""
+
+        # the camera is enclosed by a uniform emitter, so the pixel power only varies with the sampled directions
+        world = World()
+        Sphere(10, parent=world, material=UniformSurfaceEmitter(ConstantSF(1.0)))
+
+        reference = PowerPipeline2D(display_progress=False)
+        camera = PinholeCamera((64, 64), parent=world, pipelines=[reference])
+        camera.render_engine = SerialEngine(seed=1)
+        camera.quiet = True
+        camera.pixel_samples = 20
+        camera.spectral_bins = 10
+        camera.spectral_rays = 2
+        start = time()
+        camera.observe()
+        duration = time() - start
+
+        pipeline = PowerPipeline2D(display_progress=False)
+        camera.pipelines = [pipeline]
+        camera.time_budget = 0.25 * duration
+        camera.observe()
+
+        rendered = pipeline.frame.samples > 0
+        self.assertTrue(rendered.any(), 'No pixels were rendered.')
+        self.assertFalse(rendered.all(), 'The render was not stopped at the deadline.')
+        np.testing.assert_array_equal(pipeline.frame.samples[rendered], 20, 'Pixels were not rendered for every spectral slice.')
+        np.testing.assert_array_equal(camera.render_samples, pipeline.frame.samples, 'Reported samples do not match the frame.')
+
+        ratio = pipeline.frame.mean[rendered].sum() / reference.frame.mean[rendered].sum()
+        self.assertAlmostEqual(ratio, 1.0, delta=0.05, msg='The power of a budgeted render is biased.')
+
+    def test_render_samples(self):
+        """Samples of each spectral slice count as a fraction of a sample."""
+
+        pipeline = PowerPipeline2D(display_progress=False)
+        world, camera = build_scene([pipeline], pixels=(4, 4), pixel_samples=3)
+        camera.spectral_rays = 2
+        camera.max_passes = 2
+        camera.observe()
+        np.testing.assert_array_equal(camera.render_samples, 6, 'Wrong number of samples per pixel.')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -48,6 +48,12 @@ cdef class Ray(CoreRay):
         public int depth
         readonly int ray_count
         Ray _primary_ray
+        bint _lighting_weighted
+        double _direct_weight
+        double _indirect_weight
+        bint _daughter_lighting_weighted
+        double _daughter_direct_weight
+        double _daughter_indirect_weight
 
     cpdef Spectrum new_spectrum(self)
     cpdef Spectrum trace(self, World world, bint keep_alive=*)
@@ -57,6 +63,10 @@ cdef class Ray(CoreRay):
     cdef double get_min_wavelength(self) nogil
     cdef double get_max_wavelength(self) nogil
     cdef double get_important_path_weight(self) nogil
+    cdef void set_daughter_lighting_weights(self, double direct_weight, double indirect_weight)
+    cdef void clear_daughter_lighting_weights(self)
+    cdef double _lighting_weight(self, Intersection intersection)
+    cdef void _transfer_lighting_weights(self, Ray daughter)
     cdef Spectrum _sample_surface(self, Intersection intersection, World world)
     cdef Spectrum _sample_volumes(self, Spectrum spectrum, Intersection intersection, World world)
 
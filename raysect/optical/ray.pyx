@@ -34,7 +34,9 @@ from libc.math cimport M_PI as PI, asin, cos
 from raysect.core cimport Intersection
 from raysect.core.math.random cimport probability
 from raysect.core.math.cython cimport clamp
-from raysect.optical.material.material cimport Material
+from raysect.core.statistics cimport RAYSECT_STATISTICS, count_path_depth
+from raysect.core.statistics cimport profile_enter, profile_exit, PROFILE_SURFACE, PROFILE_VOLUME
+from raysect.optical.material.material cimport Material, ContinuousBSDF
 from raysect.optical.spectrum cimport new_spectrum
 from raysect.optical.scenegraph cimport Primitive
 cimport cython
@@ -372,7 +374,7 @@ cdef class Ray(CoreRay):
             Primitive primitive
             Point3D start_point, end_point
             Material material
-            double normalisation
+            double normalisation, weight
 
         # reset ray statistics
         if self._primary_ray is None:
@@ -390,11 +392,20 @@ cdef class Ray(CoreRay):
             else:
                 normalisation = 1 / (1 - self._extinction_prob)
 
+        if RAYSECT_STATISTICS:
+            count_path_depth(self.depth)
+
         # does the ray intersect with any of the primitives in the world?
         intersection = world.hit(self)
         if intersection is None:
             return self.new_spectrum()
 
+        # direct lighting samples only collect the share of light assigned to them by the launching material
+        weight = self._lighting_weight(intersection)
+        if weight == 0:
+            return self.new_spectrum()
+        normalisation *= weight
+
         # sample material
         spectrum = self._sample_surface(intersection, world)
         spectrum = self._sample_volumes(spectrum, intersection, world)
@@ -403,23 +414,72 @@ cdef class Ray(CoreRay):
         spectrum.mul_scalar(normalisation)
         return spectrum
 
+    cdef void set_daughter_lighting_weights(self, double direct_weight, double indirect_weight):
+        """
+        Sets the direct lighting weights of the next daughter ray.
+
+        Materials sampling direct lighting split the light arriving along a
+        daughter ray by the first surface it hits. Light from surfaces that are
+        not continuous BSDFs (emitters, specular and null surfaces) is scaled by
+        the direct weight, light from continuous BSDF surfaces by the indirect
+        weight. The weights are consumed by the next call to spawn_daughter().
+
+        :param double direct_weight: Weight applied to light from surfaces that are not continuous BSDFs.
+        :param double indirect_weight: Weight applied to light from continuous BSDF surfaces.
+        """
+
+        self._daughter_lighting_weighted = True
+        self._daughter_direct_weight = direct_weight
+        self._daughter_indirect_weight = indirect_weight
+
+    cdef void clear_daughter_lighting_weights(self):
+        """
+        Clears any direct lighting weights not consumed by a daughter ray.
+        """
+
+        self._daughter_lighting_weighted = False
+
+    cdef double _lighting_weight(self, Intersection intersection):
+
+        if not self._lighting_weighted:
+            return 1.0
+
+        if isinstance(intersection.primitive.get_material(), ContinuousBSDF):
+            return self._indirect_weight
+        return self._direct_weight
+
+    cdef void _transfer_lighting_weights(self, Ray daughter):
+
+        if self._daughter_lighting_weighted:
+            daughter._lighting_weighted = True
+            daughter._direct_weight = self._daughter_direct_weight
+            daughter._indirect_weight = self._daughter_indirect_weight
+            self._daughter_lighting_weighted = False
+
     @cython.cdivision(True)
     cdef Spectrum _sample_surface(self, Intersection intersection, World world):
 
-        cdef Material material
+        cdef:
+            Material material
+            Spectrum spectrum
+            bint profiled
 
         # request surface contribution to spectrum from primitive material
         material = intersection.primitive.get_material()
-        return material.evaluate_surface(world,
-                                         self,
-                                         intersection.primitive,
-                                         intersection.hit_point,
-                                         intersection.exiting,
-                                         intersection.inside_point,
-                                         intersection.outside_point,
-                                         intersection.normal,
-                                         intersection.world_to_primitive,
-                                         intersection.primitive_to_world)
+        profiled = RAYSECT_STATISTICS and profile_enter()
+        spectrum = material.evaluate_surface(world,
+                                             self,
+                                             intersection.primitive,
+                                             intersection.hit_point,
+                                             intersection.exiting,
+                                             intersection.inside_point,
+                                             intersection.outside_point,
+                                             intersection.normal,
+                                             intersection.world_to_primitive,
+                                             intersection.primitive_to_world)
+        if profiled:
+            profile_exit(PROFILE_SURFACE, material)
+        return spectrum
 
     cdef Spectrum _sample_volumes(self, Spectrum spectrum, Intersection intersection, World world):
 
@@ -428,6 +488,7 @@ cdef class Ray(CoreRay):
             Point3D start_point, end_point
             Primitive primitive
             Material material
+            bint profiled
 
         # identify any primitive volumes the ray is propagating through
         primitives = world.contains(self.origin)
@@ -443,6 +504,7 @@ cdef class Ray(CoreRay):
             for primitive in primitives:
 
                 material = primitive.get_material()
+                profiled = RAYSECT_STATISTICS and profile_enter()
                 spectrum = material.evaluate_volume(
                     spectrum,
                     world,
@@ -453,6 +515,8 @@ cdef class Ray(CoreRay):
                     primitive.to_local(),
                     primitive.to_root()
                 )
+                if profiled:
+                    profile_exit(PROFILE_VOLUME, material)
 
         return spectrum
 
@@ -534,6 +598,7 @@ cdef class Ray(CoreRay):
         ray.importance_sampling = self.importance_sampling
         ray._important_path_weight = self._important_path_weight
         ray.depth = self.depth + 1
+        self._transfer_lighting_weights(ray)
 
         # track ray statistics
         if self._primary_ray is None:
@@ -0,0 +1,123 @@
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE. 
+
+
+import unittest
+import numpy as np
+from raysect.core import Point3D, Vector3D, translate
+from raysect.primitive import Sphere
+from raysect.optical import World
+from raysect.optical.material import UniformSurfaceEmitter, Lambert
+from raysect.optical.scenegraph.world import ImportanceManager
+from raysect.optical.library.spectra.colours import orange
+
+
+class TestImportanceManager(unittest.TestCase):
+    """
+    Tests the light tree used to sample important primitives.
+    """
+
+    def build_world(self, count=40, seed=5):
+
+        rng = np.random.RandomState(seed)
+        world = World()
+        for i in range(count):
+            material = UniformSurfaceEmitter(orange)
+            material.importance = rng.uniform(0.5, 2.0)
+            Sphere(rng.uniform(0.05, 0.2), parent=world, transform=translate(*rng.uniform(-3, 3, 3)), material=material)
+
+        # a primitive without importance is ignored
+        Sphere(0.5, parent=world, material=Lambert())
+        return world
+
+    def test_sample_pdf_consistency(self):
+        """The pdf matches the distribution of the sampled directions."""
+
+        world = self.build_world()
+        manager = ImportanceManager(world.primitives)
+        origin = Point3D(0.3, -0.2, 0.1)
+
+        # the mean of 1/pdf over sampled directions is the solid angle covered by the bounding spheres
+        samples = 20000
+        estimate = 0
+        for i in range(samples):
+            direction = manager.sample(origin)
+            pdf = manager.pdf(origin, direction)
+            self.assertGreater(pdf, 0, "A sampled direction must have a non-zero pdf.")
+            estimate += 1 / pdf
+        estimate /= samples
+
+        # uniform sphere sampling estimate of the same solid angle and of the pdf normalisation
+        rng = np.random.RandomState(7)
+        directions = rng.normal(size=(200000, 3))
+        directions /= np.linalg.norm(directions, axis=1)[:, None]
+        pdfs = np.array([manager.pdf(origin, Vector3D(*d)) for d in directions])
+        covered = 4 * np.pi * np.mean(pdfs > 0)
+        integral = 4 * np.pi * np.mean(pdfs)
+
+        self.assertAlmostEqual(integral, 1.0, delta=0.05, msg="The pdf does not integrate to one.")
+        self.assertAlmostEqual(estimate / covered, 1.0, delta=0.05, msg="The sampled directions do not follow the pdf.")
+
+    def test_distance_weighting(self):
+        """Nearby primitives are selected more often than distant primitives of the same importance."""
+
+        world = World()
+        near = UniformSurfaceEmitter(orange)
+        near.importance = 1
+        far = UniformSurfaceEmitter(orange)
+        far.importance = 1
+        Sphere(0.1, parent=world, transform=translate(1, 0, 0), material=near)
+        Sphere(0.1, parent=world, transform=translate(-4, 0, 0), material=far)
+
+        manager = ImportanceManager(world.primitives)
+        origin = Point3D(0, 0, 0)
+
+        count = 0
+        for i in range(2000):
+            if manager.sample(origin).x > 0:
+                count += 1
+
+        # the selection weights are proportional to the inverse square distance, 16:1
+        self.assertAlmostEqual(count / 2000, 16 / 17, delta=0.03, msg="The nearby primitive is not favoured.")
+        self.assertAlmostEqual(manager.pdf(origin, Vector3D(1, 0, 0)) / manager.pdf(origin, Vector3D(-1, 0, 0)),
+                               16 * (1 - np.sqrt(1 - (0.1 / 4) ** 2)) / (1 - np.sqrt(1 - 0.1 ** 2)), delta=1e-9,
+                               msg="The pdf does not include the distance weighting.")
+
+    def test_no_important_primitives(self):
+        """A scene without important primitives has no importance."""
+
+        world = World()
+        Sphere(0.5, parent=world, material=Lambert())
+        manager = ImportanceManager(world.primitives)
+        self.assertFalse(manager.has_primitives())
+        self.assertEqual(manager.pdf(Point3D(1, 0, 0), Vector3D(-1, 0, 0)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
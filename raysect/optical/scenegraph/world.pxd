@@ -29,23 +29,37 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
-from numpy cimport ndarray
+from numpy cimport ndarray, int32_t
 from raysect.core cimport Point3D, Vector3D, World as CoreWorld
 
 
 cdef class ImportanceManager:
 
     cdef:
-        ndarray _cdf
-        double[::1] _cdf_mv
         double _total_importance
         list _spheres
+        ndarray _nodes
+        ndarray _children
+        ndarray _stack
+        ndarray _stack_probability
+        double[:, ::1] _nodes_mv
+        int32_t[:, ::1] _children_mv
+        int32_t[::1] _stack_mv
+        double[::1] _stack_probability_mv
 
     cdef object _process_primitives(self, list primitives)
 
-    cdef object _calculate_cdf(self)
+    cdef object _build_tree(self)
 
-    cdef tuple _pick_sphere(self)
+    cdef tuple _split(self, object ids, object centres, object radii, object importances)
+
+    cdef object _box_area(self, object extent)
+
+    cdef double _weight(self, int node, Point3D origin)
+
+    cdef double _solid_angle(self, int node, Point3D origin, Vector3D direction)
+
+    cdef tuple _pick_sphere(self, Point3D origin)
 
     cpdef Vector3D sample(self, Point3D origin)
 
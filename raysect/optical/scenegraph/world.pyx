@@ -32,14 +32,27 @@
 import numpy as np
 from raysect.core.scenegraph.signal import MATERIAL
 
-from raysect.core cimport BoundingBox3D, BoundingSphere3D, AffineMatrix3D, _NodeBase, ChangeSignal
-from raysect.core.acceleration cimport BoundPrimitive
+from raysect.core cimport BoundingSphere3D, AffineMatrix3D, _NodeBase, ChangeSignal
 from raysect.core.math.random cimport uniform, vector_sphere, vector_cone_uniform
-from raysect.core.math.cython cimport find_index, rotate_basis
+from raysect.core.math.cython cimport rotate_basis
 from libc.math cimport M_PI as PI, asin, sqrt
 cimport cython
 
 
+# light tree constants
+DEF ROOT_NODE = 0
+DEF LEAF = -1
+
+DEF CENTRE_X = 0
+DEF CENTRE_Y = 1
+DEF CENTRE_Z = 2
+DEF RADIUS = 3
+DEF IMPORTANCE = 4
+
+# lower limit on the squared distance used to weight tree nodes, avoids a division by zero for zero radius spheres
+DEF MIN_DISTANCE_SQR = 1e-12
+
+
 class ImportanceError(Exception):
     pass
 
@@ -47,6 +60,19 @@ class ImportanceError(Exception):
 cdef class ImportanceManager:
     """
     Specialist class for managing sampling of important primitives.
+
+    The bounding spheres of the important primitives are organised into a
+    binary light tree. Each tree node holds a bounding sphere enclosing its
+    primitives and the sum of their importance weights. At a given point the
+    weight of a node is its importance divided by the squared distance to the
+    node's bounding sphere (clamped to the sphere radius), so nearby primitives
+    are selected more often than distant primitives of the same importance.
+
+    A primitive is selected by descending the tree, choosing between the
+    children of each branch in proportion to their weights. The pdf of a
+    direction is evaluated by descending only into the nodes whose bounding
+    sphere projection contains the direction. Both operations visit O(log N)
+    nodes for N important primitives in typical scenes.
     """
 
     def __init__(self, primitives):
@@ -58,29 +84,41 @@ cdef class ImportanceManager:
         # Each tuple has the structure (bounding_sphere, primitive_importance).
         self._spheres = []
 
+        self._nodes = None
+        self._children = None
+        self._nodes_mv = None
+        self._children_mv = None
+        self._stack = None
+        self._stack_probability = None
+        self._stack_mv = None
+        self._stack_probability_mv = None
+
         if len(primitives) == 0:
-            self._cdf = None
-            self._cdf_mv = None
             return
 
         self._process_primitives(primitives)
 
         if self._total_importance == 0:
             # no important primitives were found
-            self._cdf = None
-            self._cdf_mv = None
             return
 
-        # Populate numpy array storing the normalised cumulative importance weights of all important primitives.
-        # Used for selecting a random primitive proportional to their respective weights.
-        self._calculate_cdf()
+        # Build the light tree used to select primitives in proportion to their importance at a point.
+        self._build_tree()
 
     def __getstate__(self):
-        state = self._cdf, self._total_importance, self._spheres
+        return self._total_importance, self._spheres, self._nodes, self._children, self._stack
 
     def __setstate__(self, state):
-        self._cdf, self._total_importance, self._spheres = state
-        self._cdf_mv = self._cdf
+
+        self._total_importance, self._spheres, self._nodes, self._children, self._stack = state
+        self._nodes_mv = self._nodes
+        self._children_mv = self._children
+        self._stack_mv = self._stack
+        if self._stack is None:
+            self._stack_probability = None
+        else:
+            self._stack_probability = np.zeros(self._stack.shape[0], dtype=np.float64)
+        self._stack_probability_mv = self._stack_probability
 
     def __reduce__(self):
         return self.__new__, (self.__class__, ), self.__getstate__()
@@ -105,49 +143,226 @@ cdef class ImportanceManager:
                 self._total_importance += importance
                 self._spheres.append((sphere, importance))
 
+    cdef object _build_tree(self):
+        """
+        Builds the light tree over the important primitive bounding spheres.
+
+        The tree is built top-down. Each node's primitives are sorted along the
+        axis of greatest centre extent and split where the sum of the child
+        importances, each weighted by the surface area of the child's bounding
+        box, is smallest. Nodes are stored in depth-first order in two arrays:
+        the node array holds the bounding sphere centre, radius and importance
+        of each node. The children array holds the indices of a branch's
+        children, or LEAF and the index of the primitive's sphere for a leaf.
+        """
+
+        cdef:
+            int count, node, lower_node, upper_node, depth
+            list pending, importance_sums, children, depths
+            BoundingSphere3D sphere
+
+        count = len(self._spheres)
+        centres = np.array([(sphere.centre.x, sphere.centre.y, sphere.centre.z) for sphere, _ in self._spheres], dtype=np.float64)
+        radii = np.array([sphere.radius for sphere, _ in self._spheres], dtype=np.float64)
+        importances = np.array([importance for _, importance in self._spheres], dtype=np.float64)
+
+        importance_sums = []
+        children = []
+        depths = []
+        spheres = []
+
+        # the node indices are allocated in depth-first order so every child index is greater than its parent's
+        pending = [(np.arange(count), None, 0, 0)]
+        while pending:
+
+            ids, parent, side, depth = pending.pop()
+
+            node = len(importance_sums)
+            importance_sums.append(None)
+            children.append([LEAF, 0])
+            depths.append(depth)
+            spheres.append(None)
+            if parent is not None:
+                children[parent][side] = node
+
+            if len(ids) == 1:
+                children[node][1] = ids[0]
+                sphere = self._spheres[ids[0]][0]
+                spheres[node] = BoundingSphere3D(sphere.centre.copy(), sphere.radius)
+                importance_sums[node] = importances[ids[0]]
+                continue
+
+            lower_ids, upper_ids = self._split(ids, centres, radii, importances)
+            importance_sums[node] = importances[ids].sum()
+
+            # the upper half is pushed first so the lower child is built immediately after its parent
+            pending.append((upper_ids, node, 1, depth + 1))
+            pending.append((lower_ids, node, 0, depth + 1))
+
+        # branch bounding spheres enclose the bounding spheres of their children, children are processed first
+        for node in range(len(importance_sums) - 1, -1, -1):
+            if children[node][0] != LEAF:
+                lower_node, upper_node = children[node]
+                sphere = BoundingSphere3D(spheres[lower_node].centre.copy(), spheres[lower_node].radius)
+                sphere.union(spheres[upper_node])
+                spheres[node] = sphere
+
+        self._nodes = np.array(
+            [(sphere.centre.x, sphere.centre.y, sphere.centre.z, sphere.radius, importance) for sphere, importance in zip(spheres, importance_sums)],
+            dtype=np.float64
+        )
+        self._children = np.array(children, dtype=np.int32)
+        self._nodes_mv = self._nodes
+        self._children_mv = self._children
+
+        # the pdf traversal stack holds at most one entry per tree level plus the sibling of each node on the path
+        self._stack = np.zeros(max(depths) + 2, dtype=np.int32)
+        self._stack_probability = np.zeros(max(depths) + 2, dtype=np.float64)
+        self._stack_mv = self._stack
+        self._stack_probability_mv = self._stack_probability
+
+    cdef tuple _split(self, object ids, object centres, object radii, object importances):
+        """
+        Splits a set of bounding spheres into two groups.
+
+        :param ids: Array of sphere indices.
+        :param centres: Array of sphere centres.
+        :param radii: Array of sphere radii.
+        :param importances: Array of sphere importances.
+        :return: A tuple of lower and upper sphere index arrays.
+        """
+
+        node_centres = centres[ids]
+        extent = node_centres.max(axis=0) - node_centres.min(axis=0)
+        axis = np.argmax(extent)
+
+        # coincident centres can not be separated, split the primitives evenly
+        if extent[axis] == 0:
+            return ids[:len(ids) // 2], ids[len(ids) // 2:]
+
+        ids = ids[np.argsort(node_centres[:, axis], kind="stable")]
+
+        # bounding boxes and importance of the lower (prefix) and upper (suffix) groups of each candidate split
+        lower = centres[ids] - radii[ids, None]
+        upper = centres[ids] + radii[ids, None]
+
+        prefix_extent = np.maximum.accumulate(upper, axis=0) - np.minimum.accumulate(lower, axis=0)
+        suffix_extent = (np.maximum.accumulate(upper[::-1], axis=0) - np.minimum.accumulate(lower[::-1], axis=0))[::-1]
+        prefix_importance = np.cumsum(importances[ids])
+        suffix_importance = np.cumsum(importances[ids][::-1])[::-1]
+
+        # candidate split k places ids[:k] in the lower group
+        cost = (
+            prefix_importance[:-1] * self._box_area(prefix_extent[:-1]) +
+            suffix_importance[1:] * self._box_area(suffix_extent[1:])
+        )
+        split = np.argmin(cost) + 1
+        return ids[:split], ids[split:]
+
+    cdef object _box_area(self, object extent):
+        return extent[:, 0] * extent[:, 1] + extent[:, 1] * extent[:, 2] + extent[:, 2] * extent[:, 0]
+
+    @cython.cdivision(True)
     @cython.wraparound(False)
     @cython.boundscheck(False)
     @cython.initializedcheck(False)
-    cdef object _calculate_cdf(self):
+    cdef double _weight(self, int node, Point3D origin):
         """
-        Calculate the cumulative distribution function for import primitives (CDF).
+        Returns the importance of a tree node as seen from a point.
+
+        The node importance is scaled by the inverse square distance to the
+        node's bounding sphere centre. The distance is clamped to the sphere
+        radius so points inside or near a sphere do not over-weight the node.
 
-        Stores an array with length equal to the number of important primitives. At
-        each point in the array the normalised cumulative importance weighting is stored.
+        :param node: The node index.
+        :param origin: The point from which the node is observed.
+        :return: The node weight.
         """
 
-        self._cdf = np.zeros(len(self._spheres), dtype=np.float64)
-        for index, sphere_data in enumerate(self._spheres):
-            _, importance = sphere_data
-            if index == 0:
-                self._cdf[index] = importance
-            else:
-                self._cdf[index] = self._cdf[index-1] + importance
-        self._cdf /= self._total_importance
+        cdef double dx, dy, dz, distance_sqr, radius_sqr
 
-        # create memoryview for fast access
-        self._cdf_mv = self._cdf
+        dx = self._nodes_mv[node, CENTRE_X] - origin.x
+        dy = self._nodes_mv[node, CENTRE_Y] - origin.y
+        dz = self._nodes_mv[node, CENTRE_Z] - origin.z
+        distance_sqr = dx * dx + dy * dy + dz * dz
+        radius_sqr = self._nodes_mv[node, RADIUS] * self._nodes_mv[node, RADIUS]
+        return self._nodes_mv[node, IMPORTANCE] / max(distance_sqr, radius_sqr, MIN_DISTANCE_SQR)
 
+    @cython.cdivision(True)
     @cython.wraparound(False)
     @cython.boundscheck(False)
     @cython.initializedcheck(False)
-    cdef tuple _pick_sphere(self):
+    cdef double _solid_angle(self, int node, Point3D origin, Vector3D direction):
         """
-        Find the important primitive bounding sphere corresponding to a uniform random number.
+        Returns the solid angle of a node's bounding sphere projection if it contains the direction.
+
+        :param node: The node index.
+        :param origin: The point from which the node is observed.
+        :param direction: The normalised sample direction.
+        :return: The solid angle of the projection, or zero if the direction lies outside the projection.
+        """
+
+        cdef double dx, dy, dz, distance, radius, angular_radius_cos, t
+
+        dx = self._nodes_mv[node, CENTRE_X] - origin.x
+        dy = self._nodes_mv[node, CENTRE_Y] - origin.y
+        dz = self._nodes_mv[node, CENTRE_Z] - origin.z
+        distance = sqrt(dx * dx + dy * dy + dz * dz)
+        radius = self._nodes_mv[node, RADIUS]
+
+        # is point inside sphere?
+        if distance == 0 or distance < radius:
+
+            # the point lies inside the sphere, the projection is a full sphere
+            return 4 * PI
+
+        # calculate cosine of angular radius of cone
+        t = radius / distance
+        angular_radius_cos = sqrt(1 - t * t)
+
+        # does the direction lie inside the cone of projection
+        if (direction.x * dx + direction.y * dy + direction.z * dz) / distance < angular_radius_cos:
+            return 0
+
+        return 2 * PI * (1 - angular_radius_cos)
+
+    @cython.cdivision(True)
+    @cython.wraparound(False)
+    @cython.boundscheck(False)
+    @cython.initializedcheck(False)
+    cdef tuple _pick_sphere(self, Point3D origin):
+        """
+        Select an important primitive bounding sphere, weighted by importance as seen from a point.
+
+        The tree is descended using a single uniform random number, which is
+        rescaled at each branch to select the next child.
         """
 
         cdef:
-            int index
-            double probability
-            BoundingBox3D box
-            BoundPrimitive bound_primitive
+            int node, lower, upper
+            double sample, lower_weight, upper_weight, probability
 
-        if self._cdf is None:
+        if self._nodes is None:
             return None
 
-        # due to the CDF not starting at zero, using find_index means that the result is offset by 1 index point.
-        index = find_index(self._cdf_mv, uniform()) + 1
-        return self._spheres[index]
+        node = ROOT_NODE
+        sample = uniform()
+        while self._children_mv[node, 0] != LEAF:
+
+            lower = self._children_mv[node, 0]
+            upper = self._children_mv[node, 1]
+            lower_weight = self._weight(lower, origin)
+            upper_weight = self._weight(upper, origin)
+            probability = lower_weight / (lower_weight + upper_weight)
+
+            if sample < probability:
+                sample = sample / probability
+                node = lower
+            else:
+                sample = (sample - probability) / (1 - probability)
+                node = upper
+
+        return self._spheres[self._children_mv[node, 1]]
 
     @cython.cdivision(True)
     @cython.wraparound(False)
@@ -172,11 +387,11 @@ cdef class ImportanceManager:
 
         # TODO: move the projection code to a projection method on BoundingSphere3D
 
-        if self._cdf is None:
+        if self._nodes is None:
             raise ImportanceError("Attempted to sample important direction when no important primitives have been"
                                   "specified.")
 
-        sphere, importance = self._pick_sphere()
+        sphere, importance = self._pick_sphere(origin)
 
         direction = origin.vector_to(sphere.centre)
         distance = direction.get_length()
@@ -200,6 +415,7 @@ cdef class ImportanceManager:
     @cython.cdivision(True)
     @cython.boundscheck(False)
     @cython.wraparound(False)
+    @cython.initializedcheck(False)
     cpdef double pdf(self, Point3D origin, Vector3D direction):
         """
         Calculates the value of the PDF for the specified sample point and direction.
@@ -210,45 +426,45 @@ cdef class ImportanceManager:
         """
 
         cdef:
-            BoundingSphere3D sphere
-            double importance, distance, solid_angle, angular_radius_cos, t
-            double pdf_all, pdf_sphere, selection_weight
-            Vector3D cone_axis
-            AffineMatrix3D rotation
-
-        pdf_all = 0
-        for sphere, importance in self._spheres:
-
-            cone_axis = origin.vector_to(sphere.centre)
-            distance = cone_axis.get_length()
-
-            # is point inside sphere?
-            if distance == 0 or distance < sphere.radius:
+            int node, lower, upper, top
+            double pdf_all, probability, solid_angle, lower_weight, upper_weight
 
-                # the point lies inside the sphere, the projection is a full sphere
-                solid_angle = 4 * PI
+        if self._nodes is None:
+            return 0
 
-            else:
-
-                # calculate cosine of angular radius of cone
-                t = sphere.radius / distance
-                angular_radius_cos = sqrt(1 - t * t)
-
-                # does the direction lie inside the cone of projection
-                cone_axis = cone_axis.normalise()
-                if direction.dot(cone_axis) < angular_radius_cos:
-                    # no contribution, outside code of projection
-                    continue
-
-                # calculate solid angle
-                solid_angle = 2 * PI * (1 - angular_radius_cos)
-
-            # calculate probability
-            pdf_sphere = 1 / solid_angle
-            selection_weight = importance / self._total_importance
-
-            # add contribution to pdf
-            pdf_all += selection_weight * pdf_sphere
+        # depth-first traversal of the nodes whose bounding sphere projections contain the direction
+        # the probability of selecting each node is accumulated on the way down
+        pdf_all = 0
+        top = 0
+        self._stack_mv[0] = ROOT_NODE
+        self._stack_probability_mv[0] = 1.0
+        while top >= 0:
+
+            node = self._stack_mv[top]
+            probability = self._stack_probability_mv[top]
+            top -= 1
+
+            solid_angle = self._solid_angle(node, origin, direction)
+            if solid_angle == 0:
+                # no contribution, outside cone of projection
+                continue
+
+            if self._children_mv[node, 0] == LEAF:
+                pdf_all += probability / solid_angle
+                continue
+
+            lower = self._children_mv[node, 0]
+            upper = self._children_mv[node, 1]
+            lower_weight = self._weight(lower, origin)
+            upper_weight = self._weight(upper, origin)
+
+            top += 1
+            self._stack_mv[top] = upper
+            self._stack_probability_mv[top] = probability * upper_weight / (lower_weight + upper_weight)
+
+            top += 1
+            self._stack_mv[top] = lower
+            self._stack_probability_mv[top] = probability * lower_weight / (lower_weight + upper_weight)
 
         return pdf_all
 
@@ -31,6 +31,7 @@
 
 cimport cython
 from raysect.core.math.cython cimport integrate, interpolate
+from raysect.core.statistics cimport RAYSECT_STATISTICS, count_event, SPECTRA_ALLOCATED
 from numpy cimport PyArray_SimpleNew, PyArray_FILLWBYTE, NPY_FLOAT64, npy_intp, import_array
 
 # Plank's constant * speed of light in a vacuum
@@ -126,6 +127,9 @@ cdef class Spectrum(SpectralFunction):
 
         cdef npy_intp size, index
 
+        if RAYSECT_STATISTICS:
+            count_event(SPECTRA_ALLOCATED, 1)
+
         self.min_wavelength = min_wavelength
         self.max_wavelength = max_wavelength
         self.bins = bins
@@ -30,8 +30,9 @@
 from raysect.primitive.box cimport Box
 from raysect.primitive.sphere cimport Sphere
 from raysect.primitive.cylinder cimport Cylinder
-from raysect.primitive.csg cimport Union, Intersect, Subtract
+from raysect.primitive.csg cimport Union, Intersect, Subtract, MultiUnion, MultiIntersect
 from raysect.primitive.mesh cimport Mesh
 from raysect.primitive.cone cimport Cone
 from raysect.primitive.parabola cimport Parabola
-from raysect.primitive.utility cimport EncapsulatedPrimitive
\ No newline at end of file
+from raysect.primitive.utility cimport EncapsulatedPrimitive
+from raysect.primitive.instance cimport Instance
@@ -30,8 +30,9 @@
 from .box import Box
 from .sphere import Sphere
 from .cylinder import Cylinder
-from .csg import Union, Intersect, Subtract
+from .csg import Union, Intersect, Subtract, MultiUnion, MultiIntersect, flatten_csg
 from .mesh import Mesh, import_obj, export_obj, import_stl, export_stl, import_ply, export_ply, import_vtk, export_vtk
 from .cone import Cone
 from .parabola import Parabola
 from .utility import EncapsulatedPrimitive
+from .instance import Instance
@@ -29,7 +29,7 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
-from raysect.core cimport new_point3d, Normal3D, new_normal3d, AffineMatrix3D, Material, new_intersection, BoundingBox3D
+from raysect.core cimport new_point3d, new_vector3d, Normal3D, new_normal3d, AffineMatrix3D, Material, new_intersection, BoundingBox3D
 from libc.math cimport fabs
 cimport cython
 
@@ -105,8 +105,10 @@ cdef class Box(Primitive):
         # initialise next intersection caching and control attributes
         self._further_intersection = False
         self._next_t = 0.0
-        self._cached_origin = None
-        self._cached_direction = None
+        self._hit_pending = False
+        self._hit_t = 0.0
+        self._cached_origin = new_point3d(0, 0, 0)
+        self._cached_direction = new_vector3d(0, 0, 0)
         self._cached_ray = None
         self._cached_face = NO_FACE
         self._cached_axis = NO_AXIS
@@ -157,6 +159,12 @@ cdef class Box(Primitive):
 
     cpdef Intersection hit(self, Ray ray):
 
+        if self.hit_distance(ray) == INFINITY:
+            return None
+        return self.materialise_intersection()
+
+    cpdef double hit_distance(self, Ray ray) except? -1:
+
         cdef:
             Point3D origin
             Vector3D direction
@@ -166,10 +174,13 @@ cdef class Box(Primitive):
 
         # invalidate next intersection cache
         self._further_intersection = False
+        self._hit_pending = False
 
-        # convert ray origin and direction to local space
-        origin = ray.origin.transform(self.to_local())
-        direction = ray.direction.transform(self.to_local())
+        # convert ray origin and direction to local space, reusing the cached objects
+        self._point_to_local(ray.origin, self._cached_origin)
+        self._vector_to_local(ray.direction, self._cached_direction)
+        origin = self._cached_origin
+        direction = self._cached_direction
 
         # set initial ray-slab intersection search range
         near_intersection = -INFINITY
@@ -188,11 +199,11 @@ cdef class Box(Primitive):
 
         # does ray intersect box?
         if near_intersection > far_intersection:
-            return None
+            return INFINITY
 
         # are there any intersections inside the ray search range?
         if near_intersection > ray.max_distance or far_intersection < 0.0:
-            return None
+            return INFINITY
 
         # identify closest intersection
         if near_intersection >= 0.0:
@@ -205,9 +216,6 @@ cdef class Box(Primitive):
 
                 self._further_intersection = True
                 self._next_t = far_intersection
-                self._cached_origin = origin
-                self._cached_direction = direction
-                self._cached_ray = ray
                 self._cached_face = far_face
                 self._cached_axis = far_axis
 
@@ -218,9 +226,23 @@ cdef class Box(Primitive):
             closest_axis = far_axis
 
         else:
+            return INFINITY
+
+        # defer construction of the intersection until it is requested
+        self._hit_pending = True
+        self._hit_t = closest_intersection
+        self._hit_face = closest_face
+        self._hit_axis = closest_axis
+        self._cached_ray = ray
+        return closest_intersection
+
+    cpdef Intersection materialise_intersection(self):
+
+        if not self._hit_pending:
             return None
 
-        return self._generate_intersection(ray, origin, direction, closest_intersection, closest_face, closest_axis)
+        self._hit_pending = False
+        return self._generate_intersection(self._cached_ray, self._cached_origin, self._cached_direction, self._hit_t, self._hit_face, self._hit_axis)
 
     cpdef Intersection next_intersection(self):
 
@@ -40,6 +40,9 @@ cdef class Cone(Primitive):
     cdef Point3D _cached_origin
     cdef Vector3D _cached_direction
     cdef Ray _cached_ray
+    cdef bint _hit_pending
+    cdef double _hit_t
+    cdef int _hit_type
     cdef int _cached_type
 
     cdef Intersection _generate_intersection(self, Ray ray, Point3D origin, Vector3D direction, double ray_distance,
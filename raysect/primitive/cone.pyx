@@ -29,7 +29,7 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
-from raysect.core cimport new_point3d, Point3D, new_normal3d, AffineMatrix3D, Material, new_intersection, BoundingBox3D
+from raysect.core cimport new_point3d, new_vector3d, Point3D, new_normal3d, AffineMatrix3D, Material, new_intersection, BoundingBox3D
 from raysect.core.math.cython cimport solve_quadratic, swap_double, swap_int
 from libc.math cimport sqrt
 cimport cython
@@ -97,8 +97,10 @@ cdef class Cone(Primitive):
         # initialise next intersection caching and control attributes
         self._further_intersection = False
         self._next_t = 0.0
-        self._cached_origin = None
-        self._cached_direction = None
+        self._hit_pending = False
+        self._hit_t = 0.0
+        self._cached_origin = new_point3d(0, 0, 0)
+        self._cached_direction = new_vector3d(0, 0, 0)
         self._cached_ray = None
         self._cached_type = NO_TYPE
 
@@ -143,6 +145,12 @@ cdef class Cone(Primitive):
     @cython.cdivision(True)
     cpdef Intersection hit(self, Ray ray):
 
+        if self.hit_distance(ray) == INFINITY:
+            return None
+        return self.materialise_intersection()
+
+    cpdef double hit_distance(self, Ray ray) except? -1:
+
         cdef:
             Point3D origin
             Vector3D direction
@@ -155,10 +163,13 @@ cdef class Cone(Primitive):
 
         # reset the next intersection cache
         self._further_intersection = False
+        self._hit_pending = False
 
-        # convert ray origin and direction to local space
-        origin = ray.origin.transform(self.to_local())
-        direction = ray.direction.transform(self.to_local())
+        # convert ray origin and direction to local space, reusing the cached objects
+        self._point_to_local(ray.origin, self._cached_origin)
+        self._vector_to_local(ray.direction, self._cached_direction)
+        origin = self._cached_origin
+        direction = self._cached_direction
 
         radius = self._radius
         height = self._height
@@ -174,7 +185,7 @@ cdef class Cone(Primitive):
         # calculate intersection distances by solving the quadratic equation
         # ray misses if there are no real roots of the quadratic
         if not solve_quadratic(a, b, c, &t0, &t1):
-            return None
+            return INFINITY
 
         if t0 == t1:
 
@@ -206,7 +217,7 @@ cdef class Cone(Primitive):
             if t0_outside and t1_outside:
 
                 # ray intersects cone outside of height range
-                return None
+                return INFINITY
 
             elif not t0_outside and t1_outside:
 
@@ -237,7 +248,7 @@ cdef class Cone(Primitive):
 
         # are there any intersections inside the ray search range?
         if t0 > ray.max_distance or t1 < 0.0:
-            return None
+            return INFINITY
 
         # identify closest intersection
         if t0 >= 0.0:
@@ -248,18 +259,28 @@ cdef class Cone(Primitive):
             if t1 <= ray.max_distance:
                 self._further_intersection = True
                 self._next_t = t1
-                self._cached_origin = origin
-                self._cached_direction = direction
-                self._cached_ray = ray
                 self._cached_type = t1_type
 
         elif t1 <= ray.max_distance:
             closest_intersection = t1
             closest_type = t1_type
         else:
+            return INFINITY
+
+        # defer construction of the intersection until it is requested
+        self._hit_pending = True
+        self._hit_t = closest_intersection
+        self._hit_type = closest_type
+        self._cached_ray = ray
+        return closest_intersection
+
+    cpdef Intersection materialise_intersection(self):
+
+        if not self._hit_pending:
             return None
 
-        return self._generate_intersection(ray, origin, direction, closest_intersection, closest_type)
+        self._hit_pending = False
+        return self._generate_intersection(self._cached_ray, self._cached_origin, self._cached_direction, self._hit_t, self._hit_type)
 
     cpdef Intersection next_intersection(self):
 
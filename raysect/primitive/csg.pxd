@@ -29,8 +29,10 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
-from raysect.core cimport Ray, Intersection, Node, Primitive
+from raysect.core cimport Ray, Intersection, Node, Primitive, Point3D, BoundingBox3D
 from raysect.core.acceleration cimport BoundPrimitive
+from raysect.core.math.spatial.kdtree3d cimport KDTree3DCore
+from libc.stdint cimport int32_t, uint64_t
 
 
 cdef class CSGPrimitive(Primitive):
@@ -44,6 +46,18 @@ cdef class CSGPrimitive(Primitive):
     cdef Intersection _cache_last_intersection
     cdef bint _cache_invalid
 
+    cdef bint _interval_evaluation
+    cdef Ray _stream_ray
+    cdef CSGPrimitive _csg_a
+    cdef CSGPrimitive _csg_b
+    cdef Intersection _pending_a
+    cdef Intersection _pending_b
+    cdef bint _active_a
+    cdef bint _active_b
+    cdef int32_t _boundary_source
+    cdef double _boundary_distance
+    cdef bint _boundary_exiting
+
     cdef bint terminate_early(self, Intersection intersection)
 
     cdef Intersection _identify_intersection(self, Ray ray, Intersection intersection_a, Intersection intersection_b, Intersection closest_intersection)
@@ -54,6 +68,24 @@ cdef class CSGPrimitive(Primitive):
 
     cdef Intersection _modify_intersection(self, Intersection closest, Intersection a, Intersection b)
 
+    cdef Intersection _convert_intersection(self, Ray ray, Intersection intersection)
+
+    cdef bint _operator(self, bint inside_a, bint inside_b) except -1
+
+    cdef bint _start(self, Ray ray) except -1
+
+    cdef bint _advance(self) except -1
+
+    cdef void _start_child(self, int32_t source, Ray ray) except *
+
+    cdef void _advance_child(self, int32_t source) except *
+
+    cdef bint _find_boundary(self) except -1
+
+    cdef Intersection _materialise_boundary(self)
+
+    cdef void _reset_stream(self)
+
     cdef void rebuild(self)
 
 
@@ -77,4 +109,75 @@ cdef class Subtract(CSGPrimitive):
     pass
 
 
+cdef class _ChildKDTree(KDTree3DCore):
+
+    cdef:
+        list primitives
+        list touched
+        uint64_t[::1] _mailbox
+        uint64_t _ray_id
+
+    cdef list _touched_children(self, Ray ray)
+
+
+cdef class MultiCSGPrimitive(Primitive):
+
+    cdef MultiCSGRoot _csgroot
+    cdef list _children
+    cdef list _primitives
+    cdef _ChildKDTree _kdtree
+    cdef bint _rebuild_required
+    cdef Ray _stream_ray
+    cdef list _slot_sources
+    cdef list _slot_pending
+    cdef double *_heap_distance
+    cdef int32_t *_heap_slot
+    cdef int32_t _heap_size
+    cdef int32_t _heap_capacity
+    cdef int32_t _inside_count
+    cdef int32_t _boundary_slot
+    cdef double _boundary_distance
+    cdef bint _boundary_exiting
+
+    cdef void _build(self) except *
+
+    cdef bint _operator(self, int32_t inside_count) except -1
+
+    cdef bint _start(self, Ray ray) except -1
+
+    cdef bint _advance(self) except -1
+
+    cdef bint _read_slot(self, int32_t slot, double *distance, bint *exiting) except -1
+
+    cdef void _advance_slot(self, int32_t slot) except *
+
+    cdef bint _find_boundary(self) except -1
+
+    cdef void _heap_push(self, double distance, int32_t slot)
+
+    cdef void _heap_pop(self)
+
+    cdef Intersection _materialise_boundary(self)
+
+    cdef Intersection _convert_intersection(self, Ray ray, Intersection intersection)
+
+    cdef void _reset_stream(self)
+
+    cdef void rebuild(self)
+
+    cdef BoundingBox3D _local_box(self)
+
+
+cdef class MultiCSGRoot(Node):
+
+    cdef MultiCSGPrimitive csg_primitive
+
+
+cdef class MultiUnion(MultiCSGPrimitive):
+
+    pass
+
+
+cdef class MultiIntersect(MultiCSGPrimitive):
 
+    pass
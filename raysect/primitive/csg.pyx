@@ -32,6 +32,11 @@
 # TODO: add more advanced material handling
 
 from raysect.core cimport _NodeBase, ChangeSignal, Material, new_ray, new_intersection, Point3D, AffineMatrix3D, BoundingBox3D
+from raysect.core.math.spatial.kdtree3d cimport Item3D
+from cpython.mem cimport PyMem_Malloc, PyMem_Free
+from libc.stdint cimport int32_t
+from numpy import zeros, uint64
+cimport cython
 
 # bounding box is padded by a small amount to avoid numerical accuracy issues
 DEF BOX_PADDING = 1e-9
@@ -51,6 +56,16 @@ cdef class CSGPrimitive(Primitive):
     sphere and box could be unified with the 'union' operation to create a
     primitive with the combined volume of the underlying primitives.
 
+    By default the intersections of the component primitives are combined
+    incrementally, each CSG primitive converting every candidate intersection
+    to its own coordinate space before testing it against the CSG operator.
+    If interval evaluation is enabled, the components are instead treated as
+    streams of entry/exit intervals along the ray. Nested CSG primitives
+    supply the boundaries of their volume as distances and enclosure states
+    and only the intersection finally returned is constructed and converted.
+    This reduces the cost of tracing deep CSG trees, see
+    demos/core/csg_evaluation.py for a benchmark.
+
     :param Primitive primitive_a: Component primitive A of the compound primitive.
     :param Primitive primitive_b: Component primitive B of the compound primitive.
     :param Node parent: Scene-graph parent node or None (default = None).
@@ -86,6 +101,28 @@ cdef class CSGPrimitive(Primitive):
         self._cache_last_intersection = None
         self._cache_invalid = False
 
+        # initialise interval evaluation state
+        self._interval_evaluation = False
+        self._reset_stream()
+
+    @property
+    def interval_evaluation(self):
+        """
+        Evaluates the CSG operation over the intervals of the component primitives.
+
+        The setting of the outermost CSG primitive applies to all nested CSG
+        primitives it contains.
+
+        :rtype: bool
+        """
+        return self._interval_evaluation
+
+    @interval_evaluation.setter
+    def interval_evaluation(self, bint value):
+        self._interval_evaluation = value
+        self._cache_invalid = True
+        self._reset_stream()
+
     @property
     def primitive_a(self):
         """
@@ -107,6 +144,7 @@ cdef class CSGPrimitive(Primitive):
 
         # invalidate next_intersection cache
         self._cache_invalid = True
+        self._reset_stream()
 
     @property
     def primitive_b(self):
@@ -129,6 +167,7 @@ cdef class CSGPrimitive(Primitive):
 
         # invalidate next_intersection cache
         self._cache_invalid = True
+        self._reset_stream()
 
     cpdef Intersection hit(self, Ray ray):
 
@@ -136,6 +175,12 @@ cdef class CSGPrimitive(Primitive):
             Ray local_ray
             Intersection intersection_a, intersection_b, closest_intersection
 
+        if self._interval_evaluation:
+            if self._start(ray) and self._boundary_distance <= ray.max_distance:
+                return self._materialise_boundary()
+            self._reset_stream()
+            return None
+
         # invalidate next_intersection cache
         self._cache_invalid = True
 
@@ -162,6 +207,12 @@ cdef class CSGPrimitive(Primitive):
 
         cdef Intersection intersection_a, intersection_b, closest_intersection
 
+        if self._interval_evaluation:
+            if self._boundary_source >= 0 and self._advance() and self._boundary_distance <= self._stream_ray.max_distance:
+                return self._materialise_boundary()
+            self._reset_stream()
+            return None
+
         if self._cache_invalid:
             return None
 
@@ -197,18 +248,7 @@ cdef class CSGPrimitive(Primitive):
 
                     # allow derived classes to modify intersection if required
                     intersection = self._modify_intersection(closest, a, b)
-
-                    # convert local intersection attributes to csg primitive coordinate space
-                    intersection.ray = ray
-                    intersection.hit_point = intersection.hit_point.transform(intersection.primitive_to_world)
-                    intersection.inside_point = intersection.inside_point.transform(intersection.primitive_to_world)
-                    intersection.outside_point = intersection.outside_point.transform(intersection.primitive_to_world)
-                    intersection.normal = intersection.normal.transform(intersection.primitive_to_world)
-                    intersection.world_to_primitive = self.to_local()
-                    intersection.primitive_to_world = self.to_root()
-                    intersection.primitive = self
-
-                    return intersection
+                    return self._convert_intersection(ray, intersection)
 
                 else:
                     return None
@@ -241,6 +281,217 @@ cdef class CSGPrimitive(Primitive):
          # by default, do nothing
         return closest
 
+    cdef Intersection _convert_intersection(self, Ray ray, Intersection intersection):
+
+        # convert local intersection attributes to csg primitive coordinate space
+        intersection.ray = ray
+        intersection.hit_point = intersection.hit_point.transform(intersection.primitive_to_world)
+        intersection.inside_point = intersection.inside_point.transform(intersection.primitive_to_world)
+        intersection.outside_point = intersection.outside_point.transform(intersection.primitive_to_world)
+        intersection.normal = intersection.normal.transform(intersection.primitive_to_world)
+        intersection.world_to_primitive = self.to_local()
+        intersection.primitive_to_world = self.to_root()
+        intersection.primitive = self
+
+        return intersection
+
+    cdef bint _operator(self, bint inside_a, bint inside_b) except -1:
+        raise NotImplementedError("Warning: CSG operator not implemented")
+
+    cdef bint _start(self, Ray ray) except -1:
+        """
+        Starts the interval evaluation of the CSG operation along a ray.
+
+        The component primitives are treated as streams of intervals along the
+        ray, each delimited by the intersections of the primitive. The next
+        intersection of each component is held pending and its exiting state
+        gives the enclosure state of the component up to that intersection.
+        The boundaries of the CSG volume are the intersections that change the
+        result of the CSG operator. Nested CSG primitives supply their
+        boundaries directly, intersections are only constructed and converted
+        to the CSG primitive's coordinate space once they are returned.
+
+        :param Ray ray: The ray in the coordinate space of the CSG primitive's parent.
+        :return: True if a boundary was found, False otherwise.
+        """
+
+        cdef Ray local_ray
+
+        # invalidate incremental evaluation cache
+        self._cache_invalid = True
+
+        self._stream_ray = ray
+        self._boundary_source = -1
+
+        # convert ray to local space
+        local_ray = new_ray(ray.origin.transform(self.to_local()),
+                            ray.direction.transform(self.to_local()),
+                            INFINITY)
+
+        self._start_child(0, local_ray)
+
+        # if primitive A is never entered and this fixes the result of the operator, primitive B need not be traced
+        if not self._active_a and self._operator(False, False) == self._operator(False, True):
+            self._active_b = False
+            self._csg_b = None
+            self._pending_b = None
+            return False
+
+        self._start_child(1, local_ray)
+        return self._find_boundary()
+
+    cdef bint _advance(self) except -1:
+        """
+        Moves past the current boundary and identifies the next boundary.
+
+        :return: True if a boundary was found, False otherwise.
+        """
+
+        self._advance_child(self._boundary_source)
+        return self._find_boundary()
+
+    cdef void _start_child(self, int32_t source, Ray ray) except *:
+
+        cdef:
+            BoundPrimitive bound_primitive
+            CSGPrimitive csg_primitive
+            Intersection intersection
+            bint active
+
+        bound_primitive = self._primitive_a if source == 0 else self._primitive_b
+        csg_primitive = None
+        intersection = None
+
+        # a ray missing the bounding box never enters the primitive
+        if not bound_primitive.box.hit(ray):
+            active = False
+
+        elif isinstance(bound_primitive.primitive, CSGPrimitive):
+            csg_primitive = <CSGPrimitive> bound_primitive.primitive
+            active = csg_primitive._start(ray)
+
+        else:
+            intersection = bound_primitive.primitive.hit(ray)
+            active = intersection is not None
+
+        if source == 0:
+            self._csg_a = csg_primitive
+            self._pending_a = intersection
+            self._active_a = active
+        else:
+            self._csg_b = csg_primitive
+            self._pending_b = intersection
+            self._active_b = active
+
+    cdef void _advance_child(self, int32_t source) except *:
+
+        if source == 0:
+            if self._csg_a is not None:
+                self._active_a = self._csg_a._advance()
+            else:
+                self._pending_a = self._primitive_a.primitive.next_intersection()
+                self._active_a = self._pending_a is not None
+        else:
+            if self._csg_b is not None:
+                self._active_b = self._csg_b._advance()
+            else:
+                self._pending_b = self._primitive_b.primitive.next_intersection()
+                self._active_b = self._pending_b is not None
+
+    cdef bint _find_boundary(self) except -1:
+        """
+        Identifies the first boundary of the CSG volume from the pending component intersections.
+        """
+
+        cdef:
+            double distance_a, distance_b
+            bint exiting_a, exiting_b, inside, closest_is_a
+
+        while self._active_a or self._active_b:
+
+            if self._active_a:
+                if self._csg_a is not None:
+                    distance_a = self._csg_a._boundary_distance
+                    exiting_a = self._csg_a._boundary_exiting
+                else:
+                    distance_a = self._pending_a.ray_distance
+                    exiting_a = self._pending_a.exiting
+            else:
+                distance_a = INFINITY
+                exiting_a = False
+
+            if self._active_b:
+                if self._csg_b is not None:
+                    distance_b = self._csg_b._boundary_distance
+                    exiting_b = self._csg_b._boundary_exiting
+                else:
+                    distance_b = self._pending_b.ray_distance
+                    exiting_b = self._pending_b.exiting
+            else:
+                distance_b = INFINITY
+                exiting_b = False
+
+            # ties are resolved in favour of primitive B, as in the incremental evaluation
+            closest_is_a = self._active_a and (not self._active_b or distance_a < distance_b)
+
+            # the intersection is a boundary if crossing it changes the result of the csg operator
+            inside = self._operator(exiting_a, exiting_b)
+            if closest_is_a:
+                if self._operator(not exiting_a, exiting_b) != inside:
+                    self._boundary_source = 0
+                    self._boundary_distance = distance_a
+                    self._boundary_exiting = inside
+                    return True
+                self._advance_child(0)
+
+            else:
+                if self._operator(exiting_a, not exiting_b) != inside:
+                    self._boundary_source = 1
+                    self._boundary_distance = distance_b
+                    self._boundary_exiting = inside
+                    return True
+                self._advance_child(1)
+
+        self._boundary_source = -1
+        return False
+
+    cdef Intersection _materialise_boundary(self):
+        """
+        Constructs the intersection for the current boundary.
+        """
+
+        cdef Intersection intersection
+
+        # _modify_intersection() identifies the source primitive by the position of the intersection in its arguments
+        if self._boundary_source == 0:
+            if self._csg_a is not None:
+                intersection = self._csg_a._materialise_boundary()
+            else:
+                intersection = self._pending_a
+            intersection = self._modify_intersection(intersection, intersection, None)
+
+        else:
+            if self._csg_b is not None:
+                intersection = self._csg_b._materialise_boundary()
+            else:
+                intersection = self._pending_b
+            intersection = self._modify_intersection(intersection, None, intersection)
+
+        return self._convert_intersection(self._stream_ray, intersection)
+
+    cdef void _reset_stream(self):
+        """
+        Discards the state of the interval evaluation.
+        """
+
+        self._csg_a = None
+        self._csg_b = None
+        self._pending_a = None
+        self._pending_b = None
+        self._active_a = False
+        self._active_b = False
+        self._boundary_source = -1
+
     cdef void rebuild(self):
         """
         Triggers a rebuild of the CSG primitive's acceleration structures.
@@ -248,6 +499,7 @@ cdef class CSGPrimitive(Primitive):
 
         self._primitive_a = BoundPrimitive(self._primitive_a.primitive)
         self._primitive_b = BoundPrimitive(self._primitive_b.primitive)
+        self._reset_stream()
 
 
 cdef class NullPrimitive(Primitive):
@@ -348,6 +600,9 @@ cdef class Union(CSGPrimitive):
         # all other intersections are occurring inside unioned object and are therefore invalid
         return False
 
+    cdef bint _operator(self, bint inside_a, bint inside_b) except -1:
+        return inside_a or inside_b
+
     cpdef bint contains(self, Point3D p) except -1:
 
         p = p.transform(self.to_local())
@@ -446,10 +701,17 @@ cdef class Intersect(CSGPrimitive):
         # all other intersections are invalid
         return False
 
+    cdef bint _operator(self, bint inside_a, bint inside_b) except -1:
+        return inside_a and inside_b
+
     cpdef bint contains(self, Point3D p) except -1:
 
         p = p.transform(self.to_local())
-        return self._primitive_a.contains(p) and self._primitive_b.contains(p)
+
+        # the point must lie inside both bounding boxes, test these before the more costly primitive tests
+        if not self._primitive_a.box.contains(p) or not self._primitive_b.box.contains(p):
+            return False
+        return self._primitive_a.primitive.contains(p) and self._primitive_b.primitive.contains(p)
 
     cpdef BoundingBox3D bounding_box(self):
 
@@ -548,6 +810,9 @@ cdef class Subtract(CSGPrimitive):
         # all other intersections are invalid
         return False
 
+    cdef bint _operator(self, bint inside_a, bint inside_b) except -1:
+        return inside_a and not inside_b
+
     cdef Intersection _modify_intersection(self, Intersection closest, Intersection a, Intersection b):
 
         if closest is b:
@@ -598,3 +863,722 @@ cdef class Subtract(CSGPrimitive):
         primitive_a = self._primitive_a.primitive.instance()
         primitive_b = self._primitive_b.primitive.instance()
         return Subtract(primitive_a, primitive_b, parent, transform, material, name)
+
+
+cdef class _ChildKDTree(KDTree3DCore):
+    """
+    A kd-tree over the bounding boxes of the children of a MultiCSGPrimitive.
+
+    Used to identify the children whose bounding boxes are intersected by a
+    ray and the children that may contain a point.
+
+    :param list primitives: A list of BoundPrimitive objects.
+    """
+
+    def __init__(self, list primitives):
+
+        cdef:
+            BoundPrimitive primitive
+            int32_t id
+
+        self.primitives = primitives
+        self.touched = None
+        self._mailbox = zeros(len(primitives), dtype=uint64)
+        self._ray_id = 0
+
+        super().__init__([Item3D(id, primitive.box) for id, primitive in enumerate(primitives)])
+
+    cdef list _touched_children(self, Ray ray):
+        """
+        Returns the indices of the children whose bounding boxes are hit by the ray.
+
+        :param Ray ray: The ray in the local space of the children.
+        :return: A list of child indices.
+        """
+
+        cdef list touched
+
+        # start a new mailbox epoch, children referenced by several leaves are only tested once
+        self._ray_id += 1
+        self.touched = []
+        self._trace(ray)
+
+        touched = self.touched
+        self.touched = None
+        return touched
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef bint _trace_leaf(self, int32_t id, Ray ray, double max_range):
+
+        cdef:
+            int32_t item, index
+            BoundPrimitive primitive
+
+        for item in range(self._nodes[id].count):
+
+            index = self._nodes[id].items[item]
+            if self._mailbox[index] == self._ray_id:
+                continue
+            self._mailbox[index] = self._ray_id
+
+            primitive = <BoundPrimitive> self.primitives[index]
+            if primitive.box.hit(ray):
+                self.touched.append(index)
+
+        # all leaves along the ray must be visited
+        return False
+
+    cdef bint _is_contained_leaf(self, int32_t id, Point3D point):
+
+        cdef:
+            int32_t item
+            BoundPrimitive primitive
+
+        for item in range(self._nodes[id].count):
+            primitive = <BoundPrimitive> self.primitives[self._nodes[id].items[item]]
+            if primitive.contains(point):
+                return True
+        return False
+
+
+cdef class MultiCSGPrimitive(Primitive):
+    """
+    N-ary Constructive Solid Geometry (CSG) Primitive base class.
+
+    This is an abstract base class and can not be used directly.
+
+    A chain of binary CSG operations, such as the union of several hundred
+    cylinders, forms a deep tree of CSG primitives through which every ray
+    must pass. The N-ary CSG primitives apply a single CSG operation to any
+    number of primitives. The bounding boxes of the primitives are held in a
+    kd-tree, only the primitives whose bounding boxes are intersected by a ray
+    are traced. The intersections of the primitives are combined in distance
+    order and only the intersections returned are converted to the
+    coordinate space of the CSG primitive.
+
+    See flatten_csg() for converting existing binary CSG trees.
+
+    :param list primitives: A list of the component primitives.
+    :param Node parent: Scene-graph parent node or None (default = None).
+    :param AffineMatrix3D transform: An AffineMatrix3D defining the local co-ordinate
+      system relative to the scene-graph parent (default = identity matrix).
+    :param Material material: A Material object defining the CSG primitive's
+      material (default = None).
+    :param str name: A string specifying a user-friendly name for the CSG primitive (default = "").
+    """
+
+    def __init__(self, object primitives, object parent=None, AffineMatrix3D transform=None, Material material=None, str name=None):
+
+        cdef Primitive primitive
+
+        super().__init__(parent, transform, material, name)
+
+        primitives = list(primitives)
+        if not primitives:
+            raise ValueError("At least one primitive must be supplied.")
+
+        for primitive in primitives:
+            if primitive is None:
+                raise TypeError("The primitives must be Primitive objects.")
+
+        # the acceleration structures are built on first use as re-parenting the primitives triggers rebuild()
+        self._children = primitives
+        self._primitives = None
+        self._kdtree = None
+        self._rebuild_required = True
+        self._heap_capacity = 0
+
+        # build CSG scene graph
+        self._csgroot = MultiCSGRoot(self)
+        for primitive in primitives:
+            primitive.parent = self._csgroot
+
+        self._stream_ray = None
+        self._reset_stream()
+
+    def __dealloc__(self):
+        PyMem_Free(self._heap_distance)
+        PyMem_Free(self._heap_slot)
+
+    @property
+    def primitives(self):
+        """
+        The component primitives of the compound CSG primitive.
+
+        :rtype: tuple
+        """
+        return tuple(self._children)
+
+    cdef void _build(self) except *:
+        """
+        Builds the child bounding boxes, kd-tree and intersection heap.
+        """
+
+        cdef:
+            Primitive primitive
+            int32_t count
+
+        self._primitives = [BoundPrimitive(primitive) for primitive in self._children]
+        self._kdtree = _ChildKDTree(self._primitives)
+
+        # at most one intersection per child is pending
+        count = len(self._children)
+        if count > self._heap_capacity:
+            PyMem_Free(self._heap_distance)
+            PyMem_Free(self._heap_slot)
+            self._heap_capacity = 0
+            self._heap_distance = <double *> PyMem_Malloc(sizeof(double) * count)
+            self._heap_slot = <int32_t *> PyMem_Malloc(sizeof(int32_t) * count)
+            if not self._heap_distance or not self._heap_slot:
+                raise MemoryError()
+            self._heap_capacity = count
+
+        self._rebuild_required = False
+
+    cpdef Intersection hit(self, Ray ray):
+
+        if self._start(ray) and self._boundary_distance <= ray.max_distance:
+            return self._materialise_boundary()
+
+        self._reset_stream()
+        return None
+
+    cpdef Intersection next_intersection(self):
+
+        if self._boundary_slot >= 0 and self._advance() and self._boundary_distance <= self._stream_ray.max_distance:
+            return self._materialise_boundary()
+
+        self._reset_stream()
+        return None
+
+    cdef bint _operator(self, int32_t inside_count) except -1:
+        raise NotImplementedError("Warning: CSG operator not implemented")
+
+    cdef bint _start(self, Ray ray) except -1:
+        """
+        Starts the evaluation of the CSG operation along a ray.
+
+        The first intersection of each child whose bounding box is hit by the
+        ray is held pending in a heap ordered by distance. The exiting state of
+        a pending intersection gives the enclosure state of its child up to
+        that intersection, the number of children enclosing the ray determines
+        the result of the CSG operator. The boundaries of the CSG volume are
+        the intersections that change the result of the operator.
+
+        :param Ray ray: The ray in the coordinate space of the CSG primitive's parent.
+        :return: True if a boundary was found, False otherwise.
+        """
+
+        cdef:
+            Ray local_ray
+            list touched
+            int32_t index, slot
+            Primitive primitive
+            double distance
+            bint exiting
+
+        if self._rebuild_required:
+            self._build()
+
+        self._reset_stream()
+        self._stream_ray = ray
+
+        # convert ray to local space
+        local_ray = new_ray(ray.origin.transform(self.to_local()),
+                            ray.direction.transform(self.to_local()),
+                            INFINITY)
+
+        # only children with bounding boxes hit by the ray can contribute intersections
+        touched = self._kdtree._touched_children(local_ray)
+        if not self._operator(len(touched)):
+            return False
+
+        self._slot_sources = []
+        self._slot_pending = []
+        for index in touched:
+
+            primitive = (<BoundPrimitive> self._primitives[index]).primitive
+            slot = len(self._slot_sources)
+            self._slot_sources.append(primitive)
+
+            # nested CSG primitives supply their boundaries directly
+            if isinstance(primitive, CSGPrimitive):
+                (<CSGPrimitive> primitive)._start(local_ray)
+                self._slot_pending.append(None)
+            elif isinstance(primitive, MultiCSGPrimitive):
+                (<MultiCSGPrimitive> primitive)._start(local_ray)
+                self._slot_pending.append(None)
+            else:
+                self._slot_pending.append(primitive.hit(local_ray))
+
+            if self._read_slot(slot, &distance, &exiting):
+                self._inside_count += exiting
+                self._heap_push(distance, slot)
+
+        return self._find_boundary()
+
+    cdef bint _advance(self) except -1:
+        """
+        Moves past the current boundary and identifies the next boundary.
+
+        :return: True if a boundary was found, False otherwise.
+        """
+
+        self._advance_slot(self._boundary_slot)
+        return self._find_boundary()
+
+    cdef bint _read_slot(self, int32_t slot, double *distance, bint *exiting) except -1:
+        """
+        Obtains the pending intersection state of a child.
+
+        :return: True if the child has a pending intersection, False otherwise.
+        """
+
+        cdef:
+            object source
+            CSGPrimitive csg
+            MultiCSGPrimitive multi_csg
+            Intersection intersection
+
+        source = self._slot_sources[slot]
+
+        if isinstance(source, CSGPrimitive):
+            csg = <CSGPrimitive> source
+            if csg._boundary_source < 0:
+                return False
+            distance[0] = csg._boundary_distance
+            exiting[0] = csg._boundary_exiting
+            return True
+
+        if isinstance(source, MultiCSGPrimitive):
+            multi_csg = <MultiCSGPrimitive> source
+            if multi_csg._boundary_slot < 0:
+                return False
+            distance[0] = multi_csg._boundary_distance
+            exiting[0] = multi_csg._boundary_exiting
+            return True
+
+        intersection = self._slot_pending[slot]
+        if intersection is None:
+            return False
+        distance[0] = intersection.ray_distance
+        exiting[0] = intersection.exiting
+        return True
+
+    cdef void _advance_slot(self, int32_t slot) except *:
+        """
+        Replaces the pending intersection of the child at the top of the heap.
+        """
+
+        cdef:
+            object source
+            double distance
+            bint exiting
+
+        # remove the child's current enclosure state
+        self._read_slot(slot, &distance, &exiting)
+        self._inside_count -= exiting
+        self._heap_pop()
+
+        source = self._slot_sources[slot]
+        if isinstance(source, CSGPrimitive):
+            (<CSGPrimitive> source)._advance()
+        elif isinstance(source, MultiCSGPrimitive):
+            (<MultiCSGPrimitive> source)._advance()
+        else:
+            self._slot_pending[slot] = (<Primitive> source).next_intersection()
+
+        if self._read_slot(slot, &distance, &exiting):
+            self._inside_count += exiting
+            self._heap_push(distance, slot)
+
+    cdef bint _find_boundary(self) except -1:
+        """
+        Identifies the first boundary of the CSG volume from the pending child intersections.
+        """
+
+        cdef:
+            int32_t slot
+            double distance
+            bint exiting, inside
+
+        while self._heap_size > 0:
+
+            slot = self._heap_slot[0]
+            self._read_slot(slot, &distance, &exiting)
+
+            # the intersection is a boundary if crossing it changes the result of the csg operator
+            inside = self._operator(self._inside_count)
+            if self._operator(self._inside_count - 1 if exiting else self._inside_count + 1) != inside:
+                self._boundary_slot = slot
+                self._boundary_distance = distance
+                self._boundary_exiting = inside
+                return True
+
+            self._advance_slot(slot)
+
+        self._boundary_slot = -1
+        return False
+
+    @cython.cdivision(True)
+    cdef void _heap_push(self, double distance, int32_t slot):
+
+        cdef int32_t index, parent
+
+        # sift up
+        index = self._heap_size
+        self._heap_size += 1
+        while index > 0:
+            parent = (index - 1) // 2
+            if self._heap_distance[parent] <= distance:
+                break
+            self._heap_distance[index] = self._heap_distance[parent]
+            self._heap_slot[index] = self._heap_slot[parent]
+            index = parent
+
+        self._heap_distance[index] = distance
+        self._heap_slot[index] = slot
+
+    cdef void _heap_pop(self):
+
+        cdef:
+            int32_t index, child
+            double distance
+            int32_t slot
+
+        self._heap_size -= 1
+        if self._heap_size == 0:
+            return
+
+        # sift the last entry down from the top of the heap
+        distance = self._heap_distance[self._heap_size]
+        slot = self._heap_slot[self._heap_size]
+        index = 0
+        while True:
+            child = 2 * index + 1
+            if child >= self._heap_size:
+                break
+            if child + 1 < self._heap_size and self._heap_distance[child + 1] < self._heap_distance[child]:
+                child += 1
+            if distance <= self._heap_distance[child]:
+                break
+            self._heap_distance[index] = self._heap_distance[child]
+            self._heap_slot[index] = self._heap_slot[child]
+            index = child
+
+        self._heap_distance[index] = distance
+        self._heap_slot[index] = slot
+
+    cdef Intersection _materialise_boundary(self):
+        """
+        Constructs the intersection for the current boundary.
+        """
+
+        cdef:
+            object source
+            Intersection intersection
+
+        source = self._slot_sources[self._boundary_slot]
+        if isinstance(source, CSGPrimitive):
+            intersection = (<CSGPrimitive> source)._materialise_boundary()
+        elif isinstance(source, MultiCSGPrimitive):
+            intersection = (<MultiCSGPrimitive> source)._materialise_boundary()
+        else:
+            intersection = self._slot_pending[self._boundary_slot]
+
+        return self._convert_intersection(self._stream_ray, intersection)
+
+    cdef Intersection _convert_intersection(self, Ray ray, Intersection intersection):
+
+        # convert local intersection attributes to csg primitive coordinate space
+        intersection.ray = ray
+        intersection.hit_point = intersection.hit_point.transform(intersection.primitive_to_world)
+        intersection.inside_point = intersection.inside_point.transform(intersection.primitive_to_world)
+        intersection.outside_point = intersection.outside_point.transform(intersection.primitive_to_world)
+        intersection.normal = intersection.normal.transform(intersection.primitive_to_world)
+        intersection.world_to_primitive = self.to_local()
+        intersection.primitive_to_world = self.to_root()
+        intersection.primitive = self
+
+        return intersection
+
+    cdef void _reset_stream(self):
+        """
+        Discards the state of the evaluation.
+        """
+
+        self._slot_sources = None
+        self._slot_pending = None
+        self._heap_size = 0
+        self._inside_count = 0
+        self._boundary_slot = -1
+
+    cdef void rebuild(self):
+        """
+        Triggers a rebuild of the CSG primitive's acceleration structures.
+        """
+
+        self._rebuild_required = True
+        self._reset_stream()
+
+    cpdef BoundingBox3D bounding_box(self):
+
+        cdef:
+            BoundingBox3D box
+            Point3D point
+
+        if self._rebuild_required:
+            self._build()
+
+        # convert the local space box vertices to world space and build an enclosing world space bounding box
+        # a small degree of padding is added to avoid potential numerical accuracy issues
+        box = BoundingBox3D()
+        for point in self._local_box().vertices():
+            box.extend(point.transform(self.to_root()), BOX_PADDING)
+
+        return box
+
+    cdef BoundingBox3D _local_box(self):
+        raise NotImplementedError("Warning: CSG bounding box not implemented")
+
+
+cdef class MultiCSGRoot(Node):
+    """
+    Specialised scenegraph root node for N-ary CSG primitives.
+
+    The root node responds to geometry change notifications and propagates them
+    to the CSG primitive and its enclosing scenegraph.
+    """
+
+    def __init__(self, MultiCSGPrimitive csg_primitive):
+
+        super().__init__()
+        self.csg_primitive = csg_primitive
+
+    def _change(self, _NodeBase node, ChangeSignal change not None):
+        """
+        Handles a scenegraph node change handler.
+
+        Propagates geometry change notifications to the enclosing CSG primitive and its
+        scenegraph.
+        """
+
+        # the CSG primitive acceleration structures must be rebuilt
+        self.csg_primitive.rebuild()
+
+        # propagate change notifications from csg scenegraph to enclosing scenegraph
+        self.csg_primitive.root._change(node, change)
+
+
+cdef class MultiUnion(MultiCSGPrimitive):
+    """
+    CSGPrimitive that is the volumetric union of any number of primitives.
+
+    :param list primitives: A list of the component primitives.
+    :param Node parent: Scene-graph parent node or None (default = None).
+    :param AffineMatrix3D transform: An AffineMatrix3D defining the local co-ordinate
+      system relative to the scene-graph parent (default = identity matrix).
+    :param Material material: A Material object defining the new CSG primitive's
+      material (default = None).
+    :param str name: A string specifying a user-friendly name for the CSG primitive (default = "").
+
+    .. code-block:: python
+
+        from raysect.core import translate
+        from raysect.primitive import Cylinder, MultiUnion
+        from raysect.optical import World
+        from raysect.optical.material import AbsorbingSurface
+
+        world = World()
+
+        pins = [Cylinder(0.1, 1.0, transform=translate(0.5 * i, 0, 0)) for i in range(500)]
+        comb = MultiUnion(pins, world, material=AbsorbingSurface())
+    """
+
+    cdef bint _operator(self, int32_t inside_count) except -1:
+        return inside_count > 0
+
+    cpdef bint contains(self, Point3D p) except -1:
+
+        if self._rebuild_required:
+            self._build()
+
+        # only the primitives with bounding boxes enclosing the point are tested
+        return self._kdtree._is_contained(p.transform(self.to_local()))
+
+    cdef BoundingBox3D _local_box(self):
+
+        cdef:
+            BoundingBox3D box
+            BoundPrimitive primitive
+
+        box = BoundingBox3D()
+        for primitive in self._primitives:
+            box.union(primitive.box)
+        return box
+
+    cpdef object instance(self, object parent=None, AffineMatrix3D transform=None, Material material=None, str name=None):
+        return MultiUnion([primitive.instance(transform=primitive.transform) for primitive in self._children], parent, transform, material, name)
+
+
+cdef class MultiIntersect(MultiCSGPrimitive):
+    """
+    CSGPrimitive that is the volumetric intersection of any number of primitives.
+
+    Only volumes that are present in all the primitives will be present in the
+    new CSG primitive.
+
+    :param list primitives: A list of the component primitives.
+    :param Node parent: Scene-graph parent node or None (default = None).
+    :param AffineMatrix3D transform: An AffineMatrix3D defining the local co-ordinate
+      system relative to the scene-graph parent (default = identity matrix).
+    :param Material material: A Material object defining the new CSG primitive's
+      material (default = None).
+    :param str name: A string specifying a user-friendly name for the CSG primitive (default = "").
+    """
+
+    cdef bint _operator(self, int32_t inside_count) except -1:
+        return inside_count == len(self._children)
+
+    cpdef bint contains(self, Point3D p) except -1:
+
+        cdef BoundPrimitive primitive
+
+        if self._rebuild_required:
+            self._build()
+
+        # the bounding boxes of all the primitives are tested before the more costly primitive tests
+        p = p.transform(self.to_local())
+        for primitive in self._primitives:
+            if not primitive.box.contains(p):
+                return False
+
+        for primitive in self._primitives:
+            if not primitive.primitive.contains(p):
+                return False
+        return True
+
+    cdef BoundingBox3D _local_box(self):
+
+        cdef:
+            BoundingBox3D box
+            BoundPrimitive primitive
+
+        # the intersection of the bounding boxes always surrounds the intersected primitives
+        box = None
+        for primitive in self._primitives:
+            if box is None:
+                box = BoundingBox3D(primitive.box.lower.copy(), primitive.box.upper.copy())
+                continue
+            box.lower.x = max(box.lower.x, primitive.box.lower.x)
+            box.lower.y = max(box.lower.y, primitive.box.lower.y)
+            box.lower.z = max(box.lower.z, primitive.box.lower.z)
+            box.upper.x = min(box.upper.x, primitive.box.upper.x)
+            box.upper.y = min(box.upper.y, primitive.box.upper.y)
+            box.upper.z = min(box.upper.z, primitive.box.upper.z)
+        return box
+
+    cpdef object instance(self, object parent=None, AffineMatrix3D transform=None, Material material=None, str name=None):
+        return MultiIntersect([primitive.instance(transform=primitive.transform) for primitive in self._children], parent, transform, material, name)
+
+
+def flatten_csg(Primitive primitive not None):
+    """
+    Returns an equivalent primitive with chains of binary CSG operations replaced by N-ary CSG primitives.
+
+    Nested Union (and MultiUnion) primitives are collected into a single
+    MultiUnion, nested Intersect (and MultiIntersect) primitives into a single
+    MultiIntersect. The transforms of the nested CSG primitives are combined
+    with the transforms of the collected primitives. The operands of Subtract
+    primitives are flattened individually.
+
+    The returned primitive is built from instances of the original primitives
+    (see Primitive.instance()) and is not attached to a scene-graph, it takes
+    the transform, material and name of the supplied primitive. The supplied
+    primitive is not modified.
+
+    :param Primitive primitive: The primitive to flatten.
+    :return: The flattened primitive.
+
+    .. code-block:: pycon
+
+        >>> from raysect.primitive import flatten_csg
+        >>>
+        >>> flat = flatten_csg(csg_primitive)
+        >>> csg_primitive.parent = None
+        >>> flat.parent = world
+    """
+
+    return _flatten(primitive, primitive.transform, primitive.material, primitive.name)
+
+
+cdef Primitive _flatten(Primitive primitive, AffineMatrix3D transform, Material material, str name):
+
+    cdef:
+        list operands
+        bint unpopulated
+
+    # placeholder operands of unpopulated binary csg primitives enclose no volume
+    if primitive is None or isinstance(primitive, NullPrimitive):
+        return None
+
+    if isinstance(primitive, (Union, MultiUnion)):
+        operands = []
+        _collect_operands(primitive, (Union, MultiUnion), AffineMatrix3D(), operands)
+        if not operands:
+            return Union(None, None, None, transform, material, name)
+        return MultiUnion(operands, None, transform, material, name)
+
+    if isinstance(primitive, (Intersect, MultiIntersect)):
+        operands = []
+        unpopulated = _collect_operands(primitive, (Intersect, MultiIntersect), AffineMatrix3D(), operands)
+        if unpopulated:
+            return Intersect(None, None, None, transform, material, name)
+        return MultiIntersect(operands, None, transform, material, name)
+
+    if isinstance(primitive, Subtract):
+        return Subtract(
+            _flatten_operand(primitive.primitive_a, AffineMatrix3D()),
+            _flatten_operand(primitive.primitive_b, AffineMatrix3D()),
+            None, transform, material, name
+        )
+
+    return primitive.instance(None, transform, material, name)
+
+
+cdef Primitive _flatten_operand(Primitive operand, AffineMatrix3D offset):
+    return _flatten(operand, offset.mul(operand.transform), operand.material, operand.name)
+
+
+cdef bint _collect_operands(Primitive primitive, tuple operator, AffineMatrix3D offset, list operands) except -1:
+    """
+    Collects the operands of a chain of CSG primitives applying the same operator.
+
+    :return: True if an unpopulated operand was encountered, False otherwise.
+    """
+
+    cdef:
+        list children
+        Primitive child
+        bint unpopulated = False
+
+    if isinstance(primitive, MultiCSGPrimitive):
+        children = list(primitive.primitives)
+    else:
+        children = [primitive.primitive_a, primitive.primitive_b]
+
+    for child in children:
+
+        if isinstance(child, NullPrimitive):
+            unpopulated = True
+            continue
+
+        # operands of the same operator are merged, their transform is relative to the enclosing csg primitive
+        if isinstance(child, operator):
+            unpopulated |= _collect_operands(child, operator, offset.mul(child.transform), operands)
+        else:
+            operands.append(_flatten_operand(child, offset))
+
+    return unpopulated
@@ -40,6 +40,10 @@ cdef class Cylinder(Primitive):
     cdef Point3D _cached_origin
     cdef Vector3D _cached_direction
     cdef Ray _cached_ray
+    cdef bint _hit_pending
+    cdef double _hit_t
+    cdef int _hit_face
+    cdef int _hit_type
     cdef int _cached_face
     cdef int _cached_type
 
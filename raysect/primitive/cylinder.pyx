@@ -101,8 +101,10 @@ cdef class Cylinder(Primitive):
         # initialise next intersection caching and control attributes
         self._further_intersection = False
         self._next_t = 0.0
-        self._cached_origin = None
-        self._cached_direction = None
+        self._hit_pending = False
+        self._hit_t = 0.0
+        self._cached_origin = new_point3d(0, 0, 0)
+        self._cached_direction = new_vector3d(0, 0, 0)
         self._cached_ray = None
         self._cached_face = NO_FACE
         self._cached_type = NO_TYPE
@@ -148,6 +150,12 @@ cdef class Cylinder(Primitive):
     @cython.cdivision(True)
     cpdef Intersection hit(self, Ray ray):
 
+        if self.hit_distance(ray) == INFINITY:
+            return None
+        return self.materialise_intersection()
+
+    cpdef double hit_distance(self, Ray ray) except? -1:
+
         cdef:
             double near_intersection, far_intersection, closest_intersection
             int near_face, far_face, closest_face
@@ -157,10 +165,13 @@ cdef class Cylinder(Primitive):
 
         # reset the next intersection cache
         self._further_intersection = False
+        self._hit_pending = False
 
-        # convert ray origin and direction to local space
-        origin = ray.origin.transform(self.to_local())
-        direction = ray.direction.transform(self.to_local())
+        # convert ray origin and direction to local space, reusing the cached objects
+        self._point_to_local(ray.origin, self._cached_origin)
+        self._vector_to_local(ray.direction, self._cached_direction)
+        origin = self._cached_origin
+        direction = self._cached_direction
 
         # check ray intersects infinite cylinder and obtain intersections
         # is ray parallel to cylinder surface?
@@ -179,7 +190,7 @@ cdef class Cylinder(Primitive):
             else:
 
                 # no ray cylinder intersection
-                return None
+                return INFINITY
 
         else:
 
@@ -191,7 +202,7 @@ cdef class Cylinder(Primitive):
             # calculate intersection distances by solving the quadratic equation
             # ray misses if there are no real roots of the quadratic
             if not solve_quadratic(a, b, c, &t0, &t1):
-                return None
+                return INFINITY
 
             # ensure t0 is always smaller than t1
             if t0 > t1:
@@ -246,11 +257,11 @@ cdef class Cylinder(Primitive):
 
         # does ray intersect cylinder?
         if near_intersection > far_intersection:
-            return None
+            return INFINITY
 
         # are there any intersections inside the ray search range?
         if near_intersection > ray.max_distance or far_intersection < 0.0:
-            return None
+            return INFINITY
 
         # identify closest intersection
         if near_intersection >= 0.0:
@@ -261,9 +272,6 @@ cdef class Cylinder(Primitive):
             if far_intersection <= ray.max_distance:
                 self._further_intersection = True
                 self._next_t = far_intersection
-                self._cached_origin = origin
-                self._cached_direction = direction
-                self._cached_ray = ray
                 self._cached_face = far_face
                 self._cached_type = far_type
 
@@ -272,9 +280,23 @@ cdef class Cylinder(Primitive):
             closest_face = far_face
             closest_type = far_type
         else:
+            return INFINITY
+
+        # defer construction of the intersection until it is requested
+        self._hit_pending = True
+        self._hit_t = closest_intersection
+        self._hit_face = closest_face
+        self._hit_type = closest_type
+        self._cached_ray = ray
+        return closest_intersection
+
+    cpdef Intersection materialise_intersection(self):
+
+        if not self._hit_pending:
             return None
 
-        return self._generate_intersection(ray, origin, direction, closest_intersection, closest_face, closest_type)
+        self._hit_pending = False
+        return self._generate_intersection(self._cached_ray, self._cached_origin, self._cached_direction, self._hit_t, self._hit_face, self._hit_type)
 
     cpdef Intersection next_intersection(self):
 
@@ -0,0 +1,247 @@
+# cython: language_level=3
+
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+from weakref import WeakValueDictionary
+from raysect.core cimport AffineMatrix3D, Material, new_ray, new_point3d
+
+
+# cython doesn't have a built-in infinity constant, this compiles to +infinity
+DEF INFINITY = 1e999
+
+# the shared state of each instanced primitive, keyed by the id of the primitive
+_shared_primitives = WeakValueDictionary()
+
+
+cdef class _SharedPrimitive:
+    """
+    Holds the state shared by all the instances of a primitive.
+
+    The instances of a primitive use the same primitive object to calculate
+    their intersections. The primitive caches the state of the last ray it
+    traced (for materialise_intersection() and next_intersection()), the owner
+    identifies the instance that traced that ray.
+
+    :param Primitive primitive: The instanced primitive.
+    """
+
+    def __init__(self, Primitive primitive not None):
+
+        self.primitive = primitive
+        self._box = None
+        self._owner = NULL
+
+    cdef BoundingBox3D local_box(self):
+        """
+        Returns the bounding box of the primitive in the instance's local space.
+
+        The box is calculated once and shared by all instances, the primitive
+        must therefore not be modified once it has been instanced.
+        """
+
+        if self._box is None:
+            self._box = self.primitive.bounding_box()
+        return self._box
+
+
+cdef _SharedPrimitive _obtain_shared(Primitive primitive):
+
+    cdef _SharedPrimitive shared
+
+    shared = _shared_primitives.get(id(primitive))
+    if shared is None:
+        shared = _SharedPrimitive(primitive)
+        _shared_primitives[id(primitive)] = shared
+    return shared
+
+
+cdef class Instance(Primitive):
+    """
+    An instance of a shared primitive.
+
+    Instances place copies of a primitive in a scene without duplicating the
+    primitive's geometry or acceleration structures. Each instance holds only
+    a transform and a material, the intersection calculation is delegated to
+    the shared primitive. This is intended for scenes containing many copies
+    of identical components, such as tiles or bolts, built from meshes or CSG
+    primitives.
+
+    Together with the world's acceleration structure this forms a two level
+    structure: the world accelerator partitions the instance bounding boxes,
+    while each instance references the internal acceleration structure of
+    the shared primitive (for example the kd-tree of a mesh). Memory use
+    therefore scales with the amount of unique geometry and the traversal
+    cost grows logarithmically with the number of instances.
+
+    The shared primitive must not be attached to the scene-graph being
+    traced. Its coordinate space, relative to the root of its own scene-graph,
+    is mapped into the local coordinate space of each instance. The shared
+    primitive must not be modified once instanced.
+
+    :param Primitive primitive: The primitive to instance.
+    :param Node parent: Scene-graph parent node or None (default = None).
+    :param AffineMatrix3D transform: An AffineMatrix3D defining the local co-ordinate system relative to the scene-graph parent (default = identity matrix).
+    :param Material material: A Material object defining the instance's material (default = the material of the shared primitive).
+    :param str name: A string specifying a user-friendly name for the instance (default = "").
+
+    :ivar Primitive primitive: The shared primitive.
+
+    .. code-block:: pycon
+
+        >>> from raysect.core import translate
+        >>> from raysect.primitive import Instance, import_obj
+        >>> from raysect.optical import World
+        >>>
+        >>> world = World()
+        >>>
+        >>> bolt = import_obj("bolt.obj")
+        >>> bolts = [Instance(bolt, parent=world, transform=translate(0.1 * i, 0, 0)) for i in range(1000)]
+    """
+
+    def __init__(self, Primitive primitive not None, object parent=None, AffineMatrix3D transform=None, Material material=None, str name=None):
+
+        if material is None:
+            material = primitive.material
+
+        super().__init__(parent, transform, material, name)
+
+        self._shared = _obtain_shared(primitive)
+        self._world_ray = None
+        self._local_ray = None
+        self._hit_pending = False
+        self._last_distance = 0.0
+
+    @property
+    def primitive(self):
+        """
+        The shared primitive.
+
+        :rtype: Primitive
+        """
+        return self._shared.primitive
+
+    cpdef Intersection hit(self, Ray ray):
+
+        if self.hit_distance(ray) == INFINITY:
+            return None
+        return self.materialise_intersection()
+
+    cpdef double hit_distance(self, Ray ray) except? -1:
+
+        cdef:
+            AffineMatrix3D to_local
+            double distance
+
+        self._hit_pending = False
+
+        # the shared primitive's coordinate space is the local space of the instance
+        to_local = self.to_local()
+        self._world_ray = ray
+        self._local_ray = new_ray(ray.origin.transform(to_local), ray.direction.transform(to_local), ray.max_distance)
+
+        distance = self._shared.primitive.hit_distance(self._local_ray)
+        self._shared._owner = <void *> self
+
+        self._hit_pending = distance < INFINITY
+        return distance
+
+    cpdef Intersection materialise_intersection(self):
+
+        cdef Intersection intersection
+
+        if not self._hit_pending:
+            return None
+        self._hit_pending = False
+
+        # another instance may have traced a ray with the shared primitive since, if so the intersection is recalculated
+        if self._shared._owner == <void *> self:
+            intersection = self._shared.primitive.materialise_intersection()
+        else:
+            intersection = self._shared.primitive.hit(self._local_ray)
+            self._shared._owner = <void *> self
+
+        if intersection is None:
+            return None
+
+        self._last_distance = intersection.ray_distance
+        return self._to_world(intersection)
+
+    cpdef Intersection next_intersection(self):
+
+        cdef Intersection intersection
+
+        if self._local_ray is None:
+            return None
+
+        if self._shared._owner == <void *> self:
+            intersection = self._shared.primitive.next_intersection()
+
+        else:
+
+            # another instance has traced a ray with the shared primitive, replay the intersections already returned
+            intersection = self._shared.primitive.hit(self._local_ray)
+            while intersection is not None and intersection.ray_distance <= self._last_distance:
+                intersection = self._shared.primitive.next_intersection()
+            self._shared._owner = <void *> self
+
+        if intersection is None:
+            return None
+
+        self._last_distance = intersection.ray_distance
+        return self._to_world(intersection)
+
+    cdef Intersection _to_world(self, Intersection intersection):
+
+        # the intersection is expressed relative to the instance's local space, extend the transforms to world space
+        intersection.ray = self._world_ray
+        intersection.primitive = self
+        intersection.world_to_primitive = intersection.world_to_primitive.mul(self.to_local())
+        intersection.primitive_to_world = self.to_root().mul(intersection.primitive_to_world)
+        return intersection
+
+    cpdef bint contains(self, Point3D p) except -1:
+        return self._shared.primitive.contains(p.transform(self.to_local()))
+
+    cpdef BoundingBox3D bounding_box(self):
+
+        cdef:
+            AffineMatrix3D to_root
+            BoundingBox3D box
+            Point3D vertex
+
+        # the world space box encloses the transformed corners of the shared primitive's box
+        to_root = self.to_root()
+        box = BoundingBox3D()
+        for vertex in self._shared.local_box().vertices():
+            box.extend(vertex.transform(to_root))
+        return box
+
+    cpdef object instance(self, object parent=None, AffineMatrix3D transform=None, Material material=None, str name=None):
+        return Instance(self._shared.primitive, parent, transform, material, name)
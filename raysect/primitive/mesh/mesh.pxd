@@ -31,7 +31,7 @@
 
 from raysect.core cimport Primitive, Ray, Intersection, BoundingBox3D, AffineMatrix3D, Normal3D, Point3D
 from raysect.core.math.spatial cimport KDTree3DCore
-from numpy cimport float32_t, int32_t, uint8_t, ndarray
+from numpy cimport float32_t, int32_t, uint8_t, uint64_t, ndarray
 
 
 cdef class MeshData(KDTree3DCore):
@@ -51,6 +51,15 @@ cdef class MeshData(KDTree3DCore):
         float _sx, _sy, _sz
         float _u, _v, _w, _t
         int32_t _i
+        uint64_t[::1] _mailbox
+        uint64_t _ray_id
+        bint _packed
+        ndarray _leaf_packets
+        ndarray _packed_vertices
+        ndarray _packed_triangles
+        int32_t[::1] leaf_packets_mv
+        float32_t[:, :, :, ::1] packed_vertices_mv
+        int32_t[:, ::1] packed_triangles_mv
 
     cpdef Point3D vertex(self, int index)
 
@@ -68,10 +77,22 @@ cdef class MeshData(KDTree3DCore):
 
     cdef BoundingBox3D _generate_bounding_box(self, int32_t i)
 
+    cdef void _reset_mailbox(self)
+
+    cdef object _pack_leaves(self)
+
+    cdef object _unpack_leaves(self)
+
+    cdef bint _trace_packed_leaf(self, int32_t id, Ray ray, double max_range)
+
+    cdef bint _trace_any_packed_leaf(self, int32_t id, Ray ray)
+
     cdef void _calc_rayspace_transform(self, Ray ray)
 
     cdef bint _hit_triangle(self, int32_t i, Ray ray, float[4] hit_data)
 
+    cdef int32_t _hit_packet(self, int32_t packet, Ray ray, double distance, float[4] hit_data)
+
     cpdef Intersection calc_intersection(self, Ray ray)
 
     cdef Normal3D _intersection_normal(self)
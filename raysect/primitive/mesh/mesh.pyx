@@ -32,11 +32,12 @@
 import io
 import struct
 
-from numpy import array, float32, int32, zeros
+from numpy import array, float32, int32, uint64, zeros, full
 from raysect.core cimport Primitive, AffineMatrix3D, Normal3D, new_normal3d, Point3D, new_point3d, Vector3D, new_vector3d, Material, Ray, new_ray, Intersection, new_intersection, BoundingBox3D, new_boundingbox3d
 from raysect.core.math.spatial cimport KDTree3DCore, Item3D
+from raysect.core.statistics cimport RAYSECT_STATISTICS, count_event, TRIANGLE_TESTS
 from libc.math cimport fabs
-from numpy cimport float32_t, int32_t, uint8_t
+from numpy cimport float32_t, int32_t, uint8_t, uint64_t
 from cpython.bytes cimport PyBytes_AsString
 cimport cython
 
@@ -73,6 +74,12 @@ DEF N3 = 5
 
 DEF NO_INTERSECTION = -1
 
+# kd-tree leaf node type
+DEF LEAF = -1
+
+# number of triangles in a packed leaf block
+DEF PACKET_SIZE = 8
+
 # raysect mesh format constants
 DEF RSM_VERSION_MAJOR = 1
 DEF RSM_VERSION_MINOR = 0
@@ -111,11 +118,14 @@ cdef class MeshData(KDTree3DCore):
       vs kd-tree traversal (default=20.0).
     :param double empty_bonus: The bonus applied to node splits that generate empty
       kd-Tree leaves (default=0.2).
+    :param bool packed_leaves: Stores the kd-tree leaf triangles in packed blocks,
+      see packed_leaves (default=False).
     """
 
     def __init__(self, object vertices, object triangles, object normals=None, bint smoothing=True,
                  bint closed=True, bint tolerant=True, bint flip_normals=False,
-                 int max_depth=0, int min_items=1, double hit_cost=20.0, double empty_bonus=0.2):
+                 int max_depth=0, int min_items=1, double hit_cost=20.0, double empty_bonus=0.2,
+                 bint packed_leaves=False):
 
         self.smoothing = smoothing
         self.closed = closed
@@ -190,13 +200,27 @@ cdef class MeshData(KDTree3DCore):
 
         super().__init__(items, max_depth, min_items, hit_cost, empty_bonus)
 
+        self._reset_mailbox()
+
+        if packed_leaves:
+            self._pack_leaves()
+
     def __getstate__(self):
         state = io.BytesIO()
         self.save(state)
-        return state.getvalue()
+        return state.getvalue(), self._packed
 
     def __setstate__(self, state):
-        self.load(io.BytesIO(state))
+
+        # states pickled before packed leaves were introduced only hold the serialised mesh
+        if isinstance(state, bytes):
+            data, packed = state, False
+        else:
+            data, packed = state
+
+        self.load(io.BytesIO(data))
+        if packed:
+            self._pack_leaves()
 
     def __reduce__(self):
         return self.__new__, (self.__class__, ), self.__getstate__()
@@ -219,6 +243,38 @@ cdef class MeshData(KDTree3DCore):
     def face_normals(self):
         return self._face_normals.copy()
 
+    @property
+    def packed_leaves(self):
+        """
+        Toggles the packed triangle layout of the kd-tree leaves.
+
+        When enabled, the triangles referenced by each kd-tree leaf are copied
+        into blocks of eight, with the vertex coordinates stored as a structure
+        of arrays. A whole block is tested against a ray in a single branch-free
+        loop that the compiler can vectorise, rather than one triangle at a time.
+
+        The vertices are duplicated for every leaf that references a triangle,
+        so the packed layout costs an additional 36 bytes per triangle reference.
+        The intersections found are identical to those of the unpacked layout.
+
+        Packing is only worth enabling for meshes built with large kd-tree
+        leaves (e.g. min_items=16), where it measured a ~1.1x speed-up. With
+        the default kd-tree settings the leaves hold too few triangles to fill
+        the blocks and there is no measurable gain, see
+        demos/core/mesh_packed_leaves.py.
+
+        :rtype: bool
+        """
+        return self._packed
+
+    @packed_leaves.setter
+    def packed_leaves(self, bint value):
+
+        if value and not self._packed:
+            self._pack_leaves()
+        elif not value:
+            self._unpack_leaves()
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
@@ -445,6 +501,88 @@ cdef class MeshData(KDTree3DCore):
 
         return bbox
 
+    cdef void _reset_mailbox(self):
+        """
+        Allocates the per-triangle mailboxes.
+
+        A triangle whose bounding box straddles a split plane is referenced by
+        several leaves. Each trace is assigned a unique ray id and a triangle's
+        mailbox records the id of the last ray it was tested against, so the
+        triangle is tested at most once per ray.
+        """
+
+        self._mailbox = zeros(self.triangles_mv.shape[0], dtype=uint64)
+        self._ray_id = 0
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef object _pack_leaves(self):
+        """
+        Copies the triangles referenced by each kd-tree leaf into packed blocks.
+
+        The blocks of each leaf are stored contiguously, the leaf packet array
+        holds the index of the first block of each node with the blocks of node
+        i spanning [leaf_packets[i], leaf_packets[i + 1]). Unused lanes in the
+        last block of a leaf have a triangle id of NO_INTERSECTION.
+        """
+
+        cdef:
+            int32_t id, item, packet, lane, triangle, vertex, axis, index
+            int32_t[::1] leaf_packets
+            int32_t[:, ::1] triangles
+            float32_t[:, :, :, ::1] vertices
+
+        # count the blocks required by each leaf
+        self._leaf_packets = zeros(self._next_node + 1, dtype=int32)
+        leaf_packets = self._leaf_packets
+        for id in range(self._next_node):
+            leaf_packets[id + 1] = leaf_packets[id]
+            if self._nodes[id].type == LEAF:
+                leaf_packets[id + 1] += (self._nodes[id].count + PACKET_SIZE - 1) // PACKET_SIZE
+
+        self._packed_vertices = zeros((leaf_packets[self._next_node], 3, 3, PACKET_SIZE), dtype=float32)
+        self._packed_triangles = full((leaf_packets[self._next_node], PACKET_SIZE), NO_INTERSECTION, dtype=int32)
+        vertices = self._packed_vertices
+        triangles = self._packed_triangles
+
+        # copy the triangle vertices into the leaf blocks, one lane per triangle
+        for id in range(self._next_node):
+
+            if self._nodes[id].type != LEAF:
+                continue
+
+            for item in range(self._nodes[id].count):
+
+                packet = leaf_packets[id] + item // PACKET_SIZE
+                lane = item % PACKET_SIZE
+
+                triangle = self._nodes[id].items[item]
+                triangles[packet, lane] = triangle
+
+                for vertex in range(3):
+                    index = self.triangles_mv[triangle, V1 + vertex]
+                    for axis in range(3):
+                        vertices[packet, vertex, axis, lane] = self.vertices_mv[index, axis]
+
+        self.leaf_packets_mv = self._leaf_packets
+        self.packed_vertices_mv = self._packed_vertices
+        self.packed_triangles_mv = self._packed_triangles
+        self._packed = True
+
+    cdef object _unpack_leaves(self):
+        """
+        Releases the packed leaf blocks.
+        """
+
+        self._packed = False
+        self._leaf_packets = None
+        self._packed_vertices = None
+        self._packed_triangles = None
+        self.leaf_packets_mv = None
+        self.packed_vertices_mv = None
+        self.packed_triangles_mv = None
+
     cpdef bint trace(self, Ray ray):
 
         # reset hit data
@@ -454,55 +592,176 @@ cdef class MeshData(KDTree3DCore):
         self._t = INFINITY
         self._i = NO_INTERSECTION
 
+        # start a new mailbox epoch
+        self._ray_id += 1
+
         self._calc_rayspace_transform(ray)
-        return self._trace(ray)
+        if self._trace(ray):
+            return True
+
+        # a triangle hit beyond the range of the last leaf visited is still the closest intersection
+        return self._i != NO_INTERSECTION
+
+    cpdef bint trace_any(self, Ray ray):
+
+        # reset hit data
+        self._u = -1.0
+        self._v = -1.0
+        self._w = -1.0
+        self._t = INFINITY
+        self._i = NO_INTERSECTION
+
+        # start a new mailbox epoch
+        self._ray_id += 1
+
+        self._calc_rayspace_transform(ray)
+        return self._trace_any(ray)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
+    @cython.initializedcheck(False)
     cdef bint _trace_leaf(self, int32_t id, Ray ray, double max_range):
 
         cdef:
             float hit_data[4]
-            int32_t count, item, index
+            int32_t count, item
             double distance
-            double u, v, w, t
-            int32_t triangle, closest_triangle
+            int32_t triangle
+
+        if self._packed:
+            return self._trace_packed_leaf(id, ray, max_range)
 
         # unpack leaf data
         count = self._nodes[id].count
 
-        # find the closest triangle-ray intersection with initial search distance limited by node and ray limits
-        # closest_triangle is initialised with an illegal value so a non-intersection can be detected
-        distance = min(ray.max_distance, max_range)
-        closest_triangle = NO_INTERSECTION
+        # find the closest triangle-ray intersection, continuing the search from the closest hit of earlier leaves
+        # the hit data holds the closest intersection found so far, hits beyond the node range are retained
+        distance = min(ray.max_distance, self._t)
         for item in range(count):
 
-            # dereference the triangle
+            # skip triangles already tested against this ray in an earlier leaf
             triangle = self._nodes[id].items[item]
+            if self._mailbox[triangle] == self._ray_id:
+                continue
+            self._mailbox[triangle] = self._ray_id
+
+            if RAYSECT_STATISTICS:
+                count_event(TRIANGLE_TESTS, 1)
 
             # test for intersection
             if self._hit_triangle(triangle, ray, hit_data):
 
-                t = hit_data[T]
-                if t < distance:
+                if hit_data[T] < distance:
 
-                    distance = t
-                    closest_triangle = triangle
-                    u = hit_data[U]
-                    v = hit_data[V]
-                    w = hit_data[W]
+                    distance = hit_data[T]
+                    self._u = hit_data[U]
+                    self._v = hit_data[V]
+                    self._w = hit_data[W]
+                    self._t = hit_data[T]
+                    self._i = triangle
 
-        if closest_triangle == NO_INTERSECTION:
-            return False
+        # a hit beyond the node range may be beaten by a triangle in a later leaf
+        return self._i != NO_INTERSECTION and self._t <= max_range
 
-        # update intersection data
-        self._u = u
-        self._v = v
-        self._w = w
-        self._t = distance
-        self._i = closest_triangle
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef bint _trace_any_leaf(self, int32_t id, Ray ray):
 
-        return True
+        cdef:
+            float hit_data[4]
+            int32_t count, item
+            int32_t triangle
+
+        if self._packed:
+            return self._trace_any_packed_leaf(id, ray)
+
+        # unpack leaf data
+        count = self._nodes[id].count
+
+        for item in range(count):
+
+            # skip triangles already tested against this ray in an earlier leaf
+            triangle = self._nodes[id].items[item]
+            if self._mailbox[triangle] == self._ray_id:
+                continue
+            self._mailbox[triangle] = self._ray_id
+
+            if RAYSECT_STATISTICS:
+                count_event(TRIANGLE_TESTS, 1)
+
+            # any intersection inside the ray range blocks the ray
+            if self._hit_triangle(triangle, ray, hit_data) and hit_data[T] < ray.max_distance:
+
+                self._u = hit_data[U]
+                self._v = hit_data[V]
+                self._w = hit_data[W]
+                self._t = hit_data[T]
+                self._i = triangle
+                return True
+
+        return False
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef bint _trace_packed_leaf(self, int32_t id, Ray ray, double max_range):
+
+        cdef:
+            float hit_data[4]
+            int32_t packet
+            double distance
+            int32_t triangle
+
+        # packed blocks are tested in the same order as the leaf items, so the closest hit selected is unchanged
+        # a triangle referenced by several leaves reproduces its earlier result and can not displace the closest hit,
+        # so the mailbox is not required
+        distance = min(ray.max_distance, self._t)
+        for packet in range(self.leaf_packets_mv[id], self.leaf_packets_mv[id + 1]):
+
+            if RAYSECT_STATISTICS:
+                count_event(TRIANGLE_TESTS, PACKET_SIZE)
+
+            triangle = self._hit_packet(packet, ray, distance, hit_data)
+            if triangle != NO_INTERSECTION:
+
+                distance = hit_data[T]
+                self._u = hit_data[U]
+                self._v = hit_data[V]
+                self._w = hit_data[W]
+                self._t = hit_data[T]
+                self._i = triangle
+
+        # a hit beyond the node range may be beaten by a triangle in a later leaf
+        return self._i != NO_INTERSECTION and self._t <= max_range
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef bint _trace_any_packed_leaf(self, int32_t id, Ray ray):
+
+        cdef:
+            float hit_data[4]
+            int32_t packet
+            int32_t triangle
+
+        for packet in range(self.leaf_packets_mv[id], self.leaf_packets_mv[id + 1]):
+
+            if RAYSECT_STATISTICS:
+                count_event(TRIANGLE_TESTS, PACKET_SIZE)
+
+            # any intersection inside the ray range blocks the ray
+            triangle = self._hit_packet(packet, ray, ray.max_distance, hit_data)
+            if triangle != NO_INTERSECTION:
+
+                self._u = hit_data[U]
+                self._v = hit_data[V]
+                self._w = hit_data[W]
+                self._t = hit_data[T]
+                self._i = triangle
+                return True
+
+        return False
 
     @cython.cdivision(True)
     cdef void _calc_rayspace_transform(self, Ray ray):
@@ -654,6 +913,159 @@ cdef class MeshData(KDTree3DCore):
 
         return True
 
+    @cython.cdivision(True)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.initializedcheck(False)
+    cdef int32_t _hit_packet(self, int32_t packet, Ray ray, double distance, float[4] hit_data):
+        """
+        Tests a packed block of triangles for intersection with the ray.
+
+        This is the watertight algorithm of _hit_triangle() applied to a block
+        of triangles. The scaled barycentric coordinates and hit distance of
+        every lane are calculated by a branch-free loop over the block's
+        coordinate arrays, the edge and range tests are then applied lane by
+        lane. Lanes that require the double precision fallback are passed to
+        _hit_triangle().
+
+        :param packet: The index of the packed block.
+        :param ray: The ray to test.
+        :param distance: Only intersections closer than this distance are reported.
+        :param hit_data: Array populated with the closest intersection's hit data.
+        :return: The id of the closest triangle hit, or NO_INTERSECTION.
+        """
+
+        cdef:
+            int32_t lane, triangle, closest
+            int32_t ix, iy, iz
+            float sx, sy, sz
+            double[3] origin
+            double ox, oy, oz
+            float *block
+            float *x1s
+            float *y1s
+            float *z1s
+            float *x2s
+            float *y2s
+            float *z2s
+            float *x3s
+            float *y3s
+            float *z3s
+            int32_t *triangles
+            float x1, x2, x3
+            float y1, y2, y3
+            float z1, z2, z3
+            float u[PACKET_SIZE]
+            float v[PACKET_SIZE]
+            float w[PACKET_SIZE]
+            float t[PACKET_SIZE]
+            float lane_hit[4]
+            float det, det_reciprocal, lane_t
+
+        # obtain ray transform
+        ix = self._ix
+        iy = self._iy
+        iz = self._iz
+
+        sx = self._sx
+        sy = self._sy
+        sz = self._sz
+
+        origin[X] = ray.origin.x
+        origin[Y] = ray.origin.y
+        origin[Z] = ray.origin.z
+
+        ox = origin[ix]
+        oy = origin[iy]
+        oz = origin[iz]
+
+        # the block holds the coordinate arrays in the order [vertex][axis][lane]
+        block = &self.packed_vertices_mv[packet, 0, 0, 0]
+        x1s = block + (3 * V1 + ix) * PACKET_SIZE
+        y1s = block + (3 * V1 + iy) * PACKET_SIZE
+        z1s = block + (3 * V1 + iz) * PACKET_SIZE
+        x2s = block + (3 * V2 + ix) * PACKET_SIZE
+        y2s = block + (3 * V2 + iy) * PACKET_SIZE
+        z2s = block + (3 * V2 + iz) * PACKET_SIZE
+        x3s = block + (3 * V3 + ix) * PACKET_SIZE
+        y3s = block + (3 * V3 + iy) * PACKET_SIZE
+        z3s = block + (3 * V3 + iz) * PACKET_SIZE
+
+        # centre on the ray origin, shear and scale space so the ray points along the +ve z axis and calculate the
+        # scaled barycentric coordinates and hit distance for all lanes, this loop is kept free of branches
+        for lane in range(PACKET_SIZE):
+
+            z1 = <float> (z1s[lane] - oz)
+            z2 = <float> (z2s[lane] - oz)
+            z3 = <float> (z3s[lane] - oz)
+
+            x1 = <float> (x1s[lane] - ox) - sx * z1
+            x2 = <float> (x2s[lane] - ox) - sx * z2
+            x3 = <float> (x3s[lane] - ox) - sx * z3
+
+            y1 = <float> (y1s[lane] - oy) - sy * z1
+            y2 = <float> (y2s[lane] - oy) - sy * z2
+            y3 = <float> (y3s[lane] - oy) - sy * z3
+
+            u[lane] = x3 * y2 - y3 * x2
+            v[lane] = x1 * y3 - y1 * x3
+            w[lane] = x2 * y1 - y2 * x1
+            t[lane] = u[lane] * (sz * z1) + v[lane] * (sz * z2) + w[lane] * (sz * z3)
+
+        # apply the edge and range tests to each lane, keeping the closest hit
+        closest = NO_INTERSECTION
+        triangles = &self.packed_triangles_mv[packet, 0]
+        for lane in range(PACKET_SIZE):
+
+            # unused lanes are only found at the end of a block
+            triangle = triangles[lane]
+            if triangle == NO_INTERSECTION:
+                break
+
+            # there is insufficient numerical accuracy to resolve the edge tests, use the double precision fallback
+            if u[lane] == 0.0 or v[lane] == 0.0 or w[lane] == 0.0:
+
+                if self._hit_triangle(triangle, ray, lane_hit) and lane_hit[T] < distance:
+
+                    distance = lane_hit[T]
+                    hit_data[U] = lane_hit[U]
+                    hit_data[V] = lane_hit[V]
+                    hit_data[W] = lane_hit[W]
+                    hit_data[T] = lane_hit[T]
+                    closest = triangle
+
+                continue
+
+            # perform edge tests
+            if (u[lane] < 0.0 or v[lane] < 0.0 or w[lane] < 0.0) and (u[lane] > 0.0 or v[lane] > 0.0 or w[lane] > 0.0):
+                continue
+
+            # if determinant is zero the ray is parallel to the face
+            det = u[lane] + v[lane] + w[lane]
+            if det == 0.0:
+                continue
+
+            # is hit distance within ray limits
+            if det > 0.0:
+                if t[lane] < 0.0 or t[lane] > ray.max_distance * det:
+                    continue
+            else:
+                if t[lane] > 0.0 or t[lane] < ray.max_distance * det:
+                    continue
+
+            det_reciprocal = 1.0 / det
+            lane_t = t[lane] * det_reciprocal
+            if lane_t < distance:
+
+                distance = lane_t
+                hit_data[U] = u[lane] * det_reciprocal
+                hit_data[V] = v[lane] * det_reciprocal
+                hit_data[W] = w[lane] * det_reciprocal
+                hit_data[T] = lane_t
+                closest = triangle
+
+        return closest
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.initializedcheck(False)
@@ -960,6 +1372,12 @@ cdef class MeshData(KDTree3DCore):
         self._t = INFINITY
         self._i = NO_INTERSECTION
 
+        self._reset_mailbox()
+
+        # the kd-tree has been replaced, rebuild the packed leaves
+        if self._packed:
+            self._pack_leaves()
+
         # if we opened a file, we should close it
         if close:
             file.close()
@@ -39,5 +39,7 @@ cdef class Sphere(Primitive):
     cdef Point3D _cached_origin
     cdef Vector3D _cached_direction
     cdef Ray _cached_ray
+    cdef bint _hit_pending
+    cdef double _hit_t
 
     cdef Intersection _generate_intersection(self, Ray ray, Point3D origin, Vector3D direction, double ray_distance)
@@ -30,10 +30,13 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 
-from raysect.core cimport Material, new_intersection, BoundingBox3D, BoundingSphere3D, new_point3d, new_normal3d, Normal3D, AffineMatrix3D
+from raysect.core cimport Material, new_intersection, BoundingBox3D, BoundingSphere3D, new_point3d, new_vector3d, new_normal3d, Normal3D, AffineMatrix3D
 from raysect.core.math.cython cimport solve_quadratic, swap_double
 
 
+# cython doesn't have a built-in infinity constant, this compiles to +infinity
+DEF INFINITY = 1e999
+
 # bounding box and sphere are padded by small amounts to avoid numerical accuracy issues
 DEF BOX_PADDING = 1e-9
 DEF SPHERE_PADDING = 1.000000001
@@ -82,8 +85,10 @@ cdef class Sphere(Primitive):
         # initialise next intersection caching and control attributes
         self._further_intersection = False
         self._next_t = 0.0
-        self._cached_origin = None
-        self._cached_direction = None
+        self._hit_pending = False
+        self._hit_t = 0.0
+        self._cached_origin = new_point3d(0, 0, 0)
+        self._cached_direction = new_vector3d(0, 0, 0)
         self._cached_ray = None
 
     @property
@@ -114,16 +119,25 @@ cdef class Sphere(Primitive):
 
     cpdef Intersection hit(self, Ray ray):
 
+        if self.hit_distance(ray) == INFINITY:
+            return None
+        return self.materialise_intersection()
+
+    cpdef double hit_distance(self, Ray ray) except? -1:
+
         cdef Point3D origin
         cdef Vector3D direction
         cdef double a, b, c, t0, t1, t_closest
 
         # reset further intersection state
         self._further_intersection = False
+        self._hit_pending = False
 
-        # convert ray parameters to local space
-        origin = ray.origin.transform(self.to_local())
-        direction = ray.direction.transform(self.to_local())
+        # convert ray parameters to local space, reusing the cached origin and direction objects
+        self._point_to_local(ray.origin, self._cached_origin)
+        self._vector_to_local(ray.direction, self._cached_direction)
+        origin = self._cached_origin
+        direction = self._cached_direction
 
         # coefficients of quadratic equation and discriminant
         a = direction.x * direction.x + direction.y * direction.y + direction.z * direction.z
@@ -133,7 +147,7 @@ cdef class Sphere(Primitive):
         # calculate intersection distances by solving the quadratic equation
         # ray misses if there are no real roots of the quadratic
         if not solve_quadratic(a, b, c, &t0, &t1):
-            return None
+            return INFINITY
 
         # ensure t0 is always smaller than t1
         if t0 > t1:
@@ -141,22 +155,31 @@ cdef class Sphere(Primitive):
 
         # test the intersection points inside the ray search range [0, max_distance]
         if t0 > ray.max_distance or t1 < 0.0:
-            return None
+            return INFINITY
 
         if t0 >= 0.0:
             t_closest = t0
             if t1 <= ray.max_distance:
                 self._further_intersection = True
-                self._cached_ray = ray
-                self._cached_origin = origin
-                self._cached_direction = direction
                 self._next_t = t1
         elif t1 <= ray.max_distance:
             t_closest = t1
         else:
+            return INFINITY
+
+        # defer construction of the intersection until it is requested
+        self._hit_pending = True
+        self._hit_t = t_closest
+        self._cached_ray = ray
+        return t_closest
+
+    cpdef Intersection materialise_intersection(self):
+
+        if not self._hit_pending:
             return None
 
-        return self._generate_intersection(ray, origin, direction, t_closest)
+        self._hit_pending = False
+        return self._generate_intersection(self._cached_ray, self._cached_origin, self._cached_direction, self._hit_t)
 
     cpdef Intersection next_intersection(self):
 
@@ -0,0 +1,249 @@
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE. 
+
+import unittest
+import numpy as np
+from raysect.core import World, Point3D, Vector3D, Ray, translate, rotate
+from raysect.primitive import Sphere, Box, Cylinder, Union, Intersect, Subtract, MultiUnion, MultiIntersect, flatten_csg
+
+
+class TestCSGIntervalEvaluation(unittest.TestCase):
+    """
+    Tests the interval evaluation of CSG primitives against the incremental evaluation.
+    """
+
+    def build_primitive(self, parent=None):
+
+        # the nested csg tree used by demos/csg.py
+        cyl_x = Cylinder(1, 4.2, transform=rotate(90, 0, 0)*translate(0, 0, -2.1))
+        cyl_y = Cylinder(1, 4.2, transform=rotate(0, 90, 0)*translate(0, 0, -2.1))
+        cyl_z = Cylinder(1, 4.2, transform=rotate(0, 0, 0)*translate(0, 0, -2.1))
+        cube = Box(Point3D(-1.5, -1.5, -1.5), Point3D(1.5, 1.5, 1.5))
+        sphere = Sphere(2.0)
+
+        return Intersect(sphere, Subtract(cube, Union(Union(cyl_x, cyl_y), cyl_z)), parent, rotate(30, -20, 0))
+
+    def intersections(self, primitive, ray):
+
+        intersections = []
+        intersection = primitive.hit(ray)
+        while intersection is not None:
+            intersections.append(intersection)
+            intersection = primitive.next_intersection()
+        return intersections
+
+    def test_hit(self):
+        """All intersections along the ray match the incremental evaluation."""
+
+        world = World()
+        incremental = self.build_primitive(world)
+        interval = self.build_primitive(world)
+        interval.interval_evaluation = True
+
+        rng = np.random.RandomState(2)
+        for i in range(2000):
+
+            origin = Point3D(*rng.uniform(-3, 3, 3))
+            direction = Vector3D(*rng.normal(size=3)).normalise()
+            max_distance = rng.uniform(0, 6) if i % 2 else float("inf")
+
+            expected = self.intersections(incremental, Ray(origin, direction, max_distance))
+            result = self.intersections(interval, Ray(origin, direction, max_distance))
+
+            self.assertEqual(len(result), len(expected), "The number of intersections differ.")
+            for a, b in zip(result, expected):
+                self.assertAlmostEqual(a.ray_distance, b.ray_distance, delta=1e-12, msg="Intersection distances differ.")
+                self.assertEqual(a.exiting, b.exiting, "Intersection exiting states differ.")
+                self.assertIs(a.primitive, interval, "The intersection primitive should be the csg primitive.")
+                for u, v in zip(a.hit_point, b.hit_point):
+                    self.assertAlmostEqual(u, v, delta=1e-12, msg="Intersection hit points differ.")
+                for u, v in zip(a.normal, b.normal):
+                    self.assertAlmostEqual(u, v, delta=1e-12, msg="Intersection normals differ.")
+
+    def test_toggle(self):
+        """Changing the evaluation mode discards the cached intersections."""
+
+        primitive = self.build_primitive(World())
+        ray = Ray(Point3D(0, 0, -5), Vector3D(0, 0, 1))
+
+        self.assertIsNotNone(primitive.hit(ray))
+        primitive.interval_evaluation = True
+        self.assertIsNone(primitive.next_intersection())
+
+        self.assertIsNotNone(primitive.hit(ray))
+        primitive.interval_evaluation = False
+        self.assertIsNone(primitive.next_intersection())
+
+    def test_contains(self):
+
+        world = World()
+        a = Sphere(1.0, transform=translate(-0.5, 0, 0))
+        b = Sphere(1.0, transform=translate(0.5, 0, 0))
+        primitive = Intersect(a, b, world)
+
+        self.assertTrue(primitive.contains(Point3D(0, 0, 0)))
+        self.assertFalse(primitive.contains(Point3D(-1.2, 0, 0)))
+        self.assertFalse(primitive.contains(Point3D(1.2, 0, 0)))
+        self.assertFalse(primitive.contains(Point3D(0, 0.9, 0)))
+
+
+class TestMultiCSG(unittest.TestCase):
+    """
+    Tests the N-ary CSG primitives and CSG flattening against binary CSG trees.
+    """
+
+    def cylinders(self):
+        rng = np.random.RandomState(4)
+        return [
+            Cylinder(rng.uniform(0.1, 0.5), rng.uniform(0.5, 3), transform=translate(*rng.uniform(-2, 2, 3)) * rotate(*rng.uniform(0, 90, 3)))
+            for i in range(30)
+        ]
+
+    def spheres(self):
+        return [Sphere(1.0, transform=translate(0.4 * np.cos(a), 0.4 * np.sin(a), 0)) for a in np.linspace(0, 2 * np.pi, 5, endpoint=False)]
+
+    def chain(self, operator, primitives, parent=None, transform=None):
+        primitive = primitives[0]
+        for operand in primitives[1:]:
+            primitive = operator(primitive, operand)
+        primitive.parent = parent
+        if transform is not None:
+            primitive.transform = transform
+        return primitive
+
+    def intersections(self, primitive, ray):
+
+        intersections = []
+        intersection = primitive.hit(ray)
+        while intersection is not None:
+            intersections.append(intersection)
+            intersection = primitive.next_intersection()
+        return intersections
+
+    def compare(self, primitive, reference, extent=3):
+
+        rng = np.random.RandomState(6)
+        hits = 0
+        for i in range(1000):
+
+            origin = Point3D(*rng.uniform(-extent, extent, 3))
+            direction = Vector3D(*rng.normal(size=3)).normalise()
+            max_distance = rng.uniform(0, 2 * extent) if i % 2 else float("inf")
+
+            expected = self.intersections(reference, Ray(origin, direction, max_distance))
+            result = self.intersections(primitive, Ray(origin, direction, max_distance))
+            hits += len(expected) > 0
+
+            self.assertEqual(len(result), len(expected), "The number of intersections differ.")
+            for a, b in zip(result, expected):
+                self.assertAlmostEqual(a.ray_distance, b.ray_distance, delta=1e-12, msg="Intersection distances differ.")
+                self.assertEqual(a.exiting, b.exiting, "Intersection exiting states differ.")
+                self.assertIs(a.primitive, primitive, "The intersection primitive should be the csg primitive.")
+                for u, v in zip(a.hit_point, b.hit_point):
+                    self.assertAlmostEqual(u, v, delta=1e-12, msg="Intersection hit points differ.")
+                for u, v in zip(a.normal, b.normal):
+                    self.assertAlmostEqual(u, v, delta=1e-12, msg="Intersection normals differ.")
+
+            point = Point3D(*rng.uniform(-extent, extent, 3))
+            self.assertEqual(primitive.contains(point), reference.contains(point), "Containment tests differ.")
+
+        self.assertGreater(hits, 100, "Too few rays intersected the primitives to be a meaningful test.")
+
+    def test_union(self):
+
+        world = World()
+        transform = translate(0.1, 0.2, 0.3) * rotate(10, 20, 30)
+        primitive = MultiUnion(self.cylinders(), world, transform)
+        reference = self.chain(Union, self.cylinders(), world, transform)
+        self.compare(primitive, reference)
+
+    def test_intersect(self):
+
+        world = World()
+        primitive = MultiIntersect(self.spheres(), world)
+        reference = self.chain(Intersect, self.spheres(), world)
+        self.compare(primitive, reference, extent=1)
+
+    def test_nested(self):
+
+        world = World()
+        primitive = Subtract(Box(Point3D(-2, -2, -2), Point3D(2, 2, 2)), MultiUnion(self.cylinders()), world)
+        reference = Subtract(Box(Point3D(-2, -2, -2), Point3D(2, 2, 2)), self.chain(Union, self.cylinders()), world)
+        self.compare(primitive, reference)
+
+        world = World()
+        primitive = MultiUnion([MultiIntersect(self.spheres()), Subtract(Box(Point3D(-2, -2, -2), Point3D(2, 2, 2)), Sphere(2.5))], world)
+        reference = Union(self.chain(Intersect, self.spheres()), Subtract(Box(Point3D(-2, -2, -2), Point3D(2, 2, 2)), Sphere(2.5)), world)
+        self.compare(primitive, reference)
+
+    def test_bounding_box(self):
+
+        world = World()
+        primitive = MultiUnion(self.cylinders(), world)
+        reference = self.chain(Union, self.cylinders(), world)
+        box = primitive.bounding_box()
+        expected = reference.bounding_box()
+        for a, b in zip((box.lower, box.upper), (expected.lower, expected.upper)):
+            for u, v in zip(a, b):
+                # each level of the binary tree pads its bounding box
+                self.assertAlmostEqual(u, v, delta=1e-7)
+
+    def test_flatten(self):
+
+        world = World()
+        transform = translate(0.5, 0, 0) * rotate(30, -20, 0)
+
+        # an unbalanced tree of unions, with nested transforms and a nested subtraction
+        cylinders = self.cylinders()
+        tree = self.chain(Union, cylinders[:10])
+        tree = Union(Union(tree, self.chain(Union, cylinders[10:20]), transform=translate(0.1, 0, 0)), Subtract(self.chain(Union, cylinders[20:]), Sphere(0.5)))
+        tree.parent = world
+        tree.transform = transform
+
+        flat = flatten_csg(tree)
+        flat.parent = world
+
+        self.assertIsInstance(flat, MultiUnion)
+        self.assertEqual(len(flat.primitives), 21, "The union operands should have been merged.")
+        self.assertIsInstance(flat.primitives[-1], Subtract)
+        self.assertIsInstance(flat.primitives[-1].primitive_a, MultiUnion)
+
+        self.compare(flat, tree)
+
+    def test_invalid_arguments(self):
+
+        with self.assertRaises(ValueError):
+            MultiUnion([])
+
+        with self.assertRaises(TypeError):
+            MultiUnion([Sphere(), None])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+# Copyright (c) 2014-2018, Dr Alex Meakins, Raysect Project
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+#     1. Redistributions of source code must retain the above copyright notice,
+#        this list of conditions and the following disclaimer.
+#
+#     2. Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#
+#     3. Neither the name of the Raysect Project nor the names of its
+#        contributors may be used to endorse or promote products derived from
+#        this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE. 
+
+
+import unittest
+import numpy as np
+from raysect.core import World, Node, Point3D, Vector3D, Ray, AffineMatrix3D, translate, rotate
+from raysect.primitive import Sphere, Box, Cylinder, Cone, Parabola
+
+
+class TestLocalTransform(unittest.TestCase):
+    """
+    Tests the conversion of rays into primitive local space.
+
+    Primitives with identity and translation root transforms use reduced
+    transform arithmetic, the intersections must match those of an untransformed
+    primitive traced with a ray transformed into local space.
+    """
+
+    transforms = [
+        translate(0, 0, 0),
+        translate(0.1, -0.2, 0.3),
+        translate(0.1, -0.2, 0.3) * rotate(10, 20, 30),
+    ]
+
+    def assert_matches(self, primitive, reference, ray, transform):
+
+        local_ray = Ray(ray.origin.transform(transform.inverse()), ray.direction.transform(transform.inverse()))
+
+        result = primitive.hit(ray)
+        expected = reference.hit(local_ray)
+        while expected is not None:
+            self.assertIsNotNone(result, "An intersection was missed.")
+            self.assertAlmostEqual(result.ray_distance, expected.ray_distance, delta=1e-9, msg="Intersection distances differ.")
+            for a, b in zip((result.hit_point.x, result.hit_point.y, result.hit_point.z),
+                            (expected.hit_point.x, expected.hit_point.y, expected.hit_point.z)):
+                self.assertAlmostEqual(a, b, delta=1e-9, msg="Local hit points differ.")
+            result = primitive.next_intersection()
+            expected = reference.next_intersection()
+        self.assertIsNone(result, "An unexpected intersection was found.")
+
+    def test_primitives(self):
+        """The analytic primitives find the same intersections for all transform types."""
+
+        rng = np.random.RandomState(3)
+        for primitive_type in (Sphere, Box, Cylinder, Cone, Parabola):
+            for transform in self.transforms:
+
+                world = World()
+                primitive = primitive_type(parent=world, transform=transform)
+                reference = primitive_type()
+
+                for i in range(200):
+                    direction = rng.normal(size=3)
+                    origin = 3 * direction / np.linalg.norm(direction)
+                    target = rng.uniform(-0.5, 0.5, 3)
+                    ray = Ray(Point3D(*origin), Vector3D(*(target - origin)).normalise())
+                    self.assert_matches(primitive, reference, ray, transform)
+
+    def test_transform_change(self):
+        """The local transform follows changes to the node and its parents."""
+
+        world = World()
+        node = Node(world)
+        sphere = Sphere(0.5, parent=node)
+        reference = Sphere(0.5)
+        ray = Ray(Point3D(0.2, 0.1, -5), Vector3D(0, 0, 1))
+
+        self.assert_matches(sphere, reference, ray, AffineMatrix3D())
+
+        sphere.transform = translate(0.1, 0, 0)
+        self.assert_matches(sphere, reference, ray, translate(0.1, 0, 0))
+
+        node.transform = rotate(0, 30, 0)
+        self.assert_matches(sphere, reference, ray, rotate(0, 30, 0) * translate(0.1, 0, 0))
+
+        sphere.transform = translate(0, 0, 0)
+        self.assert_matches(sphere, reference, ray, rotate(0, 30, 0))
+
+        sphere.parent = world
+        self.assert_matches(sphere, reference, ray, AffineMatrix3D())
+
+
+if __name__ == "__main__":
+    unittest.main()
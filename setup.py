@@ -9,6 +9,7 @@ use_cython = True
 force = False
 profile = False
 line_profile = False
+statistics = False
 
 if "--skip-cython" in sys.argv:
     use_cython = False
@@ -26,6 +27,10 @@ if "--line-profile" in sys.argv:
     line_profile = True
     del sys.argv[sys.argv.index("--line-profile")]
 
+if "--statistics" in sys.argv:
+    statistics = True
+    del sys.argv[sys.argv.index("--statistics")]
+
 source_paths = ['raysect', 'demos']
 compilation_includes = [".", numpy.get_include()]
 compilation_args = []
@@ -40,6 +45,11 @@ if line_profile:
     compilation_args.append("-DCYTHON_TRACE_NOGIL=1")
     cython_directives["linetrace"] = True
 
+# compiles the render statistics counters into the ray-tracing code (see raysect.core.statistics)
+# the extensions must be rebuilt with --force when this option is changed
+if statistics:
+    compilation_args.append("-DRAYSECT_STATISTICS=1")
+
 if use_cython:
 
     from Cython.Build import cythonize